@@ -0,0 +1,101 @@
+"""
+CLFS Run Checkpoints
+
+Persists the working state of a long validation run so a crash, or an output
+workbook locked by Excel, does not throw the run away. The state after each
+validation stage, and periodically inside the row-by-row SSOC/SSIC stages, is
+pickled to output/checkpoints/<file name>.checkpoint.pickle (the full name, so
+X.csv and X.xlsx keep separate checkpoints):
+
+- the stage to run next and the row it resumes from
+- modified_df, changes, error_cells, rule_errors and error_stages
+
+A checkpoint is written at most every CLFS_CHECKPOINT_INTERVAL seconds
+(default 60) inside and between stages, and always once all stages are done,
+so short runs pay for a single write. The file is replaced atomically and
+removed once the outputs are written. It is only reused (--resume) when the
+input rows, the rule definitions and the enabled stages are unchanged.
+
+Checkpointing is opt-in (CLFS_validator.py --checkpoint, implied by --resume):
+default runs neither hash their rows for the fingerprint nor pickle their state.
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import CLFS_incremental as incremental
+
+
+DEFAULT_CHECKPOINT_DIR = Path("output") / "checkpoints"
+DEFAULT_INTERVAL_S = float(os.environ.get("CLFS_CHECKPOINT_INTERVAL", "60"))
+
+
+def run_fingerprint(df, definitions: str) -> str:
+    """Fingerprint of the input rows and the definitions fingerprint of the run."""
+    digest = hashlib.sha256(definitions.encode("utf-8"))
+    digest.update(repr([str(col) for col in df.columns]).encode("utf-8"))
+    for row_hash in incremental.row_hashes(df):
+        digest.update(row_hash.encode("ascii"))
+    return digest.hexdigest()
+
+
+class RunCheckpoint:
+    """Checkpoint file of one input file's validation run."""
+
+    def __init__(
+        self,
+        directory: Path,
+        filename: str,
+        fingerprint: Callable[[], str],
+        interval_s: float = DEFAULT_INTERVAL_S,
+    ):
+        self.path = Path(directory) / f"{Path(filename).name}.checkpoint.pickle"
+        self.interval_s = interval_s
+        self._fingerprint_fn = fingerprint
+        self._fingerprint: Optional[str] = None
+        self._last_save = time.monotonic()
+
+    @property
+    def fingerprint(self) -> str:
+        # Hashing every row is only paid once a checkpoint is read or written
+        if self._fingerprint is None:
+            self._fingerprint = self._fingerprint_fn()
+        return self._fingerprint
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last_save >= self.interval_s
+
+    def load(self) -> Optional[dict]:
+        """The saved state, or None when there is none or it belongs to other inputs/definitions."""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "rb") as fh:
+                saved = pickle.load(fh)
+        except Exception as e:
+            print(f"Warning: ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if saved.get("fingerprint") != self.fingerprint:
+            print(f"  Checkpoint {self.path.name} is from a different input or rule set; starting over")
+            return None
+        return saved["state"]
+
+    def save(self, state: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as fh:
+            pickle.dump({"fingerprint": self.fingerprint, "state": state}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._last_save = time.monotonic()
+
+    def clear(self) -> None:
+        """Remove the checkpoint (and the checkpoint folder once it is empty)."""
+        self.path.unlink(missing_ok=True)
+        try:
+            self.path.parent.rmdir()
+        except OSError:
+            pass
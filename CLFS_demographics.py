@@ -0,0 +1,148 @@
+"""
+CLFS / MLFS Demographic Derivation
+
+Parses Date of Birth columns and derives exact ages once per file, so rules
+read precomputed dob_dt / age_years / age_band values instead of re-parsing
+dates row by row:
+
+- parse_dob:     one pd.to_datetime(format=...) call per accepted format over
+                 the whole column (later formats only see the values the
+                 earlier ones could not parse); two-digit years that would
+                 fall after the reference date are moved back a century
+- exact_age:     completed years at the survey reference date, computed in
+                 integer YYYYMMDD arithmetic
+- age_band:      5-year bands used in the survey tables
+- derive_demographics / attach_demographics: the three columns together
+
+The survey reference date is the last day of the survey wave (YYYY-MM) and can
+be fixed with the CLFS_REFERENCE_DATE environment variable (YYYY-MM-DD). Without
+either, ages are left unknown rather than computed at the day the file happens
+to be validated.
+"""
+
+import os
+from datetime import date
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+DOB_COLUMN = "Date of Birth (DD/MM/YYYY)"
+# The header says DD/MM/YYYY but exports also carry D-Mon-YY (e.g. 1-Jan-90)
+DOB_FORMATS = ("%d/%m/%Y", "%d-%b-%y")
+
+DOB_DT = "dob_dt"
+AGE_YEARS = "age_years"
+AGE_BAND = "age_band"
+
+AGE_BAND_EDGES = [0, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70]
+AGE_BAND_LABELS = [
+    "Below 15", "15-19", "20-24", "25-29", "30-34", "35-39", "40-44",
+    "45-49", "50-54", "55-59", "60-64", "65-69", "70 & Over",
+]
+
+DateLike = Union[str, date, pd.Timestamp, None]
+
+
+def reference_date(value: DateLike = None, wave: Optional[str] = None) -> Optional[pd.Timestamp]:
+    """
+    The survey reference date: value, else CLFS_REFERENCE_DATE, else the last
+    day of wave ('YYYY-MM'); None when none of them is given.
+    """
+    value = value or os.environ.get("CLFS_REFERENCE_DATE")
+    if value:
+        return pd.Timestamp(value).normalize()
+    if wave:
+        return pd.Period(wave, freq="M").end_time.normalize()
+    return None
+
+
+def parse_dob(values: pd.Series, formats=DOB_FORMATS, reference: DateLike = None) -> pd.Series:
+    """
+    Parse a Date of Birth column to datetime64 (NaT where no format matches).
+    Columns that are already datetime64 are returned unchanged. Without a
+    reference date two-digit years are only kept out of the future.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    ref = reference_date(reference) or pd.Timestamp(date.today())
+    # Positional throughout: a tidy MLFS frame repeats its household index per member
+    parsed = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+    pending = values.notna().to_numpy()
+    for fmt in formats:
+        if not pending.any():
+            break
+        attempt = pd.to_datetime(values[pending], format=fmt, errors="coerce")
+        if "%y" in fmt:
+            # %y maps 00-68 to 2000-2068; a birth date cannot lie in the future
+            attempt = attempt.mask(attempt > ref, attempt - pd.DateOffset(years=100))
+        parsed[pending] = attempt.to_numpy(dtype="datetime64[ns]")
+        pending &= np.isnat(parsed)
+    return pd.Series(parsed, index=values.index)
+
+
+def exact_age(dob: pd.Series, reference: DateLike = None) -> pd.Series:
+    """
+    Completed years between dob and the reference date (nullable Int64, all
+    missing when there is no reference date).
+
+    (ref YYYYMMDD - dob YYYYMMDD) // 10000 is the year difference minus one
+    when the birthday has not yet come round in the reference year.
+    """
+    ref = reference_date(reference)
+    dob = pd.to_datetime(dob, errors="coerce")
+    if ref is None:
+        return pd.Series(pd.NA, index=dob.index, dtype="Int64", name=AGE_YEARS)
+    ref_key = ref.year * 10000 + ref.month * 100 + ref.day
+    known = dob.notna().to_numpy()
+    dob_key = (
+        dob.dt.year.to_numpy(dtype=np.int64, na_value=0) * 10000
+        + dob.dt.month.to_numpy(dtype=np.int64, na_value=0) * 100
+        + dob.dt.day.to_numpy(dtype=np.int64, na_value=0)
+    )
+    ages = (ref_key - dob_key) // 10000
+    return pd.Series(pd.arrays.IntegerArray(ages, ~known), index=dob.index, name=AGE_YEARS)
+
+
+def age_band(ages: pd.Series) -> pd.Series:
+    """5-year age band labels (None for unknown or negative ages)."""
+    ages = pd.to_numeric(ages, errors="coerce").astype("float64")
+    bands = pd.cut(ages, bins=AGE_BAND_EDGES + [np.inf], labels=AGE_BAND_LABELS, right=False)
+    return bands.astype(object).where(bands.notna(), None).rename(AGE_BAND)
+
+
+def derive_demographics(dob_values: pd.Series, reference: DateLike = None, formats=DOB_FORMATS) -> pd.DataFrame:
+    """dob_dt, age_years and age_band for one Date of Birth column."""
+    dob_dt = parse_dob(dob_values, formats, reference)
+    ages = exact_age(dob_dt, reference)
+    return pd.DataFrame(
+        {DOB_DT: dob_dt.to_numpy(), AGE_YEARS: ages.array, AGE_BAND: age_band(ages).to_numpy()},
+        index=dob_values.index,
+    )
+
+
+def attach_demographics(
+    df: pd.DataFrame,
+    dob_col: str = DOB_COLUMN,
+    reference: DateLike = None,
+    formats=DOB_FORMATS,
+    prefix: str = "",
+) -> pd.DataFrame:
+    """df with <prefix>dob_dt / age_years / age_band derived from dob_col (all missing without it)."""
+    if dob_col in df.columns:
+        derived = derive_demographics(df[dob_col], reference, formats)
+    else:
+        derived = derive_demographics(pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]"), reference)
+    for col_name in (DOB_DT, AGE_YEARS, AGE_BAND):
+        df[f"{prefix}{col_name}"] = derived[col_name].array
+    return df
+
+
+def value_or_none(value: object) -> Optional[object]:
+    """Scalar from a derived column as a plain Python value (None when missing)."""
+    if value is None or value is pd.NaT or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    return value
@@ -0,0 +1,159 @@
+"""
+CLFS Incremental Re-validation State Store
+
+Keeps the per-respondent results of the previous validation run so that a
+correction round-trip only re-evaluates the rows whose inputs changed.
+
+Each input row is keyed by its Response ID and stored together with a
+content hash of the row and the pickled results produced for that row
+(rule errors, changed cells incl. SSOC/SSIC/SSEC assignments, error cells).
+Entries are keyed by file name and a definitions fingerprint covering the
+input's column layout, the validator, rule and SSOC sources and the reference
+files; when any of them changes (or a file is replaced by one with another
+layout), none of the cached rows are reused and every row is re-validated.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+
+DEFAULT_STATE_FILE = str(Path("output") / "clfs_incremental_state.sqlite")
+
+
+def response_keys(df: pd.DataFrame, response_col: Optional[str]) -> list[str]:
+    """
+    Build a stable key per row from the Response ID column.
+
+    Repeated Response IDs get an occurrence suffix ("<id>#2", "<id>#3", ...)
+    so every row still maps to exactly one cache entry. Without a Response ID
+    column the positional row index is used instead.
+    """
+    if not response_col or response_col not in df.columns:
+        return [f"row:{idx}" for idx in range(len(df))]
+
+    ids = df[response_col].map(lambda v: "" if pd.isna(v) else str(v).strip())
+    occurrence = ids.groupby(ids).cumcount()
+    return [
+        rid if occ == 0 else f"{rid}#{occ + 1}"
+        for rid, occ in zip(ids.tolist(), occurrence.tolist())
+    ]
+
+
+def row_hashes(df: pd.DataFrame) -> list[str]:
+    """Return a content hash per row (column order and values, index ignored)."""
+    if df.empty:
+        return []
+    hashed = pd.util.hash_pandas_object(df.astype(str), index=False)
+    return [format(int(value), "016x") for value in hashed.tolist()]
+
+
+def definitions_fingerprint(
+    columns: Iterable[object],
+    source_files: Iterable[object],
+    extra: Iterable[object] = (),
+) -> str:
+    """
+    Fingerprint the rule definitions a cached result depends on.
+
+    Python sources are hashed by content, other files (reference workbooks and
+    lookups) by size and modification time. The column layout of the input is
+    included because cached cell positions are column indices.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([str(col) for col in columns]).encode("utf-8"))
+    for path in source_files:
+        path = Path(path)
+        digest.update(str(path.name).encode("utf-8"))
+        if not path.exists():
+            digest.update(b"<missing>")
+            continue
+        if path.suffix == ".py":
+            digest.update(path.read_bytes())
+        else:
+            stat = path.stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    for value in extra:
+        digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IncrementalStateStore:
+    """SQLite-backed cache of per-row validation results keyed by Response ID."""
+
+    def __init__(self, path: str = DEFAULT_STATE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel --workers runs share the store; wait for a concurrent writer instead of failing
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        # row_state predates the fingerprint key; it only holds cached results
+        self._conn.execute("DROP TABLE IF EXISTS row_state")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS row_cache (
+                file TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                response_key TEXT NOT NULL,
+                row_hash TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (file, fingerprint, response_key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self, filename: str, fingerprint: str) -> dict[str, tuple[str, dict]]:
+        """
+        Return {response_key: (row_hash, payload)} for rows cached under the
+        same definitions fingerprint. Rows from older definitions are ignored.
+        """
+        cursor = self._conn.execute(
+            "SELECT response_key, row_hash, payload FROM row_cache WHERE file = ? AND fingerprint = ?",
+            (filename, fingerprint),
+        )
+        return {
+            key: (row_hash, pickle.loads(payload))
+            for key, row_hash, payload in cursor.fetchall()
+        }
+
+    def save(
+        self,
+        filename: str,
+        fingerprint: str,
+        entries: Iterable[tuple[str, str, dict]],
+    ) -> None:
+        """
+        Replace the cached rows of a file with (response_key, row_hash, payload)
+        entries; rows cached under other definitions fingerprints are dropped.
+        """
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (filename, fingerprint, key, row_hash,
+             pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), timestamp)
+            for key, row_hash, payload in entries
+        ]
+        with self._conn:
+            self._conn.execute("DELETE FROM row_cache WHERE file = ?", (filename,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO row_cache VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def clear(self, filename: str) -> None:
+        """Drop the cached rows of one file."""
+        with self._conn:
+            self._conn.execute("DELETE FROM row_cache WHERE file = ?", (filename,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def state_file_from_env() -> str:
+    return os.environ.get("CLFS_STATE_FILE", DEFAULT_STATE_FILE)
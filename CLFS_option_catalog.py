@@ -0,0 +1,210 @@
+"""
+CLFS Option Catalog
+
+Indexes the answer options of the survey form once, so validators look up
+allowed answers in a dict instead of walking answer.json or scanning lists:
+
+- every field (and table column) that has fieldOptions is keyed by its
+  globalId and by its normalized title (whitespace collapsed, lowercased);
+  a title shared by several fields (one per household member block) maps to
+  the first of them
+- per field: the options in form order, the normalized option -> option map
+  used for membership and canonicalization, and the option codes (the
+  1-based position of the option in the form)
+
+The index is built from answer.json and references/CLFS_rules_and_routing.json
+(fields are merged by globalId, answer.json wins) and cached as a pickle next
+to the other run artifacts in output/. The cache is rebuilt when a source file
+or this module changes (CLFS_incremental.definitions_fingerprint). Within a
+process the loaded catalog is reused while the size and modification time of
+every file are unchanged, so repeated lookups only stat the sources.
+"""
+
+import json
+import pickle
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import CLFS_incremental
+
+
+ROOT = Path(__file__).parent
+DEFAULT_SOURCES = (ROOT / "answer.json", ROOT / "references" / "CLFS_rules_and_routing.json")
+DEFAULT_CACHE_FILE = ROOT / "output" / "option_catalog.pickle"
+
+
+def normalize(text: object) -> str:
+    """Collapse whitespace and lowercase (the key used for titles and options)."""
+    return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+
+@dataclass
+class FieldOptions:
+    """Answer options of one form field."""
+    global_id: str
+    title: str
+    field_type: Optional[str]
+    options: Tuple[str, ...]
+    others: bool = False
+    lookup: Dict[str, str] = field(default_factory=dict)
+    codes: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for i, opt in enumerate(self.options):
+            self.lookup.setdefault(normalize(opt), opt)
+            self.codes.setdefault(opt, i + 1)
+
+    def canonical(self, value: object) -> Optional[str]:
+        """The form's spelling of value, or None when it is not one of the options."""
+        if isinstance(value, str) and value in self.codes:
+            return value
+        return self.lookup.get(normalize(value))
+
+    def code(self, value: object) -> Optional[int]:
+        """1-based position of value among the options, or None."""
+        canonical = self.canonical(value)
+        return self.codes[canonical] if canonical is not None else None
+
+
+class OptionCatalog:
+    """globalId / title -> FieldOptions index."""
+
+    def __init__(self, fields: Iterable[FieldOptions], fingerprint: str = ""):
+        self.fingerprint = fingerprint
+        self.by_id: Dict[str, FieldOptions] = {}
+        self.by_title: Dict[str, FieldOptions] = {}
+        for f in fields:
+            self.by_id.setdefault(f.global_id, f)
+            self.by_title.setdefault(normalize(f.title), f)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, key: str) -> bool:
+        return self.field(key) is not None
+
+    def field(self, key: str) -> Optional[FieldOptions]:
+        """Field by globalId or title."""
+        return self.by_id.get(key) or self.by_title.get(normalize(key))
+
+    def options(self, key: str) -> List[str]:
+        """Options of a field in form order ([] for unknown fields)."""
+        f = self.field(key)
+        return list(f.options) if f else []
+
+    def is_option(self, key: str, value: object) -> bool:
+        f = self.field(key)
+        return f is not None and f.canonical(value) is not None
+
+    def canonical(self, key: str, value: object) -> Optional[str]:
+        f = self.field(key)
+        return f.canonical(value) if f else None
+
+    def code(self, key: str, value: object) -> Optional[int]:
+        f = self.field(key)
+        return f.code(value) if f else None
+
+
+def _form_fields(path: Path) -> List[dict]:
+    with open(path, encoding="utf-8") as fh:
+        form = json.load(fh)
+    return form.get("form", {}).get("form_fields", []) if isinstance(form, dict) else []
+
+
+def _field_options(raw: dict) -> List[FieldOptions]:
+    """The field itself and, for tables, each column that has options."""
+    found = []
+    global_id = str(raw.get("globalId") or raw.get("_id") or "")
+    if raw.get("fieldOptions"):
+        found.append(FieldOptions(
+            global_id=global_id,
+            title=str(raw.get("title") or ""),
+            field_type=raw.get("fieldType"),
+            options=tuple(str(opt) for opt in raw["fieldOptions"]),
+            others=bool(raw.get("othersRadioButton")),
+        ))
+    for column in raw.get("columns") or []:
+        if column.get("fieldOptions"):
+            found.append(FieldOptions(
+                global_id=f"{global_id}:{column.get('_id')}",
+                title=str(column.get("title") or ""),
+                field_type=column.get("columnType"),
+                options=tuple(str(opt) for opt in column["fieldOptions"]),
+            ))
+    return found
+
+
+def build_catalog(sources: Iterable[Path] = DEFAULT_SOURCES) -> OptionCatalog:
+    """Parse the form JSON files (missing files are skipped) into a catalog."""
+    fields: List[FieldOptions] = []
+    for path in sources:
+        path = Path(path)
+        if not path.exists():
+            continue
+        for raw in _form_fields(path):
+            fields.extend(_field_options(raw))
+    return OptionCatalog(fields)
+
+
+def _fingerprint(sources: Iterable[Path]) -> str:
+    return CLFS_incremental.definitions_fingerprint((), [Path(__file__), *sources])
+
+
+def _stat_signature(sources: Iterable[Path]) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """(size, mtime_ns) of this module and every source (None when missing)."""
+    signature = []
+    for path in (Path(__file__), *sources):
+        try:
+            stat = path.stat()
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+# sources -> (stat signature, catalog); the fingerprint is only recomputed when a signature changes
+_LOADED: Dict[Tuple[str, ...], Tuple[tuple, OptionCatalog]] = {}
+
+
+def load_catalog(sources: Iterable[Path] = DEFAULT_SOURCES, cache_file: Optional[Path] = DEFAULT_CACHE_FILE) -> OptionCatalog:
+    """
+    The catalog for sources: from this process's memo while no source changed
+    size or modification time, else the cache file when its fingerprint still
+    matches, else built and written to the cache. Pass cache_file=None to skip
+    the cache file.
+    """
+    sources = tuple(Path(p) for p in sources)
+    key = tuple(str(p) for p in sources)
+    signature = _stat_signature(sources)
+    memo = _LOADED.get(key)
+    if memo is not None and memo[0] == signature:
+        return memo[1]
+
+    fingerprint = _fingerprint(sources)
+    if memo is not None and memo[1].fingerprint == fingerprint:
+        _LOADED[key] = (signature, memo[1])
+        return memo[1]
+
+    catalog = None
+    if cache_file is not None and Path(cache_file).exists():
+        try:
+            with open(cache_file, "rb") as fh:
+                cached = pickle.load(fh)
+            if getattr(cached, "fingerprint", None) == fingerprint:
+                catalog = cached
+        except Exception:
+            catalog = None
+    if catalog is None:
+        catalog = build_catalog(sources)
+        catalog.fingerprint = fingerprint
+        if cache_file is not None:
+            try:
+                Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, "wb") as fh:
+                    pickle.dump(catalog, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                print(f"Warning: could not write option catalog cache {cache_file}: {e}")
+    _LOADED[key] = (signature, catalog)
+    return catalog
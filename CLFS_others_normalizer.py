@@ -0,0 +1,205 @@
+"""
+CLFS "Others:" Answer Normalizer
+
+Column-at-once versions of the free-text rules of the CLFS validator:
+
+RULE 1:  "Others: <text>" answers that match a predefined option are replaced by
+         the option; short unmatched answers get the RSPD confirmation prefix
+RULE 16: "Others: <denomination>" religions are reclassified
+RULE 17: any religion mentioning "no religion" is normalized to "No religion"
+RULE 18: "Others: <country>" places of birth must be a known country
+
+The Others payload is extracted with a single str.extract per column, options
+are resolved through precomputed hash indexes, and each distinct answer is
+matched once. Results are identical to the per-cell functions in
+CLFS_validation_rules (validate_others_option) and the original loops of the
+validator.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+import CLFS_validation_rules as rules
+
+
+REFERENCES_DIR = Path(__file__).parent / "references"
+COUNTRIES_FILE = REFERENCES_DIR / "Countries.csv"
+RELIGIONS_FILE = REFERENCES_DIR / "Religions.csv"
+
+# Same pattern as rules._extract_others_value
+OTHERS_PATTERN = re.compile(r"^Others:\s*(.+)$", re.IGNORECASE)
+RSPD_CONFIRMATION = "The RSPD confirms that the following answer is correct as of this time; "
+
+RESULT_COLUMNS = ["original", "corrected", "message"]
+
+
+def load_country_set(path: Path = COUNTRIES_FILE, extra: Iterable[str] = ()) -> frozenset[str]:
+    """Lower-cased country names from Countries.csv plus any extra names."""
+    countries = {str(c).strip().lower() for c in extra if str(c).strip()}
+    if Path(path).exists():
+        names = pd.read_csv(path, header=None, dtype=str, encoding="utf-8-sig")[0]
+        countries.update(names.dropna().str.strip().str.lower().loc[lambda s: s != ""])
+    return frozenset(countries)
+
+
+def load_religion_reclass_map(path: Path = RELIGIONS_FILE, base: Optional[dict] = None) -> dict[str, str]:
+    """
+    Denomination -> reclassified religion, keeping the order of base first and
+    appending denominations that only appear in Religions.csv.
+    """
+    reclass = {str(k).strip().lower(): v for k, v in (base or {}).items()}
+    if Path(path).exists():
+        table = pd.read_csv(path, sep="\t", dtype=str, encoding="utf-8-sig").dropna()
+        for denom, religion in zip(table.iloc[:, 0], table.iloc[:, 1]):
+            reclass.setdefault(denom.strip().lower(), religion.strip())
+    return reclass
+
+
+def _empty_result() -> pd.DataFrame:
+    return pd.DataFrame(columns=RESULT_COLUMNS, dtype=object)
+
+
+def _text_cells(series: pd.Series) -> pd.Series:
+    """Non-missing cells as str, like str(value) in the per-cell rules."""
+    return series[series.notna()].astype(str)
+
+
+def extract_others_payload(text: pd.Series) -> pd.Series:
+    """Stripped text after an "Others:" prefix; NaN where there is no prefix."""
+    return text.str.extract(OTHERS_PATTERN, expand=False).str.strip()
+
+
+class OptionIndex:
+    """
+    Resolves a lower-cased answer to the first predefined option (in list
+    order) that equals it, contains it or is contained in it.
+    """
+
+    def __init__(self, options: list[str]):
+        self.options = list(options)
+        self.lowered = [opt.lower().strip() for opt in self.options]
+        # Every substring of an option -> first option containing it
+        # (covers both "answer == option" and "answer in option").
+        self._contained_in: dict[str, int] = {}
+        for idx, opt in enumerate(self.lowered):
+            for start in range(len(opt) + 1):
+                for end in range(start, len(opt) + 1):
+                    self._contained_in.setdefault(opt[start:end], idx)
+        self._contains = re.compile("|".join(re.escape(opt) for opt in self.lowered if opt)) if any(self.lowered) else None
+
+    def match_index(self, answer_lower: str) -> int:
+        best = self._contained_in.get(answer_lower, len(self.options))
+        if self._contains is not None and self._contains.search(answer_lower):
+            for idx in range(best):
+                if self.lowered[idx] in answer_lower:
+                    return idx
+        return best if best < len(self.options) else -1
+
+    def match_series(self, answers_lower: pd.Series) -> pd.Series:
+        """Option index per answer (-1 when nothing matches); distinct answers are resolved once."""
+        uniques = pd.unique(answers_lower)
+        lookup = {value: self.match_index(value) for value in uniques}
+        return answers_lower.map(lookup).astype(int)
+
+
+@lru_cache(maxsize=None)
+def _option_index(question_key: str) -> OptionIndex:
+    return OptionIndex(rules.QUESTIONS_WITH_OTHERS[question_key]["options"])
+
+
+def normalize_others_column(series: pd.Series, question_key: str, min_words: int = 10) -> pd.DataFrame:
+    """
+    RULE 1 for a whole column.
+
+    Returns:
+        DataFrame indexed like series with original, corrected and message for
+        every cell whose value changes (same outcome as validate_others_option)
+    """
+    if question_key not in rules.QUESTIONS_WITH_OTHERS:
+        return _empty_result()
+
+    text = _text_cells(series)
+    text = text[text != ""]
+    payload = extract_others_payload(text).dropna()
+    if payload.empty:
+        return _empty_result()
+
+    index = _option_index(question_key)
+    matched = index.match_series(payload.str.lower().str.strip())
+    options = np.array(index.options, dtype=object)
+
+    is_match = matched >= 0
+    word_counts = payload.str.split().str.len()
+    needs_prefix = ~is_match & (word_counts < min_words)
+
+    corrected = pd.Series(None, index=payload.index, dtype=object)
+    message = pd.Series(None, index=payload.index, dtype=object)
+    if is_match.any():
+        chosen = pd.Series(options[matched[is_match].to_numpy()], index=matched[is_match].index)
+        corrected[is_match] = chosen
+        message[is_match] = "Others answer matches predefined option: '" + chosen + "'"
+    if needs_prefix.any():
+        corrected[needs_prefix] = "Others: " + RSPD_CONFIRMATION + payload[needs_prefix]
+        message[needs_prefix] = (
+            "Others answer approved with RSPD confirmation (original word count: "
+            + word_counts[needs_prefix].astype(str)
+            + ", now meets minimum requirement)"
+        )
+
+    result = pd.DataFrame({"original": text[payload.index], "corrected": corrected, "message": message})
+    result = result[result["corrected"].notna() & (result["corrected"] != result["original"])]
+    return result
+
+
+def reclassify_religion_column(series: pd.Series, reclass_map: dict[str, str]) -> pd.DataFrame:
+    """
+    RULE 16 for a whole column: "Others: <text>" containing a known
+    denomination is reclassified (first denomination in map order wins).
+    """
+    raw = _text_cells(series).str.strip()
+    lowered = raw.str.lower()
+    others = lowered.str.startswith("others:")
+    if not others.any() or not reclass_map:
+        return _empty_result()
+
+    text = lowered[others].str.slice(len("others:")).str.strip()
+    denominations = list(reclass_map)
+    any_match = text.str.contains("|".join(re.escape(d) for d in denominations), regex=True)
+    text = text[any_match]
+    if text.empty:
+        return _empty_result()
+
+    conditions = [text.str.contains(denom, regex=False).to_numpy() for denom in denominations]
+    religions = np.select(conditions, [reclass_map[d] for d in denominations], default="")
+    corrected = pd.Series(religions, index=text.index, dtype=object)
+    return pd.DataFrame({
+        "original": raw[text.index],
+        "corrected": corrected,
+        "message": "Reclassified to " + corrected,
+    })
+
+
+def no_religion_column(series: pd.Series, canonical: str = "No religion") -> pd.DataFrame:
+    """RULE 17 for a whole column: answers mentioning "no religion" become the canonical option."""
+    raw = _text_cells(series).str.strip()
+    flagged = raw.str.lower().str.contains("no religion", regex=False) & (raw != canonical)
+    raw = raw[flagged]
+    return pd.DataFrame({
+        "original": raw,
+        "corrected": pd.Series(canonical, index=raw.index, dtype=object),
+        "message": pd.Series(f"Normalized to '{canonical}'", index=raw.index, dtype=object),
+    })
+
+
+def invalid_birthplace_mask(series: pd.Series, countries: frozenset[str]) -> pd.Series:
+    """RULE 18 for a whole column: True where "Others: <text>" is not a known country."""
+    lowered = _text_cells(series).str.strip().str.lower()
+    others = lowered.str.startswith("others:")
+    text = lowered.str.slice(len("others:")).str.strip()
+    invalid = others & (text != "") & ~text.isin(countries)
+    return invalid.reindex(series.index, fill_value=False)
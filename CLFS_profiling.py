@@ -0,0 +1,178 @@
+"""
+CLFS Validator Timing Instrumentation
+
+Records wall time, CPU time, rows processed and errors emitted for each stage
+of a validation run (load, household extraction, column insertion, SSOC, SSIC,
+rule stages, report writing) and for each individual rule function.
+
+The timings of one input file are written as <stem>_timing.json and
+<stem>_timing.csv, and can be printed as a summary table.
+"""
+
+import csv
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+
+
+REPORT_FIELDS = ["kind", "name", "calls", "rows", "wall_s", "cpu_s", "errors"]
+
+
+class RunProfiler:
+    """Accumulates timing entries for one validated file."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._wrapped: dict[tuple[str, int], Callable] = {}
+
+    def _entry(self, kind: str, name: str) -> dict:
+        key = (kind, name)
+        if key not in self._entries:
+            self._entries[key] = {
+                "kind": kind, "name": name, "calls": 0, "rows": 0,
+                "wall_s": 0.0, "cpu_s": 0.0, "errors": 0,
+            }
+        return self._entries[key]
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        wall_s: float,
+        cpu_s: float,
+        rows: int = 0,
+        errors: int = 0,
+    ) -> None:
+        entry = self._entry(kind, name)
+        entry["calls"] += 1
+        entry["rows"] += rows
+        entry["wall_s"] += wall_s
+        entry["cpu_s"] += cpu_s
+        entry["errors"] += errors
+
+    def add_errors(self, kind: str, name: str, count: int) -> None:
+        """Attribute emitted errors to an existing entry (unknown entries are ignored)."""
+        entry = self._entries.get((kind, name))
+        if entry is not None:
+            entry["errors"] += count
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0, kind: str = "stage"):
+        """
+        Time a block of work. The yielded dict may be updated with "rows" and
+        "errors" inside the block when they are only known afterwards.
+        """
+        counters = {"rows": rows, "errors": 0}
+        self._entry(kind, name)  # keep entries in stage start order
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield counters
+        finally:
+            self.record(
+                kind,
+                name,
+                time.perf_counter() - wall_start,
+                time.process_time() - cpu_start,
+                rows=counters["rows"],
+                errors=counters["errors"],
+            )
+
+    def timed(self, name: str, func: Callable, kind: str = "rule") -> Callable:
+        """Wrap func so every call is recorded as one processed row under name."""
+        cache_key = (name, id(func))
+        if cache_key in self._wrapped:
+            return self._wrapped[cache_key]
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(
+                    kind,
+                    name,
+                    time.perf_counter() - wall_start,
+                    time.process_time() - cpu_start,
+                    rows=1,
+                )
+
+        self._wrapped[cache_key] = wrapper
+        return wrapper
+
+    def instrument(self, module, names: dict[str, str]) -> "InstrumentedModule":
+        """Return a view of module whose functions listed in names are timed."""
+        return InstrumentedModule(module, self, names)
+
+    def entries(self) -> list[dict]:
+        return [dict(entry) for entry in self._entries.values()]
+
+    def total_wall(self) -> float:
+        return sum(e["wall_s"] for e in self._entries.values() if e["kind"] == "stage")
+
+    def write_report(self, output_dir: Path, stem: Optional[str] = None) -> tuple[Path, Path]:
+        """Write the timing report as JSON and CSV; returns both paths."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stem = stem or Path(self.label).stem
+        json_path = output_dir / f"{stem}_timing.json"
+        csv_path = output_dir / f"{stem}_timing.csv"
+
+        entries = self.entries()
+        with open(json_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "file": self.label,
+                    "started_at": self.started_at,
+                    "total_wall_s": round(self.total_wall(), 6),
+                    "entries": entries,
+                },
+                fh,
+                indent=2,
+            )
+        with open(csv_path, "w", encoding="utf-8", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(entries)
+        return json_path, csv_path
+
+    def format_table(self) -> str:
+        """Render the entries as a fixed-width summary table."""
+        total = self.total_wall() or 1.0
+        header = f"{'kind':<6} {'name':<32} {'calls':>7} {'rows':>8} {'wall s':>9} {'cpu s':>9} {'% wall':>7} {'errors':>7}"
+        lines = [f"Timing summary: {self.label}", header, "-" * len(header)]
+        for entry in self._entries.values():
+            if entry["kind"] == "stage":
+                share_text = f"{entry['wall_s'] / total * 100:>6.1f}%"
+            else:
+                share_text = f"{'':>7}"
+            lines.append(
+                f"{entry['kind']:<6} {entry['name'][:32]:<32} {entry['calls']:>7} {entry['rows']:>8} "
+                f"{entry['wall_s']:>9.3f} {entry['cpu_s']:>9.3f} {share_text} {entry['errors']:>7}"
+            )
+        lines.append(f"Total stage wall time: {self.total_wall():.3f}s")
+        return "\n".join(lines)
+
+
+class InstrumentedModule:
+    """Attribute proxy that times selected functions of a module."""
+
+    def __init__(self, module, profiler: RunProfiler, names: dict[str, str]):
+        self._module = module
+        self._profiler = profiler
+        self._names = names
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._module, attr)
+        name = self._names.get(attr)
+        if name is None or not callable(value):
+            return value
+        return self._profiler.timed(name, value)
@@ -0,0 +1,451 @@
+"""
+CLFS Programme Catalog
+
+Compiles the 2026 institution programme workbooks (ITE/, Polytechnics/,
+Local University/, Private University/) into one compact, cached index so
+respondents' highest academic qualification, field of study and place of
+study can be checked against what the institutions actually offer.
+
+Per programme the index keeps:
+- institution and the form's "Place of study" option it falls under
+- qualification level family (nitec, higher_nitec, diploma, post_diploma,
+  degree, postgraduate_diploma, masters, doctorate, certificate), from the
+  workbook's Level column or, when there is none, the course title
+- programme title, its subject (the title without the award wording) and
+  the SSEC broad field of study of that subject (keyword classification;
+  codes follow the order the form lists the broad fields)
+
+Free-text fields of study are looked up by character trigrams: an inverted
+trigram index over the subjects gives Dice similarities for all candidate
+programmes at once. check_education() validates whole columns, scoring each
+distinct (qualification, field, place) triple once.
+
+The index is pickled to output/programme_catalog.pickle and rebuilt when a
+workbook or this module changes (CLFS_incremental.definitions_fingerprint).
+"""
+
+import pickle
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import CLFS_incremental
+
+
+ROOT = Path(__file__).parent
+CATALOG_FOLDERS = ("ITE", "Polytechnics", "Local University", "Private University")
+DEFAULT_CACHE_FILE = ROOT / "output" / "programme_catalog.pickle"
+
+# Minimum trigram Dice similarity for a field of study to match a programme
+MATCH_THRESHOLD = 0.5
+
+PROGRAMME_COLUMNS = [
+    "institution", "place", "level", "level_family",
+    "programme", "subject", "field_code", "source",
+]
+
+PLACE_NUS = "National University of Singapore"
+PLACE_NTU = "Nanyang Technological University"
+PLACE_SMU = "Singapore Management University"
+PLACE_SUTD = "Singapore University of Technology and Design"
+PLACE_SIT = "Singapore Institute of Technology"
+PLACE_SUSS = "Singapore University of Social Sciences (SUSS)"
+PLACE_POLY = "Local Polytechnics"
+PLACE_ITE = "Institute of Technical Education"
+PLACE_NAFA = "Nanyang Academy of Fine Arts (including qualifications awarded by its overseas partner universities/institutions)"
+PLACE_LASALLE = "LASALLE College of the Arts"
+PLACE_UAS = "University of the Arts Singapore"
+PLACE_PRIVATE = (
+    "Other private education institutions in Singapore [e.g. SIM Global Education (SIM GE), "
+    "Kaplan Higher Education Institute/Academy, PSB Academy, Management Development Institute of Singapore (MDIS)]"
+)
+
+# Institution name patterns -> place option (checked before the folder default)
+PLACE_PATTERNS = [
+    (r"national university of singapore|\bnus\b", PLACE_NUS),
+    (r"nanyang technological|\bntu\b", PLACE_NTU),
+    (r"singapore management university|\bsmu\b", PLACE_SMU),
+    (r"technology and design|\bsutd\b", PLACE_SUTD),
+    (r"singapore institute of technology|\bsit\b", PLACE_SIT),
+    (r"social sciences|\bsuss\b", PLACE_SUSS),
+    (r"nanyang academy of fine arts|\bnafa\b", PLACE_NAFA),
+    (r"lasalle", PLACE_LASALLE),
+    (r"university of the arts|royal college of music", PLACE_UAS),
+]
+FOLDER_PLACES = {
+    "ITE": PLACE_ITE,
+    "Polytechnics": PLACE_POLY,
+    "Private University": PLACE_PRIVATE,
+}
+
+# Level / title patterns -> level family, most specific first
+LEVEL_PATTERNS = [
+    ("doctorate", r"doctor|\bph\.?d\b|\bengd\b|\bdba\b"),
+    ("masters", r"master(?!\s*nitec)|\bmba\b|\bm\.?sc\b|\bmphil\b|fleximasters"),
+    ("postgraduate_diploma", r"graduate diploma|graduate certificate|post-?graduate"),
+    ("master_nitec", r"master\s*nitec"),
+    ("higher_nitec", r"higher\s*nitec"),
+    ("nitec", r"nitec"),
+    ("post_diploma", r"specialist diploma|advanced diploma|post-?diploma|higher diploma"),
+    ("degree", r"bachelor|honours|degree|\bb\.?a\b|\bb\.?sc\b|\bb\.?eng\b|top-?up"),
+    ("diploma", r"diploma"),
+    ("certificate", r"certificate|foundation|preparatory"),
+]
+
+# Highest Academic Qualification option -> level families it may come from
+HQA_LEVEL_FAMILIES = {
+    "national ite certificate (nitec) or equivalent": ("nitec",),
+    "higher nitec or equivalent": ("higher_nitec",),
+    "master nitec or equivalent": ("master_nitec",),
+    "polytechnic diploma": ("diploma",),
+    "ite diploma": ("diploma",),
+    "polytechnic post-diploma": ("post_diploma",),
+    "other locally or externally developed diploma": ("diploma", "post_diploma"),
+    "other post-diploma qualifications or equivalent": ("post_diploma",),
+    "first degree or equivalent": ("degree",),
+    "long first degree or equivalent": ("degree",),
+    "postgraduate diploma": ("postgraduate_diploma",),
+    "master's degree or equivalent": ("masters",),
+    "doctoral degree or equivalent": ("doctorate",),
+}
+
+# SSEC broad fields of study, in the order the form lists them
+SSEC_BROAD_FIELDS = {
+    "01": "Education",
+    "02": "Fine & Applied Arts",
+    "03": "Humanities & Social Sciences",
+    "04": "Mass Communication & Information Science",
+    "05": "Business & Administration",
+    "06": "Law",
+    "07": "Natural & Mathematical Sciences",
+    "08": "Health Sciences",
+    "09": "Information Technology",
+    "10": "Architecture, Building & Real Estate",
+    "11": "Engineering Sciences",
+    "12": "Engineering, Manufacturing & Related Trades",
+    "13": "Services",
+}
+
+# Subject keywords -> broad field, in priority order (first match wins)
+FIELD_KEYWORDS = [
+    ("06", r"laws?|legal|juris\w*"),
+    ("01", r"education|teach\w*|early childhood|pedagog\w*|learning"),
+    ("11", r"engineer\w*|energy|instrumentation|process control"),
+    ("10", r"architect\w*|building|real estate|construction|facilit\w*|landscape|urban|quantity survey\w*|propert\w*"),
+    ("09", r"comput\w*|information technology|\bit\b|software|cyber\w*|data|artificial intelligence|\bai\b|informatics|"
+           r"information systems?|digital|network\w*|cloud|programming|ict|virtual reality|mobile|"
+           r"full stack|devsecops|devops|app\w* development|analytics|internet|web|user experience|game\w*|"
+           r"infocomm"),
+    ("08", r"nurs\w*|medic\w*|pharm\w*|health\w*|dent\w*|physiotherap\w*|therap\w*|radiograph\w*|nutrition|optom\w*|"
+           r"optician\w*|paramedic\w*|rehabilitat\w*|biomedic\w*|veterinar\w*|patient|clinical|diagnostic\w*|"
+           r"gerontolog\w*|epidemiolog\w*|dermatolog\w*|disability"),
+    ("12", r"mechatronic\w*|automotive|aerospace|aircraft|aeroplane\w*|aviation|marine|precision|electrical|electronic\w*|"
+           r"machin\w*|weld\w*|manufactur\w*|mechanical|technolog\w*|robotic\w*|automation|"
+           r"microelectronic\w*"),
+    ("13", r"hospitality|touris\w*|culinary|pastry|baking|food|beverage|beauty|wellness|sport\w*|exercise|security|"
+           r"transport\w*|events?|travel|hotel|customer experience|customer service|nautical|maritime"),
+    ("04", r"communication\w*|journalism|media|broadcast\w*|public relations|advertis\w*|library|information studies"),
+    ("05", r"business\w*|account\w*|financ\w*|bank\w*|manag\w*|marketing|admin\w*|human resource\w*|logistic\w*|"
+           r"supply chain|commerce|insurance|entrepreneur\w*|retail|fintech|executive|leader\w*|tax\w*|"
+           r"compliance|secretarial"),
+    ("07", r"math\w*|statistic\w*|physics|chemi\w*|\w*biolog\w*|biotechnolog\w*|life science\w*|science\w*|"
+           r"environment\w*|sustainab\w*|climate"),
+    ("03", r"histor\w*|philosoph\w*|english|chinese|malay|tamil|language\w*|linguistic\w*|literature|psycholog\w*|"
+           r"sociolog\w*|economic\w*|politic\w*|social|geograph\w*|anthropolog\w*|public policy|humanities|global studies|"
+           r"counsel\w*|youth|community|international affairs|criminolog\w*|translation"),
+    ("02", r"arts?|design\w*|music\w*|animation|film\w*|theatre|acting|danc\w*|fashion|photograph\w*|illustrat\w*|"
+           r"interior|visual|creative|performance|audio"),
+]
+_FIELD_REGEXES = [(code, re.compile(rf"\b(?:{pattern})\b")) for code, pattern in FIELD_KEYWORDS]
+
+# Award wording removed from titles to get the subject
+_AWARD_WORDING = re.compile(
+    r"\b(?:higher|master|national ite certificate|nitec|work study|specialist|advanced|post ?graduate|graduate|"
+    r"post diploma|diploma|certificate|bachelor|master'?s|doctor|degree|double|honours|hons|top up|flexi ?masters|"
+    r"of|in|with|and|the|ba|bsc|beng|msc|ma|mba|phd|full time|part time|\d+ years?)\b|&"
+)
+
+
+def normalize(text: object) -> str:
+    """Lowercase, punctuation to spaces, whitespace collapsed."""
+    text = re.sub(r"[^\w&']+", " ", str(text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def subject_of(title: object) -> str:
+    """Programme subject: the normalized title without award wording and bracketed codes."""
+    text = re.sub(r"\([^)]*\b(?:years?|t\d+|full-?time|part-?time)\b[^)]*\)", " ", str(title or ""), flags=re.I)
+    return re.sub(r"\s+", " ", _AWARD_WORDING.sub(" ", normalize(text))).strip()
+
+
+def field_code(subject: object) -> Optional[str]:
+    """SSEC broad field code of a subject or free-text field of study, or None."""
+    text = normalize(subject)
+    if not text:
+        return None
+    for code, regex in _FIELD_REGEXES:
+        if regex.search(text):
+            return code
+    return None
+
+
+def level_family(level: object) -> Optional[str]:
+    text = normalize(level)
+    for family, pattern in LEVEL_PATTERNS:
+        if re.search(pattern, text):
+            return family
+    return None
+
+
+def place_of(institution: object, folder: str) -> Optional[str]:
+    text = normalize(institution)
+    for pattern, place in PLACE_PATTERNS:
+        if re.search(pattern, text):
+            return place
+    return FOLDER_PLACES.get(folder)
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f"  {text} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+# -------------------
+# Compilation
+# -------------------
+
+def catalog_files(root: Path = ROOT) -> List[Path]:
+    """Programme workbooks in the catalog folders, in a stable order."""
+    return sorted(
+        path for folder in CATALOG_FOLDERS
+        for path in (Path(root) / folder).glob("*.xlsx")
+        if not path.name.startswith("~$")
+    )
+
+
+def _header_row(sheet: pd.DataFrame) -> Optional[int]:
+    """Row holding the "Course Title" header (workbooks have 0-2 title rows above it)."""
+    for row_idx in range(min(len(sheet), 6)):
+        if any(normalize(v) == "course title" for v in sheet.iloc[row_idx]):
+            return row_idx
+    return None
+
+
+def read_programmes(path: Path) -> pd.DataFrame:
+    """Programme rows of every sheet of one workbook (summary/QC sheets are skipped)."""
+    path = Path(path)
+    folder = path.parent.name
+    frames = []
+    for sheet_name, sheet in pd.read_excel(path, sheet_name=None, header=None, dtype=object).items():
+        header_idx = _header_row(sheet)
+        if header_idx is None:
+            continue
+        headers = [normalize(v) for v in sheet.iloc[header_idx]]
+        body = sheet.iloc[header_idx + 1:]
+        title_col = headers.index("course title")
+        inst_col = next((i for i, h in enumerate(headers) if h in ("institution", "university")), None)
+        level_col = headers.index("level") if "level" in headers else None
+
+        titles = body.iloc[:, title_col]
+        institutions = body.iloc[:, inst_col] if inst_col is not None else pd.Series(sheet_name, index=body.index)
+        # Section banners ("▌ HIGHER NITEC") and totals leave one of the two empty
+        # and count tables have numeric titles
+        keep = (
+            titles.notna() & institutions.notna()
+            & titles.astype(str).str.contains(r"[A-Za-z]")
+            & ~titles.astype(str).str.strip().str.startswith(("▌", "▶"))
+        )
+        titles = titles[keep].astype(str).str.strip()
+        institutions = institutions[keep].astype(str).str.strip()
+        levels = body.iloc[:, level_col][keep] if level_col is not None else titles
+        levels = levels.where(levels.notna(), titles).astype(str).str.strip()
+
+        frames.append(pd.DataFrame({
+            "institution": institutions.to_numpy(),
+            "place": [place_of(inst, folder) for inst in institutions],
+            "level": levels.to_numpy(),
+            "level_family": [level_family(lv) or level_family(t) for lv, t in zip(levels, titles)],
+            "programme": titles.to_numpy(),
+            "subject": [subject_of(t) for t in titles],
+            "source": f"{folder}/{path.name}:{sheet_name}",
+        }))
+    if not frames:
+        return pd.DataFrame(columns=PROGRAMME_COLUMNS)
+    programmes = pd.concat(frames, ignore_index=True)
+    programmes["field_code"] = [field_code(s) for s in programmes["subject"]]
+    return programmes[PROGRAMME_COLUMNS]
+
+
+@dataclass
+class ProgrammeCatalog:
+    """Programme table plus a trigram index over the subjects."""
+    programmes: pd.DataFrame
+    fingerprint: str = ""
+    # trigram -> int32 array of programme positions
+    index: Dict[str, np.ndarray] = field(default_factory=dict)
+    # (place, level family) -> int32 array of programme positions
+    offered: Dict[Tuple[str, str], np.ndarray] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.programmes = self.programmes.reset_index(drop=True)
+        if not self.index:
+            postings: Dict[str, List[int]] = {}
+            for pos, subject in enumerate(self.programmes["subject"]):
+                for gram in trigrams(subject):
+                    postings.setdefault(gram, []).append(pos)
+            self.index = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        if not self.offered:
+            keys = self.programmes[["place", "level_family"]].dropna()
+            self.offered = {
+                key: positions.to_numpy(dtype=np.int32)
+                for key, positions in keys.groupby(["place", "level_family"]).groups.items()
+            }
+        self._gram_counts = np.array([len(trigrams(s)) for s in self.programmes["subject"]], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.programmes)
+
+    @property
+    def places(self) -> set:
+        return {place for place, _ in self.offered}
+
+    def similarities(self, text: str) -> np.ndarray:
+        """Trigram Dice similarity of text to every programme subject."""
+        grams = trigrams(normalize(text))
+        shared = np.zeros(len(self.programmes), dtype=np.int32)
+        for gram in grams:
+            postings = self.index.get(gram)
+            if postings is not None:
+                shared[postings] += 1
+        return 2.0 * shared / np.maximum(len(grams) + self._gram_counts, 1)
+
+    def lookup(self, text: str, place: Optional[str] = None, families: Iterable[str] = ()) -> Tuple[Optional[int], float]:
+        """Best matching programme (position, similarity), optionally at a place and level families."""
+        candidates = self.candidates(place, families) if place is not None else np.arange(len(self.programmes))
+        if not len(candidates) or not normalize(text):
+            return None, 0.0
+        scores = self.similarities(text)[candidates]
+        best = int(np.argmax(scores))
+        return int(candidates[best]), float(scores[best])
+
+    def candidates(self, place: str, families: Iterable[str]) -> np.ndarray:
+        arrays = [self.offered[(place, f)] for f in families if (place, f) in self.offered]
+        return np.concatenate(arrays) if arrays else np.array([], dtype=np.int32)
+
+
+def build_catalog(files: Iterable[Path]) -> ProgrammeCatalog:
+    frames = [read_programmes(path) for path in files]
+    frames = [f for f in frames if len(f)]
+    programmes = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PROGRAMME_COLUMNS)
+    return ProgrammeCatalog(programmes)
+
+
+_LOADED: Dict[Tuple[str, ...], ProgrammeCatalog] = {}
+
+
+def load_catalog(files: Optional[Iterable[Path]] = None, cache_file: Optional[Path] = DEFAULT_CACHE_FILE) -> ProgrammeCatalog:
+    """
+    The compiled catalog: from this process's memo, else the cache file when
+    its fingerprint still matches, else compiled from the workbooks and written
+    to the cache. Pass cache_file=None to skip the cache file.
+    """
+    files = tuple(Path(p) for p in (catalog_files() if files is None else files))
+    key = tuple(str(p) for p in files)
+    fingerprint = CLFS_incremental.definitions_fingerprint((), [Path(__file__), *files])
+    catalog = _LOADED.get(key)
+    if catalog is not None and catalog.fingerprint == fingerprint:
+        return catalog
+
+    catalog = None
+    if cache_file is not None and Path(cache_file).exists():
+        try:
+            with open(cache_file, "rb") as fh:
+                cached = pickle.load(fh)
+            if getattr(cached, "fingerprint", None) == fingerprint:
+                catalog = cached
+        except Exception:
+            catalog = None
+    if catalog is None:
+        catalog = build_catalog(files)
+        catalog.fingerprint = fingerprint
+        if cache_file is not None:
+            try:
+                Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, "wb") as fh:
+                    pickle.dump(catalog, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                print(f"Warning: could not write programme catalog cache {cache_file}: {e}")
+    _LOADED[key] = catalog
+    return catalog
+
+
+# -------------------
+# Validation
+# -------------------
+
+CHECK_COLUMNS = ["rule", "message", "programme", "score"]
+_HQA_FAMILIES = {normalize(hqa): families for hqa, families in HQA_LEVEL_FAMILIES.items()}
+
+
+def check_triple(catalog: ProgrammeCatalog, qualification: object, field_of_study: object, place: object) -> Optional[dict]:
+    """
+    Check one (highest academic qualification, field of study, place) triple.
+
+    Returns None when the triple is consistent with the catalog or cannot be
+    judged, else a dict with EDU_002: the field of study matches no programme
+    of that level at the place, by name (trigram similarity) or by SSEC broad
+    field.
+
+    The catalog only lists current intakes, so a (place, level family) with no
+    programmes at all (e.g. Nitec at ITE, or a level no longer offered) is not
+    evidence against the respondent and is not judged.
+    """
+    families = _HQA_FAMILIES.get(normalize(qualification))
+    place = str(place or "").strip()
+    if not families or place not in catalog.places:
+        return None
+
+    candidates = catalog.candidates(place, families)
+    if not len(candidates):
+        return None
+
+    text = normalize(field_of_study)
+    code = field_code(text)
+    if not text or code is None:
+        return None
+    scores = catalog.similarities(text)[candidates]
+    best = int(np.argmax(scores))
+    best_pos, best_score = int(candidates[best]), float(scores[best])
+    programmes = catalog.programmes
+    if best_score >= MATCH_THRESHOLD or (programmes["field_code"].to_numpy()[candidates] == code).any():
+        return None
+    return {
+        "rule": "EDU_002",
+        "message": (
+            f"Field of study '{field_of_study}' ({SSEC_BROAD_FIELDS[code]}) is not offered at {place} "
+            f"for '{qualification}' (closest: {programmes.at[best_pos, 'programme']})"
+        ),
+        "programme": programmes.at[best_pos, "programme"],
+        "score": round(best_score, 3),
+    }
+
+
+def check_education(qualification: pd.Series, field_of_study: pd.Series, place: pd.Series, catalog: Optional[ProgrammeCatalog] = None) -> pd.DataFrame:
+    """
+    Column-at-once check_triple: one row per flagged input row (same index),
+    columns rule, message, programme, score. Each distinct triple is checked once.
+    """
+    catalog = catalog or load_catalog()
+    index = qualification.index
+    columns = [s.astype(object).where(s.notna(), None).to_numpy() for s in (qualification, field_of_study, place)]
+    codes, uniques = pd.MultiIndex.from_arrays(columns).factorize()
+    results = [check_triple(catalog, *triple) for triple in uniques]
+    flagged = np.array([r is not None for r in results] + [False], dtype=bool)[codes]
+    if not flagged.any():
+        return pd.DataFrame(columns=CHECK_COLUMNS, index=index[:0])
+    rows = [results[c] for c in codes[flagged]]
+    return pd.DataFrame(rows, columns=CHECK_COLUMNS, index=index[flagged])
@@ -0,0 +1,409 @@
+"""
+CLFS Validation Service
+
+A long-running local process that loads the reference data once (SSIC
+company list, SSOC definitions and expert map, SSEC candidates, and the
+--tolerances / --programme-catalog data when enabled) and then validates
+files and assigns codes on request, so each call only pays for the rule work.
+
+Start the service, then use the client commands against it:
+
+    python CLFS_service.py serve [--port 8765] [--tolerances] [--programme-catalog]
+    python CLFS_service.py validate Operating_Table/CLFS_newformat.csv
+    python CLFS_service.py ssoc --title "Accountant" --duties "Prepare accounts"
+    python CLFS_service.py ssoc --batch jobs.json
+    python CLFS_service.py ssic "DBS Bank Ltd" "Grab Holdings"
+    python CLFS_service.py ssec "Polytechnic Diploma"
+    python CLFS_service.py status
+    python CLFS_service.py stop
+
+The service listens on localhost only (HTTP, JSON bodies). At start it writes
+a random token to output/clfs_service.token (CLFS_SERVICE_TOKEN_FILE; owner
+read/write only) and every request must send it as "Authorization: Bearer
+<token>"; the client commands read it from that file. Requests with another
+Host than the service address (DNS rebinding) and POSTs that are not
+Content-Type application/json (cross-site form posts) are rejected. Endpoints:
+
+- POST /validate_file  {"path", "incremental", "profile"} -> run summary;
+  reports are written to output/ exactly as CLFS_validator.py writes them
+- POST /assign_ssoc    {"items": [{"title", "duties", "hqa"}]}
+                       -> {"results": [{"code", "top_5"}]}
+- POST /assign_ssic    {"items": [establishment name]} -> {"results": [code or null]}
+- POST /match_ssec     {"items": [qualification], "threshold"}
+                       -> {"results": [{"code", "score"}]}
+- GET  /status, POST /shutdown
+
+Each request runs in its own thread, so /status answers while a file is being
+validated; the work endpoints take turns on one lock, since the validator
+keeps per-process state (incremental store, caches) that is not shared
+between threads.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_TOKEN_FILE = Path("output") / "clfs_service.token"
+
+
+def service_url_from_env() -> str:
+    """Service address: CLFS_SERVICE_URL, else http://127.0.0.1:8765."""
+    return os.environ.get("CLFS_SERVICE_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}").rstrip("/")
+
+
+def token_file_from_env() -> str:
+    """Shared token file: CLFS_SERVICE_TOKEN_FILE, else output/clfs_service.token."""
+    return os.environ.get("CLFS_SERVICE_TOKEN_FILE", str(DEFAULT_TOKEN_FILE))
+
+
+def write_token(path: str) -> str:
+    """A new random token, written to path readable by the owner only."""
+    token = secrets.token_urlsafe(32)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(token)
+    return token
+
+
+def read_token(path: str) -> Optional[str]:
+    try:
+        return Path(path).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+# -------------------
+# Server
+# -------------------
+
+class ValidationService:
+    """Reference data loaded once, plus the operations the endpoints run."""
+
+    def __init__(self, state_file: Optional[str] = None, tolerance_file: Optional[str] = None, programme_catalog: bool = False):
+        start = time.perf_counter()
+        import CLFS_validator as validator
+        import CLFS_validation_rules as rules
+
+        self.validator = validator
+        self.rules = rules
+        validator.ssic_lookup()
+        validator.birth_countries()
+        validator.religion_reclass()
+        self.ssoc_resources = validator._load_ssoc_resources()
+        self.ssec_matcher = rules.get_ssec_matcher() if rules.SSEC_CANDIDATES else None
+        validator.enable_tolerances(tolerance_file)
+        validator.enable_programme_catalog(programme_catalog)
+        self.state_file = state_file or validator.incremental.state_file_from_env()
+        self._store = None
+        # Work requests take turns: the validator's module state is not thread-safe
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.warmup_s = time.perf_counter() - start
+
+    def status(self) -> dict:
+        validator = self.validator
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "warmup_s": round(self.warmup_s, 2),
+            "requests": self.requests,
+            "loaded": {
+                "ssic_companies": len(validator.ssic_lookup()),
+                "ssoc_definitions": len(self.ssoc_resources["defs"]) if self.ssoc_resources else 0,
+                "ssec_candidates": len(self.ssec_matcher) if self.ssec_matcher else 0,
+                "tolerances": validator.TOLERANCE_TABLE.version if validator.TOLERANCE_TABLE else None,
+                "programme_catalog": len(validator.PROGRAMME_CATALOG) if validator.PROGRAMME_CATALOG else None,
+            },
+        }
+
+    def _incremental_store(self):
+        if self._store is None:
+            self._store = self.validator.incremental.IncrementalStateStore(self.state_file)
+        return self._store
+
+    def validate_file(self, path: str, incremental: bool = False, profile: bool = False) -> dict:
+        file = Path(path)
+        if not file.exists():
+            raise FileNotFoundError(f"Input file not found: {file}")
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            df = self.validator.load_input_file(file)
+            load_stat = (time.perf_counter() - wall_start, time.process_time() - cpu_start)
+            store = self._incremental_store() if incremental else None
+            summary = self.validator.validate_file(file.name, df, store, load_stat, False, profile)
+        summary["log"] = log.getvalue()
+        return summary
+
+    def assign_ssoc(self, items: list) -> list:
+        if not items:
+            return []
+        import pandas as pd
+
+        matched = self.validator.assign_ssoc_batch(
+            pd.DataFrame({
+                "title": [str(item.get("title") or "") for item in items],
+                "duties": [str(item.get("duties") or "") for item in items],
+                "hqa": ["" if item.get("hqa") is None else str(item.get("hqa")) for item in items],
+            }),
+            self.ssoc_resources,
+        )
+        if matched is None:
+            return [{"code": None, "top_5": []} for _ in items]
+        return [
+            {
+                "code": code,
+                "top_5": [str(c.get("code", "")).strip() for c in top_5 if str(c.get("code", "")).strip()],
+            }
+            for code, top_5 in zip(matched["code"], matched["top_5"])
+        ]
+
+    def assign_ssic(self, items: list) -> list:
+        return [
+            self.validator.match_ssic(name) if str(name or "").strip() else None
+            for name in items
+        ]
+
+    def match_ssec(self, items: list, threshold: Optional[int] = None) -> list:
+        if self.ssec_matcher is None:
+            return [{"code": None, "score": 0} for _ in items]
+        return [
+            {"code": code, "score": score}
+            for code, score in self.ssec_matcher.match_many(items, threshold)
+        ]
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+def _make_handler(service: ValidationService, token: str, allowed_hosts: set):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            # stderr: validate_file captures stdout for the reply's log
+            print(f"[{self.log_date_time_string()}] {fmt % args}", file=sys.stderr)
+
+        def _rejected(self, post: bool) -> bool:
+            """Send 4xx and return True unless the Host, token (and for POST the Content-Type) are valid."""
+            if (self.headers.get("Host") or "").lower() not in allowed_hosts:
+                self._send(403, {"error": "Unexpected Host header"})
+            elif not secrets.compare_digest(self.headers.get("Authorization") or "", f"Bearer {token}"):
+                self._send(401, {"error": "Missing or wrong service token"})
+            elif post and (self.headers.get("Content-Type") or "").split(";")[0].strip().lower() != "application/json":
+                self._send(415, {"error": "Content-Type must be application/json"})
+            else:
+                return False
+            return True
+
+        def do_GET(self):
+            if self._rejected(post=False):
+                return
+            if self.path == "/status":
+                self._send(200, service.status())
+            else:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            if self._rejected(post=True):
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as e:
+                self._send(400, {"error": f"Invalid JSON: {e}"})
+                return
+
+            if self.path == "/shutdown":
+                self._send(200, {"stopping": True})
+                # shutdown() waits for serve_forever, so it cannot run on this request's thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            operations = {
+                "/validate_file": lambda: service.validate_file(
+                    request["path"], bool(request.get("incremental")), bool(request.get("profile"))
+                ),
+                "/assign_ssoc": lambda: {"results": service.assign_ssoc(request.get("items", []))},
+                "/assign_ssic": lambda: {"results": service.assign_ssic(request.get("items", []))},
+                "/match_ssec": lambda: {"results": service.match_ssec(request.get("items", []), request.get("threshold"))},
+            }
+            if self.path not in operations:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+
+            start = time.perf_counter()
+            try:
+                with service.lock:
+                    service.requests += 1
+                    payload = operations[self.path]()
+            except (KeyError, FileNotFoundError) as e:
+                self._send(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            payload["elapsed_s"] = round(time.perf_counter() - start, 3)
+            self._send(200, payload)
+
+    return Handler
+
+
+def serve(host: str, port: int, service: ValidationService, token_file: Optional[str] = None) -> None:
+    token_file = token_file or token_file_from_env()
+    token = write_token(token_file)
+    allowed_hosts = {f"{name}:{port}" for name in (host, "localhost", "127.0.0.1", "[::1]")}
+    server = ThreadingHTTPServer((host, port), _make_handler(service, token, allowed_hosts))
+    print(f"CLFS validation service on http://{host}:{port} (pid {os.getpid()}, warm-up {service.warmup_s:.1f}s)")
+    print(f"Service token written to {token_file}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        # Let a running validation finish before the incremental store is closed
+        with service.lock:
+            service.close()
+        with contextlib.suppress(OSError):
+            os.remove(token_file)
+        print("CLFS validation service stopped")
+
+
+# -------------------
+# Client
+# -------------------
+
+def call(url: str, endpoint: str, payload: Optional[dict] = None, timeout: float = 3600, token_file: Optional[str] = None) -> dict:
+    """POST payload (GET when None) to the service, with its token, and return the JSON reply."""
+    token_file = token_file or token_file_from_env()
+    token = read_token(token_file)
+    if token is None:
+        raise SystemExit(f"No service token at {token_file}; start the service with: python CLFS_service.py serve")
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(
+        f"{url}{endpoint}", data=data,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+        method="GET" if payload is None else "POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        raise SystemExit(f"Service error ({e.code}): {json.loads(e.read()).get('error')}")
+    except urllib.error.URLError as e:
+        raise SystemExit(f"CLFS validation service not reachable at {url} ({e.reason}); start it with: python CLFS_service.py serve")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="CLFS validation service and client")
+    parser.add_argument("--url", default=service_url_from_env(), help="Service URL for the client commands (default: CLFS_SERVICE_URL or http://127.0.0.1:8765)")
+    parser.add_argument("--token-file", default=token_file_from_env(),
+                        help="Shared token file the service writes and the client reads (default: CLFS_SERVICE_TOKEN_FILE or output/clfs_service.token)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_cmd = commands.add_parser("serve", help="Load the reference data and serve requests")
+    serve_cmd.add_argument("--host", default=DEFAULT_HOST)
+    serve_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_cmd.add_argument("--state-file", default=None, help="Incremental state store for validate --incremental")
+    serve_cmd.add_argument("--tolerances", nargs="?", const="", default=None, metavar="CONFIG",
+                           help="Enable the MRSD tolerance stage (default config: references/CLFS_tolerances.json)")
+    serve_cmd.add_argument("--programme-catalog", action="store_true", help="Enable the programme catalog stage")
+
+    validate_cmd = commands.add_parser("validate", help="Validate input files in the service")
+    validate_cmd.add_argument("paths", nargs="+")
+    validate_cmd.add_argument("--incremental", action="store_true")
+    validate_cmd.add_argument("--profile", action="store_true")
+    validate_cmd.add_argument("--log", action="store_true", help="Print the validator output of each file")
+
+    ssoc_cmd = commands.add_parser("ssoc", help="Assign SSOC codes")
+    ssoc_cmd.add_argument("--title", default="")
+    ssoc_cmd.add_argument("--duties", default="")
+    ssoc_cmd.add_argument("--hqa", default=None)
+    ssoc_cmd.add_argument("--batch", help="JSON file with a list of {title, duties, hqa} items")
+
+    ssic_cmd = commands.add_parser("ssic", help="Match SSIC codes from establishment names")
+    ssic_cmd.add_argument("names", nargs="+")
+
+    ssec_cmd = commands.add_parser("ssec", help="Match SSEC codes from qualifications")
+    ssec_cmd.add_argument("qualifications", nargs="+")
+    ssec_cmd.add_argument("--threshold", type=int, default=None)
+
+    commands.add_parser("status", help="Show what the service has loaded")
+    commands.add_parser("stop", help="Stop the service")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        tolerance_file = args.tolerances
+        if tolerance_file == "":
+            import CLFS_tolerances
+            tolerance_file = str(CLFS_tolerances.DEFAULT_CONFIG_FILE)
+        serve(args.host, args.port, ValidationService(args.state_file, tolerance_file, args.programme_catalog), args.token_file)
+        return 0
+
+    def client(endpoint: str, payload: Optional[dict] = None) -> dict:
+        return call(args.url, endpoint, payload, token_file=args.token_file)
+
+    if args.command == "validate":
+        for path in args.paths:
+            reply = client("/validate_file", {
+                "path": str(Path(path).resolve()), "incremental": args.incremental, "profile": args.profile,
+            })
+            if args.log:
+                print(reply.pop("log", ""))
+            print(
+                f"{reply['file']}: {reply['rows']} rows, {reply['members']} members, "
+                f"{reply['errors']} errors ({reply['elapsed_s']:.1f}s)"
+            )
+    elif args.command == "ssoc":
+        if args.batch:
+            with open(args.batch, encoding="utf-8") as fh:
+                items = json.load(fh)
+        else:
+            items = [{"title": args.title, "duties": args.duties, "hqa": args.hqa}]
+        reply = client("/assign_ssoc", {"items": items})
+        for item, result in zip(items, reply["results"]):
+            print(f"{result['code']}\t{item.get('title', '')}\t(top 5: {', '.join(result['top_5'])})")
+    elif args.command == "ssic":
+        reply = client("/assign_ssic", {"items": args.names})
+        for name, code in zip(args.names, reply["results"]):
+            print(f"{code or '-'}\t{name}")
+    elif args.command == "ssec":
+        reply = client("/match_ssec", {"items": args.qualifications, "threshold": args.threshold})
+        for qualification, result in zip(args.qualifications, reply["results"]):
+            print(f"{result['code'] or '-'}\t{result['score']}\t{qualification}")
+    elif args.command == "status":
+        print(json.dumps(client("/status"), indent=2))
+    elif args.command == "stop":
+        client("/shutdown", {})
+        print("Stop requested")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+CLFS MRSD Tolerance Checks
+
+Evaluates the MRSD tolerance values (the ranges the Validation List flags for
+income, bonus, hours, interest, rental, cash-in-kind and other income) as
+column masks instead of per-member function calls.
+
+The thresholds live in a versioned JSON config (references/CLFS_tolerances.json)
+keyed to the Validation List cells, so a revised list only needs a config
+change:
+
+- "fields": feature name -> {"column": header, "kind": ...}, where kind is
+  "number" (float of the cell), "code" (1-based option code of the answer in
+  the form, via CLFS_option_catalog), "ssoc_group" (SSOC major group "1"-"9",
+  or "X" for X-codes) or "text" (normalized answer text)
+- "tolerances": {"id", "cell", "item", "target", "message", "when"}, where
+  "when" is a list of [feature, op, value] conditions that must all hold for
+  the target cell to be flagged
+
+Ops: gt, ge, lt, le, eq, ne, in, not_in and outside ([lo, hi]: <= lo or >= hi).
+Missing or unparseable values never satisfy a condition, and a tolerance
+whose columns are not in the file is skipped.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import CLFS_option_catalog as option_catalog
+
+
+ROOT = Path(__file__).parent
+DEFAULT_CONFIG_FILE = ROOT / "references" / "CLFS_tolerances.json"
+
+FIELD_KINDS = ("number", "code", "ssoc_group", "text")
+OPS = ("gt", "ge", "lt", "le", "eq", "ne", "in", "not_in", "outside")
+HIT_COLUMNS = ["tolerance", "cell", "target", "message"]
+
+
+@dataclass
+class FieldSpec:
+    """How one feature is read from the export."""
+    name: str
+    column: str
+    kind: str = "number"
+    # Form question whose option codes a "code" field uses (default: column)
+    options: Optional[str] = None
+
+
+@dataclass
+class Tolerance:
+    """One Validation List tolerance: flag target when every condition holds."""
+    id: str
+    cell: str
+    target: str
+    message: str
+    when: List[Tuple[str, str, object]] = field(default_factory=list)
+    item: str = ""
+
+    @property
+    def features(self) -> List[str]:
+        return [self.target] + [name for name, _, _ in self.when if name != self.target]
+
+
+@dataclass
+class ToleranceTable:
+    version: str
+    fields: Dict[str, FieldSpec]
+    tolerances: List[Tolerance]
+    source: str = ""
+    path: Optional[Path] = None
+
+
+def load_tolerances(path: Path = DEFAULT_CONFIG_FILE) -> ToleranceTable:
+    """Read and check a tolerance config (ValueError on unknown fields, kinds or ops)."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as fh:
+        config = json.load(fh)
+
+    fields = {}
+    for name, spec in config.get("fields", {}).items():
+        kind = spec.get("kind", "number")
+        if kind not in FIELD_KINDS:
+            raise ValueError(f"{path.name}: field '{name}' has unknown kind '{kind}'")
+        fields[name] = FieldSpec(name=name, column=spec["column"], kind=kind, options=spec.get("options"))
+
+    tolerances = []
+    seen = set()
+    for raw in config.get("tolerances", []):
+        tol = Tolerance(
+            id=raw["id"],
+            cell=raw.get("cell", ""),
+            target=raw["target"],
+            message=raw["message"],
+            when=[tuple(cond) for cond in raw.get("when", [])],
+            item=raw.get("item", ""),
+        )
+        if tol.id in seen:
+            raise ValueError(f"{path.name}: duplicate tolerance id '{tol.id}'")
+        seen.add(tol.id)
+        for name in tol.features:
+            if name not in fields:
+                raise ValueError(f"{path.name}: tolerance '{tol.id}' uses undefined field '{name}'")
+        for name, op, _ in tol.when:
+            if op not in OPS:
+                raise ValueError(f"{path.name}: tolerance '{tol.id}' has unknown op '{op}'")
+        tolerances.append(tol)
+
+    return ToleranceTable(
+        version=str(config.get("version", "")),
+        fields=fields,
+        tolerances=tolerances,
+        source=str(config.get("source", "")),
+        path=path,
+    )
+
+
+# -------------------
+# Features
+# -------------------
+
+def _normalized_text(values: pd.Series) -> pd.Series:
+    """Stripped cell text, None for empty/missing cells."""
+    text = values.astype(object).where(values.notna(), None)
+    text = text.map(lambda v: None if v is None else str(v).strip(), na_action="ignore")
+    return text.where(text != "", None)
+
+
+def _map_unique(values: pd.Series, func) -> np.ndarray:
+    """func(value) per row, evaluated once per distinct value (None stays None)."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = np.array([func(u) for u in uniques] + [None], dtype=object)
+    return mapped[codes]
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _ssoc_group(text: str) -> Optional[str]:
+    if text[:1].upper() == "X":
+        return "X"
+    match = re.search(r"[1-9]", text)
+    return match.group(0) if match else None
+
+
+def derive_feature(values: Optional[pd.Series], spec: FieldSpec, catalog=None) -> Optional[np.ndarray]:
+    """One feature column (float64 for numbers and codes, object otherwise); None without a column."""
+    if values is None:
+        return None
+    text = _normalized_text(values)
+    if spec.kind == "number":
+        return _map_unique(text, _to_float).astype(float)
+    if spec.kind == "code":
+        catalog = catalog or option_catalog.load_catalog()
+        question = spec.options or spec.column
+        codes = _map_unique(text, lambda v: catalog.code(question, v))
+        return np.array([np.nan if c is None else c for c in codes], dtype=float)
+    if spec.kind == "ssoc_group":
+        return _map_unique(text, _ssoc_group)
+    return _map_unique(text, option_catalog.normalize)
+
+
+def derive_features(columns: Dict[str, Optional[pd.Series]], table: ToleranceTable, catalog=None) -> Dict[str, Optional[np.ndarray]]:
+    """Every table field from its column (name -> Series, None when absent)."""
+    return {
+        name: derive_feature(columns.get(name), spec, catalog)
+        for name, spec in table.fields.items()
+    }
+
+
+# -------------------
+# Evaluation
+# -------------------
+
+def _condition_mask(values: np.ndarray, op: str, operand: object) -> np.ndarray:
+    if values.dtype == object:
+        present = np.array([v is not None for v in values], dtype=bool)
+        if op in ("in", "not_in"):
+            members = np.isin(values, [str(x) for x in operand])
+            return present & (members if op == "in" else ~members)
+        if op in ("eq", "ne"):
+            equal = values == str(operand)
+            return present & (equal if op == "eq" else ~equal)
+        raise ValueError(f"op '{op}' needs a number or code field")
+
+    present = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        if op == "gt":
+            return values > operand
+        if op == "ge":
+            return values >= operand
+        if op == "lt":
+            return values < operand
+        if op == "le":
+            return values <= operand
+        if op == "eq":
+            return values == operand
+        if op == "ne":
+            return present & (values != operand)
+        if op == "in":
+            return np.isin(values, list(operand))
+        if op == "not_in":
+            return present & ~np.isin(values, list(operand))
+        if op == "outside":
+            lo, hi = operand
+            return (values <= lo) | (values >= hi)
+    raise ValueError(f"unknown op '{op}'")
+
+
+def evaluate(features: Dict[str, Optional[np.ndarray]], table: ToleranceTable, index: pd.Index) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Rows flagged by each tolerance: (hits, skipped). hits has one row per
+    (row, tolerance) in table order then row order, indexed by row label;
+    skipped lists the tolerances whose columns are missing.
+    """
+    frames = []
+    skipped = []
+    for tol in table.tolerances:
+        if any(features.get(name) is None for name in tol.features):
+            skipped.append(tol.id)
+            continue
+        target = features[tol.target]
+        # The flagged cell has to hold a value
+        mask = ~np.isnan(target) if target.dtype != object else np.array([v is not None for v in target], dtype=bool)
+        for name, op, operand in tol.when:
+            mask &= _condition_mask(features[name], op, operand)
+        if mask.any():
+            rows = index[mask]
+            frames.append(pd.DataFrame({
+                "tolerance": tol.id, "cell": tol.cell, "target": tol.target, "message": tol.message,
+            }, index=rows))
+    hits = pd.concat(frames) if frames else pd.DataFrame(columns=HIT_COLUMNS, index=index[:0])
+    return hits, skipped
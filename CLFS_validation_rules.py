@@ -5,10 +5,20 @@ This module contains all validation rules for the Comprehensive Labour Force Sur
 Each rule is numbered and documented.
 """
 
+import difflib
 import re
+from functools import lru_cache
 from typing import Optional, Tuple
 from dataclasses import dataclass
 
+import pandas as pd
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+    _HAS_RF = True
+except Exception:
+    _HAS_RF = False
+
 
 @dataclass
 class ValidationResult:
@@ -512,28 +522,152 @@ def _normalize_value(value: Optional[str]) -> str:
     return str(value).strip().lower()
 
 
+class SSECMatcher:
+    """
+    RULE 9: Match a Highest Academic Qualification to an SSEC code.
+
+    Candidate descriptions are normalized once. A qualification is matched by:
+    1. containment - the first candidate (in list order) whose description
+       contains, or is contained in, the qualification scores 100; an exact
+       hash lookup short-circuits the scan;
+    2. fuzzy - the best difflib ratio (first candidate wins ties). Candidates
+       are visited in order of an upper bound on that ratio (rapidfuzz's
+       Indel ratio, or difflib's quick_ratio without rapidfuzz) and the scan
+       stops once no remaining candidate can reach the best score, so the
+       result is identical to scoring every candidate.
+
+    Results are memoized per normalized qualification.
+
+    Args:
+        candidates: List of (code, description) tuples
+        threshold: Minimum fuzzy score (0-100) to accept a match
+        cache_size: Number of normalized qualifications kept in the LRU cache
+    """
+
+    def __init__(
+        self,
+        candidates: list[tuple[str, str]],
+        threshold: int = 85,
+        cache_size: int = 4096,
+    ):
+        self.threshold = threshold
+        self._codes: list[str] = []
+        self._norms: list[str] = []
+        for code, desc in candidates:
+            dn = _normalize_text(desc)
+            if dn:
+                self._codes.append(code)
+                self._norms.append(dn)
+
+        self._exact: dict[str, int] = {}
+        for idx, dn in enumerate(self._norms):
+            self._exact.setdefault(dn, idx)
+
+        # b-side (candidate) preprocessing is done once per matcher
+        self._matchers = [difflib.SequenceMatcher(None, "", dn) for dn in self._norms]
+        self._match_normalized = lru_cache(maxsize=cache_size)(self._score_normalized)
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def _upper_bounds(self, qn: str) -> list[float]:
+        if _HAS_RF:
+            return [float(score) for score in _rf_process.cdist([qn], self._norms, scorer=_rf_fuzz.ratio)[0]]
+        bounds = []
+        for matcher in self._matchers:
+            matcher.set_seq1(qn)
+            bounds.append(matcher.quick_ratio() * 100)
+        return bounds
+
+    def _score_normalized(self, qn: str) -> tuple[Optional[str], int, bool]:
+        """Return (code, score, contained) for a normalized qualification, before thresholding."""
+        exact_idx = self._exact.get(qn)
+        scan_to = exact_idx if exact_idx is not None else len(self._norms)
+        for idx in range(scan_to):
+            dn = self._norms[idx]
+            if dn in qn or qn in dn:
+                return self._codes[idx], 100, True
+        if exact_idx is not None:
+            return self._codes[exact_idx], 100, True
+
+        bounds = self._upper_bounds(qn)
+        best_idx: Optional[int] = None
+        best_score = 0
+        for idx in sorted(range(len(bounds)), key=lambda i: (-bounds[i], i)):
+            if bounds[idx] + 1e-6 < best_score:
+                break
+            matcher = self._matchers[idx]
+            matcher.set_seq1(qn)
+            score = int(matcher.ratio() * 100)
+            if score > best_score or (score == best_score and best_idx is not None and idx < best_idx):
+                best_idx = idx
+                best_score = score
+
+        best_code = self._codes[best_idx] if best_idx is not None else None
+        return best_code, best_score, False
+
+    def match(self, qualification: str, threshold: Optional[int] = None) -> tuple[Optional[str], int]:
+        """
+        Match one qualification.
+
+        Returns:
+            (ssec_code, score); ssec_code is None when the best fuzzy score is below threshold
+        """
+        qn = _normalize_text(qualification)
+        if not qn or not self._norms:
+            return None, 0
+
+        code, score, contained = self._match_normalized(qn)
+        if contained:
+            return code, score
+        threshold = self.threshold if threshold is None else threshold
+        if score >= threshold:
+            return code, score
+        return None, score
+
+    def match_many(self, qualifications, threshold: Optional[int] = None) -> list[tuple[Optional[str], int]]:
+        """
+        Match a whole column of qualifications (any iterable, e.g. a pandas Series).
+        Each distinct value is matched once; missing values (None/NaN) match nothing.
+        """
+        results: dict[object, tuple[Optional[str], int]] = {}
+        matched = []
+        for value in qualifications:
+            if isinstance(value, str):
+                key = value
+            elif value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+                key = ""
+            else:
+                key = str(value)
+            if key not in results:
+                results[key] = self.match(key, threshold)
+            matched.append(results[key])
+        return matched
+
+
+_SSEC_MATCHER: Optional[SSECMatcher] = None
+
+
+def get_ssec_matcher() -> SSECMatcher:
+    """Return the shared SSECMatcher built from SSEC_CANDIDATES."""
+    global _SSEC_MATCHER
+    if _SSEC_MATCHER is None:
+        _SSEC_MATCHER = SSECMatcher(SSEC_CANDIDATES)
+    return _SSEC_MATCHER
+
+
 def best_ssec_match(qualification: str, threshold: int = 85) -> tuple[Optional[str], int]:
-    qn = _normalize_text(qualification)
-    if not qn or not SSEC_CANDIDATES:
+    """RULE 9: Best SSEC code for a qualification (see SSECMatcher)."""
+    if not SSEC_CANDIDATES:
         return None, 0
+    return get_ssec_matcher().match(qualification, threshold)
+
 
-    best_code = None
-    best_score = 0
-    for code, desc in SSEC_CANDIDATES:
-        dn = _normalize_text(desc)
-        if not dn:
-            continue
-        if dn in qn or qn in dn:
-            return code, 100
-        import difflib
-        score = int(difflib.SequenceMatcher(None, qn, dn).ratio() * 100)
-        if score > best_score:
-            best_code = code
-            best_score = score
-
-    if best_score >= threshold:
-        return best_code, best_score
-    return None, best_score
+def best_ssec_matches(qualifications, threshold: int = 85) -> list[tuple[Optional[str], int]]:
+    """RULE 9 for a whole qualification column: best_ssec_match per value, in input order."""
+    if not SSEC_CANDIDATES:
+        return [(None, 0)] * len(qualifications)
+    return get_ssec_matcher().match_many(qualifications, threshold)
 
 
 # RULE 1: Others option validation and confirmation prefix
@@ -1279,20 +1413,71 @@ def validate_freelance_employment_consistency(
 
 
 # RULE 8: Qualification vs Place of Study Validation
+QUALIFICATION_PLACE_COLUMNS = ["rule_id", "severity", "reason"]
+
+
+def compile_qualification_place_rules(rule_table: list[dict]) -> dict[tuple[str, str], tuple[dict, ...]]:
+    """
+    Index a qualification/place rule table by (qualification, place), both
+    lowercased: each key maps to the rules it matches, in table order.
+    """
+    index: dict[tuple[str, str], list[dict]] = {}
+    for rule in rule_table:
+        for qual in rule["qualification_values"]:
+            for place in rule["place_values"]:
+                matches = index.setdefault((qual.lower(), place.lower()), [])
+                if not matches or matches[-1] is not rule:
+                    matches.append(rule)
+    return {key: tuple(matches) for key, matches in index.items()}
+
+
+def _qualification_place_frame(index: dict[tuple[str, str], tuple[dict, ...]]) -> pd.DataFrame:
+    """The compiled index as a join table (one row per key and matching rule)."""
+    rows = [
+        (qual, place, order, rule["rule_id"], rule.get("severity"), rule["reason"])
+        for (qual, place), matches in index.items()
+        for order, rule in enumerate(matches)
+    ]
+    return pd.DataFrame(rows, columns=["qualification", "place", "order"] + QUALIFICATION_PLACE_COLUMNS)
+
+
+# Compiled at import; recompile both after editing QUALIFICATION_PLACE_RULES
+QUALIFICATION_PLACE_INDEX = compile_qualification_place_rules(QUALIFICATION_PLACE_RULES)
+_QUALIFICATION_PLACE_FRAME = _qualification_place_frame(QUALIFICATION_PLACE_INDEX)
+
+
 def validate_qualification_place(qualification: str, place: str) -> list[dict]:
     if not qualification or not place:
         return []
+    key = (str(qualification).strip().lower(), str(place).strip().lower())
+    return list(QUALIFICATION_PLACE_INDEX.get(key, ()))
 
-    qual_norm = str(qualification).strip().lower()
-    place_norm = str(place).strip().lower()
 
-    matches = []
-    for rule in QUALIFICATION_PLACE_RULES:
-        qual_values = [q.lower() for q in rule["qualification_values"]]
-        place_values = [p.lower() for p in rule["place_values"]]
-        if qual_norm in qual_values and place_norm in place_values:
-            matches.append(rule)
-    return matches
+def validate_qualification_place_column(qualifications: pd.Series, places: pd.Series) -> pd.DataFrame:
+    """
+    RULE 8 for a whole Highest Academic Qualification / Place of study column
+    pair, in one merge against the compiled rule table.
+
+    Returns one row per (input row, matching rule), indexed by the input row
+    label, with columns rule_id, severity and reason; rows keep input order and
+    the rules of a row keep table order (as validate_qualification_place).
+    """
+    def _keys(values: pd.Series) -> list:
+        # Each distinct value is normalized once
+        codes, uniques = pd.factorize(values.astype(object), use_na_sentinel=True)
+        normalized = [str(v).strip().lower() if v else None for v in uniques] + [None]
+        return [normalized[c] for c in codes]
+
+    pairs = pd.DataFrame({
+        "qualification": _keys(qualifications),
+        "place": _keys(places),
+        "position": range(len(qualifications)),
+    })
+    matched = pairs.merge(_QUALIFICATION_PLACE_FRAME, on=["qualification", "place"], how="inner")
+    matched = matched.sort_values(["position", "order"], kind="mergesort")
+    result = matched[QUALIFICATION_PLACE_COLUMNS]
+    result.index = qualifications.index[matched["position"].to_numpy()]
+    return result
 
 
 # RULE 9: SSEC mapping uses best_ssec_match (helper)
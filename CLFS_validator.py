@@ -1,38 +1,56 @@
+import argparse
 import os
 import re
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
 
+import CLFS_checkpoint as checkpoints
+import CLFS_demographics as demographics
+import CLFS_incremental as incremental
+import CLFS_others_normalizer as others
+import CLFS_profiling as profiling
+import CLFS_programme_catalog as programmes
+import CLFS_tolerances as tolerances
 import CLFS_validation_rules as rules
+import CLFS_warehouse as warehouse
 import SSOC_assigner_V3 as ssoc
 
 
+SSIC_LIST_FILE = Path(__file__).parent / "references" / "SSIC_List_2Sep2025.csv"
+
+
 def _load_ssic_lookup() -> list[tuple[str, str]]:
     """
     Load SSIC reference data from CSV and return list of (normalized_company_name, ssic_code) tuples.
     """
-    ssic_file = Path(__file__).parent / "references" / "SSIC_List_2Sep2025.csv"
+    ssic_file = SSIC_LIST_FILE
     if not ssic_file.exists():
         print(f"Warning: SSIC reference file not found at {ssic_file}")
         return []
     
     try:
         df = pd.read_csv(ssic_file, sep="\t", encoding="utf-8")
-        lookup = []
-        for _, row in df.iterrows():
-            company_name = str(row.get("CompanyName", "")).strip()
-            ssic_code = str(row.get("SSIC2020", "")).strip()
-            if company_name and company_name != "nan" and ssic_code:
-                # Normalize company name for matching
-                normalized_name = re.sub(r"[^a-z0-9\s]", "", company_name.lower()).strip()
-                normalized_name = re.sub(r"\s+", " ", normalized_name)
-                if normalized_name:
-                    lookup.append((normalized_name, ssic_code))
+        if "CompanyName" not in df.columns:
+            return []
+        company_names = df["CompanyName"].astype(str).str.strip()
+        ssic_codes = (
+            df["SSIC2020"].astype(str).str.strip() if "SSIC2020" in df.columns else pd.Series("", index=df.index)
+        )
+        # Normalize company names for matching
+        normalized = (
+            company_names.str.lower()
+            .str.replace(r"[^a-z0-9\s]", "", regex=True)
+            .str.strip()
+            .str.replace(r"\s+", " ", regex=True)
+        )
+        keep = (company_names != "") & (company_names != "nan") & (ssic_codes != "") & (normalized != "")
+        lookup = list(zip(normalized[keep].tolist(), ssic_codes[keep].tolist()))
         print(f"Loaded {len(lookup)} SSIC company mappings from {ssic_file.name}")
         return lookup
     except Exception as e:
@@ -40,6 +58,17 @@ def _load_ssic_lookup() -> list[tuple[str, str]]:
         return []
 
 
+_SSIC_LOOKUP_CACHE: Optional[list[tuple[str, str]]] = None
+
+
+def ssic_lookup() -> list[tuple[str, str]]:
+    """The SSIC (normalized company name, code) pairs, loaded on first use."""
+    global _SSIC_LOOKUP_CACHE
+    if _SSIC_LOOKUP_CACHE is None:
+        _SSIC_LOOKUP_CACHE = _load_ssic_lookup()
+    return _SSIC_LOOKUP_CACHE
+
+
 RELIGION_RECLASS_MAP = {
     "mahayana": "Buddhism",
     "theravada": "Buddhism",
@@ -262,8 +291,24 @@ COUNTRY_LIST = {
     "zimbabwe",
 }
 
-# Load SSIC company name to code mappings from reference file
-STRATA_LOOKUP: list[tuple[str, str]] = _load_ssic_lookup()
+# Reference lists from references/Countries.csv and references/Religions.csv,
+# merged with the built-in lists above; read on first use
+_BIRTH_COUNTRIES_CACHE: Optional[frozenset[str]] = None
+_RELIGION_RECLASS_CACHE: Optional[dict[str, str]] = None
+
+
+def birth_countries() -> frozenset[str]:
+    global _BIRTH_COUNTRIES_CACHE
+    if _BIRTH_COUNTRIES_CACHE is None:
+        _BIRTH_COUNTRIES_CACHE = others.load_country_set(extra=COUNTRY_LIST)
+    return _BIRTH_COUNTRIES_CACHE
+
+
+def religion_reclass() -> dict[str, str]:
+    global _RELIGION_RECLASS_CACHE
+    if _RELIGION_RECLASS_CACHE is None:
+        _RELIGION_RECLASS_CACHE = others.load_religion_reclass_map(base=RELIGION_RECLASS_MAP)
+    return _RELIGION_RECLASS_CACHE
 
 NO_FREELANCE_TEXT = (
     "I did not take up freelance or assignment-based work through online platforms in the last 12 months"
@@ -469,6 +514,10 @@ class HouseholdMember:
     full_name: str
     date_of_birth: Optional[str] = None
     age: Optional[int] = None
+    # Derived once per file from this member's own Date of Birth (CLFS_demographics)
+    dob_dt: Optional[pd.Timestamp] = None
+    age_years: Optional[int] = None
+    age_band: Optional[str] = None
     contact_number: Optional[str] = None
     tenancy_of_household: Optional[str] = None
     hire_foreign_domestic_workers: Optional[str] = None
@@ -940,56 +989,127 @@ def _get_member_column_groups(columns: list[str]) -> list[dict[str, Optional[int
     return groups
 
 
-def extract_household_members(df: pd.DataFrame) -> list[list[HouseholdMember]]:
+_INT_ATTRIBUTES = frozenset([
+    "age", "num_foreign_domestic_workers", "number_of_children",
+    "retirement_age", "care_recipient_age", "num_jobs_held_last_week",
+    "num_job_changes_last_2_years", "care_recipient_age_leaving",
+    "when_left_last_job_months", "care_recipient_age_2",
+    "when_left_last_job_months_2", "how_long_looking_for_job_weeks",
+    "age_started_employment", "breaks_in_employment",
+])
+_FLOAT_ATTRIBUTES = frozenset([
+    "gmi", "bonus_received_last_12_months", "usual_hours_of_work",
+    "last_drawn_gmi_relocated", "usual_hours_work_previous",
+    "usual_hours_work_last_worked", "usual_hours_work_last_worked_2",
+    "interest_from_savings_last_12_months", "interest_from_savings_revised",
+    "dividends_interests_investments_last_12_months",
+    "income_from_rents_last_12_months", "allowances_contributions_last_12_months",
+    "other_sources_income_last_12_months", "last_drawn_gmi_relocated_2",
+])
+
+
+def _convert_member_value(attr_name: str, value: str) -> object:
+    """Typed value of a normalized cell (the text itself when it does not convert)."""
+    try:
+        if attr_name in _INT_ATTRIBUTES:
+            return int(float(value))
+        if attr_name in _FLOAT_ATTRIBUTES:
+            return float(value)
+    except (ValueError, TypeError):
+        pass
+    return value
+
+
+def _normalized_column_values(series: pd.Series, attr_name: Optional[str] = None) -> list:
+    """
+    Per-row _normalize_value of a column (None where empty), converted for
+    attr_name; every distinct cell is converted once.
+    """
+    values: list = [None] * len(series)
+    cells = series.to_numpy(dtype=object)
+    positions = np.flatnonzero(pd.notna(cells))
+    text = pd.Series(cells[positions], dtype=object).astype(str).str.strip()
+    keep = (text != "").to_numpy()
+    positions, text = positions[keep], text[keep]
+    if text.empty:
+        return values
+    if attr_name is not None:
+        lookup = {value: _convert_member_value(attr_name, value) for value in pd.unique(text)}
+        text = text.map(lookup)
+    for position, value in zip(positions, text.tolist()):
+        values[position] = value
+    return values
+
+
+def _member_attribute_values(df: pd.DataFrame) -> dict[str, list]:
+    """
+    attr -> per-row typed values of the column COLUMN_MAPPING resolves it to
+    (the first matching column), resolved and converted once per file.
+    """
     columns = list(df.columns)
-    groups = _get_member_column_groups(columns)
+    by_column: dict[tuple[int, Optional[str]], list] = {}
+    values_by_attr: dict[str, list] = {}
+    for attr_name, col_name in COLUMN_MAPPING.items():
+        if attr_name == "full_name":
+            # Taken from each member's own block
+            continue
+        matched_col = _find_column_name(columns, col_name)
+        if not matched_col:
+            continue
+        col_idx = columns.index(matched_col)
+        key = (col_idx, attr_name if attr_name in _INT_ATTRIBUTES or attr_name in _FLOAT_ATTRIBUTES else None)
+        if key not in by_column:
+            by_column[key] = _normalized_column_values(df.iloc[:, col_idx], key[1])
+        values_by_attr[attr_name] = by_column[key]
+    return values_by_attr
+
+
+def _member_demographics(
+    df: pd.DataFrame,
+    dob_idx: Optional[int],
+    reference: Optional[pd.Timestamp],
+) -> Optional[tuple[list, list, list]]:
+    """(dob_dt, age_years, age_band) at the survey reference date per row for one member block's Date of Birth column."""
+    if dob_idx is None:
+        return None
+    derived = demographics.derive_demographics(df.iloc[:, dob_idx].reset_index(drop=True), reference)
+    return tuple(
+        [demographics.value_or_none(value) for value in derived[col_name].tolist()]
+        for col_name in (demographics.DOB_DT, demographics.AGE_YEARS, demographics.AGE_BAND)
+    )
+
+
+def extract_household_members(
+    df: pd.DataFrame,
+    reference: Optional[pd.Timestamp] = None,
+) -> list[list[HouseholdMember]]:
+    """Members per row; ages from Date of Birth are completed years at reference (unknown without one)."""
+    groups = _get_member_column_groups(list(df.columns))
+    # Column lookups, type conversion and DOB parsing happen once per column, not per cell
+    names_by_group = [_normalized_column_values(df.iloc[:, group["full_name_idx"]]) for group in groups]
+    demographics_by_group = [_member_demographics(df, group["dob_idx"], reference) for group in groups]
+    attribute_values = list(_member_attribute_values(df).items())
     households: list[list[HouseholdMember]] = []
 
-    for _, row in df.iterrows():
+    for position in range(len(df)):
         members: list[HouseholdMember] = []
-        for group in groups:
-            name = _normalize_value(row.iloc[group["full_name_idx"]])
+        for names, demo in zip(names_by_group, demographics_by_group):
+            name = names[position]
             if not name:
                 continue
-            
+
             # Create member with name (required)
             member = HouseholdMember(full_name=name)
-            
+
             # Populate all mapped attributes from the row
-            for attr_name, col_name in COLUMN_MAPPING.items():
-                if attr_name == "full_name":
-                    # Already set
-                    continue
-                matched_col = _find_column_name(columns, col_name)
-                if matched_col:
-                    col_idx = columns.index(matched_col)
-                    value = _normalize_value(row.iloc[col_idx])
-                    # Try to convert to appropriate type
-                    if value:
-                        if attr_name in ["age", "num_foreign_domestic_workers", "number_of_children", 
-                                        "retirement_age", "care_recipient_age", "num_jobs_held_last_week",
-                                        "num_job_changes_last_2_years", "care_recipient_age_leaving", 
-                                        "when_left_last_job_months", "care_recipient_age_2", 
-                                        "when_left_last_job_months_2", "how_long_looking_for_job_weeks",
-                                        "age_started_employment", "breaks_in_employment"]:
-                            try:
-                                value = int(float(value))
-                            except (ValueError, TypeError):
-                                pass
-                        elif attr_name in ["gmi", "bonus_received_last_12_months", "usual_hours_of_work",
-                                          "last_drawn_gmi_relocated", "usual_hours_work_previous",
-                                          "usual_hours_work_last_worked", "usual_hours_work_last_worked_2",
-                                          "gmi", "bonus_received_last_12_months", "usual_hours_of_work",
-                                          "interest_from_savings_last_12_months", "interest_from_savings_revised",
-                                          "dividends_interests_investments_last_12_months", 
-                                          "income_from_rents_last_12_months", "allowances_contributions_last_12_months",
-                                          "other_sources_income_last_12_months", "last_drawn_gmi_relocated_2"]:
-                            try:
-                                value = float(value)
-                            except (ValueError, TypeError):
-                                pass
-                        setattr(member, attr_name, value)
-            
+            for attr_name, values in attribute_values:
+                value = values[position]
+                if value is not None:
+                    setattr(member, attr_name, value)
+
+            if demo is not None:
+                member.dob_dt, member.age_years, member.age_band = (column[position] for column in demo)
+
             members.append(member)
         households.append(members)
 
@@ -1031,55 +1151,72 @@ def _detect_separator(file_path: Path) -> str:
         return '\t'
 
 
-def load_input_files(folder_path="Operating_Table"):
+def list_input_files(folder_path="Operating_Table") -> list[Path]:
+    """The .xlsx files of folder_path followed by its .csv and .tsv files."""
+    folder = Path(folder_path)
+    return (
+        list(folder.glob("*.xlsx"))
+        + list(folder.glob("*.csv"))
+        + list(folder.glob("*.tsv"))
+    )
+
+
+def load_input_file(file: Path) -> pd.DataFrame:
+    """
+    Load one .xlsx, .csv or .tsv input file (CSV separator auto-detected)
+    and clean it. Raises on read errors.
+    """
+    file = Path(file)
+    if file.suffix.lower() == ".xlsx":
+        df = pd.read_excel(file)
+        df = _clean_dataframe(df)
+        print(f"Successfully loaded {file.name} with {len(df)} rows and {len(df.columns)} columns")
+        return df
+
+    header_row_idx = 5  # Skip 5 metadata header rows
+
+    # Auto-detect separator
+    separator = _detect_separator(file)
+
+    df = pd.read_csv(
+        file,
+        sep=separator,
+        header=0,
+        skiprows=range(header_row_idx),
+        encoding="utf-8-sig"
+    )
+    df = _clean_dataframe(df)
+    print(f"Successfully loaded {file.name} with {len(df)} rows and {len(df.columns)} columns (separator: {'tab' if separator == '\t' else 'comma'})")
+    return df
+
+
+def load_input_files(folder_path="Operating_Table", load_stats=None):
     """
     Load all .xlsx, .csv, and .tsv files from the specified folder.
     Automatically detects CSV separator (comma or tab).
     
     Args:
         folder_path (str): Path to the folder containing input files
+        load_stats (dict, optional): Filled with {filename: (wall_s, cpu_s)} load timings
         
     Returns:
         dict: Dictionary with filenames as keys and DataFrames as values
     """
     input_files = {}
+    if load_stats is None:
+        load_stats = {}
     
     # Check if folder exists
     if not os.path.exists(folder_path):
         print(f"Error: Folder '{folder_path}' does not exist.")
         return input_files
     
-    # Find all .xlsx files
-    for file in Path(folder_path).glob("*.xlsx"):
+    for file in list_input_files(folder_path):
         try:
             print(f"Loading {file.name}...")
-            df = pd.read_excel(file)
-            df = _clean_dataframe(df)
-            input_files[file.name] = df
-            print(f"Successfully loaded {file.name} with {len(df)} rows and {len(df.columns)} columns")
-        except Exception as e:
-            print(f"Error loading {file.name}: {e}")
-    
-    # Find all .csv and .tsv files
-    for file in list(Path(folder_path).glob("*.csv")) + list(Path(folder_path).glob("*.tsv")):
-        try:
-            print(f"Loading {file.name}...")
-            header_row_idx = 5  # Skip 5 metadata header rows
-            
-            # Auto-detect separator
-            separator = _detect_separator(file)
-            
-            df = pd.read_csv(
-                file,
-                sep=separator,
-                header=0,
-                skiprows=range(header_row_idx),
-                encoding="utf-8-sig"
-            )
-            df = _clean_dataframe(df)
-
-            input_files[file.name] = df
-            print(f"Successfully loaded {file.name} with {len(df)} rows and {len(df.columns)} columns (separator: {'tab' if separator == '\t' else 'comma'})")
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            input_files[file.name] = load_input_file(file)
+            load_stats[file.name] = (time.perf_counter() - wall_start, time.process_time() - cpu_start)
         except Exception as e:
             print(f"Error loading {file.name}: {e}")
     
@@ -1125,6 +1262,13 @@ SSOC_EXPERT_MAP_FILE = os.environ.get(
     str(Path("references") / "Library_of_SSOC_eng_manager.xlsx")
 )
 SSOC_MIN_SCORE = float(os.environ.get("SSOC_MIN_SCORE", "0.05"))
+SSOC_WORKERS = int(os.environ.get("SSOC_WORKERS", "1"))
+# Similarity (0-1) above which job descriptions share one SSOC scoring; unset: off
+SSOC_NEAR_DUP_THRESHOLD = (
+    float(os.environ["SSOC_NEAR_DUP_THRESHOLD"]) if os.environ.get("SSOC_NEAR_DUP_THRESHOLD") else None
+)
+# Rows coded per assign_ssoc_batch call (and between SSOC checkpoints)
+SSOC_BATCH_ROWS = 500
 
 _SSOC_RESOURCES_CACHE: Optional[dict] = None
 
@@ -1269,10 +1413,15 @@ def _add_ft_pt_columns(df: pd.DataFrame) -> tuple[pd.DataFrame, list[tuple[int,
     return df, changes
 
 
+# Folder the reports, validated files and timing reports are written to
+# (CLFS_watch points it at a staging folder and publishes the files when done)
+OUTPUT_DIR = Path("output")
+
+
 def create_output_directory():
     """Create output folder if it doesn't exist"""
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
+    output_dir = Path(OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
 
 
@@ -1282,6 +1431,7 @@ def _apply_dataset_highlights(
     error_cells: set[tuple[int, int]]
 ):
     """Apply the same change/error highlights used in validated output sheets."""
+    from openpyxl.styles import PatternFill
     orange_fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
     yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
 
@@ -1375,6 +1525,8 @@ def create_validation_report(
             validated_df.to_excel(writer, sheet_name="Complete Dataset", index=False)
 
     # Apply yellow highlighting to the corrections column in Details sheet
+    from openpyxl import load_workbook
+    from openpyxl.styles import PatternFill
     wb = load_workbook(report_path)
     
     # Highlight corrections column in Details sheet
@@ -1429,6 +1581,7 @@ def save_with_highlights(
     df.to_excel(output_path, index=False, engine="openpyxl")
     
     # Now apply highlights to changed cells
+    from openpyxl import load_workbook
     wb = load_workbook(output_path)
     ws = wb.active
     
@@ -1439,52 +1592,45 @@ def save_with_highlights(
     return output_path
 
 
-def main():
-    """Main function to run the validator."""
-    print("CLFS Data Validator")
-    print("=" * 50)
+@dataclass
+class ValidationRun:
+    """Working state for validating one input file."""
+    filename: str
+    df: pd.DataFrame
+    households: list[list[HouseholdMember]]
+    modified_df: pd.DataFrame
+    ssic_col: Optional[str] = None
+    ssoc_groups: list[dict] = field(default_factory=list)
+    changes: dict = field(default_factory=dict)
+    error_cells: set[tuple[int, int]] = field(default_factory=set)
+    rule_errors: list[dict] = field(default_factory=list)
+    # Index into VALIDATION_STAGES of the stage that emitted each rule error
+    error_stages: list[int] = field(default_factory=list)
+    profiler: Optional[profiling.RunProfiler] = None
+    # Checkpointing (see --resume): the stage being run and the row it resumes from
+    checkpoint: Optional[checkpoints.RunCheckpoint] = None
+    stage_idx: int = 0
+    resume_row: int = 0
+
+
+def prepare_validation_run(
+    filename: str,
+    df: pd.DataFrame,
+    profiler: Optional[profiling.RunProfiler] = None,
+) -> ValidationRun:
+    """
+    Parse household members and insert the derived SSEC/SSIC/SSOC/FT-PT columns.
 
-    print("\nModule diagnostics")
-    print("-" * 50)
-    print(f"rules.__file__: {getattr(rules, '__file__', 'unknown')}")
-    ssec_count = len(getattr(rules, "SSEC_CANDIDATES", []) or [])
-    print(f"SSEC_CANDIDATES count: {ssec_count}")
-    print(f"has validate_qualification_place: {hasattr(rules, 'validate_qualification_place')}")
-    
-    # Load all .xlsx and .csv files from Operating_Table folder
-    files = load_input_files()
-    
-    print(f"\nTotal files loaded: {len(files)}")
-    
-    # Display summary of loaded files
-    for filename, df in files.items():
-        print(f"\n{filename}:")
-        print(f"  Rows: {len(df)}")
-        print(f"  Columns: {len(df.columns)}")
-
-        households = extract_household_members(df)
-        total_members = sum(len(members) for members in households)
-        print(f"  Households parsed: {len(households)}")
-        print(f"  Household members parsed: {total_members}")
-        
-        # Display household member details
-        print(f"\n  Household Member Details:")
-        for household_idx, members in enumerate(households, 1):
-            print(f"\n  Household {household_idx}:")
-            for member_idx, member in enumerate(members, 1):
-                print(f"    Member {member_idx}:")
-                print(f"      Name: {member.full_name}")
-                print(f"      DOB: {member.date_of_birth}")
-                print(f"      Age: {member.age}")
-                print(f"      Labour Force Status: {member.labour_force_status}")
-                print(f"      Employment Status: {member.employment_status_last_week}")
-                print(f"      Job Title: {member.job_title}")
-        
-        # Apply validation rules
-        print(f"\n{'=' * 50}")
-        print(f"Applying Validation Rules...")
-        print(f"{'=' * 50}")
-        
+    Returns a ValidationRun whose modified_df is a copy of the prepared data,
+    ready for the validation stages. Timings are recorded on profiler (a new
+    one is created when none is given).
+    """
+    profiler = profiler or profiling.RunProfiler(filename)
+
+    with profiler.stage("extract_household_members", rows=len(df)):
+        households = extract_household_members(df, survey_reference_date(filename))
+
+    with profiler.stage("column insertion", rows=len(df)):
         df = _ensure_ssec_column(df)
         df, ssic_col = _ensure_ssic_column(df)
         df, ssoc_groups = _ensure_ssoc_columns(df)
@@ -1495,105 +1641,123 @@ def main():
             if isinstance(col, str) and "SSOC Code" in col:
                 if str(df.dtypes[col]) != 'object':
                     df[col] = df[col].astype(object)
-        
-        # Track changes and errors for output
-        changes = {}
-        error_cells = set()
-        modified_df = df.copy()  # Copy AFTER dtype conversion
-        for row_idx, col_idx, value in ftpt_changes:
-            changes[(row_idx, col_idx)] = ("", value)
-
-        rule_errors = []
-
-        # RULE 16: Religion reclass for Others
-        religion_col = _find_column_name(list(df.columns), "What is your religion?")
-        if religion_col:
-            col_idx = df.columns.get_loc(religion_col)
-            for row_idx, value in df[religion_col].items():
-                if pd.isna(value):
-                    continue
-                raw = str(value).strip()
-                raw_lower = raw.lower()
-                if raw_lower.startswith("others:"):
-                    text = raw_lower.split(":", 1)[1].strip()
-                    for denom, reclass in RELIGION_RECLASS_MAP.items():
-                        if denom in text:
-                            modified_df.at[row_idx, religion_col] = reclass
-                            changes[(row_idx, col_idx)] = (raw, reclass)
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": _get_cell_value(df, row_idx, "Response ID"),
-                                "member_index": None,
-                                "member": _get_cell_value(df, row_idx, "Full Name"),
-                                "rule": "RULE 16",
-                                "column": religion_col,
-                                "message": f"Reclassified to {reclass}",
-                            })
-                            break
-
-        # RULE 17: Religion consistency for "No religion"
-        if religion_col:
-            col_idx = df.columns.get_loc(religion_col)
-            for row_idx, value in df[religion_col].items():
-                if pd.isna(value):
-                    continue
-                raw = str(value).strip()
-                raw_lower = raw.lower()
-                if "no religion" in raw_lower and raw != "No religion":
-                    modified_df.at[row_idx, religion_col] = "No religion"
-                    changes[(row_idx, col_idx)] = (raw, "No religion")
-                    rule_errors.append({
-                        "file": filename,
-                        "row": row_idx + 1,
-                        "response_id": _get_cell_value(df, row_idx, "Response ID"),
-                        "member_index": None,
-                        "member": _get_cell_value(df, row_idx, "Full Name"),
-                        "rule": "RULE 17",
-                        "column": religion_col,
-                        "message": "Normalized to 'No religion'",
-                    })
 
-        # RULE 18: Place of Birth validation for Others
-        pob_col = _find_column_name(list(df.columns), "Place of Birth")
-        if pob_col:
-            col_idx = df.columns.get_loc(pob_col)
-            for row_idx, value in df[pob_col].items():
-                if pd.isna(value):
-                    continue
-                raw = str(value).strip()
-                raw_lower = raw.lower()
-                if raw_lower.startswith("others:"):
-                    text = raw_lower.split(":", 1)[1].strip()
-                    if text and text not in COUNTRY_LIST:
-                        error_cells.add((row_idx, col_idx))
-                        rule_errors.append({
-                            "file": filename,
-                            "row": row_idx + 1,
-                            "response_id": _get_cell_value(df, row_idx, "Response ID"),
-                            "member_index": None,
-                            "member": _get_cell_value(df, row_idx, "Full Name"),
-                            "rule": "RULE 18",
-                            "column": pob_col,
-                            "message": "Invalid country in Others: Place of Birth",
-                        })
+    run = ValidationRun(
+        filename=filename,
+        df=df,
+        households=households,
+        modified_df=df.copy(),  # Copy AFTER dtype conversion
+        ssic_col=ssic_col,
+        ssoc_groups=ssoc_groups,
+        profiler=profiler,
+    )
+    for row_idx, col_idx, value in ftpt_changes:
+        run.changes[(row_idx, col_idx)] = ("", value)
+    return run
+
+
+def _household_error(run: ValidationRun, row_idx: int, rule: str, column: str, message: str) -> dict:
+    """Error record for a household-level (row) rule."""
+    return {
+        "file": run.filename,
+        "row": row_idx + 1,
+        "response_id": _get_cell_value(run.df, row_idx, "Response ID"),
+        "member_index": None,
+        "member": _get_cell_value(run.df, row_idx, "Full Name"),
+        "rule": rule,
+        "column": column,
+        "message": message,
+    }
 
-        ssoc_resources = _load_ssoc_resources()
-        ssoc_debug = os.environ.get("SSOC_DEBUG", "").strip().lower() in {"1", "true", "yes"}
-        ssoc_use_gmi_hqa = False
-        ssoc_debug_fh = None
-        ssoc_debug_path = None
-        if ssoc_debug:
-            output_dir = create_output_directory()
-            ssoc_debug_path = output_dir / "ssoc_debug.log"
-            ssoc_debug_fh = open(ssoc_debug_path, "w", encoding="utf-8")
-        if not ssoc_groups:
-            print("  ⚠ SSOC mapping skipped (no Job Title/Main tasks columns found)")
-        elif not ssoc_resources:
-            print("  ⚠ SSOC mapping skipped (SSOC definitions file not found). Set SSOC_DEFINITIONS_FILE env var.")
-        else:
-            print("  ✓ SSOC definitions loaded; assigning SSOC codes")
-            for row_idx in range(len(df)):
+
+def _apply_column_corrections(run: ValidationRun, col_name: str, result: pd.DataFrame, rule: str) -> None:
+    """Write a column of normalizer corrections into modified_df and record them."""
+    col_idx = run.df.columns.get_loc(col_name)
+    for row_idx, original, corrected, message in zip(
+        result.index, result["original"], result["corrected"], result["message"]
+    ):
+        run.modified_df.at[row_idx, col_name] = corrected
+        run.changes[(row_idx, col_idx)] = (original, corrected)
+        run.rule_errors.append(_household_error(run, row_idx, rule, col_name, message))
+
+
+def _apply_religion_rules(run: ValidationRun) -> None:
+    """RULE 16: Religion reclass for Others; RULE 17: Religion consistency for "No religion"."""
+    religion_col = _find_column_name(list(run.df.columns), "What is your religion?")
+    if not religion_col:
+        return
+
+    # RULE 16: Religion reclass for Others
+    reclassified = others.reclassify_religion_column(run.df[religion_col], religion_reclass())
+    _apply_column_corrections(run, religion_col, reclassified, "RULE 16")
+
+    # RULE 17: Religion consistency for "No religion"
+    normalized = others.no_religion_column(run.df[religion_col])
+    _apply_column_corrections(run, religion_col, normalized, "RULE 17")
+
+
+def _apply_place_of_birth_rule(run: ValidationRun) -> None:
+    """RULE 18: Place of Birth validation for Others."""
+    pob_col = _find_column_name(list(run.df.columns), "Place of Birth")
+    if not pob_col:
+        return
+
+    col_idx = run.df.columns.get_loc(pob_col)
+    invalid = others.invalid_birthplace_mask(run.df[pob_col], birth_countries())
+    for row_idx in invalid[invalid].index:
+        run.error_cells.add((row_idx, col_idx))
+        run.rule_errors.append(
+            _household_error(run, row_idx, "RULE 18", pob_col, "Invalid country in Others: Place of Birth")
+        )
+
+
+def assign_ssoc_batch(jobs: pd.DataFrame, ssoc_resources: Optional[dict] = None) -> Optional[pd.DataFrame]:
+    """
+    SSOC codes (and top-5 candidates), as the SSOC stage assigns them, for the
+    "title", "duties" and "hqa" (text) columns of jobs: the
+    SSOC_assigner_V3.assign_ssoc_batch columns (code, top_5, ...), or None
+    without SSOC definitions. SSOC_WORKERS processes score the shortlists and
+    SSOC_NEAR_DUP_THRESHOLD turns on near-duplicate clustering.
+    """
+    ssoc_resources = ssoc_resources or _load_ssoc_resources()
+    if not ssoc_resources:
+        return None
+    return ssoc.assign_ssoc_batch(
+        jobs, "title", "duties", "hqa",
+        defs=ssoc_resources["defs"],
+        title_map=ssoc_resources["title_map"],
+        expert_map=ssoc_resources["expert_map"],
+        min_score_0_to_1=SSOC_MIN_SCORE,
+        workers=SSOC_WORKERS,
+        near_duplicate_threshold=SSOC_NEAR_DUP_THRESHOLD,
+    )
+
+
+def _assign_ssoc_codes(run: ValidationRun) -> None:
+    """Assign SSOC codes from Job Title / Main tasks for every household member."""
+    filename, df, modified_df = run.filename, run.df, run.modified_df
+    changes, error_cells, rule_errors = run.changes, run.error_cells, run.rule_errors
+    households, ssoc_groups = run.households, run.ssoc_groups
+
+    ssoc_resources = _load_ssoc_resources()
+    ssoc_debug = os.environ.get("SSOC_DEBUG", "").strip().lower() in {"1", "true", "yes"}
+    ssoc_use_gmi_hqa = False
+    ssoc_debug_fh = None
+    ssoc_debug_path = None
+    if ssoc_debug:
+        output_dir = create_output_directory()
+        ssoc_debug_path = output_dir / "ssoc_debug.log"
+        ssoc_debug_fh = open(ssoc_debug_path, "w", encoding="utf-8")
+    if not ssoc_groups:
+        print("  ⚠ SSOC mapping skipped (no Job Title/Main tasks columns found)")
+    elif not ssoc_resources:
+        print("  ⚠ SSOC mapping skipped (SSOC definitions file not found). Set SSOC_DEFINITIONS_FILE env var.")
+    else:
+        print("  ✓ SSOC definitions loaded; assigning SSOC codes")
+        for chunk_start in range(run.resume_row, len(df), SSOC_BATCH_ROWS):
+            _checkpoint_progress(run, chunk_start)
+            jobs = []
+            for row_idx in range(chunk_start, min(chunk_start + SSOC_BATCH_ROWS, len(df))):
                 for group_idx, group in enumerate(ssoc_groups):
                     title_idx = group.get("title_idx")
                     duties_idx = group.get("duties_idx")
@@ -1615,627 +1779,1578 @@ def main():
 
                     hqa_value = member.highest_academic_qualification if member else None
                     gmi_value = _parse_gmi_value(member.gmi if member else None)
+                    jobs.append((row_idx, group_idx, ssoc_idx, title_text, duties_text, hqa_value, gmi_value))
+
+            if not jobs:
+                continue
+            matched = assign_ssoc_batch(
+                pd.DataFrame({
+                    "title": [job[3] for job in jobs],
+                    "duties": [job[4] for job in jobs],
+                    "hqa": ["" if job[5] is None else str(job[5]) for job in jobs],
+                }),
+                ssoc_resources,
+            )
+
+            for job, ssoc_code, top_5 in zip(jobs, matched["code"], matched["top_5"]):
+                row_idx, group_idx, ssoc_idx, title_text, duties_text, hqa_value, gmi_value = job
 
-                    ssoc_code, _, _, _, top_5, _ = ssoc.best_match_duties_priority(
-                        title_text,
-                        duties_text,
-                        ssoc_resources["defs"],
-                        ssoc_resources["title_map"],
-                        ssoc_resources["expert_map"],
-                        SSOC_MIN_SCORE,
-                        "" if hqa_value is None else str(hqa_value),
-                        occ_group_hint_raw=None,
-                        company_industry=""
+                if ssoc_use_gmi_hqa:
+                    example_code = _select_candidate_by_examples(top_5 or [], hqa_value, gmi_value)
+                    if example_code:
+                        ssoc_code = example_code
+                    else:
+                        required_group = _required_group_from_band(hqa_value, gmi_value)
+                        band_code = _select_candidate_by_band(top_5 or [], required_group)
+                        if band_code:
+                            ssoc_code = band_code
+
+                if ssoc_debug:
+                    top_5_codes = [str(c.get("code", "")).strip() for c in (top_5 or []) if str(c.get("code", "")).strip()]
+                    debug_line = (
+                        f"SSOC DEBUG row={row_idx + 1} group={group_idx + 1} "
+                        f"title='{title_text}' duties='{duties_text}' "
+                        f"hqa='{hqa_value}' gmi='{gmi_value}' "
+                        f"top5={top_5_codes} selected='{ssoc_code}'"
                     )
+                    print(debug_line)
+                    if ssoc_debug_fh:
+                        ssoc_debug_fh.write(debug_line + "\n")
+
+                old_val = modified_df.iat[row_idx, ssoc_idx]
+                if str(old_val).strip() != str(ssoc_code).strip():
+                    try:
+                        modified_df.iat[row_idx, ssoc_idx] = ssoc_code
+                        changes[(row_idx, ssoc_idx)] = (old_val, ssoc_code)
+                    except (TypeError, pd.errors.LossySetitemError):
+                        # Skip SSOC assignment if there's a dtype error
+                        pass
+
+        if ssoc_debug_fh:
+            ssoc_debug_fh.close()
+            print(f"  ✓ SSOC debug log saved to: {ssoc_debug_path}")
+
+def match_ssic(establishment: object) -> Optional[str]:
+    """
+    RULE 14: SSIC code of an establishment name from ssic_lookup() (exact
+    normalized name first, then substring either way), or None.
+    """
+    est_norm = _normalize_text(establishment)
+    # Remove non-alphanumeric chars and normalize whitespace for matching
+    est_clean = re.sub(r"[^a-z0-9\s]", "", est_norm).strip()
+    est_clean = re.sub(r"\s+", " ", est_clean)
+
+    lookup = ssic_lookup()
+    # First pass: exact match
+    for name, code in lookup:
+        if est_clean == name:
+            return code
+    # Second pass: substring match (either direction)
+    for name, code in lookup:
+        if est_clean in name or name in est_clean:
+            return code
+    return None
 
-                    if ssoc_use_gmi_hqa:
-                        example_code = _select_candidate_by_examples(top_5 or [], hqa_value, gmi_value)
-                        if example_code:
-                            ssoc_code = example_code
-                        else:
-                            required_group = _required_group_from_band(hqa_value, gmi_value)
-                            band_code = _select_candidate_by_band(top_5 or [], required_group)
-                            if band_code:
-                                ssoc_code = band_code
-
-                    if ssoc_debug:
-                        top_5_codes = [str(c.get("code", "")).strip() for c in (top_5 or []) if str(c.get("code", "")).strip()]
-                        debug_line = (
-                            f"SSOC DEBUG row={row_idx + 1} group={group_idx + 1} "
-                            f"title='{title_text}' duties='{duties_text}' "
-                            f"hqa='{hqa_value}' gmi='{gmi_value}' "
-                            f"top5={top_5_codes} selected='{ssoc_code}'"
-                        )
-                        print(debug_line)
-                        if ssoc_debug_fh:
-                            ssoc_debug_fh.write(debug_line + "\n")
-
-                    old_val = modified_df.iat[row_idx, ssoc_idx]
-                    if str(old_val).strip() != str(ssoc_code).strip():
+
+def _assign_ssic_codes(run: ValidationRun) -> None:
+    """RULE 14: Assign SSIC codes from the establishment name."""
+    filename, df, modified_df = run.filename, run.df, run.modified_df
+    changes, error_cells, rule_errors = run.changes, run.error_cells, run.rule_errors
+    ssic_col = run.ssic_col
+
+    if ssic_col and ssic_lookup():
+        print("  ✓ SSIC lookup loaded; assigning SSIC codes")
+        est_col = _find_column_name(list(df.columns), "Name of Establishment you were working last week?")
+        ssic_matched_col, ssic_idx = _get_column_index(df, "SSIC Code")
+        if est_col and ssic_matched_col is not None and ssic_idx is not None:
+            for row_idx in range(run.resume_row, len(df)):
+                _checkpoint_progress(run, row_idx)
+                est_val = df.at[row_idx, est_col]
+                if pd.isna(est_val) or str(est_val).strip() == "":
+                    continue
+                match = match_ssic(est_val)
+                if match:
+                    old_val = modified_df.iat[row_idx, ssic_idx]
+                    if str(old_val).strip() != str(match).strip():
                         try:
-                            modified_df.iat[row_idx, ssoc_idx] = ssoc_code
-                            changes[(row_idx, ssoc_idx)] = (old_val, ssoc_code)
+                            modified_df.iat[row_idx, ssic_idx] = match
+                            changes[(row_idx, ssic_idx)] = (old_val, match)
                         except (TypeError, pd.errors.LossySetitemError):
-                            # Skip SSOC assignment if there's a dtype error
+                            # Skip SSIC assignment if there's a dtype error
                             pass
+                else:
+                    error_cells.add((row_idx, ssic_idx))
+                    rule_errors.append({
+                        "file": filename,
+                        "row": row_idx + 1,
+                        "response_id": _get_cell_value(df, row_idx, "Response ID"),
+                        "member_index": None,
+                        "member": _get_cell_value(df, row_idx, "Full Name"),
+                        "rule": "RULE 14",
+                        "column": ssic_matched_col,
+                        "message": "Unable to match SSIC Code from establishment name",
+                    })
+    elif ssic_col:
+        print("  ⚠ SSIC lookup skipped (SSIC reference list is empty)")
 
-            if ssoc_debug_fh:
-                ssoc_debug_fh.close()
-                print(f"  ✓ SSOC debug log saved to: {ssoc_debug_path}")
-
-        if ssic_col and STRATA_LOOKUP:
-            print("  ✓ SSIC lookup loaded; assigning SSIC codes")
-            est_col = _find_column_name(list(df.columns), "Name of Establishment you were working last week?")
-            ssic_matched_col, ssic_idx = _get_column_index(df, "SSIC Code")
-            if est_col and ssic_matched_col is not None and ssic_idx is not None:
-                for row_idx in range(len(df)):
-                    est_val = df.at[row_idx, est_col]
-                    if pd.isna(est_val) or str(est_val).strip() == "":
-                        continue
-                    est_norm = _normalize_text(est_val)
-                    # Remove non-alphanumeric chars and normalize whitespace for matching
-                    est_clean = re.sub(r"[^a-z0-9\s]", "", est_norm).strip()
-                    est_clean = re.sub(r"\s+", " ", est_clean)
-                    
-                    # Try to find best match: prefer exact match, then substring match
-                    match = None
-                    # First pass: exact match
-                    for name, code in STRATA_LOOKUP:
-                        if est_clean == name:
-                            match = code
-                            break
-                    # Second pass: substring match (either direction)
-                    if not match:
-                        for name, code in STRATA_LOOKUP:
-                            if est_clean in name or name in est_clean:
-                                match = code
-                                break
-                    
-                    if match:
-                        old_val = modified_df.iat[row_idx, ssic_idx]
-                        if str(old_val).strip() != str(match).strip():
-                            try:
-                                modified_df.iat[row_idx, ssic_idx] = match
-                                changes[(row_idx, ssic_idx)] = (old_val, match)
-                            except (TypeError, pd.errors.LossySetitemError):
-                                # Skip SSIC assignment if there's a dtype error
-                                pass
-                    else:
-                        error_cells.add((row_idx, ssic_idx))
+def _apply_others_rule(run: ValidationRun) -> None:
+    """RULE 1: Others option validation."""
+    df = run.df
+
+    print(f"\nRULE 1: Others option validation")
+    print("-" * 50)
+
+    rule1_corrected = 0
+
+    # Check all columns with "Others:" options
+    for attr_name, question_config in rules.QUESTIONS_WITH_OTHERS.items():
+        col_name = question_config["column_name"]
+
+        matched_col = _find_column_name(list(df.columns), col_name)
+        if not matched_col:
+            print(f"  ⚠ Column '{col_name}' not found in data")
+            continue
+
+        with run.profiler.stage("RULE 1", rows=len(df), kind="rule"):
+            result = others.normalize_others_column(df[matched_col], attr_name)
+
+        for row_idx, original, corrected, message in zip(
+            result.index, result["original"], result["corrected"], result["message"]
+        ):
+            print(f"  ✓ Row {row_idx + 1} ({col_name}): {message}")
+            print(f"    Before: {original}")
+            print(f"    After:  {corrected}")
+        _apply_column_corrections(run, matched_col, result, f"RULE 1 - {col_name}")
+        rule1_corrected += len(result)
+
+    print(f"\nRULE 1 Summary: {rule1_corrected} corrected")
+
+
+def _apply_member_rules(run: ValidationRun) -> None:
+    """RULES 2-20 and RULE 9 (SSEC) for every household member."""
+    filename, df, modified_df = run.filename, run.df, run.modified_df
+    changes, error_cells, rule_errors = run.changes, run.error_cells, run.rule_errors
+    households = run.households
+    rule_fns = run.profiler.instrument(rules, RULE_IDS_BY_FUNCTION)
+
+    print(f"\nRULES 2-13: Data quality validations")
+    print("-" * 50)
+
+    ssec_enabled = bool(getattr(rules, "SSEC_CANDIDATES", []))
+    if not ssec_enabled:
+        print("  ⚠ SSEC mapping skipped (SSEC_CANDIDATES is empty)")
+
+    # Column rules run once over every member, in member-loop order
+    all_members = [member for members in households for member in members]
+    qualifications = pd.Series([m.highest_academic_qualification for m in all_members], dtype=object)
+    places = pd.Series([m.place_of_study_highest_academic for m in all_members], dtype=object)
+    place_matches = {
+        position: matches.to_dict("records")
+        for position, matches in rule_fns.validate_qualification_place_column(qualifications, places).groupby(level=0, sort=False)
+    }
+    ssec_matches = rule_fns.best_ssec_matches(qualifications) if ssec_enabled else []
+
+    # Iterate through all household members for validation
+    position = -1
+    for household_idx, members in enumerate(households, 1):
+        for member_idx, member in enumerate(members, 1):
+            position += 1
+            row_idx = household_idx - 1  # Adjust for 0-based indexing
+            response_id = _get_cell_value(df, row_idx, "Response ID")
+
+            # RULE 2: Age started employment validation
+            if member.age_started_employment is not None:
+                result = rule_fns.validate_age_started_employment(member.age_started_employment)
+                if not result.is_valid:
+                    col_name = "At what age did you start employment"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
                         rule_errors.append({
                             "file": filename,
                             "row": row_idx + 1,
-                            "response_id": _get_cell_value(df, row_idx, "Response ID"),
-                            "member_index": None,
-                            "member": _get_cell_value(df, row_idx, "Full Name"),
-                            "rule": "RULE 14",
-                            "column": ssic_matched_col,
-                            "message": "Unable to match SSIC Code from establishment name",
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 2",
+                            "column": matched_col,
+                            "message": result.message
                         })
-        elif ssic_col:
-            print("  ⚠ SSIC lookup skipped (STRATA_LOOKUP is empty)")
-        
-        # RULE 1: Others option validation
-        print(f"\nRULE 1: Others option validation")
-        print("-" * 50)
-        
-        rule1_issues = 0
-        rule1_corrected = 0
-        
-        # Check all columns with "Others:" options
-        for attr_name, question_config in rules.QUESTIONS_WITH_OTHERS.items():
-            col_name = question_config["column_name"]
 
-            matched_col = _find_column_name(list(df.columns), col_name)
-            if not matched_col:
-                print(f"  ⚠ Column '{col_name}' not found in data")
-                continue
+            # RULE 3: Bonus validation
+            if member.bonus_received_last_12_months is not None:
+                result = rule_fns.validate_bonus(member.bonus_received_last_12_months)
+                if not result.is_valid:
+                    col_name = "Bonus received from your job(s) during the last 12 months"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 3",
+                            "column": matched_col,
+                            "message": result.message
+                        })
 
-            col_idx = df.columns.get_loc(matched_col)
+                # RULE 3b: Advanced contextual bonus validation
+                result_contextual = rule_fns.validate_bonus_contextual(
+                    member.bonus_received_last_12_months,
+                    labour_force_status=member.labour_force_status,
+                    usual_hours=member.usual_hours_of_work,
+                    identification_type=member.identification_type
+                )
+                if not result_contextual.is_valid:
+                    col_name = "Bonus received from your job(s) during the last 12 months"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 3b",
+                            "column": matched_col,
+                            "message": result_contextual.message
+                        })
 
-            for row_idx, value in df[matched_col].items():
-                if pd.isna(value):
-                    continue
-                
-                result = rules.validate_others_option(str(value), attr_name)
-                
-                if result.corrected_value and result.corrected_value != str(value):
-                    print(f"  ✓ Row {row_idx + 1} ({col_name}): {result.message}")
-                    print(f"    Before: {result.original_value}")
-                    print(f"    After:  {result.corrected_value}")
-                    modified_df.at[row_idx, matched_col] = result.corrected_value
-                    changes[(row_idx, col_idx)] = (result.original_value, result.corrected_value)
-                    rule1_corrected += 1
-                    response_id = _get_cell_value(df, row_idx, "Response ID")
-                    member_name = _get_cell_value(df, row_idx, "Full Name")
-                    rule_errors.append({
-                        "file": filename,
-                        "row": row_idx + 1,
-                        "response_id": response_id,
-                        "member_index": None,
-                        "member": member_name,
-                        "rule": f"RULE 1 - {col_name}",
-                        "column": matched_col,
-                        "message": result.message
-                    })
-        
-        print(f"\nRULE 1 Summary: {rule1_corrected} corrected")
-        
-        # RULE 2-13: Additional validation rules from colleague's work
-        print(f"\nRULES 2-13: Data quality validations")
-        print("-" * 50)
+            # RULE 20: Usual hours limit validation (Brandon's rule)
+            if member.usual_hours_of_work is not None:
+                result = rule_fns.validate_usual_hours_limit(member.usual_hours_of_work)
+                if not result.is_valid:
+                    matched_col, col_idx = _get_column_index(df, "Usual hours of work")
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 20",
+                            "column": matched_col,
+                            "message": result.message
+                        })
 
-        ssec_enabled = bool(getattr(rules, "SSEC_CANDIDATES", []))
-        if not ssec_enabled:
-            print("  ⚠ SSEC mapping skipped (SSEC_CANDIDATES is empty)")
-        
-        # Iterate through all household members for validation
-        for household_idx, members in enumerate(households, 1):
-            for member_idx, member in enumerate(members, 1):
-                row_idx = household_idx - 1  # Adjust for 0-based indexing
-                response_id = _get_cell_value(df, row_idx, "Response ID")
-                
-                # RULE 2: Age started employment validation
-                if member.age_started_employment is not None:
-                    result = rules.validate_age_started_employment(member.age_started_employment)
-                    if not result.is_valid:
-                        col_name = "At what age did you start employment"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 2",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-                
-                # RULE 3: Bonus validation
-                if member.bonus_received_last_12_months is not None:
-                    result = rules.validate_bonus(member.bonus_received_last_12_months)
-                    if not result.is_valid:
-                        col_name = "Bonus received from your job(s) during the last 12 months"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 3",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-                    
-                    # RULE 3b: Advanced contextual bonus validation
-                    result_contextual = rules.validate_bonus_contextual(
-                        member.bonus_received_last_12_months,
-                        labour_force_status=member.labour_force_status,
-                        usual_hours=member.usual_hours_of_work,
-                        identification_type=member.identification_type
-                    )
-                    if not result_contextual.is_valid:
-                        col_name = "Bonus received from your job(s) during the last 12 months"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 3b",
-                                "column": matched_col,
-                                "message": result_contextual.message
-                            })
-                
-                # RULE 20: Usual hours limit validation (Brandon's rule)
-                if member.usual_hours_of_work is not None:
-                    result = rules.validate_usual_hours_limit(member.usual_hours_of_work)
-                    if not result.is_valid:
-                        matched_col, col_idx = _get_column_index(df, "Usual hours of work")
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 20",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-                
-                # RULE 4: Previous company name validation
-                if member.establishment_name_last_worked is not None:
-                    result = rules.validate_previous_company_name(member.establishment_name_last_worked)
-                    if not result.is_valid:
-                        col_name = "Name of Establishment you were working last worked"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 4",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # RULE 15: Current establishment name validation
-                if member.name_of_establishment_last_week is not None:
-                    result = rules.validate_previous_company_name(member.name_of_establishment_last_week)
-                    if not result.is_valid:
-                        col_name = "Name of Establishment you were working last week?"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 15",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-                
-                # RULE 5: Interest from savings validation
-                if member.interest_from_savings_last_12_months is not None:
-                    result = rules.validate_interest_from_savings(member.interest_from_savings_last_12_months)
-                    if not result.is_valid:
-                        col_name = "How much interest did you receive from savings (e.g., current and saving accounts, fixed deposits) in the last 12 months?"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 5",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-                
-                # RULE 6: Dividends/investment interest validation
-                if member.dividends_interests_investments_last_12_months is not None:
-                    result = rules.validate_dividends_investment_interest(member.dividends_interests_investments_last_12_months)
-                    if not result.is_valid:
-                        col_name = "How much dividends and interests did you receive from other investment sources (e.g., bonds, shares, unit trust, personal loans to persons outside your households) in the last 12 months?"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 6",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # ZW HW_001: Usual hours > 99
-                if member.usual_hours_of_work is not None:
-                    result = rules.validate_hours_worked_hw001(member.usual_hours_of_work)
-                    if not result.is_valid:
-                        matched_col, col_idx = _get_column_index(df, "Usual hours of work")
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "HW_001",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # ZW HW_002/HW_003: Usual hours by SSOC major group
-                if member.usual_hours_of_work is not None:
-                    ssoc_value = _get_cell_value(modified_df, row_idx, "SSOC Code")
-                    result = rules.validate_hours_worked_by_ssoc_group(member.usual_hours_of_work, ssoc_value)
-                    if not result.is_valid:
-                        matched_col, col_idx = _get_column_index(df, "Usual hours of work")
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": result.rule_applied or "HW_002/HW_003",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # ZW HW_004: Student hours should not exceed 40
-                if member.usual_hours_of_work is not None:
-                    result = rules.validate_hours_worked_student_hw004(
-                        member.usual_hours_of_work,
-                        member.labour_force_status,
-                    )
-                    if not result.is_valid:
-                        matched_col, col_idx = _get_column_index(df, "Usual hours of work")
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "HW_004",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # ZW INTR_001/INTR_002: Interest/dividend thresholds by age
-                for value, col_name in [
-                    (
-                        member.interest_from_savings_last_12_months,
-                        "How much interest did you receive from savings (e.g., current and saving accounts, fixed deposits) in the last 12 months?",
-                    ),
-                    (
-                        member.dividends_interests_investments_last_12_months,
-                        "How much dividends and interests did you receive from other investment sources (e.g., bonds, shares, unit trust, personal loans to persons outside your households) in the last 12 months?",
-                    ),
-                ]:
-                    if value is None:
-                        continue
-                    result = rules.validate_interest_age_threshold(member.age, value)
-                    if not result.is_valid:
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": result.rule_applied or "INTR_001/INTR_002",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # ZW CIK_001: Cash in-kind / allowances threshold
-                if member.allowances_contributions_last_12_months is not None:
-                    result = rules.validate_cash_in_kind_allowances(member.allowances_contributions_last_12_months)
-                    if not result.is_valid:
-                        col_name = "How much did you receive from regular cash and in-kind allowances or contributions (including alimony) from children, relatives, friends not staying in this household in the last 12 months"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "CIK_001",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-
-                # ZW OTH_001: Amount from sources other than employment threshold
-                if member.other_sources_income_last_12_months is not None:
-                    result = rules.validate_other_sources_income(member.other_sources_income_last_12_months)
-                    if not result.is_valid:
-                        col_name = "How much did you receive from sources other than employment and the above (e.g., regular pension payments, regular annuity payouts (excluding CPF Life, CPF Retirement Sum Scheme), social welfare grants, etc.) in the last 12 months"
-                        matched_col, col_idx = _get_column_index(df, col_name)
-                        if matched_col is not None and col_idx is not None:
-                            error_cells.add((row_idx, col_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "OTH_001",
-                                "column": matched_col,
-                                "message": result.message
-                            })
-                
-                # RULE 7: Freelance work vs Own Account Worker consistency
-                if member.freelance_online_platforms_last_12_months is not None:
-                    result = rules.validate_freelance_employment_consistency(
-                        member.employment_status_last_week,
-                        member.freelance_online_platforms_last_12_months
-                    )
-                    if not result.is_valid:
-                        # Highlight both employment status and freelance columns
-                        emp_col = "Employment Status as of last week"
-                        free_col = "Did you perform any freelance or assignment-based work via any of the following online platform(s) in the last 12 months?"
-                        emp_matched, emp_idx = _get_column_index(df, emp_col)
-                        if emp_matched is not None and emp_idx is not None:
-                            error_cells.add((row_idx, emp_idx))
-                        free_matched, free_idx = _get_column_index(df, free_col)
-                        if free_matched is not None and free_idx is not None:
-                            error_cells.add((row_idx, free_idx))
+            # RULE 4: Previous company name validation
+            if member.establishment_name_last_worked is not None:
+                result = rule_fns.validate_previous_company_name(member.establishment_name_last_worked)
+                if not result.is_valid:
+                    col_name = "Name of Establishment you were working last worked"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
                         rule_errors.append({
                             "file": filename,
                             "row": row_idx + 1,
                             "response_id": response_id,
                             "member_index": member_idx,
                             "member": member.full_name,
-                            "rule": "RULE 7",
-                            "column": f"{emp_matched or emp_col} & {free_matched or free_col}",
+                            "rule": "RULE 4",
+                            "column": matched_col,
                             "message": result.message
                         })
 
-                # RULE 19: Freelance requires self-employed and own-account
-                freelance_val = _normalize_text(member.freelance_online_platforms_last_12_months)
-                if freelance_val and freelance_val != _normalize_text(NO_FREELANCE_TEXT):
-                    se_val = _normalize_text(member.self_employed_last_12_months)
-                    oa_val = _normalize_text(member.worked_own_business_last_12_months)
-                    if se_val != "yes" or oa_val != "yes":
-                        self_col = "At any point in the last 12 months, were you self-employed?"
-                        own_col = "At any point in the last 12 months, did you work on your own (i.e., without paid employees) while running your own business or trade?"
-                        free_col = "Did you perform any freelance or assignment-based work via any of the following online platform(s) in the last 12 months?"
-                        self_matched, self_idx = _get_column_index(df, self_col)
-                        own_matched, own_idx = _get_column_index(df, own_col)
-                        free_matched, free_idx = _get_column_index(df, free_col)
-                        for idx in [self_idx, own_idx, free_idx]:
-                            if idx is not None:
-                                error_cells.add((row_idx, idx))
+            # RULE 15: Current establishment name validation
+            if member.name_of_establishment_last_week is not None:
+                result = rule_fns.validate_previous_company_name(member.name_of_establishment_last_week)
+                if not result.is_valid:
+                    col_name = "Name of Establishment you were working last week?"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
                         rule_errors.append({
                             "file": filename,
                             "row": row_idx + 1,
                             "response_id": response_id,
                             "member_index": member_idx,
                             "member": member.full_name,
-                            "rule": "RULE 19",
-                            "column": f"{self_matched or self_col} & {own_matched or own_col} & {free_matched or free_col}",
-                            "message": "Freelance selected but self-employed/own-account not both Yes",
+                            "rule": "RULE 15",
+                            "column": matched_col,
+                            "message": result.message
                         })
 
-                # RULE 8: Validate Highest Academic Qualification vs Place of Study
-                qualification = member.highest_academic_qualification
-                place = member.place_of_study_highest_academic
-                if qualification and place:
-                    matches = rules.validate_qualification_place(str(qualification), str(place))
-                    if matches:
-                        qual_col = "Highest Academic Qualification"
-                        place_col = "Place of study for your Highest Academic Attained in?"
-                        qual_matched, qual_idx = _get_column_index(df, qual_col)
-                        if qual_matched is not None and qual_idx is not None:
-                            error_cells.add((row_idx, qual_idx))
-                        place_matched, place_idx = _get_column_index(df, place_col)
-                        if place_matched is not None and place_idx is not None:
-                            error_cells.add((row_idx, place_idx))
-
-                        for match in matches:
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": f"RULE 8 - {match['rule_id']}",
-                                "column": f"{qual_matched or qual_col} & {place_matched or place_col}",
-                                "message": match["reason"]
-                            })
-
-                # RULE 9: Assign SSEC Code based on Highest Academic Qualification
-                
-                # RULE 10: Internship/Employment type validation
-                internship_value = member.paid_internship_traineeship
-                employment_value = member.type_of_employment
-                result = rules.validate_internship_employment_rule(internship_value, employment_value)
+            # RULE 5: Interest from savings validation
+            if member.interest_from_savings_last_12_months is not None:
+                result = rule_fns.validate_interest_from_savings(member.interest_from_savings_last_12_months)
                 if not result.is_valid:
-                    internship_col = "Was your main job last week a paid internship, traineeship or apprenticeship?"
-                    employment_col = "Type of Employment?"
-                    employment_matched, employment_idx = _get_column_index(df, employment_col)
-                    if employment_matched is not None and employment_idx is not None:
-                        error_cells.add((row_idx, employment_idx))
-                    internship_matched, internship_idx = _get_column_index(df, internship_col)
-                    if internship_matched is not None and internship_idx is not None:
-                        error_cells.add((row_idx, internship_idx))
-                    rule_errors.append({
-                        "file": filename,
-                        "row": row_idx + 1,
-                        "response_id": response_id,
-                        "member_index": member_idx,
-                        "member": member.full_name,
-                        "rule": "RULE 10",
-                        "column": f"{internship_matched or internship_col} & {employment_matched or employment_col}",
-                        "message": result.message
-                    })
+                    col_name = "How much interest did you receive from savings (e.g., current and saving accounts, fixed deposits) in the last 12 months?"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 5",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # RULE 6: Dividends/investment interest validation
+            if member.dividends_interests_investments_last_12_months is not None:
+                result = rule_fns.validate_dividends_investment_interest(member.dividends_interests_investments_last_12_months)
+                if not result.is_valid:
+                    col_name = "How much dividends and interests did you receive from other investment sources (e.g., bonds, shares, unit trust, personal loans to persons outside your households) in the last 12 months?"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 6",
+                            "column": matched_col,
+                            "message": result.message
+                        })
 
-                # RULE 11: Job title validation
-                result = rules.validate_job_title_rule(member.job_title)
+            # ZW HW_001: Usual hours > 99
+            if member.usual_hours_of_work is not None:
+                result = rule_fns.validate_hours_worked_hw001(member.usual_hours_of_work)
                 if not result.is_valid:
-                    job_col = "Job Title"
-                    job_matched, job_idx = _get_column_index(df, job_col)
-                    if job_matched is not None and job_idx is not None:
-                        error_cells.add((row_idx, job_idx))
+                    matched_col, col_idx = _get_column_index(df, "Usual hours of work")
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "HW_001",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # ZW HW_002/HW_003: Usual hours by SSOC major group
+            if member.usual_hours_of_work is not None:
+                ssoc_value = _get_cell_value(modified_df, row_idx, "SSOC Code")
+                result = rule_fns.validate_hours_worked_by_ssoc_group(member.usual_hours_of_work, ssoc_value)
+                if not result.is_valid:
+                    matched_col, col_idx = _get_column_index(df, "Usual hours of work")
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": result.rule_applied or "HW_002/HW_003",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # ZW HW_004: Student hours should not exceed 40
+            if member.usual_hours_of_work is not None:
+                result = rule_fns.validate_hours_worked_student_hw004(
+                    member.usual_hours_of_work,
+                    member.labour_force_status,
+                )
+                if not result.is_valid:
+                    matched_col, col_idx = _get_column_index(df, "Usual hours of work")
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "HW_004",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # ZW INTR_001/INTR_002: Interest/dividend thresholds by age
+            for value, col_name in [
+                (
+                    member.interest_from_savings_last_12_months,
+                    "How much interest did you receive from savings (e.g., current and saving accounts, fixed deposits) in the last 12 months?",
+                ),
+                (
+                    member.dividends_interests_investments_last_12_months,
+                    "How much dividends and interests did you receive from other investment sources (e.g., bonds, shares, unit trust, personal loans to persons outside your households) in the last 12 months?",
+                ),
+            ]:
+                if value is None:
+                    continue
+                age = member.age if member.age is not None else member.age_years
+                result = rule_fns.validate_interest_age_threshold(age, value)
+                if not result.is_valid:
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": result.rule_applied or "INTR_001/INTR_002",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # ZW CIK_001: Cash in-kind / allowances threshold
+            if member.allowances_contributions_last_12_months is not None:
+                result = rule_fns.validate_cash_in_kind_allowances(member.allowances_contributions_last_12_months)
+                if not result.is_valid:
+                    col_name = "How much did you receive from regular cash and in-kind allowances or contributions (including alimony) from children, relatives, friends not staying in this household in the last 12 months"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "CIK_001",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # ZW OTH_001: Amount from sources other than employment threshold
+            if member.other_sources_income_last_12_months is not None:
+                result = rule_fns.validate_other_sources_income(member.other_sources_income_last_12_months)
+                if not result.is_valid:
+                    col_name = "How much did you receive from sources other than employment and the above (e.g., regular pension payments, regular annuity payouts (excluding CPF Life, CPF Retirement Sum Scheme), social welfare grants, etc.) in the last 12 months"
+                    matched_col, col_idx = _get_column_index(df, col_name)
+                    if matched_col is not None and col_idx is not None:
+                        error_cells.add((row_idx, col_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "OTH_001",
+                            "column": matched_col,
+                            "message": result.message
+                        })
+
+            # RULE 7: Freelance work vs Own Account Worker consistency
+            if member.freelance_online_platforms_last_12_months is not None:
+                result = rule_fns.validate_freelance_employment_consistency(
+                    member.employment_status_last_week,
+                    member.freelance_online_platforms_last_12_months
+                )
+                if not result.is_valid:
+                    # Highlight both employment status and freelance columns
+                    emp_col = "Employment Status as of last week"
+                    free_col = "Did you perform any freelance or assignment-based work via any of the following online platform(s) in the last 12 months?"
+                    emp_matched, emp_idx = _get_column_index(df, emp_col)
+                    if emp_matched is not None and emp_idx is not None:
+                        error_cells.add((row_idx, emp_idx))
+                    free_matched, free_idx = _get_column_index(df, free_col)
+                    if free_matched is not None and free_idx is not None:
+                        error_cells.add((row_idx, free_idx))
                     rule_errors.append({
                         "file": filename,
                         "row": row_idx + 1,
                         "response_id": response_id,
                         "member_index": member_idx,
                         "member": member.full_name,
-                        "rule": "RULE 11",
-                        "column": job_matched or job_col,
+                        "rule": "RULE 7",
+                        "column": f"{emp_matched or emp_col} & {free_matched or free_col}",
                         "message": result.message
                     })
 
-                # RULE 13: Usual hours of work must be numeric
-                result = rules.validate_usual_hours_value(member.usual_hours_of_work)
-                if not result.is_valid:
-                    hours_col = "Usual hours of work"
-                    hours_matched, hours_idx = _get_column_index(df, hours_col)
-                    if hours_matched is not None and hours_idx is not None:
-                        error_cells.add((row_idx, hours_idx))
+            # RULE 19: Freelance requires self-employed and own-account
+            freelance_val = _normalize_text(member.freelance_online_platforms_last_12_months)
+            if freelance_val and freelance_val != _normalize_text(NO_FREELANCE_TEXT):
+                se_val = _normalize_text(member.self_employed_last_12_months)
+                oa_val = _normalize_text(member.worked_own_business_last_12_months)
+                if se_val != "yes" or oa_val != "yes":
+                    self_col = "At any point in the last 12 months, were you self-employed?"
+                    own_col = "At any point in the last 12 months, did you work on your own (i.e., without paid employees) while running your own business or trade?"
+                    free_col = "Did you perform any freelance or assignment-based work via any of the following online platform(s) in the last 12 months?"
+                    self_matched, self_idx = _get_column_index(df, self_col)
+                    own_matched, own_idx = _get_column_index(df, own_col)
+                    free_matched, free_idx = _get_column_index(df, free_col)
+                    for idx in [self_idx, own_idx, free_idx]:
+                        if idx is not None:
+                            error_cells.add((row_idx, idx))
                     rule_errors.append({
                         "file": filename,
                         "row": row_idx + 1,
                         "response_id": response_id,
                         "member_index": member_idx,
                         "member": member.full_name,
-                        "rule": "RULE 13",
-                        "column": hours_matched or hours_col,
-                        "message": result.message
+                        "rule": "RULE 19",
+                        "column": f"{self_matched or self_col} & {own_matched or own_col} & {free_matched or free_col}",
+                        "message": "Freelance selected but self-employed/own-account not both Yes",
                     })
-                if ssec_enabled and qualification:
-                    ssec_code, ssec_score = rules.best_ssec_match(str(qualification))
-                    ssec_col, ssec_idx = _get_column_index(df, "SSEC Code")
-                    if ssec_col is not None and ssec_idx is not None:
-                        if ssec_code:
-                            modified_df.at[row_idx, ssec_col] = ssec_code
-                            changes[(row_idx, ssec_idx)] = ("", ssec_code)
-                        else:
-                            error_cells.add((row_idx, ssec_idx))
-                            rule_errors.append({
-                                "file": filename,
-                                "row": row_idx + 1,
-                                "response_id": response_id,
-                                "member_index": member_idx,
-                                "member": member.full_name,
-                                "rule": "RULE 9",
-                                "column": ssec_col,
-                                "message": "Unable to map SSEC Code from Highest Academic Qualification"
-                            })
-        
-        # Display errors found
-        if rule_errors:
-            print(f"\n  ✗ Found {len(rule_errors)} validation errors:")
-            for error in rule_errors:
-                print(f"    Row {error['row']} - {error['member']}")
-                print(f"    {error['rule']}: {error['message']}")
-                print(f"    Column: {error['column']}")
-                print()
-        else:
-            print(f"  ✓ No validation errors found")
-        
-        print(f"\nRULES 2-13 Summary: {len(rule_errors)} errors found")
 
-        # Create validation report (summary + details + complete dataset)
-        create_validation_report(rule_errors, filename, modified_df, changes, error_cells)
-        
-        # Save validated output if changes were made
-        if changes or error_cells:
-            original_path = Path("Operating_Table") / filename
-            save_with_highlights(modified_df, str(original_path), changes, error_cells)
+            # RULE 8: Validate Highest Academic Qualification vs Place of Study
+            qualification = member.highest_academic_qualification
+            place = member.place_of_study_highest_academic
+            if qualification and place:
+                matches = place_matches.get(position)
+                if matches:
+                    qual_col = "Highest Academic Qualification"
+                    place_col = "Place of study for your Highest Academic Attained in?"
+                    qual_matched, qual_idx = _get_column_index(df, qual_col)
+                    if qual_matched is not None and qual_idx is not None:
+                        error_cells.add((row_idx, qual_idx))
+                    place_matched, place_idx = _get_column_index(df, place_col)
+                    if place_matched is not None and place_idx is not None:
+                        error_cells.add((row_idx, place_idx))
+
+                    for match in matches:
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": f"RULE 8 - {match['rule_id']}",
+                            "column": f"{qual_matched or qual_col} & {place_matched or place_col}",
+                            "message": match["reason"]
+                        })
+
+            # RULE 9: Assign SSEC Code based on Highest Academic Qualification
+
+            # RULE 10: Internship/Employment type validation
+            internship_value = member.paid_internship_traineeship
+            employment_value = member.type_of_employment
+            result = rule_fns.validate_internship_employment_rule(internship_value, employment_value)
+            if not result.is_valid:
+                internship_col = "Was your main job last week a paid internship, traineeship or apprenticeship?"
+                employment_col = "Type of Employment?"
+                employment_matched, employment_idx = _get_column_index(df, employment_col)
+                if employment_matched is not None and employment_idx is not None:
+                    error_cells.add((row_idx, employment_idx))
+                internship_matched, internship_idx = _get_column_index(df, internship_col)
+                if internship_matched is not None and internship_idx is not None:
+                    error_cells.add((row_idx, internship_idx))
+                rule_errors.append({
+                    "file": filename,
+                    "row": row_idx + 1,
+                    "response_id": response_id,
+                    "member_index": member_idx,
+                    "member": member.full_name,
+                    "rule": "RULE 10",
+                    "column": f"{internship_matched or internship_col} & {employment_matched or employment_col}",
+                    "message": result.message
+                })
+
+            # RULE 11: Job title validation
+            result = rule_fns.validate_job_title_rule(member.job_title)
+            if not result.is_valid:
+                job_col = "Job Title"
+                job_matched, job_idx = _get_column_index(df, job_col)
+                if job_matched is not None and job_idx is not None:
+                    error_cells.add((row_idx, job_idx))
+                rule_errors.append({
+                    "file": filename,
+                    "row": row_idx + 1,
+                    "response_id": response_id,
+                    "member_index": member_idx,
+                    "member": member.full_name,
+                    "rule": "RULE 11",
+                    "column": job_matched or job_col,
+                    "message": result.message
+                })
+
+            # RULE 13: Usual hours of work must be numeric
+            result = rule_fns.validate_usual_hours_value(member.usual_hours_of_work)
+            if not result.is_valid:
+                hours_col = "Usual hours of work"
+                hours_matched, hours_idx = _get_column_index(df, hours_col)
+                if hours_matched is not None and hours_idx is not None:
+                    error_cells.add((row_idx, hours_idx))
+                rule_errors.append({
+                    "file": filename,
+                    "row": row_idx + 1,
+                    "response_id": response_id,
+                    "member_index": member_idx,
+                    "member": member.full_name,
+                    "rule": "RULE 13",
+                    "column": hours_matched or hours_col,
+                    "message": result.message
+                })
+            if ssec_enabled and qualification:
+                ssec_code, ssec_score = ssec_matches[position]
+                ssec_col, ssec_idx = _get_column_index(df, "SSEC Code")
+                if ssec_col is not None and ssec_idx is not None:
+                    if ssec_code:
+                        modified_df.at[row_idx, ssec_col] = ssec_code
+                        changes[(row_idx, ssec_idx)] = ("", ssec_code)
+                    else:
+                        error_cells.add((row_idx, ssec_idx))
+                        rule_errors.append({
+                            "file": filename,
+                            "row": row_idx + 1,
+                            "response_id": response_id,
+                            "member_index": member_idx,
+                            "member": member.full_name,
+                            "rule": "RULE 9",
+                            "column": ssec_col,
+                            "message": "Unable to map SSEC Code from Highest Academic Qualification"
+                        })
+
+
+def _block_column_index(columns: list, start: int, stop: int, target: str) -> Optional[int]:
+    """
+    Position of target among columns[start:stop]: the first exact header match
+    (ignoring pandas' ".1" duplicate suffixes), else the shortest partial match.
+    """
+    target_norm = _normalize_header(target)
+    headers = [
+        (i, re.sub(r"\.\d+$", "", _normalize_header(columns[i])))
+        for i in range(start, stop)
+    ]
+    for i, header in headers:
+        if header == target_norm:
+            return i
+    partial = [(len(header), i) for i, header in headers if target_norm and target_norm in header]
+    return min(partial)[1] if partial else None
+
+
+def _member_blocks(df: pd.DataFrame) -> list[tuple[int, int, int, pd.Series, np.ndarray]]:
+    """
+    Column ranges of the household member blocks, for the column-at-once stages:
+    (block_idx, start, stop, names, member_numbers). Members are numbered by the
+    named blocks of their row, as in the member rules (0 where the block is empty).
+    """
+    columns = list(df.columns)
+    groups = _get_member_column_groups(columns)
+    counts = np.zeros(len(df), dtype=int)
+    blocks = []
+    for block_idx, group in enumerate(groups):
+        start = group["full_name_idx"]
+        stop = groups[block_idx + 1]["full_name_idx"] if block_idx + 1 < len(groups) else len(columns)
+        names = df.iloc[:, start].map(_normalize_value)
+        named = names.notna().to_numpy()
+        counts = counts + named
+        blocks.append((block_idx, start, stop, names, np.where(named, counts, 0)))
+    return blocks
+
+
+def _record_block_errors(run: ValidationRun, found: list[pd.DataFrame]) -> int:
+    """
+    Record the errors of a column-at-once stage in row, member block, check order.
+
+    found holds frames with columns row_idx, block, order, member_index, member,
+    col_indices (cells to highlight), column, rule and message.
+    """
+    if not found:
+        return 0
+    errors = pd.concat(found).sort_values(["row_idx", "block", "order"], kind="mergesort")
+    for row_idx, member_idx, member, col_indices, column, rule, message in zip(
+        errors["row_idx"], errors["member_index"], errors["member"], errors["col_indices"],
+        errors["column"], errors["rule"], errors["message"],
+    ):
+        for col_idx in col_indices:
+            run.error_cells.add((row_idx, col_idx))
+        run.rule_errors.append({
+            "file": run.filename,
+            "row": row_idx + 1,
+            "response_id": _get_cell_value(run.df, row_idx, "Response ID"),
+            "member_index": int(member_idx),
+            "member": member,
+            "rule": rule,
+            "column": column,
+            "message": message,
+        })
+    return len(errors)
+
+
+# Tolerance table of the MRSD tolerance stage (None: stage disabled, see --tolerances)
+TOLERANCE_TABLE: Optional["tolerances.ToleranceTable"] = None
+
+
+def enable_tolerances(path: Optional[str]) -> None:
+    """Turn the MRSD tolerance stage on with the config at path (None: off)."""
+    global TOLERANCE_TABLE
+    TOLERANCE_TABLE = tolerances.load_tolerances(Path(path)) if path else None
+
+
+def _apply_tolerance_rules(run: ValidationRun) -> None:
+    """MRSD tolerance values (CLFS_tolerances), column-at-once per member block."""
+    table = TOLERANCE_TABLE
+    if table is None:
+        return
+
+    print(f"\nMRSD tolerances ({table.version}, {len(table.tolerances)} checks)")
+    print("-" * 50)
+
+    df = run.modified_df
+    columns = list(df.columns)
+    order = {tol.id: i for i, tol in enumerate(table.tolerances)}
+    found = []
+    skipped = set()
+
+    for block_idx, start, stop, names, members in _member_blocks(df):
+        positions = {
+            name: _block_column_index(columns, start, stop, spec.column)
+            for name, spec in table.fields.items()
+        }
+        features = tolerances.derive_features(
+            {name: df.iloc[:, pos] for name, pos in positions.items() if pos is not None}, table
+        )
+        hits, block_skipped = tolerances.evaluate(features, table, df.index)
+        skipped.update(block_skipped)
+        rows = df.index.get_indexer(hits.index)
+        hits = hits[members[rows] > 0]
+        rows = df.index.get_indexer(hits.index)
+        if len(hits):
+            found.append(pd.DataFrame({
+                "row_idx": hits.index,
+                "block": block_idx,
+                "order": hits["tolerance"].map(order).to_numpy(),
+                "member_index": members[rows],
+                "member": names.to_numpy()[rows],
+                "col_indices": [(positions[target],) for target in hits["target"]],
+                "column": [columns[positions[target]] for target in hits["target"]],
+                "rule": hits["tolerance"].to_numpy(),
+                "message": hits["message"].to_numpy(),
+            }))
+
+    if skipped:
+        print(f"  ⚠ Skipped (columns not in file): {', '.join(sorted(skipped))}")
+    count = _record_block_errors(run, found)
+    if count:
+        print(f"  ✗ {count} values outside the MRSD tolerances")
+    else:
+        print("  ✓ No values outside the MRSD tolerances")
+
+
+# Compiled programme catalog of the programme stage (None: stage disabled, see --programme-catalog)
+PROGRAMME_CATALOG: Optional["programmes.ProgrammeCatalog"] = None
+
+
+def enable_programme_catalog(enabled: bool) -> None:
+    """Turn the programme catalog stage on (compiling or loading the cached catalog) or off."""
+    global PROGRAMME_CATALOG
+    PROGRAMME_CATALOG = programmes.load_catalog() if enabled else None
+
+
+def _apply_programme_rules(run: ValidationRun) -> None:
+    """
+    EDU_002: Highest Academic Qualification, field of study and place of study
+    against the institution programme catalog (CLFS_programme_catalog).
+    """
+    catalog = PROGRAMME_CATALOG
+    if catalog is None:
+        return
+
+    print(f"\nProgramme catalog checks ({len(catalog)} programmes)")
+    print("-" * 50)
+
+    df = run.modified_df
+    columns = list(df.columns)
+    qual_col = "Highest Academic Qualification"
+    field_col = "Field of study of your highest academic qualification attained?"
+    place_col = "Place of study for your Highest Academic Attained in?"
+    found = []
+
+    for block_idx, start, stop, names, members in _member_blocks(df):
+        qual_idx = _block_column_index(columns, start, stop, qual_col)
+        field_idx = _block_column_index(columns, start, stop, field_col)
+        place_idx = _block_column_index(columns, start, stop, place_col)
+        if qual_idx is None or field_idx is None or place_idx is None:
+            continue
+        result = programmes.check_education(
+            df.iloc[:, qual_idx], df.iloc[:, field_idx], df.iloc[:, place_idx], catalog
+        )
+        rows = df.index.get_indexer(result.index)
+        result = result[members[rows] > 0]
+        rows = df.index.get_indexer(result.index)
+        if len(result):
+            found.append(pd.DataFrame({
+                "row_idx": result.index,
+                "block": block_idx,
+                "order": 0,
+                "member_index": members[rows],
+                "member": names.to_numpy()[rows],
+                "col_indices": [(field_idx,)] * len(result),
+                "column": columns[field_idx],
+                "rule": result["rule"].to_numpy(),
+                "message": result["message"].to_numpy(),
+            }))
+
+    count = _record_block_errors(run, found)
+    if count:
+        print(f"  ✗ {count} qualifications not matched by the programme catalog")
+    else:
+        print("  ✓ All qualifications consistent with the programme catalog")
+
+
+# Validation stages in execution order. Later stages may read cells written by
+# earlier ones (HW_002/HW_003 use the assigned SSOC Code).
+VALIDATION_STAGES = [
+    ("RULE 16/17 religion", _apply_religion_rules),
+    ("RULE 18 place of birth", _apply_place_of_birth_rule),
+    ("SSOC", _assign_ssoc_codes),
+    ("SSIC", _assign_ssic_codes),
+    ("RULE 1 others", _apply_others_rule),
+    ("RULES 2-20 members", _apply_member_rules),
+    ("MRSD tolerances", _apply_tolerance_rules),
+    ("Programme catalog", _apply_programme_rules),
+]
+
+# Rule functions timed individually inside the RULE 1 and member stages
+RULE_IDS_BY_FUNCTION = {
+    "validate_age_started_employment": "RULE 2",
+    "validate_bonus": "RULE 3",
+    "validate_bonus_contextual": "RULE 3b",
+    "validate_previous_company_name": "RULE 4/15",
+    "validate_interest_from_savings": "RULE 5",
+    "validate_dividends_investment_interest": "RULE 6",
+    "validate_freelance_employment_consistency": "RULE 7",
+    "validate_qualification_place": "RULE 8",
+    "validate_qualification_place_column": "RULE 8",
+    "best_ssec_match": "RULE 9",
+    "best_ssec_matches": "RULE 9",
+    "validate_internship_employment_rule": "RULE 10",
+    "validate_job_title_rule": "RULE 11",
+    "validate_usual_hours_value": "RULE 13",
+    "validate_usual_hours_limit": "RULE 20",
+    "validate_hours_worked_hw001": "HW_001",
+    "validate_hours_worked_by_ssoc_group": "HW_002/HW_003",
+    "validate_hours_worked_student_hw004": "HW_004",
+    "validate_interest_age_threshold": "INTR_001/INTR_002",
+    "validate_cash_in_kind_allowances": "CIK_001",
+    "validate_other_sources_income": "OTH_001",
+}
+
+# Error labels that are reported under a shared timing entry
+_RULE_TIMING_ALIASES = {
+    "RULE 4": "RULE 4/15",
+    "RULE 15": "RULE 4/15",
+    "HW_002": "HW_002/HW_003",
+    "HW_003": "HW_002/HW_003",
+    "INTR_001": "INTR_001/INTR_002",
+    "INTR_002": "INTR_001/INTR_002",
+}
+
+
+def _record_rule_errors(run: ValidationRun) -> None:
+    """Attribute the emitted errors of a run to the timed rule entries."""
+    counts: dict[str, int] = {}
+    for error in run.rule_errors:
+        label = str(error.get("rule", "")).split(" - ", 1)[0]
+        label = _RULE_TIMING_ALIASES.get(label, label)
+        counts[label] = counts.get(label, 0) + 1
+    for label, count in counts.items():
+        run.profiler.add_errors("rule", label, count)
+
+
+# Folder of the run checkpoints (None: off; on with --checkpoint or --resume) and
+# whether runs continue from a matching checkpoint (--resume)
+CHECKPOINT_DIR: Optional[str] = None
+RESUME = False
+
+
+def enable_checkpoints(directory: Optional[str], resume: bool = False) -> None:
+    """Checkpoint runs into directory (None: off); with resume, continue from existing checkpoints."""
+    global CHECKPOINT_DIR, RESUME
+    CHECKPOINT_DIR = directory
+    RESUME = bool(directory) and resume
+
+
+def _checkpoint_state(run: ValidationRun) -> dict:
+    return {
+        "stage_idx": run.stage_idx,
+        "resume_row": run.resume_row,
+        "modified_df": run.modified_df,
+        "changes": run.changes,
+        "error_cells": run.error_cells,
+        "rule_errors": run.rule_errors,
+        # Errors of a stage saved part-way through belong to that stage
+        "error_stages": run.error_stages + [run.stage_idx] * (len(run.rule_errors) - len(run.error_stages)),
+    }
+
+
+def _save_checkpoint(run: ValidationRun, force: bool = False) -> None:
+    if run.checkpoint is not None and (force or run.checkpoint.due()):
+        run.checkpoint.save(_checkpoint_state(run))
+
+
+def _checkpoint_progress(run: ValidationRun, next_row: int) -> None:
+    """Row-by-row stages: rows before next_row are done (saved when a checkpoint is due)."""
+    if run.checkpoint is not None and run.checkpoint.due():
+        run.resume_row = next_row
+        _save_checkpoint(run, force=True)
+
+
+def _attach_checkpoint(run: ValidationRun) -> None:
+    """Give a full run its checkpoint and, with --resume, restore the saved state."""
+    if not CHECKPOINT_DIR:
+        return
+    run.checkpoint = checkpoints.RunCheckpoint(
+        Path(CHECKPOINT_DIR),
+        run.filename,
+        lambda: checkpoints.run_fingerprint(run.df, _incremental_fingerprint(run)),
+    )
+    if not RESUME:
+        return
+    state = run.checkpoint.load()
+    if state is None:
+        return
+    run.modified_df = state["modified_df"]
+    run.changes = state["changes"]
+    run.error_cells = state["error_cells"]
+    run.rule_errors = state["rule_errors"]
+    run.error_stages = state["error_stages"]
+    run.stage_idx, run.resume_row = state["stage_idx"], state["resume_row"]
+    if run.stage_idx >= len(VALIDATION_STAGES):
+        print(f"\n  Resuming from {run.checkpoint.path}: all stages done, writing outputs")
+    else:
+        print(
+            f"\n  Resuming from {run.checkpoint.path}: {run.stage_idx} of {len(VALIDATION_STAGES)} stages done, "
+            f"continuing with '{VALIDATION_STAGES[run.stage_idx][0]}' at row {run.resume_row + 1}"
+        )
+
+
+def run_validation_stages(run: ValidationRun) -> ValidationRun:
+    """Run every validation stage against the prepared run."""
+    print(f"\n{'=' * 50}")
+    print(f"Applying Validation Rules...")
+    print(f"{'=' * 50}")
+
+    for stage_idx, (stage_name, stage_fn) in enumerate(VALIDATION_STAGES):
+        # Stages completed before a --resume checkpoint
+        if stage_idx < run.stage_idx:
+            continue
+        run.stage_idx = stage_idx
+        errors_before = len(run.rule_errors)
+        with run.profiler.stage(stage_name, rows=len(run.df)) as counters:
+            stage_fn(run)
+            counters["errors"] = len(run.rule_errors) - errors_before
+        run.error_stages.extend([stage_idx] * (len(run.rule_errors) - len(run.error_stages)))
+        run.stage_idx, run.resume_row = stage_idx + 1, 0
+        _save_checkpoint(run)
+    return run
+
+
+# Rule sources and reference definitions (SSEC candidates live in the rules module)
+def _definition_sources() -> list:
+    return [
+        __file__,
+        rules.__file__,
+        ssoc.__file__,
+        SSIC_LIST_FILE,
+        SSOC_DEFINITIONS_FILE,
+        SSOC_EXPERT_MAP_FILE,
+        tolerances.__file__,
+        programmes.__file__,
+    ]
+
+
+def settings_fingerprint(tolerance_file: Optional[str] = None, programme_catalog: bool = False) -> str:
+    """
+    Fingerprint of what a file's results depend on besides its content: the
+    rule sources, SSOC/SSEC/SSIC definitions, --tolerances config and
+    --programme-catalog workbooks, and the options that change results.
+    Computed from the options alone, so no reference data is loaded.
+    """
+    return incremental.definitions_fingerprint(
+        (),
+        [
+            *_definition_sources(),
+            *([tolerance_file] if tolerance_file else []),
+            *(programmes.catalog_files() if programme_catalog else []),
+        ],
+        extra=[
+            SSOC_MIN_SCORE,
+            SSOC_NEAR_DUP_THRESHOLD,
+            [name for name, _ in VALIDATION_STAGES],
+            str(Path(tolerance_file).resolve()) if tolerance_file else None,
+            programme_catalog,
+            str(demographics.reference_date(wave=SURVEY_WAVE)),
+        ],
+    )
+
+
+def _incremental_fingerprint(run: ValidationRun) -> str:
+    return incremental.definitions_fingerprint(
+        run.df.columns,
+        [
+            *_definition_sources(),
+            *([TOLERANCE_TABLE.path] if TOLERANCE_TABLE is not None else []),
+        ],
+        extra=[
+            SSOC_MIN_SCORE,
+            SSOC_NEAR_DUP_THRESHOLD,
+            [name for name, _ in VALIDATION_STAGES],
+            # The tolerance and programme stages only run with their flags
+            str(TOLERANCE_TABLE.path) if TOLERANCE_TABLE is not None else None,
+            PROGRAMME_CATALOG.fingerprint if PROGRAMME_CATALOG is not None else None,
+            # Ages (INTR_001/INTR_002) are computed at the survey reference date
+            str(demographics.reference_date(wave=SURVEY_WAVE or warehouse.file_wave(run.filename))),
+        ],
+    )
+
+
+def _row_payloads(run: ValidationRun, row_positions: list[int]) -> dict[int, dict]:
+    """
+    Split the results of a (sub)run into per-row payloads.
+
+    row_positions maps the run's row index to the row index in the full file.
+    """
+    payloads = {
+        full_idx: {"errors": [], "changes": [], "error_cells": []}
+        for full_idx in row_positions
+    }
+    for error, stage_idx in zip(run.rule_errors, run.error_stages):
+        full_idx = row_positions[error["row"] - 1]
+        payloads[full_idx]["errors"].append((stage_idx, error))
+    for (row_idx, col_idx), (old_val, new_val) in run.changes.items():
+        payloads[row_positions[row_idx]]["changes"].append((col_idx, old_val, new_val))
+    for row_idx, col_idx in sorted(run.error_cells):
+        payloads[row_positions[row_idx]]["error_cells"].append(col_idx)
+    return payloads
+
+
+def run_incremental_validation(run: ValidationRun, store: "incremental.IncrementalStateStore") -> ValidationRun:
+    """
+    Validate only the rows whose content changed since the previous run and
+    merge the cached results of unchanged rows back in.
+
+    Rows are matched to the cache by Response ID. The whole cache of a file is
+    invalidated when the rule definitions or reference data change.
+    """
+    response_col = _find_column_name(list(run.df.columns), "Response ID")
+    keys = incremental.response_keys(run.df, response_col)
+    hashes = incremental.row_hashes(run.df)
+    fingerprint = _incremental_fingerprint(run)
+    cached = store.load(run.filename, fingerprint)
+
+    dirty = [
+        row_idx for row_idx, (key, row_hash) in enumerate(zip(keys, hashes))
+        if key not in cached or cached[key][0] != row_hash
+    ]
+    print(f"\n  Incremental: {len(dirty)} of {len(run.df)} rows changed; "
+          f"reusing cached results for {len(run.df) - len(dirty)}")
+
+    payloads: dict[int, dict] = {}
+    if dirty:
+        sub_df = run.df.iloc[dirty].reset_index(drop=True)
+        sub_run = ValidationRun(
+            filename=run.filename,
+            df=sub_df,
+            households=[run.households[row_idx] for row_idx in dirty],
+            modified_df=sub_df.copy(),
+            ssic_col=run.ssic_col,
+            ssoc_groups=run.ssoc_groups,
+            profiler=run.profiler,
+        )
+        run_validation_stages(sub_run)
+        payloads.update(_row_payloads(sub_run, dirty))
+
+    ordered_errors = []
+    for row_idx, key in enumerate(keys):
+        payload = payloads.get(row_idx)
+        if payload is None:
+            payload = cached[key][1]
+            payloads[row_idx] = payload
+        for seq, (stage_idx, error) in enumerate(payload["errors"]):
+            error = dict(error)
+            error["row"] = row_idx + 1
+            ordered_errors.append((stage_idx, row_idx, seq, error))
+        for col_idx, old_val, new_val in payload["changes"]:
+            try:
+                run.modified_df.iat[row_idx, col_idx] = new_val
+            except (TypeError, pd.errors.LossySetitemError):
+                continue
+            run.changes[(row_idx, col_idx)] = (old_val, new_val)
+        for col_idx in payload["error_cells"]:
+            run.error_cells.add((row_idx, col_idx))
+
+    # Same order a full run produces: stage by stage, rows ascending within a stage
+    ordered_errors.sort(key=lambda item: item[:3])
+    run.rule_errors = [item[3] for item in ordered_errors]
+    run.error_stages = [item[0] for item in ordered_errors]
+
+    store.save(
+        run.filename,
+        fingerprint,
+        [(key, row_hash, payloads[row_idx]) for row_idx, (key, row_hash) in enumerate(zip(keys, hashes))],
+    )
+    return run
+
+
+def write_validation_outputs(run: ValidationRun) -> None:
+    """Print the errors found and write the validation report and validated file."""
+    rule_errors = run.rule_errors
+
+    # Display errors found
+    if rule_errors:
+        print(f"\n  ✗ Found {len(rule_errors)} validation errors:")
+        for error in rule_errors:
+            print(f"    Row {error['row']} - {error['member']}")
+            print(f"    {error['rule']}: {error['message']}")
+            print(f"    Column: {error['column']}")
+            print()
+    else:
+        print(f"  ✓ No validation errors found")
+
+    print(f"\nRULES 2-13 Summary: {len(rule_errors)} errors found")
+    # Create validation report (summary + details + complete dataset)
+    with run.profiler.stage("report writing", rows=len(rule_errors)):
+        create_validation_report(rule_errors, run.filename, run.modified_df, run.changes, run.error_cells)
+
+    # Save validated output if changes were made
+    if run.changes or run.error_cells:
+        with run.profiler.stage("validated file writing", rows=len(run.modified_df)):
+            original_path = Path("Operating_Table") / run.filename
+            save_with_highlights(run.modified_df, str(original_path), run.changes, run.error_cells)
+
+
+# Results warehouse every run is appended to (None: off; opt in with --warehouse or CLFS_WAREHOUSE)
+WAREHOUSE_FILE: Optional[str] = warehouse.recording_file_from_env()
+# Survey wave (--wave): ages are computed at its last day and runs recorded under it
+# (None: YYYY-MM from the file name, else no reference date and the run month)
+SURVEY_WAVE: Optional[str] = None
+
+
+def enable_warehouse(path: Optional[str], wave: Optional[str] = None) -> None:
+    """Record runs in the results warehouse at path (None: off); wave is the survey wave of the run."""
+    global WAREHOUSE_FILE, SURVEY_WAVE
+    WAREHOUSE_FILE = path
+    SURVEY_WAVE = wave
+
+
+def survey_reference_date(filename: str) -> Optional[pd.Timestamp]:
+    """
+    Date ages are computed at: CLFS_REFERENCE_DATE, else the last day of the
+    survey wave (--wave, else YYYY-MM in the file name). None (with a warning)
+    when neither is known, so ages from Date of Birth are left unknown.
+    """
+    reference = demographics.reference_date(wave=SURVEY_WAVE or warehouse.file_wave(filename))
+    if reference is None:
+        print(
+            f"  ⚠ No survey wave for {filename} (use --wave YYYY-MM or CLFS_REFERENCE_DATE); "
+            "ages are not derived from Date of Birth"
+        )
+    return reference
+
+
+def _warehouse_assignments(run: ValidationRun, response_ids: np.ndarray) -> list[pd.DataFrame]:
+    """SSOC codes of every member with job text and SSIC codes of every establishment name."""
+    frames = []
+    df, modified_df = run.df, run.modified_df
+
+    def _present(values: pd.Series) -> np.ndarray:
+        return (values.notna() & (values.astype(str).str.strip() != "")).to_numpy()
+
+    if run.ssoc_groups and _load_ssoc_resources():
+        for group_idx, group in enumerate(run.ssoc_groups):
+            ssoc_idx, title_idx, duties_idx = group.get("ssoc_idx"), group.get("title_idx"), group.get("duties_idx")
+            if ssoc_idx is None or duties_idx is None:
+                continue
+            titles = df.iloc[:, title_idx] if title_idx is not None else pd.Series("", index=df.index)
+            has_text = _present(titles) | _present(df.iloc[:, duties_idx])
+            rows = np.flatnonzero(has_text)
+            if not len(rows):
+                continue
+            codes = [warehouse._text(v) for v in modified_df.iloc[rows, ssoc_idx]]
+            frames.append(pd.DataFrame({
+                "row": rows + 1,
+                "response_id": response_ids[rows],
+                "member_index": group_idx + 1,
+                "scheme": "SSOC",
+                "input_text": [warehouse._text(v) for v in titles.iloc[rows]],
+                "code": codes,
+                "matched": [int(bool(c) and c != "X1000") for c in codes],
+            }))
+
+    est_col = _find_column_name(list(df.columns), "Name of Establishment you were working last week?")
+    _, ssic_idx = _get_column_index(df, "SSIC Code")
+    if run.ssic_col and ssic_lookup() and est_col and ssic_idx is not None:
+        rows = np.flatnonzero(_present(df[est_col]))
+        if len(rows):
+            matched = [int((row, ssic_idx) not in run.error_cells) for row in rows]
+            frames.append(pd.DataFrame({
+                "row": rows + 1,
+                "response_id": response_ids[rows],
+                "scheme": "SSIC",
+                "input_text": [warehouse._text(v) for v in df[est_col].iloc[rows]],
+                "code": [warehouse._text(v) if ok else None for v, ok in zip(modified_df.iloc[rows, ssic_idx], matched)],
+                "matched": matched,
+            }))
+    return frames
+
+
+def record_in_warehouse(run: ValidationRun) -> Optional[int]:
+    """Append the errors, changes, SSOC/SSIC assignments and timings of a finished run to the warehouse."""
+    if not WAREHOUSE_FILE:
+        return None
+    response_col = _find_column_name(list(run.df.columns), "Response ID")
+    response_ids = np.array(
+        [warehouse._text(v) for v in run.df[response_col]] if response_col else [None] * len(run.df),
+        dtype=object,
+    )
+    columns = run.modified_df.columns
+    changes = [
+        {
+            "row": row_idx + 1,
+            "response_id": response_ids[row_idx],
+            "column": str(columns[col_idx]),
+            "old_value": warehouse._text(old_val),
+            "new_value": warehouse._text(new_val),
+        }
+        for (row_idx, col_idx), (old_val, new_val) in run.changes.items()
+    ]
+    assignments = _warehouse_assignments(run, response_ids)
+    errors = [
+        {**error, "response_id": warehouse._text(error.get("response_id")), "member": warehouse._text(error.get("member"))}
+        for error in run.rule_errors
+    ]
+    return warehouse.record_run(
+        WAREHOUSE_FILE,
+        "CLFS_validator",
+        run.filename,
+        wave=SURVEY_WAVE,
+        rows=len(run.df),
+        wall_s=run.profiler.total_wall(),
+        errors=errors,
+        changes=changes,
+        assignments=pd.concat(assignments, ignore_index=True) if assignments else None,
+        timings=run.profiler.entries(),
+    )
+
+
+def _print_household_details(households: list[list[HouseholdMember]]) -> None:
+    print(f"\n  Household Member Details:")
+    for household_idx, members in enumerate(households, 1):
+        print(f"\n  Household {household_idx}:")
+        for member_idx, member in enumerate(members, 1):
+            print(f"    Member {member_idx}:")
+            print(f"      Name: {member.full_name}")
+            print(f"      DOB: {member.date_of_birth}")
+            print(f"      Age: {member.age}")
+            print(f"      Labour Force Status: {member.labour_force_status}")
+            print(f"      Employment Status: {member.employment_status_last_week}")
+            print(f"      Job Title: {member.job_title}")
+
+
+def validate_file(
+    filename: str,
+    df: pd.DataFrame,
+    store: Optional["incremental.IncrementalStateStore"] = None,
+    load_stat: Optional[tuple[float, float]] = None,
+    verbose: bool = False,
+    profile: bool = False,
+) -> dict:
+    """
+    Validate one loaded input file and write its report, validated file and
+    timing report. Returns a summary (file, rows, households, members, errors,
+    wall_s) for the end-of-run overview.
+    """
+    print(f"\n{filename}:")
+    print(f"  Rows: {len(df)}")
+    print(f"  Columns: {len(df.columns)}")
+
+    profiler = profiling.RunProfiler(filename)
+    if load_stat is not None:
+        load_wall, load_cpu = load_stat
+        profiler.record("stage", "load", load_wall, load_cpu, rows=len(df))
+
+    run = prepare_validation_run(filename, df, profiler)
+    total_members = sum(len(members) for members in run.households)
+    print(f"  Households parsed: {len(run.households)}")
+    print(f"  Household members parsed: {total_members}")
+
+    # Display household member details
+    if verbose:
+        _print_household_details(run.households)
+
+    if store is not None:
+        run_incremental_validation(run, store)
+    else:
+        _attach_checkpoint(run)
+        run_validation_stages(run)
+        # Keep the results if the outputs cannot be written (e.g. a workbook open in Excel)
+        _save_checkpoint(run, force=True)
+    _record_rule_errors(run)
+
+    try:
+        write_validation_outputs(run)
+    except PermissionError as e:
+        if run.checkpoint is not None:
+            print(f"\n✗ Could not write the outputs of {filename}: {e}")
+            print(f"  The validation results are kept in {run.checkpoint.path}; "
+                  f"close the workbook and re-run with --resume to only write the outputs")
+        raise
+    if run.checkpoint is not None:
+        run.checkpoint.clear()
+
+    json_path, _ = profiler.write_report(create_output_directory(), Path(filename).stem)
+    print(f"✓ Timing report saved to: {json_path}")
+    if record_in_warehouse(run) is not None:
+        print(f"✓ Results recorded in: {WAREHOUSE_FILE}")
+    if profile:
+        print()
+        print(profiler.format_table())
+
+    return {
+        "file": filename,
+        "rows": len(df),
+        "households": len(run.households),
+        "members": total_members,
+        "errors": len(run.rule_errors),
+        "wall_s": profiler.total_wall(),
+    }
+
+
+# Per-process state of a --workers pool (set by _init_worker)
+_WORKER_STORE: Optional["incremental.IncrementalStateStore"] = None
+
+
+def _init_worker(
+    state_file: Optional[str],
+    tolerance_file: Optional[str] = None,
+    programme_catalog: bool = False,
+    warehouse_file: Optional[str] = WAREHOUSE_FILE,
+    wave: Optional[str] = None,
+    checkpoint_dir: Optional[str] = CHECKPOINT_DIR,
+    resume: bool = False,
+) -> None:
+    """
+    Pool initializer: load the shared reference data once per worker process.
+
+    SSEC candidates are defined when CLFS_validation_rules is imported; the
+    SSIC company mappings, country/religion lists and SSOC definitions (and the
+    --tolerances config and --programme-catalog index) are loaded here so no
+    file pays for them. With
+    --incremental every worker opens its own connection to the state store.
+    Every worker appends its runs to the --warehouse file (None: off) and, with
+    --checkpoint, checkpoints (and with --resume continues) its own files.
+    """
+    global _WORKER_STORE
+    ssic_lookup()
+    birth_countries()
+    religion_reclass()
+    _load_ssoc_resources()
+    enable_tolerances(tolerance_file)
+    enable_programme_catalog(programme_catalog)
+    enable_warehouse(warehouse_file, wave)
+    enable_checkpoints(checkpoint_dir, resume)
+    if state_file:
+        _WORKER_STORE = incremental.IncrementalStateStore(state_file)
+
+
+def _validate_file_in_worker(file_path: str, verbose: bool, profile: bool) -> Optional[dict]:
+    """Load and validate one input file inside a pool worker."""
+    file = Path(file_path)
+    try:
+        print(f"Loading {file.name}...")
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        df = load_input_file(file)
+        load_stat = (time.perf_counter() - wall_start, time.process_time() - cpu_start)
+    except Exception as e:
+        print(f"Error loading {file.name}: {e}")
+        return None
+    return validate_file(file.name, df, _WORKER_STORE, load_stat, verbose, profile)
+
+
+def _run_in_workers(files: list[Path], workers: int, state_file: Optional[str], args) -> list[dict]:
+    """Validate files in a process pool; every worker writes its own per-file reports."""
+    summaries = {}
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(files)),
+        initializer=_init_worker,
+        initargs=(state_file, args.tolerances, args.programme_catalog, args.warehouse, args.wave,
+                  args.checkpoint_dir, args.resume),
+    ) as pool:
+        futures = {
+            pool.submit(_validate_file_in_worker, str(file), args.verbose, args.profile): file
+            for file in files
+        }
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                print(f"Error validating {file.name}: {e}")
+                continue
+            if summary is not None:
+                summaries[file.name] = summary
+    # Report in input order regardless of completion order
+    return [summaries[file.name] for file in files if file.name in summaries]
+
+
+def _print_run_summary(summaries: list[dict], wall_s: float) -> None:
+    print(f"\nRun summary ({len(summaries)} files, {wall_s:.1f}s)")
+    print("-" * 50)
+    for summary in summaries:
+        print(
+            f"  {summary['file']}: {summary['rows']} rows, {summary['members']} members, "
+            f"{summary['errors']} errors ({summary['wall_s']:.1f}s)"
+        )
+    print(f"  Total errors: {sum(summary['errors'] for summary in summaries)}")
+
+
+def main(argv=None):
+    """Main function to run the validator."""
+    parser = argparse.ArgumentParser(description="CLFS Data Validator")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-validate only respondents whose rows changed since the previous run",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=incremental.state_file_from_env(),
+        help="Incremental state store (default: output/clfs_incremental_state.sqlite or CLFS_STATE_FILE)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="With --incremental: drop the cached results of the input files and re-validate every row",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage / per-rule timing summary table for each file",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the details of every parsed household member",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Validate up to N input files in parallel worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--tolerances",
+        nargs="?",
+        const=str(tolerances.DEFAULT_CONFIG_FILE),
+        default=None,
+        metavar="CONFIG",
+        help="Also flag values outside the MRSD tolerances (default config: references/CLFS_tolerances.json)",
+    )
+    parser.add_argument(
+        "--programme-catalog",
+        action="store_true",
+        help="Also check qualification, field and place of study against the 2026 institution programme catalogs",
+    )
+    parser.add_argument(
+        "--warehouse",
+        nargs="?",
+        const=str(warehouse.DEFAULT_WAREHOUSE_FILE),
+        default=warehouse.recording_file_from_env(),
+        metavar="PATH",
+        help="Record the runs in the results warehouse at PATH (default PATH: output/clfs_results.sqlite; "
+        "on by default only when CLFS_WAREHOUSE is set)",
+    )
+    parser.add_argument(
+        "--no-warehouse",
+        dest="warehouse",
+        action="store_const",
+        const=None,
+        help="Do not record this run in the results warehouse",
+    )
+    parser.add_argument(
+        "--wave",
+        default=None,
+        help="Survey wave (YYYY-MM): ages are computed at its last day and the runs recorded under it "
+        "(default: from the file name)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint long runs (after each stage and every CLFS_CHECKPOINT_INTERVAL seconds) "
+        "so an interrupted run can be continued with --resume",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue each file from its checkpoint of an interrupted run (last completed stage / row); "
+        "implies --checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=str(checkpoints.DEFAULT_CHECKPOINT_DIR),
+        help="Folder of the run checkpoints (default: output/checkpoints)",
+    )
+    args = parser.parse_args(argv)
+    if args.resume and args.incremental:
+        parser.error("--resume cannot be combined with --incremental (incremental runs only re-validate changed rows)")
+    if not (args.checkpoint or args.resume):
+        args.checkpoint_dir = None
+
+    print("CLFS Data Validator")
+    print("=" * 50)
+
+    print("\nModule diagnostics")
+    print("-" * 50)
+    print(f"rules.__file__: {getattr(rules, '__file__', 'unknown')}")
+    ssec_count = len(getattr(rules, "SSEC_CANDIDATES", []) or [])
+    print(f"SSEC_CANDIDATES count: {ssec_count}")
+    print(f"has validate_qualification_place: {hasattr(rules, 'validate_qualification_place')}")
+
+    enable_tolerances(args.tolerances)
+    if TOLERANCE_TABLE is not None:
+        print(f"MRSD tolerances: {TOLERANCE_TABLE.path} (version {TOLERANCE_TABLE.version})")
+    enable_programme_catalog(args.programme_catalog)
+    if PROGRAMME_CATALOG is not None:
+        print(f"Programme catalog: {len(PROGRAMME_CATALOG)} programmes")
+    enable_warehouse(args.warehouse, args.wave)
+    enable_checkpoints(args.checkpoint_dir, args.resume)
+
+    run_start = time.perf_counter()
+    input_paths = list_input_files() if os.path.exists("Operating_Table") else []
+    if args.workers > 1 and len(input_paths) > 1:
+        if args.incremental:
+            store = incremental.IncrementalStateStore(args.state_file)
+            if args.full:
+                for path in input_paths:
+                    store.clear(path.name)
+            print(f"Incremental state store: {store.path}")
+            store.close()
+        print(f"\nValidating {len(input_paths)} files with {min(args.workers, len(input_paths))} workers")
+        summaries = _run_in_workers(
+            input_paths, args.workers, args.state_file if args.incremental else None, args
+        )
+        _print_run_summary(summaries, time.perf_counter() - run_start)
+        return
+
+    store = None
+    if args.incremental:
+        store = incremental.IncrementalStateStore(args.state_file)
+        print(f"Incremental state store: {store.path}")
+
+    # Load all .xlsx and .csv files from Operating_Table folder
+    load_stats = {}
+    files = load_input_files(load_stats=load_stats)
+    if store is not None and args.full:
+        for filename in files:
+            store.clear(filename)
+
+    print(f"\nTotal files loaded: {len(files)}")
+
+    summaries = []
+    try:
+        # Display summary of loaded files
+        for filename, df in files.items():
+            try:
+                summaries.append(
+                    validate_file(filename, df, store, load_stats.get(filename), args.verbose, args.profile)
+                )
+            except PermissionError as e:
+                print(f"Error writing the outputs of {filename}: {e}")
+    finally:
+        if store is not None:
+            store.close()
+    _print_run_summary(summaries, time.perf_counter() - run_start)
 
 
 if __name__ == "__main__":
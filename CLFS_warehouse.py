@@ -0,0 +1,359 @@
+"""
+CLFS Results Warehouse
+
+Runs of CLFS_validator, the MLFS prototype and SSOC_assigner_V3 can append
+what they found to one SQLite database, so questions across files and survey
+waves are answered with one query instead of opening the per-file Excel
+reports. Recording is opt-in: pass --warehouse [PATH] (default PATH:
+output/clfs_results.sqlite) or set CLFS_WAREHOUSE.
+
+- runs: one row per validated file (tool, file, wave, rows, errors, wall time)
+- errors: rule errors (rule, column, message, row, Response ID, member)
+- changes: cells the run corrected or filled (column, old and new value)
+- assignments: SSOC / SSIC codes assigned from job text or establishment
+  names, with whether a code was found
+- timings: the per-stage / per-rule timing entries of CLFS_profiling
+
+The wave is the YYYY-MM in the file name ("MLFS_2025-03.xlsx"), else the month
+of the run; its quarter ("2025Q1") is stored next to it. Every table carries
+tool, file, wave and quarter and is indexed on rule / column / Response ID /
+wave, so aggregates need no joins.
+
+Re-validating a file appends another run of it, so counts and failing-ssic
+only read the latest run of each (tool, file) unless --all-runs is given.
+
+    python CLFS_warehouse.py runs
+    python CLFS_warehouse.py count --by rule --quarter 2025Q3
+    python CLFS_warehouse.py count --by wave --rule HW_002
+    python CLFS_warehouse.py count --table changes --by column
+    python CLFS_warehouse.py failing-ssic --min-count 2
+    python CLFS_warehouse.py sql "SELECT rule, COUNT(*) FROM errors GROUP BY rule"
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import pandas as pd
+
+
+ROOT = Path(__file__).parent
+DEFAULT_WAREHOUSE_FILE = ROOT / "output" / "clfs_results.sqlite"
+
+# Columns of each fact table after the shared (run_id, tool, file, wave, quarter)
+TABLE_COLUMNS = {
+    "errors": ["row", "response_id", "member_index", "member", "rule", "column", "message"],
+    "changes": ["row", "response_id", "column", "old_value", "new_value"],
+    "assignments": ["row", "response_id", "member_index", "scheme", "input_text", "code", "matched", "score", "method"],
+    "timings": ["kind", "name", "calls", "rows", "wall_s", "cpu_s", "errors"],
+}
+RUN_COLUMNS = ["tool", "file", "wave", "quarter"]
+INDEXES = {
+    "errors": [("rule", "wave"), ("column",), ("response_id",), ("wave",)],
+    "changes": [("column",), ("response_id",), ("wave",)],
+    "assignments": [("scheme", "matched"), ("response_id",), ("wave",)],
+    "timings": [("name",), ("wave",)],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool TEXT NOT NULL,
+    file TEXT NOT NULL,
+    wave TEXT,
+    quarter TEXT,
+    started_at TEXT NOT NULL,
+    rows INTEGER,
+    errors INTEGER,
+    wall_s REAL
+);
+CREATE TABLE IF NOT EXISTS errors (
+    run_id INTEGER, tool TEXT, file TEXT, wave TEXT, quarter TEXT,
+    row INTEGER, response_id TEXT, member_index INTEGER, member TEXT,
+    rule TEXT, "column" TEXT, message TEXT
+);
+CREATE TABLE IF NOT EXISTS changes (
+    run_id INTEGER, tool TEXT, file TEXT, wave TEXT, quarter TEXT,
+    row INTEGER, response_id TEXT, "column" TEXT, old_value TEXT, new_value TEXT
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    run_id INTEGER, tool TEXT, file TEXT, wave TEXT, quarter TEXT,
+    row INTEGER, response_id TEXT, member_index INTEGER, scheme TEXT,
+    input_text TEXT, code TEXT, matched INTEGER, score REAL, method TEXT
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER, tool TEXT, file TEXT, wave TEXT, quarter TEXT,
+    kind TEXT, name TEXT, calls INTEGER, rows INTEGER, wall_s REAL, cpu_s REAL, errors INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_wave ON runs (wave, tool);
+"""
+
+
+def warehouse_file_from_env() -> str:
+    """Warehouse to query: CLFS_WAREHOUSE, else output/clfs_results.sqlite."""
+    return os.environ.get("CLFS_WAREHOUSE", str(DEFAULT_WAREHOUSE_FILE))
+
+
+def recording_file_from_env() -> Optional[str]:
+    """Warehouse runs are recorded in by default: CLFS_WAREHOUSE, else None (off)."""
+    return os.environ.get("CLFS_WAREHOUSE") or None
+
+
+def file_wave(file_name: str) -> Optional[str]:
+    """'YYYY-MM' from a file name such as 'MLFS_2025-03.xlsx' or 'CLFS 202503.csv' (None when absent)."""
+    match = re.search(r"(20\d{2})[-_ ]?(0[1-9]|1[0-2])(?!\d)", os.path.basename(str(file_name)))
+    return f"{match.group(1)}-{match.group(2)}" if match else None
+
+
+def wave_label(file_name: str, when: Optional[datetime] = None) -> str:
+    """The wave in the file name (see file_wave), else the month of when (default: now)."""
+    return file_wave(file_name) or (when or datetime.now()).strftime("%Y-%m")
+
+
+def quarter_label(wave: str) -> Optional[str]:
+    """'2025Q3' for wave '2025-08' (None when the wave is not YYYY-MM)."""
+    match = re.fullmatch(r"(\d{4})-(\d{2})", str(wave or ""))
+    if not match:
+        return None
+    return f"{match.group(1)}Q{(int(match.group(2)) - 1) // 3 + 1}"
+
+
+def _text(value: object) -> Optional[str]:
+    """Cell value as stored text (None for missing cells)."""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _records(table: str, data) -> pd.DataFrame:
+    """A list of dicts or a DataFrame reduced to the table's columns (missing columns as None)."""
+    columns = TABLE_COLUMNS[table]
+    frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data or []))
+    frame = frame.reindex(columns=columns)
+    return frame.astype(object).where(frame.notna(), None)
+
+
+# The most recent run of every (tool, file); earlier runs of a re-validated file are history
+LATEST_RUNS = "SELECT MAX(run_id) FROM runs GROUP BY tool, file"
+
+
+class Warehouse:
+    """Append-only store of validation results across files and waves."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or warehouse_file_from_env())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel workers and watch runs append concurrently; wait for the writer
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+        for table, indexes in INDEXES.items():
+            for columns in indexes:
+                name = f"{table}_{'_'.join(columns)}"
+                quoted = ", ".join(f'"{c}"' for c in columns)
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({quoted})")
+        self._conn.commit()
+
+    def __enter__(self) -> "Warehouse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record_run(
+        self,
+        tool: str,
+        file: str,
+        wave: Optional[str] = None,
+        rows: Optional[int] = None,
+        wall_s: Optional[float] = None,
+        errors=None,
+        changes=None,
+        assignments=None,
+        timings=None,
+    ) -> int:
+        """
+        Append one run and its facts (each a list of dicts or a DataFrame with
+        the TABLE_COLUMNS of its table). Returns the run id.
+        """
+        started = datetime.now()
+        wave = wave or wave_label(file, started)
+        quarter = quarter_label(wave)
+        facts = {
+            "errors": _records("errors", errors),
+            "changes": _records("changes", changes),
+            "assignments": _records("assignments", assignments),
+            "timings": _records("timings", timings),
+        }
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (tool, file, wave, quarter, started_at, rows, errors, wall_s) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (tool, file, wave, quarter, started.isoformat(timespec="seconds"), rows, len(facts["errors"]), wall_s),
+            )
+            run_id = cursor.lastrowid
+            for table, frame in facts.items():
+                if frame.empty:
+                    continue
+                columns = ["run_id"] + RUN_COLUMNS + TABLE_COLUMNS[table]
+                placeholders = ", ".join("?" for _ in columns)
+                quoted = ", ".join(f'"{c}"' for c in columns)
+                prefix = (run_id, tool, file, wave, quarter)
+                self._conn.executemany(
+                    f"INSERT INTO {table} ({quoted}) VALUES ({placeholders})",
+                    (prefix + tuple(values) for values in frame.itertuples(index=False, name=None)),
+                )
+        return run_id
+
+    # -------------------
+    # Queries
+    # -------------------
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """Run any SELECT against the warehouse."""
+        return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    @staticmethod
+    def _where(
+        table: str,
+        tool: Optional[str] = None,
+        wave: Optional[str] = None,
+        quarter: Optional[str] = None,
+        file: Optional[str] = None,
+        rule: Optional[str] = None,
+        since: Optional[str] = None,
+        all_runs: bool = False,
+    ) -> tuple[str, list]:
+        clauses, params = [], []
+        if not all_runs:
+            clauses.append(f"run_id IN ({LATEST_RUNS})")
+        for column, value in (("tool", tool), ("wave", wave), ("quarter", quarter), ("file", file)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if rule and table == "errors":
+            clauses.append("rule = ?")
+            params.append(rule)
+        if since:
+            clauses.append("run_id IN (SELECT run_id FROM runs WHERE started_at >= ?)")
+            params.append(since)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, by: Iterable[str] = ("rule",), table: str = "errors", **filters) -> pd.DataFrame:
+        """
+        Row counts of table grouped by columns of it (most frequent first), e.g.
+        count(by=["rule"], quarter="2025Q3") or count(by=["wave"], rule="HW_002").
+        Filters: tool, wave, quarter, file, rule (errors only), since (run date),
+        all_runs (count every run, not only the latest of each tool and file).
+        """
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"Unknown table '{table}' (expected one of {', '.join(TABLE_COLUMNS)})")
+        by = list(by)
+        allowed = RUN_COLUMNS + TABLE_COLUMNS[table]
+        unknown = [c for c in by if c not in allowed]
+        if unknown:
+            raise ValueError(f"Cannot group {table} by {', '.join(unknown)} (columns: {', '.join(allowed)})")
+        where, params = self._where(table, **filters)
+        group = ", ".join(f'"{c}"' for c in by)
+        select = f"{group}, COUNT(*) AS count" if by else "COUNT(*) AS count"
+        group_by = f" GROUP BY {group}" if by else ""
+        return self.query(f"SELECT {select} FROM {table}{where}{group_by} ORDER BY count DESC", params)
+
+    def failing_establishments(self, min_count: int = 1, **filters) -> pd.DataFrame:
+        """Establishment names SSIC coding failed for, with failure counts and the waves they failed in."""
+        where, params = self._where("assignments", **filters)
+        where += (" AND " if where else " WHERE ") + "scheme = 'SSIC' AND matched = 0"
+        return self.query(
+            "SELECT lower(trim(input_text)) AS establishment, COUNT(*) AS failures, "
+            "COUNT(DISTINCT wave) AS waves, MIN(wave) AS first_wave, MAX(wave) AS last_wave "
+            f"FROM assignments{where} GROUP BY establishment HAVING failures >= ? "
+            "ORDER BY failures DESC, establishment",
+            params + [min_count],
+        )
+
+    def runs(self, limit: int = 20) -> pd.DataFrame:
+        return self.query("SELECT * FROM runs ORDER BY run_id DESC LIMIT ?", [limit])
+
+
+def record_run(path: Optional[str], tool: str, file: str, **facts) -> Optional[int]:
+    """Append one run to the warehouse at path (see Warehouse.record_run); warns instead of failing the run."""
+    try:
+        with Warehouse(path) as warehouse:
+            return warehouse.record_run(tool, file, **facts)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: could not record {file} in the results warehouse: {e}")
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query the CLFS results warehouse")
+    parser.add_argument("--db", default=warehouse_file_from_env(), help="Warehouse file (default: output/clfs_results.sqlite or CLFS_WAREHOUSE)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(cmd):
+        cmd.add_argument("--tool", help="CLFS_validator, MLFS or SSOC_assigner")
+        cmd.add_argument("--wave", help="YYYY-MM")
+        cmd.add_argument("--quarter", help="YYYYQn, e.g. 2025Q3")
+        cmd.add_argument("--file")
+        cmd.add_argument("--since", help="Only runs started on or after this date (YYYY-MM-DD)")
+        cmd.add_argument("--all-runs", action="store_true",
+                         help="Count every recorded run, not only the latest run of each tool and file")
+
+    runs_cmd = commands.add_parser("runs", help="Latest runs")
+    runs_cmd.add_argument("--limit", type=int, default=20)
+
+    count_cmd = commands.add_parser("count", help="Counts grouped by columns")
+    count_cmd.add_argument("--table", default="errors", choices=list(TABLE_COLUMNS))
+    count_cmd.add_argument("--by", action="append", help="Column to group by (repeatable; default: rule)")
+    count_cmd.add_argument("--rule")
+    add_filters(count_cmd)
+
+    ssic_cmd = commands.add_parser("failing-ssic", help="Establishments SSIC coding keeps failing for")
+    ssic_cmd.add_argument("--min-count", type=int, default=1)
+    add_filters(ssic_cmd)
+
+    sql_cmd = commands.add_parser("sql", help="Run a SELECT statement")
+    sql_cmd.add_argument("statement")
+
+    args = parser.parse_args(argv)
+    if not Path(args.db).exists():
+        print(f"No results warehouse at {args.db} yet; run CLFS_validator.py --warehouse first")
+        return 1
+
+    start = time.perf_counter()
+    with Warehouse(args.db) as warehouse:
+        filters = {}
+        if args.command in ("count", "failing-ssic"):
+            filters = {k: getattr(args, k) for k in ("tool", "wave", "quarter", "file", "since", "all_runs")}
+        try:
+            if args.command == "runs":
+                result = warehouse.runs(args.limit)
+            elif args.command == "count":
+                result = warehouse.count(args.by or ["rule"], args.table, rule=args.rule, **filters)
+            elif args.command == "failing-ssic":
+                result = warehouse.failing_establishments(args.min_count, **filters)
+            else:
+                result = warehouse.query(args.statement)
+        except (ValueError, pd.errors.DatabaseError) as e:
+            print(f"Error: {e}")
+            return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(result.to_string(index=False) if not result.empty else "(no rows)")
+    print(f"\n{len(result)} rows in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
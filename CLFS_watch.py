@@ -0,0 +1,339 @@
+"""
+CLFS Watch-Folder Validation
+
+Keeps validating Operating_Table/ as exports land instead of re-running the
+whole folder: the folder is polled, and every .xlsx/.csv/.tsv file that is new
+or modified is validated in a bounded pool of worker processes (each loads
+the reference data once, as with CLFS_validator.py --workers).
+
+    python CLFS_watch.py [--folder Operating_Table] [--workers 2] [--interval 2] [--debounce 5]
+                         [--incremental] [--tolerances [CONFIG]] [--programme-catalog] [--once]
+
+- Debounce: a file is picked up once it has not been written for --debounce
+  seconds, so half-copied exports are not validated
+- Content hash: the SHA-256 of every validated file is kept in
+  output/watch_ledger.json with a fingerprint of the settings it was
+  validated under (rule sources, SSOC/SSEC definitions, --tolerances,
+  --programme-catalog); a file whose content was already validated with the
+  same settings (touched, re-copied, or seen by an earlier watch run) is skipped
+- Atomic outputs: each file is validated into its own staging folder under
+  output/.staging/ and its reports are moved into output/ with os.replace,
+  so readers never see a half-written workbook
+- Metrics: one line per file (queue wait, validation time, latency from
+  detection to published outputs, rows/s), appended to output/watch_metrics.csv
+
+A file modified again while it is being validated is queued behind the
+running validation. --once validates what is new or modified and exits.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import CLFS_incremental as incremental
+import CLFS_tolerances as tolerances
+import CLFS_validator as validator
+
+
+DEFAULT_FOLDER = "Operating_Table"
+INPUT_SUFFIXES = (".xlsx", ".csv", ".tsv")
+STAGING_DIR = Path("output") / ".staging"
+DEFAULT_LEDGER_FILE = Path("output") / "watch_ledger.json"
+DEFAULT_METRICS_FILE = Path("output") / "watch_metrics.csv"
+METRICS_FIELDS = [
+    "file", "sha256", "rows", "members", "errors",
+    "detected_at", "wait_s", "validate_s", "latency_s", "rows_per_s",
+]
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchLedger:
+    """File name -> content hash and settings fingerprint of the last successful validation (JSON file)."""
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_FILE):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as fh:
+                    self.entries = json.load(fh)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: ignoring unreadable watch ledger {self.path}: {e}")
+
+    def already_validated(self, name: str, sha256: str, settings: str) -> bool:
+        entry = self.entries.get(name, {})
+        return entry.get("sha256") == sha256 and entry.get("settings") == settings
+
+    def record(self, name: str, sha256: str, settings: str, summary: dict) -> None:
+        self.entries[name] = {
+            "sha256": sha256,
+            "settings": settings,
+            "validated_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": summary["rows"],
+            "errors": summary["errors"],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class WatchJob:
+    """One new or modified file waiting for (or in) validation."""
+    path: Path
+    sha256: str
+    detected_at: float
+    queued_at: float
+    staging: Optional[Path] = None
+    staged_files: list[str] = field(default_factory=list)
+
+
+class FolderWatcher:
+    """Polls a folder for input files that are new or modified and no longer being written."""
+
+    def __init__(self, folder: str, debounce_s: float):
+        self.folder = Path(folder)
+        self.debounce_s = debounce_s
+        # name -> (size, mtime_ns) of the version already handed out
+        self._handled: dict[str, tuple[int, int]] = {}
+        # name -> when a not-yet-handled version was first seen
+        self._detected: dict[str, float] = {}
+
+    def _input_files(self) -> list[Path]:
+        if not self.folder.exists():
+            return []
+        return sorted(
+            path for path in self.folder.iterdir()
+            if path.suffix.lower() in INPUT_SUFFIXES
+            # Skip Excel lock files and hidden partial copies
+            and not path.name.startswith(("~$", "."))
+            and path.is_file()
+        )
+
+    def poll(self) -> list[tuple[Path, float]]:
+        """(path, detected_at) of the files that became ready since the last poll."""
+        now = time.time()
+        ready = []
+        names = set()
+        for path in self._input_files():
+            names.add(path.name)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._handled.get(path.name) == signature:
+                continue
+            detected_at = self._detected.setdefault(path.name, now)
+            if now - stat.st_mtime_ns / 1e9 < self.debounce_s:
+                continue
+            self._handled[path.name] = signature
+            del self._detected[path.name]
+            ready.append((path, detected_at))
+        for name in set(self._handled) - names:
+            del self._handled[name]
+        for name in set(self._detected) - names:
+            del self._detected[name]
+        return ready
+
+    @property
+    def settling(self) -> bool:
+        """True while some file is still inside its debounce window."""
+        return bool(self._detected)
+
+
+def _validate_staged(file_path: str, staging: str, verbose: bool, profile: bool) -> Optional[dict]:
+    """
+    Pool task: validate one file with its outputs written to staging. Returns
+    the validator summary with the worker's start/end times, or None when the
+    file could not be loaded.
+    """
+    started = time.time()
+    validator.OUTPUT_DIR = Path(staging)
+    try:
+        summary = validator._validate_file_in_worker(file_path, verbose, profile)
+    finally:
+        validator.OUTPUT_DIR = Path("output")
+    if summary is not None:
+        summary["started_at"] = started
+        summary["finished_at"] = time.time()
+    return summary
+
+
+def _publish(staging: Path, output_dir: Path) -> list[str]:
+    """Move every staged output into output_dir (atomic per file) and drop the staging folder."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    published = []
+    for staged in sorted(staging.iterdir()):
+        os.replace(staged, output_dir / staged.name)
+        published.append(staged.name)
+    shutil.rmtree(staging, ignore_errors=True)
+    return published
+
+
+def _write_metrics(path: Path, row: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not path.exists()
+    with open(path, "a", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=METRICS_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def watch(args) -> int:
+    """Run the watch loop until interrupted (or, with --once, until the folder is done)."""
+    watcher = FolderWatcher(args.folder, args.debounce)
+    ledger = WatchLedger(Path(args.ledger))
+    metrics_file = Path(args.metrics)
+    output_dir = Path("output")
+    state_file = None
+    if args.incremental:
+        state_file = args.state_file
+        print(f"Incremental state store: {state_file}")
+
+    # Fixed for the run: the workers load these settings once
+    settings = validator.settings_fingerprint(args.tolerances, args.programme_catalog)
+
+    queue: deque[WatchJob] = deque()
+    in_flight = {}
+    sequence = 0
+    validated = 0
+    total_rows = 0
+    start = time.perf_counter()
+
+    print(f"Watching {watcher.folder}/ every {args.interval:g}s (debounce {args.debounce:g}s, {args.workers} workers)")
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=validator._init_worker,
+        initargs=(state_file, args.tolerances, args.programme_catalog),
+    ) as pool:
+        try:
+            while True:
+                for path, detected_at in watcher.poll():
+                    try:
+                        sha256 = file_digest(path)
+                    except OSError as e:
+                        print(f"Error reading {path.name}: {e}")
+                        continue
+                    if ledger.already_validated(path.name, sha256, settings):
+                        print(f"{path.name}: content already validated with these settings, skipped")
+                        continue
+                    # A newer version replaces a queued one
+                    queue = deque(job for job in queue if job.path.name != path.name)
+                    queue.append(WatchJob(path, sha256, detected_at, time.time()))
+
+                # Submit up to --workers files; a file already in flight waits for its run
+                busy = {job.path.name for job in in_flight.values()}
+                for job in list(queue):
+                    if len(in_flight) >= args.workers:
+                        break
+                    if job.path.name in busy:
+                        continue
+                    queue.remove(job)
+                    sequence += 1
+                    job.staging = STAGING_DIR / f"{job.path.stem}.{os.getpid()}.{sequence}"
+                    job.staging.mkdir(parents=True, exist_ok=True)
+                    future = pool.submit(_validate_staged, str(job.path), str(job.staging), args.verbose, args.profile)
+                    in_flight[future] = job
+                    busy.add(job.path.name)
+
+                if args.once and not queue and not in_flight and not watcher.settling:
+                    break
+
+                if not in_flight:
+                    time.sleep(args.interval)
+                    continue
+                done, _ = wait(in_flight, timeout=args.interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        summary = None
+                        print(f"Error validating {job.path.name}: {e}")
+                    if summary is None:
+                        shutil.rmtree(job.staging, ignore_errors=True)
+                        continue
+                    _publish(job.staging, output_dir)
+                    published_at = time.time()
+                    ledger.record(job.path.name, job.sha256, settings, summary)
+
+                    validate_s = summary["finished_at"] - summary["started_at"]
+                    row = {
+                        "file": job.path.name,
+                        "sha256": job.sha256,
+                        "rows": summary["rows"],
+                        "members": summary["members"],
+                        "errors": summary["errors"],
+                        "detected_at": datetime.fromtimestamp(job.detected_at).isoformat(timespec="seconds"),
+                        "wait_s": round(max(summary["started_at"] - job.queued_at, 0.0), 3),
+                        "validate_s": round(validate_s, 3),
+                        "latency_s": round(published_at - job.detected_at, 3),
+                        "rows_per_s": round(summary["rows"] / validate_s, 1) if validate_s > 0 else None,
+                    }
+                    _write_metrics(metrics_file, row)
+                    validated += 1
+                    total_rows += summary["rows"]
+                    print(
+                        f"✓ {row['file']}: {row['rows']} rows, {row['errors']} errors | "
+                        f"wait {row['wait_s']:.1f}s, validate {row['validate_s']:.1f}s, "
+                        f"latency {row['latency_s']:.1f}s, {row['rows_per_s']} rows/s"
+                    )
+        except KeyboardInterrupt:
+            print("\nStopping watch (waiting for running validations)")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nWatch summary: {validated} files, {total_rows} rows validated in {elapsed:.1f}s")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="CLFS watch-folder validation")
+    parser.add_argument("--folder", default=DEFAULT_FOLDER, help="Folder to watch (default: Operating_Table)")
+    parser.add_argument("--workers", type=int, default=1, help="Files validated in parallel (default: 1)")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between folder polls (default: 2)")
+    parser.add_argument("--debounce", type=float, default=5.0,
+                        help="Seconds a file must be left unwritten before it is validated (default: 5)")
+    parser.add_argument("--once", action="store_true", help="Validate the new or modified files, then exit")
+    parser.add_argument("--ledger", default=str(DEFAULT_LEDGER_FILE), help="Content hashes of validated files")
+    parser.add_argument("--metrics", default=str(DEFAULT_METRICS_FILE), help="Per-file metrics CSV")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-validate only respondents whose rows changed since the previous run")
+    parser.add_argument("--state-file", default=incremental.state_file_from_env(),
+                        help="Incremental state store (default: output/clfs_incremental_state.sqlite or CLFS_STATE_FILE)")
+    parser.add_argument("--tolerances", nargs="?", const=str(tolerances.DEFAULT_CONFIG_FILE), default=None,
+                        metavar="CONFIG", help="Also flag values outside the MRSD tolerances")
+    parser.add_argument("--programme-catalog", action="store_true",
+                        help="Also check qualifications against the institution programme catalogs")
+    parser.add_argument("--profile", action="store_true", help="Print a timing table for each file")
+    parser.add_argument("--verbose", action="store_true", help="Print the details of every parsed household member")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return watch(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
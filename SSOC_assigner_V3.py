@@ -17,7 +17,7 @@ Created on Sept 01 15:18:21 2025
 # ======== [NEW] Detailed Top-5 Scoring Report feature =========================
 # =========================================
 
-import os, re, sys, datetime as _dt, argparse, shutil, glob
+import os, re, sys, time, datetime as _dt, argparse, shutil, glob, importlib.util, atexit, threading
 from typing import List, Dict, Tuple, Optional, Set, Callable
 from difflib import SequenceMatcher
 from functools import lru_cache
@@ -33,13 +33,11 @@ try:
 except Exception:
     _HAS_RF = False
 
-# Optional fast candidate shortlisting
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    _HAS_SK = True
-except Exception:
-    _HAS_SK = False
+# Optional fast candidate shortlisting. scikit-learn (and scipy behind it) takes
+# about a second to import, so it is only imported when the TF-IDF index is built.
+_HAS_SK = importlib.util.find_spec("sklearn") is not None
+
+import CLFS_warehouse as warehouse
 
 # ====== CONFIG DEFAULTS ======
 DEFAULT_DEFINITIONS_FILE = r"C:\Users\MOMSGK2\Desktop\OED\SSOC_coder_from_yeefei\ssoc2024-detailed-definitions.xlsx"
@@ -235,21 +233,30 @@ SECTOR_ANCHORS: Dict[str, Set[str]] = {
                        "martial arts","yoga","pilates","zumba","training","mentorship"}
 }
 
-def _sector_cues_from_text(text: str) -> Set[str]:
-    toks_list = _tokens(text)
-    toks_set  = set(toks_list)
-    lower     = _normalize(text)
-    cues: Set[str] = set()
+@lru_cache(maxsize=1)
+def _sector_anchor_index() -> Tuple[Dict[str, Set[str]], List[Tuple[str, str]]]:
+    """SECTOR_ANCHORS normalized once: (single-word anchor -> sectors, [(phrase, sector)])."""
+    words: Dict[str, Set[str]] = {}
+    phrases: List[Tuple[str, str]] = []
     for sector, anchors in SECTOR_ANCHORS.items():
         for a in anchors:
             a_norm = _normalize(a.replace("_", " "))
             if " " in a_norm:
-                if a_norm in lower:
-                    cues.add(sector)
+                phrases.append((a_norm, sector))
             else:
-                if a_norm in toks_set:
-                    cues.add(sector)
-    return cues
+                words.setdefault(a_norm, set()).add(sector)
+    return words, phrases
+
+@lru_cache(maxsize=200_000)
+def _sector_cues_from_text(text: str) -> frozenset:
+    # Candidate blobs recur for every query, so cues are memoized per text
+    words, phrases = _sector_anchor_index()
+    lower = _normalize(text)
+    cues: Set[str] = set()
+    for tok in set(_tokens(text)):
+        cues.update(words.get(tok, ()))
+    cues.update(sector for phrase, sector in phrases if sector not in cues and phrase in lower)
+    return frozenset(cues)
 
 ROLE_ANCHORS = {
     "driver","painter","drafter","draftsman","draftsperson","installer","fitter","welder",
@@ -1625,15 +1632,36 @@ _TFIDF_VECT  = None
 _TFIDF_MAT   = None
 _TFIDF_TEXTS = None
 
+def build_tfidf_index(defs: List[Dict[str, str]]) -> None:
+    """Fit the TF-IDF shortlist over the definitions (no-op without scikit-learn)."""
+    global _TFIDF_VECT, _TFIDF_MAT, _TFIDF_TEXTS
+    if not _HAS_SK:
+        return
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    _TFIDF_TEXTS = [ (r.get("title_norm","") + " " + r.get("blob_norm","")).strip() for r in defs ]
+    _TFIDF_VECT  = TfidfVectorizer(min_df=2, ngram_range=(1,2))
+    _TFIDF_MAT   = _TFIDF_VECT.fit_transform(_TFIDF_TEXTS)
+
 def _tfidf_topk_indices(query_text: str, K: int = 150) -> Optional[List[int]]:
+    return _tfidf_topk_indices_batch([query_text], K)[0]
+
+def _tfidf_topk_indices_batch(query_texts: List[str], K: int = 150) -> List[Optional[List[int]]]:
+    """Shortlists of many queries from a single sparse similarity product."""
+    out: List[Optional[List[int]]] = [None] * len(query_texts)
     if not _HAS_SK or _TFIDF_VECT is None or _TFIDF_MAT is None:
-        return None
-    q = _normalize(query_text)
-    if not q:
-        return None
-    qv = _TFIDF_VECT.transform([q])
-    sims = cosine_similarity(qv, _TFIDF_MAT, dense_output=False)
-    row = sims.getrow(0)
+        return out
+    queries = [(i, _normalize(q)) for i, q in enumerate(query_texts)]
+    queries = [(i, q) for i, q in queries if q]
+    if not queries:
+        return out
+    from sklearn.metrics.pairwise import cosine_similarity
+    qv = _TFIDF_VECT.transform([q for _, q in queries])
+    sims = cosine_similarity(qv, _TFIDF_MAT, dense_output=False).tocsr()
+    for j, (i, _) in enumerate(queries):
+        out[i] = _topk_from_row(sims.getrow(j), K)
+    return out
+
+def _topk_from_row(row, K: int) -> Optional[List[int]]:
     if row.nnz == 0:
         return None
     data = row.data
@@ -1923,6 +1951,37 @@ def _apply_baked_rules(title_text: str, duties_text: str) -> Optional[Tuple[str,
                 
             return code, occ_title, reason
 
+    return _apply_conditional_rules(t_norm, both_norm)
+
+def _apply_baked_rules_batch(titles: List[str], duties: List[str]) -> List[Optional[Tuple[str, str, str]]]:
+    """
+    _apply_baked_rules over many rows: each rule is tried, in order, on every
+    row no earlier rule has claimed, so every row gets its first matching rule.
+    """
+    t_norm = [_normalize(t or "") for t in titles]
+    both_norm = [f"{t} {_normalize(d or '')}".strip() for t, d in zip(t_norm, duties)]
+    results: List[Optional[Tuple[str, str, str]]] = [None] * len(t_norm)
+    open_rows = list(range(len(t_norm)))
+
+    for rx, code, occ_title, reason, cue, title_only_check in _BAKED_RULES:
+        if not open_rows:
+            break
+        texts = t_norm if title_only_check else both_norm
+        still_open = []
+        for i in open_rows:
+            if (rx.search(texts[i])
+                    and (cue is None or cue.search(both_norm[i]))
+                    and ("rule_admin_exec" not in reason or "executive" in both_norm[i] or "exec" in both_norm[i])):
+                results[i] = (code, occ_title, reason)
+            else:
+                still_open.append(i)
+        open_rows = still_open
+
+    for i in open_rows:
+        results[i] = _apply_conditional_rules(t_norm[i], both_norm[i])
+    return results
+
+def _apply_conditional_rules(t_norm: str, both_norm: str) -> Optional[Tuple[str, str, str]]:
     # === MODIFIED: Conditional permutations now check the TITLE for the main role keyword ===
     # This prevents misclassifying junior roles that mention a senior title in their duties.
 
@@ -1997,6 +2056,14 @@ def best_match_duties_priority(title_text: str, duties_text: str, defs: List[Dic
 
     # 4. FINAL FALLBACK: The full scoring engine
     q_text = f"{title_text} {duties_text}".strip()
+    return _shortlist_match(title_text, duties_text, defs, min_score_0_to_1, edu_text_for_row,
+                            group_hint, company_industry, _tfidf_topk_indices(q_text, K=150))
+
+def _shortlist_match(title_text: str, duties_text: str, defs: List[Dict[str, str]],
+                     min_score_0_to_1: float, edu_text_for_row: str, group_hint: Optional[str],
+                     company_industry: str, cand_indices: Optional[List[int]]):
+    """Score the TF-IDF shortlist (every 5-digit code without one), with the 4-digit fallback."""
+    q_text = f"{title_text} {duties_text}".strip()
     search_type_label = "Title + Duties (Combined)"
     q_norm = _normalize(q_text)
     q_toks = set(_tokens(q_norm))
@@ -2006,7 +2073,6 @@ def best_match_duties_priority(title_text: str, duties_text: str, defs: List[Dic
         return _score_vs_record_precomputed(title_text, duties_text, q_norm, q_toks, q_bis, rec, edu_text_for_row, group_hint, company_industry)
 
     five_digit_candidates = [r for r in defs if r.get("is_5d")]
-    cand_indices = _tfidf_topk_indices(q_text, K=150)
     cand_iter_5d = [defs[i] for i in cand_indices if defs[i].get("is_5d")] if cand_indices is not None else five_digit_candidates
 
     all_candidates = []
@@ -2038,9 +2104,276 @@ def best_match_duties_priority(title_text: str, duties_text: str, defs: List[Dic
         final_title = X_TITLE_MAP["X1000"]
     
     return final_code, final_title, final_score, final_explain, top_5, final_search_type
-# ---------- write back ----------
-from openpyxl import load_workbook
 
+# ---------- near-duplicate clustering ----------
+# MinHash signatures over stemmed (title, duties) token shingles, bucketed by
+# LSH bands; rows sharing a bucket are joined when their exact shingle Jaccard
+# similarity reaches the threshold.
+NEAR_DUPLICATE_THRESHOLD = 0.8
+MINHASH_PERMUTATIONS = 64
+_MINHASH_PRIME = (1 << 31) - 1
+_SHINGLE_STOP = {"a", "an", "and", "the", "of", "to", "in", "on", "for", "with", "at", "by", "or", "as", "from", "all", "any"}
+
+@lru_cache(maxsize=200_000)
+def _shingle_stem(word: str) -> str:
+    """Crude stem so "mopping floors" and "mop floor" share shingles."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    for suffix, min_len in (("ing", 6), ("ed", 5), ("er", 5)):
+        if len(word) >= min_len and word.endswith(suffix):
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 2 and word[-1] == word[-2] and word[-1] not in "aeiou":
+        word = word[:-1]
+    return word
+
+def _job_shingles(title_text: str, duties_text: str) -> frozenset:
+    title = {"t:" + _shingle_stem(w) for w in _tokens_cached(title_text) if w not in _SHINGLE_STOP}
+    duties = {_shingle_stem(w) for w in _tokens_cached(duties_text) if w not in _SHINGLE_STOP}
+    return frozenset(title | duties)
+
+@lru_cache(maxsize=1)
+def _minhash_params():
+    import numpy as np
+    rng = np.random.RandomState(2025)
+    a = rng.randint(1, _MINHASH_PRIME, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+    b = rng.randint(0, _MINHASH_PRIME, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+    return a, b
+
+def _minhash_signature(shingles: frozenset):
+    import numpy as np
+    import zlib
+    a, b = _minhash_params()
+    hashes = np.fromiter((zlib.crc32(sh.encode("utf-8")) % _MINHASH_PRIME for sh in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    return ((a[:, None] * hashes[None, :] + b[:, None]) % _MINHASH_PRIME).min(axis=1)
+
+def _lsh_bands(threshold: float) -> int:
+    """Number of bands whose S-curve midpoint (1/b)^(1/r) is closest to the threshold."""
+    splits = [b for b in range(1, MINHASH_PERMUTATIONS + 1) if MINHASH_PERMUTATIONS % b == 0]
+    return min(splits, key=lambda b: abs((1.0 / b) ** (b / MINHASH_PERMUTATIONS) - threshold))
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if (a or b) else 1.0
+
+def near_duplicate_clusters(titles: List[str], duties: List[str], threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                            context: Optional[List[tuple]] = None) -> List[List[int]]:
+    """
+    Group row indices whose (title, duties) are near duplicates. Rows are only
+    grouped with rows of the same context (e.g. education / hint / industry);
+    every row is in exactly one cluster, clusters and members in input order.
+    """
+    n = len(titles)
+    context = context or [()] * n
+    shingles = [_job_shingles(t, d) for t, d in zip(titles, duties)]
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands = _lsh_bands(threshold)
+    rows_per_band = MINHASH_PERMUTATIONS // bands
+    buckets: Dict[tuple, int] = {}
+    for i, sh in enumerate(shingles):
+        if not sh:
+            continue
+        sig = _minhash_signature(sh)
+        for band in range(bands):
+            key = (context[i], band, sig[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+            first = buckets.setdefault(key, i)
+            if first != i and find(first) != find(i) and _jaccard(shingles[first], sh) >= threshold:
+                parent[find(i)] = find(first)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+# ---------- batch matcher ----------
+BATCH_COLUMNS = ["code", "title", "score", "search_type", "explain", "top_5"]
+
+_BATCH_DEFS: Optional[List[Dict[str, str]]] = None
+_BATCH_MIN_SCORE = 0.0
+
+def _init_batch_worker(defs: List[Dict[str, str]], min_score_0_to_1: float) -> None:
+    global _BATCH_DEFS, _BATCH_MIN_SCORE
+    _BATCH_DEFS, _BATCH_MIN_SCORE = defs, min_score_0_to_1
+
+def _shortlist_chunk(items: list) -> list:
+    return [_shortlist_match(t, d, _BATCH_DEFS, _BATCH_MIN_SCORE, e, g, ind, cand) for t, d, e, g, ind, cand in items]
+
+# (pool, defs, min_score, workers) of the process pool kept between assign_ssoc_batch calls;
+# --file-threads codes files concurrently, so it is only touched under _BATCH_POOL_LOCK
+_BATCH_POOL: Optional[tuple] = None
+_BATCH_POOL_LOCK = threading.Lock()
+
+def _batch_pool(defs: List[Dict[str, str]], min_score_0_to_1: float, workers: int):
+    """
+    Process pool with defs loaded in every worker. Callers that code a file in
+    chunks get the same pool back (defs are pickled to the workers once), until
+    the definitions, threshold or worker count change. Call with _BATCH_POOL_LOCK
+    held, and submit the work before releasing it.
+    """
+    global _BATCH_POOL
+    if _BATCH_POOL is not None:
+        pool, pool_defs, pool_min_score, pool_workers = _BATCH_POOL
+        if pool_defs is defs and pool_min_score == min_score_0_to_1 and pool_workers == workers:
+            return pool
+        pool.shutdown()
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                               initargs=(defs, min_score_0_to_1))
+    _BATCH_POOL = (pool, defs, min_score_0_to_1, workers)
+    return pool
+
+@atexit.register
+def shutdown_batch_pool() -> None:
+    """Stop the worker processes kept by _batch_pool."""
+    global _BATCH_POOL
+    with _BATCH_POOL_LOCK:
+        if _BATCH_POOL is not None:
+            _BATCH_POOL[0].shutdown()
+            _BATCH_POOL = None
+
+def _score_shortlists(items: list, defs: List[Dict[str, str]], min_score_0_to_1: float, workers: int) -> list:
+    """_shortlist_match over (title, duties, edu, group hint, industry, shortlist) items, in order."""
+    if workers <= 1 or len(items) < 2 * workers:
+        return [_shortlist_match(t, d, defs, min_score_0_to_1, e, g, ind, cand) for t, d, e, g, ind, cand in items]
+    size = -(-len(items) // (workers * 4))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    with _BATCH_POOL_LOCK:
+        # map submits every chunk at once; a pool replaced later still finishes them
+        parts = _batch_pool(defs, min_score_0_to_1, workers).map(_shortlist_chunk, chunks)
+    return [res for part in parts for res in part]
+
+def _text_column(frame: "pd.DataFrame", col: Optional[str], strip: bool = False) -> "pd.Series":
+    if col is None:
+        return pd.Series("", index=frame.index, dtype=object)
+    values = frame[col].astype(object)
+    values = values.where(values.notna(), "").astype(str)
+    return values.str.strip() if strip else values
+
+def assign_ssoc_batch(df, title_col: str, duties_col: str, edu_col: Optional[str] = None,
+                      hint_col: Optional[str] = None, industry_col: Optional[str] = None, *,
+                      defs: List[Dict[str, str]], title_map: Dict[str, Dict],
+                      expert_map: Optional[Dict[str, Tuple[str, str]]] = None,
+                      min_score_0_to_1: float = DEFAULT_MIN_SCORE / 100.0, workers: int = 1,
+                      near_duplicate_threshold: Optional[float] = None):
+    """
+    best_match_duties_priority over every row of a DataFrame (or pyarrow Table).
+
+    Returns the code, title, score, search_type, explain and top_5 of each row
+    as columns aligned with the input (a pyarrow Table for a pyarrow input).
+    Identical inputs are matched once, and each tier (baked rules, expert map,
+    exact title, X-codes, shortlist scoring) runs over all rows the tiers
+    before it left open, with one TF-IDF product for the whole shortlist tier;
+    workers > 1 scores the shortlists in that many processes, kept between
+    calls (see _batch_pool; shutdown_batch_pool stops them).
+
+    With near_duplicate_threshold, rows left for shortlist scoring are
+    clustered (near_duplicate_clusters) and each cluster's result is taken
+    from its first row, provided the member least similar to it gets the same
+    code; clusters where the two disagree are scored row by row. The counts
+    of rows, distinct rows and scored rows are left in the result's attrs.
+    """
+    is_arrow = not isinstance(df, pd.DataFrame) and hasattr(df, "to_pandas")
+    frame = df.to_pandas() if is_arrow else df
+    expert_map = expert_map or {}
+
+    inputs = pd.DataFrame({
+        "title": _text_column(frame, title_col, strip=True),
+        "duties": _text_column(frame, duties_col, strip=True),
+        "edu": _text_column(frame, edu_col),
+        "hint": _text_column(frame, hint_col),
+        "industry": _text_column(frame, industry_col),
+    })
+    if inputs.empty:
+        out = pd.DataFrame({c: pd.Series(dtype=object) for c in BATCH_COLUMNS}, index=frame.index)
+    else:
+        inverse, uniques = pd.MultiIndex.from_frame(inputs).factorize()
+        titles, duties, edus, hints, industries = (list(uniques.get_level_values(i)) for i in range(5))
+        results: List[Optional[tuple]] = [None] * len(uniques)
+
+        # 1. Baked-in rules
+        for i, br in enumerate(_apply_baked_rules_batch(titles, duties)):
+            if br:
+                code, occ_title, reason = br
+                results[i] = (code, occ_title, 0.66, f"{reason}", [], "Baked-in Rule")
+
+        # 2. Expert map, 3. exact title, X-codes and empty inputs
+        for i in range(len(results)):
+            if results[i] is not None:
+                continue
+            title_text, duties_text = titles[i], duties[i]
+            expert_match = _validate_expert_match(title_text, duties_text, expert_map, defs) if expert_map else None
+            rec = title_map.get(_normalize(title_text))
+            xhit = _xcode_checker(duties_text, title_text)
+            if expert_match:
+                results[i] = (expert_match[0], expert_match[1], 1.0, "Expert Map Match (Validated)", [], "Expert Map Match")
+            elif rec is not None and rec.get("is_5d"):
+                results[i] = (rec["code"], rec["title"], 1.0, "Exact Title Match", [], "Exact Title Match")
+            elif xhit is not None and xhit[0] in ("X3000","X4000","X5000"):
+                results[i] = (xhit[0], xhit[1], 1.0, "xcode-direct", [], "X-Code")
+            elif not duties_text and not title_text:
+                results[i] = ("X2000", X_TITLE_MAP["X2000"], 1.0, "xcode-noinfo", [], "No Input")
+
+        # 4. Shortlist scoring of everything left
+        scored = []
+
+        def _score(rows: List[int]) -> None:
+            shortlists = _tfidf_topk_indices_batch([f"{titles[i]} {duties[i]}".strip() for i in rows], K=150)
+            items = [
+                (titles[i], duties[i], edus[i], _parse_occ_group_hint(hints[i]), industries[i], cand)
+                for i, cand in zip(rows, shortlists)
+            ]
+            for i, res in zip(rows, _score_shortlists(items, defs, min_score_0_to_1, workers)):
+                results[i] = res
+            scored.extend(rows)
+
+        open_rows = [i for i, res in enumerate(results) if res is None]
+        if near_duplicate_threshold is None:
+            _score(open_rows)
+        else:
+            clusters = [
+                [open_rows[j] for j in cluster]
+                for cluster in near_duplicate_clusters(
+                    [titles[i] for i in open_rows], [duties[i] for i in open_rows], near_duplicate_threshold,
+                    context=[(edus[i], hints[i], industries[i]) for i in open_rows],
+                )
+            ]
+            checks = {}
+            for cluster in clusters:
+                if len(cluster) > 1:
+                    rep = _job_shingles(titles[cluster[0]], duties[cluster[0]])
+                    checks[cluster[0]] = min(cluster[1:], key=lambda i: _jaccard(rep, _job_shingles(titles[i], duties[i])))
+            _score([cluster[0] for cluster in clusters] + list(checks.values()))
+            # Opt out of propagation where the representatives disagree
+            _score([
+                i for cluster in clusters
+                if len(cluster) > 1 and results[cluster[0]][0] != results[checks[cluster[0]]][0]
+                for i in cluster if results[i] is None
+            ])
+            for cluster in clusters:
+                code, occ_title, score, explain, top_5, search_type = results[cluster[0]]
+                for i in cluster:
+                    if results[i] is None:
+                        results[i] = (code, occ_title, score, explain, top_5, f"{search_type} (near-duplicate)")
+
+        matched = pd.DataFrame(
+            [(code, title, score, search_type, explain, top_5) for code, title, score, explain, top_5, search_type in results],
+            columns=BATCH_COLUMNS,
+        )
+        out = matched.take(inverse).set_axis(frame.index)
+        out.attrs.update(rows=len(out), unique=len(uniques), scored=len(scored))
+
+    if is_arrow:
+        import pyarrow as pa
+        return pa.Table.from_pandas(out, preserve_index=False)
+    return out
+# ---------- write back ----------
 def _write_back_copy(jobs_path: str, sheet, header_row: int,
                      code_col_name: str, title_col_name: str,
                      row_indices: List[int], codes: List[str], titles: List[str],
@@ -2049,6 +2382,7 @@ def _write_back_copy(jobs_path: str, sheet, header_row: int,
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
     shutil.copyfile(jobs_path, save_path)
 
+    from openpyxl import load_workbook
     wb = load_workbook(save_path)
     ws = wb[wb.sheetnames[0]] if sheet is None else (wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet])
 
@@ -2169,6 +2503,7 @@ def _resolve_jobs_input(args):
 def process_single_file(jobs_path: str, defs: List[Dict[str, str]], title_map: Dict[str, Dict],
                         expert_map: Dict[str, Tuple[str, str]], uen_to_ssic_map: Dict[str, str], 
                         ssic_definitions: Dict[str, str], args, out_dir: str) -> Tuple[str, Optional[str], int, int]:
+    file_start = time.perf_counter()
     try:
         row_idxs, titles, duties, edus, groups, uen_for_file = load_jobs_separate(
             jobs_path, args.jobs_sheet, args.jobs_header_row,
@@ -2199,24 +2534,21 @@ def process_single_file(jobs_path: str, defs: List[Dict[str, str]], title_map: D
         if company_industry_description:
             print(f"[INFO] Using 5-digit only industry context: '{company_industry_description[:100]}...'")
 
-    def _score_row(i: int, t_text: str, d_text: str, edu_text: str, grp_hint_raw: str):
-        code, occ_title, score, explain, top_5, search_type = best_match_duties_priority(
-            t_text, d_text, defs, title_map, expert_map, min_s, edu_text, grp_hint_raw, company_industry_description
-        )
-        return i, code, occ_title, score, explain, top_5, search_type
-
-    results = []
-    if args.threads and args.threads > 1:
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        with ThreadPoolExecutor(max_workers=args.threads) as ex:
-            futs = [ex.submit(_score_row, i, t, d, e, g) for i, (t, d, e, g) in enumerate(zip(titles, duties, edus, groups))]
-            for fut in as_completed(futs): results.append(fut.result())
-        results.sort(key=lambda x: x[0])
-    else:
-        for i, (t, d, e, g) in enumerate(zip(titles, duties, edus, groups)):
-            results.append(_score_row(i, t, d, e, g))
+    jobs = pd.DataFrame({"title": titles, "duties": duties, "edu": edus, "group": groups,
+                         "industry": company_industry_description})
+    matched = assign_ssoc_batch(
+        jobs, "title", "duties", "edu", "group", "industry",
+        defs=defs, title_map=title_map, expert_map=expert_map,
+        min_score_0_to_1=min_s, workers=args.threads or 1,
+        near_duplicate_threshold=getattr(args, "near_dup_threshold", None),
+    )
+    if args.debug:
+        print(f"[INFO] {matched.attrs['rows']} rows, {matched.attrs['unique']} distinct, "
+              f"{matched.attrs['scored']} scored against the definitions")
+    results = list(zip(range(len(matched)), matched["code"], matched["title"], matched["score"],
+                       matched["explain"], matched["top_5"], matched["search_type"]))
 
-    out_codes, out_titles, detailed_report_data = [], [], []
+    out_codes, out_titles, detailed_report_data, assignments = [], [], [], []
     
     for i, code, occ_title, score, explain, top_5, search_type in results:
         final_code = code
@@ -2228,6 +2560,10 @@ def process_single_file(jobs_path: str, defs: List[Dict[str, str]], title_map: D
         
         out_codes.append(final_code)
         out_titles.append(final_title)
+        assignments.append({
+            "row": row_idxs[i] + 1, "scheme": "SSOC", "input_text": titles[i], "code": final_code,
+            "matched": int(final_code != "X1000"), "score": round(score * 100, 2), "method": search_type,
+        })
 
         if args.detailed_report:
             base_info = {
@@ -2260,6 +2596,11 @@ def process_single_file(jobs_path: str, defs: List[Dict[str, str]], title_map: D
         
     updated = sum(1 for _c, _t in zip(out_codes, out_titles) if _c or _t)
     total = len(out_codes)
+    if getattr(args, "warehouse", None):
+        warehouse.record_run(
+            args.warehouse, "SSOC_assigner", input_filename, rows=total,
+            wall_s=time.perf_counter() - file_start, assignments=assignments,
+        )
     print(f"[OK] Processed '{os.path.basename(jobs_path)}' -> Saved as '{os.path.basename(saved)}' in output folder | rows updated: {updated}/{total}")
     if audit_path: print(f"      audit: {os.path.basename(audit_path)}")
     return saved, audit_path, updated, total
@@ -2286,11 +2627,22 @@ def main():
     parser.add_argument("--min-score", default=DEFAULT_MIN_SCORE, type=float, help="0�100 threshold")
     parser.add_argument("--detailed-report", action="store_true", help="Generate a detailed Excel report with top 5 candidates for each job.")
     parser.add_argument("--debug", action="store_true", default=DEFAULT_DEBUG)
-    parser.add_argument("--threads", type=int, default=1, help="Threads per file for row scoring (optional)")
+    parser.add_argument("--threads", type=int, default=1, help="Worker processes per file for row scoring (optional)")
     parser.add_argument("--file-threads", type=int, default=1, help="Parallelism across files for batch mode")
+    parser.add_argument("--near-dup-threshold", type=float, nargs="?", const=NEAR_DUPLICATE_THRESHOLD, default=None,
+                        metavar="SIMILARITY",
+                        help="Score one representative per cluster of job descriptions at least this similar "
+                             f"(0-1; {NEAR_DUPLICATE_THRESHOLD} when given without a value). "
+                             "Default: off, every distinct job description is scored on its own")
 
     parser.add_argument("--skip-unreadable", action="store_true", default=True,
                         help="Skip unreadable/corrupted Excel files and continue (default ON)")
+    parser.add_argument("--warehouse", nargs="?", const=str(warehouse.DEFAULT_WAREHOUSE_FILE),
+                        default=warehouse.recording_file_from_env(), metavar="PATH",
+                        help="Record the assignments in the results warehouse at PATH (default PATH: "
+                             "output/clfs_results.sqlite; on by default only when CLFS_WAREHOUSE is set)")
+    parser.add_argument("--no-warehouse", dest="warehouse", action="store_const", const=None,
+                        help="Do not record the assignments in the results warehouse")
 
     args = parser.parse_args()
     
@@ -2316,12 +2668,7 @@ def main():
     uen_to_ssic_map = load_uen_to_ssic_map(DEFAULT_SSIC_LIST_FILE, debug=args.debug)
     ssic_definitions = load_ssic_definitions(DEFAULT_SSIC_DEFS_FILE, debug=args.debug)
 
-    global _TFIDF_VECT, _TFIDF_MAT, _TFIDF_TEXTS
-    if _HAS_SK:
-        # This line will now work correctly because `defs` is the list of records
-        _TFIDF_TEXTS = [ (r.get("title_norm","") + " " + r.get("blob_norm","")).strip() for r in defs ]
-        _TFIDF_VECT  = TfidfVectorizer(min_df=2, ngram_range=(1,2))
-        _TFIDF_MAT   = _TFIDF_VECT.fit_transform(_TFIDF_TEXTS)
+    build_tfidf_index(defs)
 
     _resolve_jobs_input(args)
 
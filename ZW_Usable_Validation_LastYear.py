@@ -2,36 +2,38 @@
 ZW_Usable_Validation_LastYear.py
 
 Orchestrator that loads CLFS_newformat.csv and answer.json, groups household members,
-invokes validators from CLFS_Brain.py, applies corrections, writes a _validated.xlsx with
+invokes validators from ZW_Usable_Validation_Rules.py, applies corrections, writes a _validated.xlsx with
 highlights and a _report.xlsx summary.
 
+Each field is resolved to its column once per file (FIELD_CANDIDATES) and every
+rule runs over whole columns through the column versions of the validators, so
+the run time grows with the number of cells rather than rows x columns.
+
 Usage:
     python3 ZW_Usable_Validation_LastYear.py   # runs main pipeline (will look for CLFS_newformat.csv and answer.json)
 
 """
 from pathlib import Path
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Iterable, Optional
 import pandas as pd  # type: ignore
 from openpyxl.styles import PatternFill, Font  # type: ignore
 from openpyxl import load_workbook  # type: ignore
 
-from CLFS_Brain import (
-    validate_identification_type,
-    validate_residential_st,
-    validate_h_sep_y,
-    validate_activity_status,
-    validate_i_l,
-    validate_none_of_the_above_exclusive,
-    validate_travel_time_format,
-    validate_years_in_employment_consistency,
-    validate_num_children,
-    validate_oaw_income_threshold,
-    validate_occupation_details,
-    validate_employment_consistency,
-    validate_seeking_work_logic,
-    validate_duration_numeric,
-    ValidationResult,
+import CLFS_option_catalog as option_catalog
+from ZW_Usable_Validation_Rules import (
+    identification_type_column,
+    residential_st_column,
+    activity_status_column,
+    i_l_column,
+    none_of_the_above_exclusive_column,
+    travel_time_format_column,
+    years_in_employment_consistency_column,
+    num_children_column,
+    oaw_income_threshold_column,
+    occupation_details_column,
+    employment_consistency_column,
+    seeking_work_logic_column,
+    duration_numeric_column,
 )
 
 ROOT = Path(__file__).parent
@@ -42,6 +44,35 @@ SKIPROWS = 5
 
 YELLOW_FILL = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
 
+# Column names accepted for each validated field (case-insensitive)
+FIELD_CANDIDATES = {
+    'identification': ['Identification Type', 'identification_type', 'id_type'],
+    'res_st': ['Where are you currently staying?', 'where_currently_staying', 'residential_status'],
+    'labour': ['Labour Force Status', 'labour_force_status', 'activity_status'],
+    'looking': ['Are you actively looking for a new job?', 'looking_for_job', 'i_l'],
+    'travel': ['TravelTime', 'travel_time', 'travel_minutes'],
+    'job_title': ['Job Title', 'job_title'],
+    'total_years': ['TotalYearsEmployed', 'total_years'],
+    'years_current': ['YearsCurrentJob', 'years_current'],
+    'age': ['Age', 'age'],
+    'age_started': ['At what age did you start employment'],
+    'num_children': ['Number of children given birth to'],
+    'employment_status': ['Employment Status', 'employment_status'],
+    'monthly_income': ['Last drawn GMI'],
+    # Next-15 candidate fields (best-effort mapping)
+    'e_occ': ['What kind of occupation were you looking for?'],
+    'w_desc': ['Main tasks / duties'],
+    'emp_flag': ['_EMP_', 'is_employed', 'employed_flag'],
+    'e_empst': ['E_EMPST', 'employment_status_detail'],
+    'empst': ['_EMPST', 'emp_status'],
+    'u_l': ['U_L', 'actively_looking'],
+    'u_w': ['U_W', 'available_to_start'],
+    'i_w': ['I_W', 'inability_to_work'],
+    'e_w': ['E_W', 'other_availability_flag'],
+    'duration': ['_DUR', 'duration', 'duration_years'],
+    'multi_select': ['SomeMultiSelectQuestion', 'multi_select'],
+}
+
 
 def _find_household_id_column(df: pd.DataFrame) -> str:
     # In this CSV layout the first two columns are metadata; start search from column index 2
@@ -53,24 +84,31 @@ def _find_household_id_column(df: pd.DataFrame) -> str:
     return str(cols[0]) if cols else str(df.columns[0])
 
 
-def _extract_identification_options(answer_json: Dict[str, Any]) -> List[str]:
-    # Heuristic: find any fieldOptions lists that contain 'Singapore Citizen'
-    def walk(obj):
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                if k == 'fieldOptions' and isinstance(v, list):
-                    yield v
-                else:
-                    yield from walk(v)
-        elif isinstance(obj, list):
-            for item in obj:
-                yield from walk(item)
-    for options in walk(answer_json):
-        try:
-            if any('Singapore Citizen' in str(opt) for opt in options):
-                return [str(o) for o in options]
-        except Exception:
-            continue
+def resolve_field_columns(columns: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Map every FIELD_CANDIDATES field to the first column (in column order) whose
+    lowercased name is one of its candidates, or None when the file has none.
+    """
+    # Ignore first two metadata columns when searching for fields
+    first_by_name: Dict[str, str] = {}
+    for c in list(columns)[2:]:
+        first_by_name.setdefault(c.lower(), c)
+    position = {c: i for i, c in enumerate(first_by_name.values())}
+    fields: Dict[str, Optional[str]] = {}
+    for field, candidates in FIELD_CANDIDATES.items():
+        matches = [first_by_name[x.lower()] for x in candidates if x.lower() in first_by_name]
+        fields[field] = min(matches, key=position.__getitem__) if matches else None
+    return fields
+
+
+def _extract_identification_options(catalog: option_catalog.OptionCatalog) -> List[str]:
+    # The Identification Type field; otherwise the first option list that contains 'Singapore Citizen'
+    options = catalog.options('Identification Type')
+    if options:
+        return options
+    for f in catalog.by_id.values():
+        if any('Singapore Citizen' in opt for opt in f.options):
+            return list(f.options)
     # fallback empty
     return []
 
@@ -102,152 +140,68 @@ def run_pipeline(csv_path: Path = CSV_PATH, answer_json_path: Path = ANSWER_JSON
     # Load answer.json for identification options
     options = []
     if answer_json_path.exists():
-        with open(answer_json_path, 'r', encoding='utf-8') as f:
-            aj = json.load(f)
-            options = _extract_identification_options(aj)
+        catalog = option_catalog.load_catalog((answer_json_path,) + option_catalog.DEFAULT_SOURCES[1:])
+        options = _extract_identification_options(catalog)
     else:
         print("Warning: answer.json not found; identification validation will be less strict")
 
-    # Prepare book-keeping
-    errors = []  # list of dicts: row, col, rule, message
-    corrections = []
-
-    # We'll operate on a copy to apply corrections
+    # Resolve every field to its column once per file, then run each rule over whole columns
+    fields = resolve_field_columns(df.columns)
+    index = df.index
+
+    def col(field):
+        return df[fields[field]] if fields[field] else None
+
+    def report_col(*names, default):
+        return next((fields[n] for n in names if fields[n]), default)
+
+    id_failures, id_corrections = identification_type_column(col('identification'), index, allowed_options=options)
+    checks = [
+        (id_failures, report_col('identification', default='Identification Type')),
+        (residential_st_column(col('res_st'), index), report_col('res_st', default='Where are you currently staying?')),
+        (activity_status_column(col('labour'), index), report_col('labour', default='Labour Force Status')),
+        (i_l_column(col('looking'), index), report_col('looking', default='Are you actively looking for a new job?')),
+        (occupation_details_column(col('employment_status'), col('e_occ'), col('w_desc'), index),
+         report_col('job_title', 'e_occ', 'w_desc', default='Job Title')),
+        (employment_consistency_column(col('emp_flag'), col('e_empst'), col('empst'), col('labour'), index),
+         report_col('emp_flag', 'e_empst', 'empst', 'labour', default='Labour Force Status')),
+        (seeking_work_logic_column(col('u_l'), col('u_w'), col('i_w'), col('e_w'), index),
+         report_col('u_l', 'u_w', 'i_w', 'e_w', default='Are you actively looking for a new job?')),
+        (duration_numeric_column(col('duration'), index), report_col('duration', default='Total Duration')),
+        (none_of_the_above_exclusive_column(col('multi_select'), index), report_col('multi_select', default='SomeMultiSelectQuestion')),
+        (travel_time_format_column(col('travel'), index), report_col('travel', default='TravelTime')),
+        (years_in_employment_consistency_column(col('total_years'), col('years_current'), col('age'), col('age_started'), index),
+         'EmploymentYears'),
+        (num_children_column(col('num_children'), col('age'), index), report_col('num_children', default='Number of children given birth to')),
+        (oaw_income_threshold_column(col('employment_status'), col('monthly_income'), index),
+         report_col('monthly_income', default='Last drawn GMI')),
+    ]
+
+    # Errors are reported household by household (sorted household id, rows without one are
+    # skipped), in file order within a household and in rule order within a row
+    household_order = df.groupby(hh_col).ngroup()
+    found = pd.concat(
+        [failures.assign(col=report, check=k) for k, (failures, report) in enumerate(checks)]
+    )
+    found['household'] = household_order.reindex(found.index).to_numpy()
+    found['row'] = found.index
+    found = found.dropna(subset=['household']).sort_values(['household', 'row', 'check'], kind='mergesort')
+    errors = found[['row', 'col', 'rule', 'message']].to_dict('records')  # list of dicts: row, col, rule, message
+
+    # Apply identification corrections to a copy (rows inside a household only)
     mod_df = df.copy()
-
-    # Group by household and iterate
-    for hh, grp in df.groupby(hh_col):
-        # collect household ethnicities for language rule — heuristic: look for column names containing 'ethnic'
-        eth_cols = [c for c in df.columns if 'ethnic' in c.lower()]
-        household_ethnicities = []
-        if eth_cols:
-            household_ethnicities = [str(x) for x in grp[eth_cols].stack().dropna().astype(str).tolist()]
-
-        for idx, row in grp.iterrows():
-            # Example candidate columns (best-effort): Identification Type, Where are you currently staying?, Marital Status,
-            # Labour Force Status, Are you actively looking for a new job?, PostalCode, TravelTime, TotalYearsEmployed,
-            # YearsCurrentJob, Age, AgeStartedEmployment, NumChildren, PrimaryLanguage, EmploymentStatus, MonthlyIncome
-
-            # we try to map a few common column names (case-insensitive)
-            def _get(col_candidates):
-                # Ignore first two metadata columns when searching for fields
-                columns_to_search = list(df.columns)[2:]
-                lower_candidates = [x.lower() for x in col_candidates]
-                for c in columns_to_search:
-                    if c.lower() in lower_candidates:
-                        return row[c], c
-                return None, None
-
-            identification, identification_col = _get(['Identification Type', 'identification_type', 'id_type'])
-            res_st, res_st_col = _get(['Where are you currently staying?', 'where_currently_staying', 'residential_status'])
-            marital, marital_col = _get(['Marital Status', 'marital_status'])
-            labour, labour_col = _get(['Labour Force Status', 'labour_force_status', 'activity_status'])
-            looking, looking_col = _get(['Are you actively looking for a new job?', 'looking_for_job', 'i_l'])
-            # postal code check removed per final cleanup
-            travel, travel_col = _get(['TravelTime', 'travel_time', 'travel_minutes'])
-            job_title, job_title_col = _get(['Job Title', 'job_title'])
-            total_years, total_years_col = _get(['TotalYearsEmployed', 'total_years'])
-            years_current, years_current_col = _get(['YearsCurrentJob', 'years_current'])
-            age, age_col = _get(['Age', 'age'])
-            age_started, age_started_col = _get(['At what age did you start employment'])
-            num_children, num_children_col = _get(['Number of children given birth to'])
-            employment_status, employment_status_col = _get(['Employment Status', 'employment_status'])
-            monthly_income, monthly_income_col = _get(['Last drawn GMI'])
-            # Next-15 candidate fields (best-effort mapping)
-            e_occ, e_occ_col = _get(['What kind of occupation were you looking for?'])
-            w_desc, w_desc_col = _get(['Main tasks / duties'])
-            emp_flag, emp_flag_col = _get(['_EMP_', 'is_employed', 'employed_flag'])
-            e_empst, e_empst_col = _get(['E_EMPST', 'employment_status_detail'])
-            empst, empst_col = _get(['_EMPST', 'emp_status'])
-            u_l, u_l_col = _get(['U_L', 'actively_looking'])
-            u_w, u_w_col = _get(['U_W', 'available_to_start'])
-            i_w, i_w_col = _get(['I_W', 'inability_to_work'])
-            e_w, e_w_col = _get(['E_W', 'other_availability_flag'])
-            duration, duration_col = _get(['_DUR', 'duration', 'duration_years'])
-
-            # Run the validators from CLFS_Brain
-            # Survey rules
-            vr = validate_identification_type(identification, allowed_options=options)
-            id_col_for_report = identification_col or 'Identification Type'
-            if not vr.is_valid:
-                errors.append({'row': idx, 'col': id_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-            elif vr.corrected_value is not None and vr.corrected_value != identification:
-                target_col = identification_col or 'Identification Type'
-                mod_df.at[idx, target_col] = vr.corrected_value
-                corrections.append({'row': idx, 'col': target_col, 'from': identification, 'to': vr.corrected_value, 'rule': vr.rule_applied})
-
-            vr = validate_residential_st(res_st)
-            res_col_for_report = res_st_col or 'Where are you currently staying?'
-            if not vr.is_valid:
-                errors.append({'row': idx, 'col': res_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_h_sep_y(marital)
-            marital_col_for_report = marital_col or 'Marital Status'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': marital_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_activity_status(labour)
-            labour_col_name = labour_col or 'Labour Force Status'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': labour_col_name, 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_i_l(looking)
-            looking_col_for_report = looking_col or 'Are you actively looking for a new job?'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': looking_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            # Next-15 validators
-            vr = validate_occupation_details(employment_status, e_occ, w_desc)
-            occ_col_for_report = job_title_col or e_occ_col or w_desc_col or 'Job Title'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': occ_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_employment_consistency(emp_flag, e_empst, empst, labour)
-            emp_cons_col_for_report = emp_flag_col or e_empst_col or empst_col or labour_col or 'Labour Force Status'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': emp_cons_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_seeking_work_logic(u_l, u_w, i_w, e_w)
-            seeking_col_for_report = u_l_col or u_w_col or i_w_col or e_w_col or 'Are you actively looking for a new job?'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': seeking_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_duration_numeric(duration)
-            duration_col_for_report = duration_col or 'Total Duration'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': duration_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            # Logic rules
-            ms_val, ms_col = _get(['SomeMultiSelectQuestion','multi_select'])
-            vr = validate_none_of_the_above_exclusive(ms_val)
-            ms_col_for_report = ms_col or 'SomeMultiSelectQuestion'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': ms_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            # postal code validation removed
-
-            vr = validate_travel_time_format(travel)
-            travel_col_for_report = travel_col or 'TravelTime'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': travel_col_for_report, 'rule': vr.rule_applied, 'message': vr.message})
-
-            # Cross-field rules
-            vr = validate_years_in_employment_consistency(total_years, years_current, age, age_started)
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': 'EmploymentYears', 'rule': vr.rule_applied, 'message': vr.message})
-
-            vr = validate_num_children(num_children, age)
-            num_children_col_name = num_children_col or 'Number of children given birth to'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': num_children_col_name, 'rule': vr.rule_applied, 'message': vr.message})
-
-            # language-vs-ethnicity validation removed
-
-            # Financial rules
-            vr = validate_oaw_income_threshold(employment_status, monthly_income)
-            monthly_income_col_name = monthly_income_col or 'Last drawn GMI'
-            if vr and not vr.is_valid:
-                errors.append({'row': idx, 'col': monthly_income_col_name, 'rule': vr.rule_applied, 'message': vr.message})
+    id_corrections = id_corrections[household_order.reindex(id_corrections.index).notna().to_numpy()]
+    corrections = []
+    corrected_cols = []
+    if len(id_corrections):
+        target_col = fields['identification']
+        mod_df[target_col] = mod_df[target_col].astype(object)
+        mod_df.loc[id_corrections.index, target_col] = id_corrections['corrected']
+        corrected_cols.append(target_col)
+        corrections = [
+            {'row': idx, 'col': target_col, 'from': df.at[idx, target_col], 'to': c['corrected'], 'rule': c['rule']}
+            for idx, c in id_corrections.iterrows()
+        ]
 
     # Write validated dataframe to Excel
     out_validated = ROOT / (csv_path.stem + "_validated.xlsx")
@@ -273,21 +227,12 @@ def run_pipeline(csv_path: Path = CSV_PATH, answer_json_path: Path = ANSWER_JSON
 
         # Red text for any auto-corrected value (mod_df differs from original df)
         red_font = Font(color='FFFF0000')
-        for idx in mod_df.index:
-            for col in mod_df.columns:
-                if col not in df.columns:
-                    continue
-                try:
-                    orig_val = df.at[idx, col]
-                except Exception:
-                    orig_val = None
-                new_val = mod_df.at[idx, col]
-                if orig_val is not None and str(orig_val) != str(new_val):
-                    excel_row = int(idx) + 2
-                    c = col_to_idx.get(col, None)
-                    if c is None:
-                        continue
-                    ws.cell(row=excel_row, column=c).font = red_font
+        for col in corrected_cols:
+            orig = df[col]
+            changed = orig.astype(str).ne(mod_df[col].astype(str)) & (orig.to_numpy(dtype=object) != None)  # noqa: E711
+            c = col_to_idx[col]
+            for idx in mod_df.index[changed.to_numpy()]:
+                ws.cell(row=int(idx) + 2, column=c).font = red_font
 
         wb.save(out_validated)
     print(f"Wrote validated workbook: {out_validated.name}")
@@ -314,23 +259,18 @@ def run_pipeline(csv_path: Path = CSV_PATH, answer_json_path: Path = ANSWER_JSON
     name_col = _find_col(df, ['membername', 'member name', 'name', 'full name', 'fullname'])
 
     # Details: File Name, Row Number (original CSV), Response ID, Member Name, Rule ID, Column Name, Error Message
-    details_rows = []
-    for e in errors:
-        idx = int(e['row'])
-        original_csv_row = idx + SKIPROWS + 2  # account for header and skiprows so original CSV row matches
-        resp_val = df.at[idx, resp_col] if resp_col and resp_col in df.columns else ''
-        name_val = df.at[idx, name_col] if name_col and name_col in df.columns else ''
-        details_rows.append({
-            'File Name': csv_path.name,
-            'Row Number': original_csv_row,
-            'Response ID': resp_val,
-            'Member Name': name_val,
-            'Rule ID': e.get('rule'),
-            'Column Name': e.get('col'),
-            'Error Message': e.get('message'),
-        })
-
-    df_details = pd.DataFrame(details_rows)
+    def _values_at(col_name):
+        return df[col_name].loc[found['row']].to_numpy() if col_name and col_name in df.columns else ''
+
+    df_details = pd.DataFrame({
+        'File Name': csv_path.name,
+        'Row Number': found['row'].to_numpy() + SKIPROWS + 2,  # account for header and skiprows so original CSV row matches
+        'Response ID': _values_at(resp_col),
+        'Member Name': _values_at(name_col),
+        'Rule ID': found['rule'].to_numpy(),
+        'Column Name': found['col'].to_numpy(),
+        'Error Message': found['message'].to_numpy(),
+    }) if errors else pd.DataFrame()
 
     out_report = ROOT / (csv_path.stem + "_validation_report.xlsx")
     with pd.ExcelWriter(out_report) as writer:
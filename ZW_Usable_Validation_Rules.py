@@ -2,6 +2,9 @@ from dataclasses import dataclass
 from typing import Optional, List, Tuple
 import re
 
+import numpy as np
+import pandas as pd
+
 
 @dataclass
 class ValidationResult:
@@ -12,6 +15,21 @@ class ValidationResult:
     rule_applied: Optional[str] = None
 
 
+# Keyword lists shared by the per-value validators and their column versions
+ACTIVITY_STATUSES = [
+    'employed', 'employee', 'employer', 'own account worker', 'contributing family worker',
+    'schooling', 'studying', 'working while schooling', 'not working', 'not in labour force'
+]
+LOOKING_FLAGS = ('yes', 'no', 'y', 'n')
+EMPLOYED_KEYWORDS = ["employ", "working", "employee", "self-employed", "own account"]
+WORKING_KEYWORDS = ["employ", "working", "employee", "own account", "oaw"]
+NOT_EMPLOYED_FLAGS = ("no", "n", "not employed", "none", "")
+EMPLOYED_FLAGS = ("yes", "y", "employed")
+YES_VALUES = ('yes', 'y', '1', 'true')
+NO_VALUES = ('no', 'n', '0', 'false')
+OAW_KEYWORDS = ["own account", "own-account", "own account worker", "self-employed", "running own business"]
+
+
 # --- Helpers ---
 
 def _normalize_text(text: Optional[str]) -> str:
@@ -42,6 +60,16 @@ def _to_number_nullable(v: Optional[object]) -> Optional[float]:
         return None
 
 
+def _to_float_or_none(v: Optional[object]) -> Optional[float]:
+    """float(v); None for None/empty or unparseable values."""
+    try:
+        if v is None or str(v).strip() == "":
+            return None
+        return float(v)
+    except Exception:
+        return None
+
+
 def _word_count(text: Optional[str]) -> int:
     if not text:
         return 0
@@ -126,11 +154,7 @@ def validate_activity_status(value: Optional[str]) -> ValidationResult:
     if value is None or str(value).strip() == "":
         return ValidationResult(is_valid=False, message="Activity status missing", original_value=original)
     v = str(value).strip().lower()
-    allowed = [
-        'employed', 'employee', 'employer', 'own account worker', 'contributing family worker',
-        'schooling', 'studying', 'working while schooling', 'not working', 'not in labour force'
-    ]
-    if any(a in v for a in allowed):
+    if any(a in v for a in ACTIVITY_STATUSES):
         return ValidationResult(is_valid=True, message="Activity status valid", original_value=original, rule_applied='ACTIVITY_ST')
     return ValidationResult(is_valid=False, message="Unrecognised activity status", original_value=original, rule_applied='ACTIVITY_ST')
 
@@ -140,7 +164,7 @@ def validate_i_l(value: Optional[str]) -> ValidationResult:
     if value is None or str(value).strip() == "":
         return ValidationResult(is_valid=True, message="No looking-for-job flag provided", original_value=original)
     v = str(value).strip().lower()
-    if v in ('yes', 'no', 'y', 'n'):
+    if v in LOOKING_FLAGS:
         return ValidationResult(is_valid=True, message="Looking-for-job flag OK", original_value=original, rule_applied='I_L')
     return ValidationResult(is_valid=False, message="Looking-for-job flag must be Yes or No", original_value=original, rule_applied='I_L')
 
@@ -179,18 +203,10 @@ def validate_travel_time_format(value: Optional[str]) -> ValidationResult:
 def validate_years_in_employment_consistency(total_years: Optional[object], years_current: Optional[object], age: Optional[object], age_started_employment: Optional[object]) -> ValidationResult:
     orig = f"total={total_years}, current={years_current}, age={age}, started={age_started_employment}"
 
-    def _to_float(v):
-        try:
-            if v is None or str(v).strip() == "":
-                return None
-            return float(v)
-        except Exception:
-            return None
-
-    t = _to_float(total_years)
-    c = _to_float(years_current)
-    a = _to_float(age)
-    s = _to_float(age_started_employment)
+    t = _to_float_or_none(total_years)
+    c = _to_float_or_none(years_current)
+    a = _to_float_or_none(age)
+    s = _to_float_or_none(age_started_employment)
 
     if t is None or c is None:
         return ValidationResult(is_valid=True, message="Insufficient data for years-in-employment consistency check", original_value=orig)
@@ -238,7 +254,7 @@ def validate_num_children(num_children: Optional[object], age: Optional[object])
 def validate_oaw_income_threshold(employment_status: Optional[str], monthly_income: Optional[object]) -> ValidationResult:
     orig = f"emp={employment_status}, income={monthly_income}"
     emp = str(employment_status or "").lower()
-    is_oaw = any(k in emp for k in ["own account", "own-account", "own account worker", "self-employed", "running own business"]) 
+    is_oaw = any(k in emp for k in OAW_KEYWORDS)
     income = _to_number_nullable(monthly_income)
     if not is_oaw:
         return ValidationResult(is_valid=True, message="Not an Own Account Worker; rule not applicable", original_value=orig, rule_applied='RULE_34_OAW_INCOME')
@@ -257,7 +273,7 @@ def validate_occupation_details(employment_status: Optional[str], e_occ: Optiona
     """If employed, ensure occupation code/description are present."""
     orig = f"emp={employment_status}, e_occ={e_occ}, w_desc={w_desc}"
     emp = str(employment_status or "").lower()
-    is_employed = any(k in emp for k in ["employ", "working", "employee", "self-employed", "own account"]) or emp in ("employed", "w")
+    is_employed = any(k in emp for k in EMPLOYED_KEYWORDS) or emp in ("employed", "w")
     if not is_employed:
         return ValidationResult(is_valid=True, message="Not employed; occupation details not applicable", original_value=orig)
     # If employed, require either occupation code or work description
@@ -270,14 +286,14 @@ def validate_employment_consistency(emp_flag: Optional[str], e_empst: Optional[s
     """Cross-check employment flags/status values for major inconsistencies."""
     orig = f"emp_flag={emp_flag}, e_empst={e_empst}, empst={empst}, labour={labour_force_status}"
     lf = str(labour_force_status or "").lower()
-    indicates_working = any(k in lf for k in ["employ", "working", "employee", "own account", "oaw"]) 
+    indicates_working = any(k in lf for k in WORKING_KEYWORDS)
     # emp_flag may be textual like 'Yes' for employed indicator
     empf = str(emp_flag or "").lower()
     # If labour indicates working but emp_flag suggests not employed => inconsistent
-    if indicates_working and empf in ("no", "n", "not employed", "none", ""):
+    if indicates_working and empf in NOT_EMPLOYED_FLAGS:
         return ValidationResult(is_valid=False, message="Labour force status indicates working but employment flag/state indicates not employed", original_value=orig, rule_applied='EMP_CONSISTENCY')
     # If labour indicates not working but emp_flag or empst indicates employed => inconsistent
-    if (not indicates_working) and (empf in ("yes", "y", "employed") or (empst and 'employ' in str(empst).lower()) or (e_empst and 'employ' in str(e_empst).lower())):
+    if (not indicates_working) and (empf in EMPLOYED_FLAGS or (empst and 'employ' in str(empst).lower()) or (e_empst and 'employ' in str(e_empst).lower())):
         return ValidationResult(is_valid=False, message="Labour force status indicates not working but employment fields indicate employed", original_value=orig, rule_applied='EMP_CONSISTENCY')
     return ValidationResult(is_valid=True, message="Employment consistency checks passed", original_value=orig, rule_applied='EMP_CONSISTENCY')
 
@@ -290,9 +306,9 @@ def validate_seeking_work_logic(u_l: Optional[str], u_w: Optional[str], i_w: Opt
         if x is None:
             return None
         t = str(x).strip().lower()
-        if t in ('yes','y','1','true'):
+        if t in YES_VALUES:
             return True
-        if t in ('no','n','0','false'):
+        if t in NO_VALUES:
             return False
         return None
 
@@ -338,3 +354,238 @@ def validate_duration_numeric(duration: Optional[object]) -> ValidationResult:
             return ValidationResult(is_valid=False, message="Duration in years out of expected bounds", original_value=original, rule_applied='DURATION_NUM')
     return ValidationResult(is_valid=True, message="Duration numeric and within bounds", original_value=original, rule_applied='DURATION_NUM')
 
+
+# -------------------
+# Column-at-once versions
+# -------------------
+# Each function below runs one rule over whole columns: one pandas Series per
+# field, or None when the file has no such column (what the per-value
+# validator receives in that case). It returns only the failing rows, as a
+# DataFrame with 'rule' and 'message' columns indexed like the input. The
+# results equal calling the per-value validator on every row. Free text is
+# compared as str(value), `value or ""` becomes '' for falsy cells, and the
+# numeric and fuzzy-match helpers run once per distinct value.
+# validate_h_sep_y never fails, so it has no column version.
+
+FAILURE_COLUMNS = ['rule', 'message']
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """str(value) per row; None is "" as in the per-value validators (NaN stays 'nan', as str gives)."""
+    return values.astype(str).mask(values.to_numpy(dtype=object) == None, "")  # noqa: E711
+
+
+def _text_or_empty(values: Optional[pd.Series], index: pd.Index) -> pd.Series:
+    """str(value or "") per row."""
+    if values is None:
+        return pd.Series("", index=index, dtype=object)
+    return _text(values).mask(values.isin([0, ""]), "")
+
+
+def _is_blank(values: Optional[pd.Series]):
+    """value is None or str(value).strip() == "" per row."""
+    if values is None:
+        return True
+    return _text(values).str.strip() == ""
+
+
+def _contains_any(text: pd.Series, keywords) -> pd.Series:
+    return text.str.contains("|".join(re.escape(k) for k in keywords), regex=True)
+
+
+def _unique_map(values: pd.Series, func) -> np.ndarray:
+    """
+    func(value) per row (object array), evaluated once per distinct value.
+    Object cells are keyed with their type, so 1/True/1.0 and None/NaN stay distinct.
+    """
+    if values.dtype == object:
+        cells = values.to_numpy()
+        keys = np.empty(len(cells), dtype=object)
+        keys[:] = [(type(v), v) for v in cells]
+        codes, uniques = pd.factorize(keys)
+        uniques = [u[1] for u in uniques]
+    else:
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.empty(len(uniques), dtype=object)
+    for i, u in enumerate(uniques):
+        mapped[i] = func(u)
+    return mapped[codes]
+
+
+def _numbers(values: Optional[pd.Series], index: pd.Index, parser) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    parser(value) per row as float64 (NaN where it returns None) and the mask
+    of rows where it did not return None; parsed text such as 'nan' counts as given.
+    """
+    if values is None:
+        return np.full(len(index), np.nan), np.zeros(len(index), dtype=bool)
+    parsed = _unique_map(values, parser)
+    given = parsed != None  # noqa: E711
+    return np.where(given, parsed, np.nan).astype(float), given
+
+
+def _failures(index: pd.Index, cases) -> pd.DataFrame:
+    """Failing rows for (mask, rule, message) cases checked in order; the first matching case wins."""
+    rule = np.full(len(index), None, dtype=object)
+    message = np.full(len(index), None, dtype=object)
+    failed = np.zeros(len(index), dtype=bool)
+    for mask, rule_id, text in cases:
+        hit = np.broadcast_to(np.asarray(mask, dtype=bool), len(index)) & ~failed
+        rule[hit] = rule_id
+        message[hit] = text
+        failed |= hit
+    return pd.DataFrame({'rule': rule[failed], 'message': message[failed]}, index=index[failed])
+
+
+def identification_type_column(values: Optional[pd.Series], index: pd.Index, allowed_options: Optional[List[str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    validate_identification_type per row: (failures, corrections). corrections
+    holds the 'corrected' value and its 'rule' for valid rows whose matched
+    option differs from the original value.
+    """
+    if values is None:
+        vr = validate_identification_type(None, allowed_options)
+        return _failures(index, [(True, vr.rule_applied, vr.message)]), pd.DataFrame(columns=['corrected', 'rule'], index=index[:0], dtype=object)
+    results = _unique_map(_text(values), lambda v: validate_identification_type(v, allowed_options))
+    invalid = np.array([not vr.is_valid for vr in results], dtype=bool)
+    failures = pd.DataFrame({
+        'rule': [vr.rule_applied for vr in results[invalid]],
+        'message': [vr.message for vr in results[invalid]],
+    }, index=index[invalid], dtype=object)
+    corrections = pd.DataFrame({
+        'corrected': [vr.corrected_value for vr in results],
+        'rule': [vr.rule_applied for vr in results],
+    }, index=index, dtype=object)
+    changed = ~invalid & corrections['corrected'].notna() & corrections['corrected'].ne(values)
+    return failures, corrections[changed]
+
+
+def residential_st_column(values: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    if values is None:
+        return _failures(index, [])
+    institutional = _text(values).str.strip().str.lower() == 'institutional unit'
+    return _failures(index, [(institutional, 'RESIDENTIAL_ST', "Respondent staying in institutional unit — interview should end")])
+
+
+def activity_status_column(values: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    if values is None:
+        return _failures(index, [(True, None, "Activity status missing")])
+    v = _text(values).str.strip().str.lower()
+    return _failures(index, [
+        (v == "", None, "Activity status missing"),
+        (~_contains_any(v, ACTIVITY_STATUSES), 'ACTIVITY_ST', "Unrecognised activity status"),
+    ])
+
+
+def i_l_column(values: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    if values is None:
+        return _failures(index, [])
+    v = _text(values).str.strip().str.lower()
+    return _failures(index, [((v != "") & ~v.isin(LOOKING_FLAGS), 'I_L', "Looking-for-job flag must be Yes or No")])
+
+
+def none_of_the_above_exclusive_column(answers: Optional[pd.Series], index: pd.Index, none_option_text: str = "None of the above") -> pd.DataFrame:
+    if answers is None:
+        return _failures(index, [])
+    parts = _text_or_empty(answers, index).str.split(r"[;|,]", regex=True).explode().str.strip()
+    parts = parts[parts != ""].str.lower()
+    is_none = parts == none_option_text.strip().lower()
+    mixed = is_none.groupby(level=0).any() & (~is_none).groupby(level=0).any()
+    mixed = mixed.reindex(index, fill_value=False)
+    return _failures(index, [(mixed, 'NONE_OF_THE_ABOVE_EXCLUSIVE', "None-of-the-above selected together with other responses")])
+
+
+def travel_time_format_column(values: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    if values is None:
+        return _failures(index, [])
+    v = _text(values).str.strip()
+    return _failures(index, [(
+        (v != "") & ~v.str.fullmatch(r"0|[1-9]\d*"), 'RULE_36_TRAVEL_TIME',
+        "Invalid travel time format (expect integer minutes, no symbols or leading zeros)",
+    )])
+
+
+def years_in_employment_consistency_column(total_years: Optional[pd.Series], years_current: Optional[pd.Series], age: Optional[pd.Series], age_started_employment: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    # Missing values are NaN here, so every comparison involving one is False
+    t, t_given = _numbers(total_years, index, _to_float_or_none)
+    c, c_given = _numbers(years_current, index, _to_float_or_none)
+    a, _ = _numbers(age, index, _to_float_or_none)
+    s, _ = _numbers(age_started_employment, index, _to_float_or_none)
+    both_given = t_given & c_given
+    with np.errstate(invalid='ignore'):
+        implied = a - s
+        return _failures(index, [
+            (t < c, 'RULE_37_YEARS', "Total years in employment is less than years in current job"),
+            (both_given & (implied < 0), 'RULE_37_YEARS', "Inconsistent ages: started employment after current age?"),
+            (both_given & (t > implied + 1), 'RULE_37_YEARS', "Total years in employment exceeds plausible maximum based on age and start age"),
+        ])
+
+
+def num_children_column(num_children: Optional[pd.Series], age: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    # int() of a parsed nan/inf raises in the per-value validator: 'not numeric'
+    nc, nc_given = _numbers(num_children, index, _to_number_nullable)
+    a = np.trunc(_numbers(age, index, _to_number_nullable)[0])
+    has_children = np.trunc(nc) > 0
+    with np.errstate(invalid='ignore'):
+        return _failures(index, [
+            (nc_given & ~np.isfinite(nc), 'RULE_20_NUM_CHILDREN', "Invalid number of children (not numeric)"),
+            (np.isfinite(a) & (a < 12) & has_children, 'RULE_20_NUM_CHILDREN', "Impossible: respondent age < 12 but reported children > 0"),
+            (np.isfinite(a) & (a < 15) & has_children, 'RULE_20_NUM_CHILDREN', "Unusual: respondent age < 15 but reported children > 0; verify responses"),
+        ])
+
+
+def oaw_income_threshold_column(employment_status: Optional[pd.Series], monthly_income: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    is_oaw = _contains_any(_text_or_empty(employment_status, index).str.lower(), OAW_KEYWORDS)
+    income, _ = _numbers(monthly_income, index, _to_number_nullable)
+    with np.errstate(invalid='ignore'):
+        return _failures(index, [(is_oaw & (income < 200), 'RULE_34_OAW_INCOME', "Own Account Worker reports monthly income < $200; confirm with interviewer")])
+
+
+def occupation_details_column(employment_status: Optional[pd.Series], e_occ: Optional[pd.Series], w_desc: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    emp = _text_or_empty(employment_status, index).str.lower()
+    is_employed = _contains_any(emp, EMPLOYED_KEYWORDS) | emp.isin(("employed", "w"))
+    return _failures(index, [(is_employed & _is_blank(e_occ) & _is_blank(w_desc), 'E_OCC_W_DESC', "Employed but occupation code/description missing")])
+
+
+def employment_consistency_column(emp_flag: Optional[pd.Series], e_empst: Optional[pd.Series], empst: Optional[pd.Series], labour_force_status: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    def mentions_employ(values):
+        if values is None:
+            return False
+        return _text(values).str.lower().str.contains('employ', regex=False)
+
+    indicates_working = _contains_any(_text_or_empty(labour_force_status, index).str.lower(), WORKING_KEYWORDS)
+    empf = _text_or_empty(emp_flag, index).str.lower()
+    return _failures(index, [
+        (indicates_working & empf.isin(NOT_EMPLOYED_FLAGS), 'EMP_CONSISTENCY',
+         "Labour force status indicates working but employment flag/state indicates not employed"),
+        (~indicates_working & (empf.isin(EMPLOYED_FLAGS) | mentions_employ(empst) | mentions_employ(e_empst)), 'EMP_CONSISTENCY',
+         "Labour force status indicates not working but employment fields indicate employed"),
+    ])
+
+
+def seeking_work_logic_column(u_l: Optional[pd.Series], u_w: Optional[pd.Series], i_w: Optional[pd.Series], e_w: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    def yn(values, answers):
+        if values is None:
+            return False
+        return _text(values).str.strip().str.lower().isin(answers)
+
+    return _failures(index, [
+        (yn(u_l, YES_VALUES) & yn(u_w, NO_VALUES), 'SEEKING_LOGIC',
+         "Actively looking for work but not available to start/accept work"),
+        (yn(u_w, YES_VALUES) & yn(u_l, NO_VALUES) & yn(i_w, YES_VALUES), 'SEEKING_LOGIC',
+         "Marked available but indicates other unavailability flags; inconsistent job-seeking info"),
+    ])
+
+
+def duration_numeric_column(durations: Optional[pd.Series], index: pd.Index) -> pd.DataFrame:
+    if durations is None:
+        return _failures(index, [])
+    original = _text(durations).str.strip()
+    num = original.str.extract(r"([0-9]+(?:\.[0-9]+)?)", expand=False)
+    value = num.astype(float)
+    in_months = original.str.lower().str.contains('month', regex=False)
+    return _failures(index, [
+        ((original != "") & num.isna(), 'DURATION_NUM', "Duration does not contain a numeric value"),
+        (in_months & (value > 2400), 'DURATION_NUM', "Duration in months out of expected bounds"),
+        (~in_months & (value > 200), 'DURATION_NUM', "Duration in years out of expected bounds"),
+    ])
@@ -3,68 +3,86 @@
 
 Writes: output/applied_corrections_audit.csv
 Columns: excel_row, df_index, column, old_value, new_value
+
+The two 'Complete Dataset' sheets are aligned by Response ID (row position when
+there is none) and compared as normalized text arrays (ZW_corrections_engine.diff_datasets).
+Every changed cell is also written to the compact audit log
+(output/applied_corrections_report_log.csv, or a .parquet path with --log) together
+with the rule of the Details correction behind it, so later questions can be
+answered from the log alone:
+
+    python ZW_applied_corrections_report.py --summary-only --by rule
+    python ZW_applied_corrections_report.py --summary-only --by applied_by column
+
+The applier (ZW_applied_corrections_audit_V2) logs the same changes as it makes
+them, so this report keeps its own log by default, and a re-run for the same
+applied workbook replaces its earlier rows rather than adding them again.
 """
+import argparse
 from pathlib import Path
+from typing import List, Optional
+
 import pandas as pd
 
-report = Path("output") / "CLFS_contextually_wrong_answers_validation_report.xlsx"
-applied = Path("output") / "CLFS_contextually_wrong_answers_validation_applied.xlsx"
-out_csv = Path("output") / "applied_corrections_audit.csv"
-
-if not report.exists():
-    raise SystemExit(f"Report not found: {report}")
-if not applied.exists():
-    raise SystemExit(f"Applied workbook not found: {applied}")
-
-# Read Complete Dataset sheets as object dtype to preserve values
-orig = pd.read_excel(report, sheet_name='Complete Dataset', dtype=object)
-new = pd.read_excel(applied, sheet_name='Complete Dataset', dtype=object)
-
-# Align columns: use intersection to avoid reporting unrelated columns
-cols = list(sorted(set(orig.columns).union(set(new.columns)), key=lambda x: str(x)))
-
-max_rows = max(len(orig), len(new))
-
-changes = []
-for i in range(max_rows):
-    for col in cols:
-        try:
-            old = orig.at[i, col] if col in orig.columns and i in orig.index else None
-        except Exception:
-            old = None
-        try:
-            cur = new.at[i, col] if col in new.columns and i in new.index else None
-        except Exception:
-            cur = None
-        # Normalize NaN -> None for comparison
-        if pd.isna(old):
-            old_val = None
-        else:
-            old_val = old
-        if pd.isna(cur):
-            new_val = None
-        else:
-            new_val = cur
-        if (old_val is None and new_val is None):
-            continue
-        # Compare string representations to capture e.g., int vs '1'
-        if (None if old_val is None else str(old_val)) != (None if new_val is None else str(new_val)):
-            changes.append({
-                'excel_row': i + 2,  # header row is 1
-                'df_index': i,
-                'column': col,
-                'old_value': old_val,
-                'new_value': new_val,
-            })
-
-out_csv.parent.mkdir(parents=True, exist_ok=True)
-if changes:
-    audit_df = pd.DataFrame(changes)
-    audit_df.to_csv(out_csv, index=False, encoding='utf-8-sig')
-    print(f"Wrote audit CSV with {len(changes)} changes to: {out_csv}")
-else:
-    # write empty csv with headers
-    pd.DataFrame(columns=['excel_row','df_index','column','old_value','new_value']).to_csv(out_csv, index=False, encoding='utf-8-sig')
-    print("No differences found between sheets. Wrote empty audit CSV to:", out_csv)
-
-print("Done.")
+import ZW_corrections_engine as engine
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit the cells changed by ZW_applied_corrections")
+    parser.add_argument("--report", default=str(Path("output") / "CLFS_contextually_wrong_answers_validation_report.xlsx"))
+    parser.add_argument("--applied", default=str(Path("output") / "CLFS_contextually_wrong_answers_validation_applied.xlsx"))
+    parser.add_argument("--out-csv", default=str(Path("output") / "applied_corrections_audit.csv"))
+    parser.add_argument("--log", default=str(engine.DEFAULT_REPORT_LOG_FILE),
+                        help="Audit log to write to (.csv, or .parquet when pyarrow/fastparquet is installed; "
+                             "a Parquet log is rewritten in full on every run)")
+    parser.add_argument("--applied-by", default=None, help="Who applied the corrections (default: current user)")
+    parser.add_argument("--by", nargs="+", default=["rule"],
+                        help="Summary grouping: any of rule, applied_by, column, response_id, timestamp")
+    parser.add_argument("--summary-only", action="store_true", help="Summarize the existing audit log and exit")
+    parser.add_argument("--all-runs", action="store_true",
+                        help="Summarize every run in the log, not only the latest per tool and workbook")
+    args = parser.parse_args(argv)
+
+    if args.summary_only:
+        if not Path(args.log).exists():
+            raise SystemExit(f"Audit log not found: {args.log}")
+        log = engine.load_audit_log(Path(args.log))
+        print(engine.summarize_audit(log, args.by, all_runs=args.all_runs).to_string(index=False))
+        return 0
+
+    report = Path(args.report)
+    applied = Path(args.applied)
+    out_csv = Path(args.out_csv)
+    if not report.exists():
+        raise SystemExit(f"Report not found: {report}")
+    if not applied.exists():
+        raise SystemExit(f"Applied workbook not found: {applied}")
+
+    # Read Complete Dataset sheets as object dtype to preserve values
+    report_sheets = pd.read_excel(report, sheet_name=None, dtype=object)
+    orig = report_sheets[engine.COMPLETE_SHEET]
+    new = pd.read_excel(applied, sheet_name=engine.COMPLETE_SHEET, dtype=object)
+
+    audit = engine.diff_datasets(orig, new)
+    if engine.DETAILS_SHEET in report_sheets:
+        audit = engine.attach_rules(audit, engine.plan_changes(report_sheets[engine.DETAILS_SHEET], orig))
+
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    audit[engine.AUDIT_COLUMNS].to_csv(out_csv, index=False, encoding='utf-8-sig')
+    if len(audit):
+        print(f"Wrote audit CSV with {len(audit)} changes to: {out_csv}")
+    else:
+        print("No differences found between sheets. Wrote empty audit CSV to:", out_csv)
+
+    log = engine.build_audit_log(audit, applied_by=args.applied_by, source="report", input_file=applied)
+    log_path = engine.write_audit_log(log, Path(args.log), replace_previous=True)
+    print(f"Wrote {len(log)} changes to audit log: {log_path}")
+    if len(log):
+        print(engine.summarize_audit(log, args.by).to_string(index=False))
+
+    print("Done.")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
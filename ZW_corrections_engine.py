@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""Correction-application engine shared by ZW_applied_corrections and ZW_applied_corrections_audit_V2
+
+pd.read_excel reads every sheet of the report as cached cell values (formula
+cells give their last computed result, not the formula text) and the workbook
+itself is only loaded with openpyxl to write the highlighted copy; every
+Details row is normalized into one (target_row, column, new_value) frame with
+vectorized parsing, column names are resolved through a precomputed header map
+and the corrections are applied with one indexed assignment per touched column.
+
+Every applied change (and every cell that differs between an original and an
+applied Complete Dataset, see diff_datasets) can be kept as a compact audit log
+of (response_id, column, old, new, rule, applied_by, timestamp) rows, CSV or
+Parquet, which summarize_audit answers questions from without re-reading the
+workbooks. Rows carry the run that wrote them (run_id), the tool (source) and
+the workbook they describe (input), so a log shared by several tools or re-runs
+can be narrowed to the latest run of each (source, input).
+
+Details rows are interpreted exactly like the original per-row loop:
+ - 'row' is 1-based (int(float(row)) - 1) and must fall inside 'Complete Dataset'
+ - targets are 'column' split on '&', then the numbered column_n fields
+ - correction k (corrections, corrections_2, corrections_3) goes to target k,
+   or to the first target when there are fewer targets
+ - column names match exactly, else case-insensitively (first match wins)
+ - a correction is a change only when it differs from the cell's current text;
+   several corrections to one cell are applied in order
+"""
+import getpass
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import PatternFill
+
+DETAILS_SHEET = 'Details'
+COMPLETE_SHEET = 'Complete Dataset'
+CORRECTION_COLUMNS = ['corrections', 'corrections_2', 'corrections_3']
+EXCEL_SUFFIXES = {'.xlsx', '.xls', '.xlsm'}
+HIGHLIGHT_COLOR = 'FFA500'
+
+RULE_COLUMNS = ['Rule ID', 'rule', 'Rule']  # optional Details column naming the rule behind a correction
+
+AUDIT_COLUMNS = ['excel_row', 'df_index', 'column', 'old_value', 'new_value']
+CHANGE_COLUMNS = ['target_row', 'loc', 'response_id'] + AUDIT_COLUMNS + ['rule']
+
+RESPONSE_ID_COLUMNS = ['Response ID', 'ResponseID', 'Response_ID', 'Response Id']
+LOG_COLUMNS = [
+    'response_id', 'excel_row', 'column', 'old', 'new', 'rule', 'applied_by', 'timestamp',
+    'run_id', 'source', 'input',
+]
+LOG_RUN_KEY = ['source', 'input']
+DEFAULT_LOG_FILE = Path("output") / "applied_corrections_log.csv"
+# ZW_applied_corrections_report re-derives the applier's changes from the workbooks,
+# so its rows go to their own log instead of counting every change a second time
+DEFAULT_REPORT_LOG_FILE = Path("output") / "applied_corrections_report_log.csv"
+
+
+def load_report(path: Path) -> tuple[Workbook, dict[str, pd.DataFrame]]:
+    """
+    The report workbook (formulas kept, for writing the highlighted copy) and
+    every sheet of it as a DataFrame of cell values.
+
+    The DataFrames are read from the path (openpyxl data_only=True): reading
+    them from the writable workbook would return formula cells as '=...' text.
+    """
+    sheets = pd.read_excel(path, sheet_name=None, engine='openpyxl')
+    return load_workbook(path), sheets
+
+
+def correction_columns(details_df: pd.DataFrame) -> list[str]:
+    return [c for c in CORRECTION_COLUMNS if c in details_df.columns]
+
+
+def numbered_column_keys(columns) -> list[str]:
+    """The column_n fields read (in order) for every Details row, as the original loop walked them."""
+    present = set(columns)
+    keys = []
+    i = 2
+    while f'column_{i-1}' in present or f'column_{i}' in present:
+        keys.append(f'column_{i-1}' if f'column_{i-1}' in present else f'column_{i}')
+        i += 1
+    return keys
+
+
+def _stripped_text(series: pd.Series) -> pd.Series:
+    """str(value).strip() of the non-missing cells."""
+    return series[series.notna()].astype(str).str.strip()
+
+
+def _cell_text(values) -> np.ndarray:
+    """'' for missing values, str(value) otherwise."""
+    return np.array(['' if pd.isna(v) else str(v) for v in values], dtype=object)
+
+
+def _target_rows(details: pd.DataFrame, n_rows: int) -> pd.Series:
+    """0-based Complete Dataset row per Details row (only rows inside the dataset)."""
+    if 'row' not in details.columns:
+        return pd.Series(dtype=np.int64)
+    parsed = pd.to_numeric(_stripped_text(details['row']), errors='coerce')
+    parsed = parsed[np.isfinite(parsed)]
+    rows = np.trunc(parsed).astype(np.int64) - 1
+    return rows[(rows >= 0) & (rows < n_rows)]
+
+
+def _target_columns(details: pd.DataFrame) -> pd.DataFrame:
+    """Long frame (detail, position, name) of every row's target column names, in order."""
+    pieces = []
+    if 'column' in details.columns:
+        base = _stripped_text(details['column']).str.split('&').explode().str.strip()
+        pieces.append(base[base != ''])
+    for key in numbered_column_keys(details.columns):
+        pieces.append(_stripped_text(details[key]))
+    if not pieces:
+        return pd.DataFrame(columns=['detail', 'position', 'name'])
+    names = pd.concat(pieces).sort_index(kind='stable')
+    return pd.DataFrame({
+        'detail': names.index.to_numpy(),
+        'position': names.groupby(level=0).cumcount().to_numpy(),
+        'name': names.to_numpy(),
+    })
+
+
+def normalize_corrections(details_df: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    """
+    One row per correction to apply, in application order, with columns
+    detail, target_row, name (target column name as written in Details),
+    new_value and rule (None when Details has no rule column).
+    """
+    details = details_df.reset_index(drop=True)
+    empty = pd.DataFrame(columns=['detail', 'target_row', 'name', 'new_value', 'rule'])
+    target_rows = _target_rows(details, n_rows)
+    if target_rows.empty:
+        return empty
+
+    corrections = []
+    for idx_c, corr_col in enumerate(correction_columns(details)):
+        values = _stripped_text(details[corr_col])
+        values = values[(values != '') & values.index.isin(target_rows.index)]
+        corrections.append(pd.DataFrame({'detail': values.index, 'idx_c': idx_c, 'new_value': values.to_numpy()}))
+    targets = _target_columns(details)
+    if not corrections or targets.empty:
+        return empty
+    corrections = pd.concat(corrections, ignore_index=True)
+
+    # Correction k goes to target k, or to the first target when there are fewer targets
+    n_targets = targets.groupby('detail')['position'].size()
+    available = corrections['detail'].map(n_targets)
+    corrections = corrections[available.notna()]
+    available = available[available.notna()]
+    corrections = corrections.assign(position=np.where(corrections['idx_c'] < available, corrections['idx_c'], 0))
+    corrections = corrections.merge(targets, on=['detail', 'position'], how='inner')
+    corrections = corrections[corrections['name'] != '']
+
+    corrections = corrections.sort_values(['detail', 'idx_c'], kind='stable').reset_index(drop=True)
+    corrections['target_row'] = corrections['detail'].map(target_rows)
+    rule_col = next((c for c in RULE_COLUMNS if c in details.columns), None)
+    rules = _stripped_text(details[rule_col]) if rule_col else pd.Series(dtype=object)
+    corrections['rule'] = corrections['detail'].map(rules).astype(object).where(lambda r: r.notna(), None)
+    return corrections[['detail', 'target_row', 'name', 'new_value', 'rule']]
+
+
+def build_header_map(columns) -> tuple[dict, dict]:
+    """(exact name -> position, case-insensitive name -> position), first occurrence wins."""
+    exact: dict = {}
+    folded: dict[str, int] = {}
+    for loc, label in enumerate(columns):
+        exact.setdefault(label, loc)
+        folded.setdefault(str(label).strip().lower(), loc)
+    return exact, folded
+
+
+def resolve_column_positions(names: pd.Series, columns) -> pd.Series:
+    """Position in columns of every name (-1 when it does not match); each distinct name is resolved once."""
+    exact, folded = build_header_map(columns)
+    lookup = {}
+    for name in pd.unique(names):
+        loc = exact.get(name)
+        lookup[name] = loc if loc is not None else folded.get(name.lower(), -1)
+    return names.map(lookup).astype(np.int64)
+
+
+def plan_changes(details_df: pd.DataFrame, complete_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The corrections from Details that change a Complete Dataset cell, in
+    application order (target_row, loc, excel_row, df_index, column,
+    old_value, new_value, rule).
+    """
+    corrections = normalize_corrections(details_df, len(complete_df))
+    if corrections.empty:
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+
+    corrections['loc'] = resolve_column_positions(corrections['name'], complete_df.columns)
+    corrections = corrections[corrections['loc'] >= 0].reset_index(drop=True)
+    if corrections.empty:
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+
+    rows = corrections['target_row'].to_numpy(dtype=np.int64)
+    locs = corrections['loc'].to_numpy(dtype=np.int64)
+    original = np.empty(len(corrections), dtype=object)
+    for loc in np.unique(locs):
+        at_loc = locs == loc
+        original[at_loc] = complete_df.iloc[:, loc].to_numpy(dtype=object)[rows[at_loc]]
+
+    # The cell text before each correction is the previous correction to the same cell
+    # (applied, or already equal to the cell), else the original value
+    cell = [corrections['target_row'], corrections['loc']]
+    previous = corrections.groupby(cell)['new_value'].shift()
+    has_previous = previous.notna().to_numpy()
+    current_text = np.where(has_previous, previous.to_numpy(dtype=object), _cell_text(original))
+    changed = current_text != corrections['new_value'].to_numpy(dtype=object)
+
+    # Raw value replaced by each change: the last applied correction to the cell, else the original
+    applied = corrections['new_value'].where(changed)
+    last_applied = applied.groupby(cell).ffill().groupby(cell).shift()
+    old_value = np.where(last_applied.notna().to_numpy(), last_applied.to_numpy(dtype=object), original)
+
+    id_col = find_response_id_column(complete_df.columns)
+    changes = pd.DataFrame({
+        'target_row': rows,
+        'loc': locs,
+        'response_id': _cell_text(complete_df[id_col].to_numpy(dtype=object)[rows]) if id_col else None,
+        'excel_row': rows + 2,
+        'df_index': rows,
+        'column': [complete_df.columns[loc] for loc in locs],
+        'old_value': old_value,
+        'new_value': corrections['new_value'].to_numpy(dtype=object),
+        'rule': corrections['rule'].to_numpy(dtype=object),
+    })
+    return changes[changed].reset_index(drop=True)
+
+
+def apply_changes(complete_df: pd.DataFrame, changes: pd.DataFrame) -> pd.DataFrame:
+    """complete_df with every change applied (one indexed assignment per touched column)."""
+    final = changes.drop_duplicates(['target_row', 'loc'], keep='last')
+    for loc, group in final.groupby('loc'):
+        values = complete_df.iloc[:, loc].to_numpy(dtype=object).copy()
+        values[group['target_row'].to_numpy(dtype=np.int64)] = group['new_value'].to_numpy(dtype=object)
+        complete_df.isetitem(loc, values)
+    return complete_df
+
+
+def write_highlighted_workbook(wb: Workbook, output_path: Path, changes: pd.DataFrame) -> Optional[int]:
+    """
+    Saves wb (the loaded report) to output_path with every changed 'Complete Dataset'
+    cell rewritten and filled orange. Returns an error code when the sheet header
+    cannot be read.
+    """
+    ws = wb[COMPLETE_SHEET]
+    try:
+        first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
+    except Exception:
+        print(f"Error reading header row from '{COMPLETE_SHEET}' sheet")
+        return 7
+    header_cells = [str(v).strip() if v is not None else "" for v in first_row]
+    exact = {name: idx + 1 for idx, name in enumerate(header_cells) if name}
+    folded: dict[str, int] = {}
+    for name, idx in exact.items():
+        folded.setdefault(name.lower(), idx)
+
+    orange = PatternFill(start_color=HIGHLIGHT_COLOR, end_color=HIGHLIGHT_COLOR, fill_type='solid')
+    final_values = changes.drop_duplicates(['target_row', 'loc'], keep='last').set_index(['target_row', 'loc'])['new_value']
+    for trow, loc, col_name in zip(changes['target_row'], changes['loc'], changes['column']):
+        col_name = str(col_name)
+        col_idx = exact.get(col_name) or folded.get(col_name.lower())
+        if col_idx is None:
+            continue
+        cell = ws.cell(row=int(trow) + 2, column=col_idx)
+        cell.value = final_values[(trow, loc)]
+        cell.fill = orange
+
+    wb.save(output_path)
+    wb.close()
+    return None
+
+
+def apply_workbook_corrections(
+    input_path: Path,
+    output_path: Path,
+    report: Optional[tuple[Workbook, dict[str, pd.DataFrame]]] = None,
+) -> tuple[int, Optional[pd.DataFrame]]:
+    """
+    Applies the Details corrections of a report workbook to its 'Complete Dataset'
+    sheet and writes the highlighted copy to output_path. report is the result of
+    load_report (loaded here when not given).
+
+    Returns:
+        (exit code, changes frame) - changes is None when nothing was applied
+        because the workbook has no correction columns or could not be used
+    """
+    wb, sheets = report if report is not None else load_report(input_path)
+    if DETAILS_SHEET not in sheets or COMPLETE_SHEET not in sheets:
+        print(f"Error: Excel input missing required sheets '{DETAILS_SHEET}' and/or '{COMPLETE_SHEET}'")
+        return 4, None
+
+    details_df = sheets[DETAILS_SHEET]
+    complete_df = sheets[COMPLETE_SHEET]
+    if not correction_columns(details_df):
+        print(f"No correction columns found in '{DETAILS_SHEET}' sheet. Nothing to apply.")
+        # Still write a copy of the workbook
+        from shutil import copyfile
+        copyfile(input_path, output_path)
+        print(f"Wrote copy of original workbook to: {output_path}")
+        return 0, None
+
+    changes = plan_changes(details_df, complete_df)
+    apply_changes(complete_df, changes)
+    error_code = write_highlighted_workbook(wb, output_path, changes)
+    if error_code is not None:
+        return error_code, None
+    print(f"Applied corrections to {len(changes)} cells and saved: {output_path}")
+    return 0, changes
+
+
+def apply_table_corrections(df: pd.DataFrame, output_xlsx: Path) -> int:
+    """
+    CSV input: overwrites 'Complete Dataset' with the first non-empty correction
+    of each row, writes the table to Excel and highlights the changed cells.
+    """
+    if COMPLETE_SHEET not in df.columns:
+        print(f"Error: '{COMPLETE_SHEET}' column not found in input CSV or sheet")
+        return 4
+
+    corr_cols = [c for c in CORRECTION_COLUMNS if c in df.columns]
+    if not corr_cols:
+        print("No correction columns found ('corrections', 'corrections_2', 'corrections_3'). Nothing to apply.")
+        # Still write out Excel copy
+        df.to_excel(output_xlsx, index=False, engine='openpyxl')
+        print(f"Wrote output (no changes): {output_xlsx}")
+        return 0
+
+    # First non-empty correction per row (priority: corrections, corrections_2, corrections_3)
+    texts = pd.DataFrame({col: _stripped_text(df[col]) for col in corr_cols}, index=df.index)
+    new_val = texts.where(texts != '').bfill(axis=1).iloc[:, 0]
+    old_str = pd.Series(_cell_text(df[COMPLETE_SHEET]), index=df.index)
+    changed = (new_val.notna() & (old_str != new_val)).to_numpy()
+    changed_rows = np.flatnonzero(changed)
+    if len(changed_rows):
+        df[COMPLETE_SHEET] = df[COMPLETE_SHEET].astype(object)
+        df.loc[changed, COMPLETE_SHEET] = new_val[changed]
+
+    # Save to Excel first
+    output_xlsx.parent.mkdir(parents=True, exist_ok=True)
+    df.to_excel(output_xlsx, index=False, engine='openpyxl')
+
+    # If no changes, we're done
+    if not len(changed_rows):
+        print("No changes were applied.")
+        print(f"Output written to: {output_xlsx}")
+        return 0
+
+    # Open workbook and highlight changed cells in 'Complete Dataset' column
+    wb = load_workbook(output_xlsx)
+    ws = wb.active
+    first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
+    headers = [str(v) if v is not None else "" for v in first_row]
+    try:
+        col_idx = headers.index(COMPLETE_SHEET) + 1
+    except ValueError:
+        print(f"Error: '{COMPLETE_SHEET}' header not found in written Excel file")
+        wb.save(output_xlsx)
+        wb.close()
+        return 5
+
+    orange = PatternFill(start_color=HIGHLIGHT_COLOR, end_color=HIGHLIGHT_COLOR, fill_type='solid')
+    for r in changed_rows:
+        # pandas row 0 => excel row 2 (header in row 1)
+        ws.cell(row=int(r) + 2, column=col_idx).fill = orange
+
+    wb.save(output_xlsx)
+    wb.close()
+
+    print(f"Applied corrections to {len(changed_rows)} rows and saved: {output_xlsx}")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Audit trail
+# ---------------------------------------------------------------------------
+
+def find_response_id_column(columns) -> Optional[str]:
+    """The Response ID column among columns (exact name first, then case-insensitive)."""
+    for name in RESPONSE_ID_COLUMNS:
+        if name in columns:
+            return name
+    folded = {str(c).strip().lower(): c for c in reversed(list(columns))}
+    return next((folded[n.lower()] for n in RESPONSE_ID_COLUMNS if n.lower() in folded), None)
+
+
+def _text_matrix(df: pd.DataFrame) -> np.ndarray:
+    """str(value) of every cell (None where missing) as a 2-D object array."""
+    missing = pd.isna(df.to_numpy(dtype=object))
+    return np.where(missing, None, df.astype(str).to_numpy(dtype=object))
+
+
+def _row_keys(ids: pd.Series) -> np.ndarray:
+    """Response ID text plus its occurrence number, so repeated IDs still align one to one."""
+    text = pd.Series(_cell_text(ids.to_numpy(dtype=object)), index=ids.index)
+    occurrence = text.groupby(text).cumcount().astype(str)
+    return (text + '\x1f' + occurrence).to_numpy(dtype=object)
+
+
+def diff_datasets(orig: pd.DataFrame, new: pd.DataFrame, key_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    Every cell whose text differs between orig and new (missing on both sides is
+    no change), aligned by Response ID when both frames have it and by row
+    position otherwise, over the union of the columns.
+
+    Returns:
+        DataFrame (response_id, excel_row, df_index, column, old_value,
+        new_value) in row order, then column name order; rows are numbered as
+        in new, and rows only in orig are numbered after them
+    """
+    orig = orig.astype(object)
+    new = new.astype(object)
+    columns = sorted(set(orig.columns).union(new.columns), key=lambda c: str(c))
+    key_col = key_col or find_response_id_column(new.columns)
+    if key_col is not None and key_col in orig.columns and key_col in new.columns:
+        orig_keys, new_keys = _row_keys(orig[key_col]), _row_keys(new[key_col])
+    else:
+        key_col = None
+        orig_keys, new_keys = np.arange(len(orig)), np.arange(len(new))
+
+    only_orig = ~pd.Index(orig_keys).isin(new_keys)
+    keys = np.concatenate([new_keys, orig_keys[only_orig]])
+    positions = np.arange(len(keys))
+    orig_aligned = orig.set_axis(orig_keys).reindex(index=keys, columns=columns)
+    new_aligned = new.set_axis(new_keys).reindex(index=keys, columns=columns)
+
+    changed = _text_matrix(orig_aligned) != _text_matrix(new_aligned)
+    rows, cols = np.nonzero(changed)
+
+    def raw(frame):
+        values = frame.to_numpy(dtype=object)[rows, cols]
+        return np.where(pd.isna(values), None, values)
+
+    if key_col is not None:
+        ids = new_aligned[key_col].where(new_aligned[key_col].notna(), orig_aligned[key_col])
+        response_ids = _cell_text(ids.to_numpy(dtype=object)[rows])
+    else:
+        response_ids = np.full(len(rows), None, dtype=object)
+    return pd.DataFrame({
+        'response_id': response_ids,
+        'excel_row': positions[rows] + 2,  # header row is 1
+        'df_index': positions[rows],
+        'column': np.array(columns, dtype=object)[cols],
+        'old_value': raw(orig_aligned),
+        'new_value': raw(new_aligned),
+    })
+
+
+def attach_rules(audit: pd.DataFrame, changes: pd.DataFrame) -> pd.DataFrame:
+    """
+    audit with the rule of the last correction planned for each (row, column)
+    (see plan_changes; the applier never reorders rows).
+    """
+    rules = changes.drop_duplicates(['df_index', 'column'], keep='last')[['df_index', 'column', 'rule']]
+    audit = audit.drop(columns=['rule'], errors='ignore')
+    return audit.merge(rules, on=['df_index', 'column'], how='left')
+
+
+def build_audit_log(
+    audit: pd.DataFrame,
+    applied_by: Optional[str] = None,
+    timestamp: Optional[str] = None,
+    source: str = '',
+    input_file: Optional[Path] = None,
+    run_id: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    The compact audit log of a change frame (plan_changes or diff_datasets):
+    old and new as text, plus rule, who applied the corrections and when, tagged
+    with run_id (new per call unless given), source (the writing tool) and
+    input (the file name of the workbook the changes belong to).
+    """
+    if applied_by is None:
+        try:
+            applied_by = getpass.getuser()
+        except Exception:
+            applied_by = ''
+    timestamp = timestamp or datetime.now().isoformat(timespec='seconds')
+    run_id = run_id or uuid.uuid4().hex[:12]
+
+    def text(column):
+        return [None if v is None or (not isinstance(v, str) and pd.isna(v)) else str(v) for v in audit[column]]
+
+    return pd.DataFrame({
+        'response_id': audit['response_id'] if 'response_id' in audit.columns else None,
+        'excel_row': audit['excel_row'],
+        'column': audit['column'].astype(str),
+        'old': text('old_value'),
+        'new': text('new_value'),
+        'rule': audit['rule'] if 'rule' in audit.columns else None,
+        'applied_by': applied_by,
+        'timestamp': timestamp,
+        'run_id': run_id,
+        'source': source,
+        'input': Path(input_file).name if input_file is not None else None,
+    }, columns=LOG_COLUMNS)
+
+
+def _same_run_key(existing: pd.DataFrame, log: pd.DataFrame) -> pd.Series:
+    """Rows of existing that share a (source, input) with a row of log."""
+    keys = pd.MultiIndex.from_frame(log[LOG_RUN_KEY].astype(str).drop_duplicates())
+    return pd.MultiIndex.from_frame(existing[LOG_RUN_KEY].astype(str)).isin(keys)
+
+
+def _csv_header(path: Path) -> list[str]:
+    return list(pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns)
+
+
+def write_audit_log(
+    log: pd.DataFrame,
+    path: Path = DEFAULT_LOG_FILE,
+    append: bool = True,
+    replace_previous: bool = False,
+) -> Path:
+    """
+    Writes (or appends) the audit log; with replace_previous, earlier rows of
+    the same (source, input) are dropped first, so a re-run replaces its own
+    rows instead of adding a second copy. Returns the path written.
+
+    CSV logs are appended in place (replace_previous rewrites the file). A
+    .parquet path needs pyarrow or fastparquet (without either the log goes to
+    the .csv next to it) and cannot be appended to: every write re-reads and
+    rewrites the whole file, so keep long-lived, frequently appended logs as CSV.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == '.parquet':
+        try:
+            if append and path.exists():
+                existing = pd.read_parquet(path)
+                if replace_previous:
+                    existing = existing[~_same_run_key(existing.reindex(columns=LOG_COLUMNS), log)]
+                log = pd.concat([existing, log], ignore_index=True)
+            log.to_parquet(path, index=False)
+            return path
+        except ImportError:
+            path = path.with_suffix('.csv')
+            print(f"Warning: no Parquet engine installed (pyarrow/fastparquet); writing audit log to {path}")
+    if append and path.exists() and (replace_previous or _csv_header(path) != LOG_COLUMNS):
+        # Replacing rows, or a log written before run tagging: rewrite it with the current columns
+        existing = load_audit_log(path)
+        if replace_previous:
+            existing = existing[~_same_run_key(existing, log)]
+        log = pd.concat([existing, log], ignore_index=True)
+        append = False
+    write_header = not (append and path.exists())
+    log.to_csv(path, mode='a' if append else 'w', header=write_header, index=False, encoding='utf-8-sig' if write_header else 'utf-8')
+    return path
+
+
+def load_audit_log(path: Path = DEFAULT_LOG_FILE) -> pd.DataFrame:
+    """The audit log at path (logs written before run tagging get empty run_id/source/input)."""
+    path = Path(path)
+    if path.suffix.lower() == '.parquet':
+        log = pd.read_parquet(path)
+    else:
+        log = pd.read_csv(path, dtype=str, encoding='utf-8-sig')
+    return log.reindex(columns=LOG_COLUMNS)
+
+
+def latest_runs(log: pd.DataFrame) -> pd.DataFrame:
+    """Only the rows of the last run (by timestamp) of every (source, input) in the log."""
+    if log.empty or log['run_id'].isna().all():
+        return log
+    runs = log[LOG_RUN_KEY + ['run_id', 'timestamp']].astype(str).drop_duplicates('run_id', keep='last')
+    latest = runs.sort_values('timestamp', kind='stable').drop_duplicates(LOG_RUN_KEY, keep='last')['run_id']
+    return log[log['run_id'].isna() | log['run_id'].astype(str).isin(latest)]
+
+
+def summarize_audit(log: pd.DataFrame, by: Iterable[str] = ('rule',), all_runs: bool = False) -> pd.DataFrame:
+    """
+    Changed cells per group of the audit log (e.g. by rule, applied_by,
+    column or response_id), with the respondents and columns they touch.
+    Only the latest run of each (source, input) is counted unless all_runs.
+    """
+    by = list(by)
+    if not all_runs:
+        log = latest_runs(log)
+    if log.empty:
+        return pd.DataFrame(columns=by + ['changes', 'respondents', 'columns'])
+    summary = log.groupby(by, dropna=False).agg(
+        changes=('column', 'size'),
+        respondents=('response_id', 'nunique'),
+        columns=('column', 'nunique'),
+    )
+    return summary.sort_values('changes', ascending=False, kind='stable').reset_index()
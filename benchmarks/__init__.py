@@ -0,0 +1,13 @@
+"""
+CLFS benchmark suite.
+
+synthetic_wave   - generate synthetic CLFS waves from the CLFS_newformat.csv header
+                   and the answer.json option lists
+run_benchmarks   - time CLFS_validator (end to end and per stage) and the SSOC
+                   assigner on synthetic waves and append the results to history.jsonl
+import_time      - time the import (python -X importtime) and --help startup of
+                   every tool
+
+Run from the repository root, e.g.:
+    python -m benchmarks.run_benchmarks --sizes 1000 10000
+"""
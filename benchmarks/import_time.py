@@ -0,0 +1,189 @@
+"""
+Startup benchmarks for the CLFS tools.
+
+Each module is imported in a fresh interpreter under `python -X importtime` and
+the cumulative import time of the module (and of its slowest dependencies) is
+parsed from the report. The `--help` of every command line tool is timed end to
+end as well, since that is the floor every run pays before reading any input.
+
+Records use the same history format as run_benchmarks (benchmark/size/wall_s),
+with size = 0, so startup regressions show up in the same comparison.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 5 --top 15
+"""
+
+import argparse
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Optional
+
+from benchmarks.synthetic_wave import REPO_ROOT
+
+MODULES = [
+    "CLFS_validator",
+    "SSOC_assigner_V3",
+    "CLFS_validation_rules",
+    "CLFS_service",
+    "CLFS_watch",
+    "CLFS_warehouse",
+]
+CLI_SCRIPTS = [
+    "CLFS_validator.py",
+    "SSOC_assigner_V3.py",
+    "CLFS_service.py",
+    "CLFS_watch.py",
+    "CLFS_warehouse.py",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(REPO_ROOT), env.get("PYTHONPATH", "")) if p)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def parse_importtime(report: str) -> list[dict]:
+    """(module, self_us, cumulative_us, depth) entries of a -X importtime report."""
+    entries = []
+    for line in report.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+    return entries
+
+
+def import_profile(module: str) -> list[dict]:
+    """Import `module` in a fresh interpreter and return its -X importtime entries."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=_env(), capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def bench_import(module: str, repeat: int, top: int) -> dict:
+    """Median cumulative import time of `module` over `repeat` fresh interpreters."""
+    runs = [import_profile(module) for _ in range(repeat)]
+    totals = []
+    for entries in runs:
+        own = [e for e in entries if e["module"] == module]
+        totals.append(own[-1]["cumulative_us"] if own else 0)
+
+    # Slowest direct dependencies of the median run
+    entries = runs[sorted(range(repeat), key=lambda i: totals[i])[repeat // 2]]
+    first_level = [e for e in entries if e["depth"] == 1]
+    slowest = sorted(first_level, key=lambda e: e["cumulative_us"], reverse=True)[:top]
+    own = [e for e in entries if e["module"] == module]
+    return {
+        "benchmark": f"import_{module}",
+        "size": 0,
+        "wall_s": round(median(totals) / 1e6, 4),
+        "self_s": round(own[-1]["self_us"] / 1e6, 4) if own else None,
+        "modules_imported": len(entries),
+        "slowest_imports": {e["module"]: round(e["cumulative_us"] / 1e6, 4) for e in slowest},
+    }
+
+
+def bench_cli_help(script: str, repeat: int) -> Optional[dict]:
+    """Median wall time of `python <script> --help`."""
+    path = REPO_ROOT / script
+    if not path.exists():
+        return None
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(path), "--help"],
+            cwd=REPO_ROOT, env=_env(), capture_output=True, text=True,
+        )
+        walls.append(time.perf_counter() - start)
+    return {
+        "benchmark": f"help_{path.stem}",
+        "size": 0,
+        "wall_s": round(median(walls), 4),
+        "exit_code": proc.returncode,
+    }
+
+
+def run(repeat: int = 3, top: int = 8, modules=MODULES, scripts=CLI_SCRIPTS) -> list[dict]:
+    records = []
+    for module in modules:
+        print(f"Timing import {module}...")
+        records.append(bench_import(module, repeat, top))
+    for script in scripts:
+        print(f"Timing {script} --help...")
+        record = bench_cli_help(script, repeat)
+        if record:
+            records.append(record)
+    return records
+
+
+def print_report(records: list[dict]) -> None:
+    print(f"\n{'benchmark':<32} {'wall s':>8} {'self s':>8} {'modules':>8}")
+    for record in records:
+        print(f"{record['benchmark']:<32} {record['wall_s']:>8.3f} "
+              f"{record.get('self_s') or 0:>8.3f} {record.get('modules_imported') or 0:>8}")
+        if record.get("slowest_imports"):
+            print("  slowest imports: " + ", ".join(
+                f"{name} {secs:.3f}s" for name, secs in record["slowest_imports"].items()
+            ))
+        if record.get("exit_code"):
+            print(f"  ⚠ exited with code {record['exit_code']}")
+
+
+def main(argv=None):
+    # run_benchmarks imports this module, so its history helpers are imported here
+    from benchmarks.run_benchmarks import (
+        DEFAULT_HISTORY_FILE, _git_commit, append_history, compare_with_previous, load_history,
+    )
+
+    parser = argparse.ArgumentParser(description="CLFS import-time / CLI startup benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per measurement (median is kept)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports to record per module")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_FILE))
+    parser.add_argument("--no-history", action="store_true", help="Print the results without recording them")
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history)
+    history = load_history(history_path)
+    base = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    records = [dict(base, **r) for r in run(max(1, args.repeat), args.top, args.modules)]
+    print_report(records)
+    for record in records:
+        comparison = compare_with_previous(record, history)
+        if comparison:
+            print(f"{record['benchmark']}: {comparison}")
+        if not args.no_history:
+            append_history(history_path, record)
+    if not args.no_history:
+        print(f"\n✓ Results appended to {history_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Scaling benchmarks for the CLFS validator and the SSOC assigner.
+
+For each requested size a synthetic wave is generated (benchmarks.synthetic_wave),
+CLFS_validator.py is run end to end on it in a scratch working directory, and its
+per-stage timing report is collected. SSOC_assigner_V3.best_match_duties_priority
+(row by row) and assign_ssoc_batch are timed separately on job titles/duties
+drawn from the SSOC definitions, and the import time and `--help` startup of
+every tool by benchmarks.import_time.
+
+Every result is appended to benchmarks/history.jsonl (throughput, peak RSS, stage
+timings, git commit) and compared with the previous run of the same benchmark.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks --sizes 1000 10000
+    python -m benchmarks.run_benchmarks --sizes 100000 --skip-ssoc --skip-import
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from benchmarks import import_time
+from benchmarks.synthetic_wave import REPO_ROOT, generate_wave, load_job_pool
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+try:
+    import resource
+    _HAS_RESOURCE = True
+except ImportError:  # Windows
+    _HAS_RESOURCE = False
+
+DEFAULT_HISTORY_FILE = REPO_ROOT / "benchmarks" / "history.jsonl"
+REGRESSION_THRESHOLD = 0.10  # flag slowdowns above 10%
+
+
+def _maxrss_mb(maxrss: float) -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    if sys.platform == "darwin":
+        return round(maxrss / (1024 * 1024), 1)
+    return round(maxrss / 1024, 1)
+
+
+def _self_peak_rss_mb() -> Optional[float]:
+    if _HAS_RESOURCE:
+        return _maxrss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _run_child(cmd: list[str], cwd: Path, env: dict, log_path: Path) -> tuple[int, float, Optional[float]]:
+    """Run cmd and return (exit code, wall seconds, child peak RSS in MB)."""
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            peak = _maxrss_mb(usage.ru_maxrss)
+        else:
+            proc.wait()
+            peak = None
+    return proc.returncode, time.perf_counter() - start, peak
+
+
+def bench_validator(members: int, workdir: Path, seed: int, job_pool: list) -> dict:
+    """Generate a wave of `members` members and time CLFS_validator.py on it."""
+    input_dir = workdir / "Operating_Table"
+    if workdir.exists():
+        shutil.rmtree(workdir)
+    input_dir.mkdir(parents=True)
+
+    gen_start = time.perf_counter()
+    wave = generate_wave(members, input_dir / f"CLFS_synthetic_{members}.csv", seed=seed, job_pool=job_pool)
+    gen_seconds = time.perf_counter() - gen_start
+
+    env = dict(os.environ)
+    env.setdefault("SSOC_DEFINITIONS_FILE", str(REPO_ROOT / "references" / "ssoc2024-detailed-definitions.xlsx"))
+    env.setdefault("SSOC_EXPERT_MAP_FILE", str(REPO_ROOT / "references" / "Library_of_SSOC_eng_manager.xlsx"))
+    code, wall, peak = _run_child(
+        [sys.executable, str(REPO_ROOT / "CLFS_validator.py")],
+        workdir,
+        env,
+        workdir / "validator.log",
+    )
+
+    stages = {}
+    timing_path = workdir / "output" / f"CLFS_synthetic_{members}_timing.json"
+    if timing_path.exists():
+        with open(timing_path, encoding="utf-8") as fh:
+            for entry in json.load(fh).get("entries", []):
+                if entry["kind"] == "stage":
+                    stages[entry["name"]] = round(entry["wall_s"], 4)
+
+    return {
+        "benchmark": "clfs_validator",
+        "size": members,
+        "rows": wave["rows"],
+        "members": wave["members"],
+        "exit_code": code,
+        "generate_s": round(gen_seconds, 3),
+        "wall_s": round(wall, 3),
+        "throughput_members_per_s": round(wave["members"] / wall, 2) if wall else None,
+        "peak_rss_mb": peak,
+        "stages": stages,
+    }
+
+
+def _clear_ssoc_caches(ssoc) -> None:
+    for fn in (ssoc._normalize, ssoc._tokens_cached, ssoc._bigrams_from_text, ssoc._sector_cues_from_text):
+        fn.cache_clear()
+
+
+def bench_ssoc(samples: int, seed: int, job_pool: list) -> list[dict]:
+    """
+    Time best_match_duties_priority, row by row, and assign_ssoc_batch on the
+    same `samples` (title, duties) pairs, each from cold text caches.
+    """
+    import pandas as pd
+    import SSOC_assigner_V3 as ssoc
+
+    defs_path = os.environ.get(
+        "SSOC_DEFINITIONS_FILE", str(REPO_ROOT / "references" / "ssoc2024-detailed-definitions.xlsx")
+    )
+    load_start = time.perf_counter()
+    defs, title_map = ssoc.load_definitions(defs_path, ssoc.DEFAULT_DEF_SHEET, ssoc.DEFAULT_DEF_SKIP_ROWS)
+    load_seconds = time.perf_counter() - load_start
+
+    rnd = random.Random(seed)
+    pairs = [rnd.choice(job_pool) for _ in range(samples)]
+
+    def _record(benchmark: str, wall: float, cpu: float) -> dict:
+        return {
+            "benchmark": benchmark,
+            "size": samples,
+            "load_definitions_s": round(load_seconds, 3),
+            "wall_s": round(wall, 3),
+            "cpu_s": round(cpu, 3),
+            "throughput_per_s": round(samples / wall, 2) if wall else None,
+            "peak_rss_mb": _self_peak_rss_mb(),
+        }
+
+    _clear_ssoc_caches(ssoc)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for title, duties in pairs:
+        ssoc.best_match_duties_priority(
+            title, duties, defs, title_map, {}, 0.05, "",
+            occ_group_hint_raw=None, company_industry="",
+        )
+    scalar = _record("ssoc_best_match", time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+    _clear_ssoc_caches(ssoc)
+    jobs = pd.DataFrame(pairs, columns=["title", "duties"])
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    ssoc.assign_ssoc_batch(jobs, "title", "duties", defs=defs, title_map=title_map, min_score_0_to_1=0.05)
+    batch = _record("ssoc_batch", time.perf_counter() - wall_start, time.process_time() - cpu_start)
+    return [scalar, batch]
+
+
+def load_history(history_path: Path) -> list[dict]:
+    if not history_path.exists():
+        return []
+    with open(history_path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def append_history(history_path: Path, record: dict) -> None:
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record) + "\n")
+
+
+def compare_with_previous(record: dict, history: list[dict]) -> Optional[str]:
+    """Describe the change in wall time versus the last run of the same benchmark and size."""
+    previous = [
+        h for h in history
+        if h.get("benchmark") == record["benchmark"] and h.get("size") == record["size"]
+    ]
+    if not previous or not previous[-1].get("wall_s"):
+        return None
+    before = previous[-1]["wall_s"]
+    change = (record["wall_s"] - before) / before
+    flag = "  ⚠ REGRESSION" if change > REGRESSION_THRESHOLD else ""
+    return f"{before:.3f}s -> {record['wall_s']:.3f}s ({change:+.1%} vs {previous[-1].get('commit')}){flag}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLFS validator / SSOC assigner scaling benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000],
+                        help="Synthetic wave sizes in household members (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--ssoc-samples", type=int, default=200,
+                        help="Number of jobs to code row by row and as one batch")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_FILE))
+    parser.add_argument("--workdir", default=None, help="Scratch directory (default: a temporary directory)")
+    parser.add_argument("--keep-data", action="store_true", help="Keep generated waves and validator output")
+    parser.add_argument("--skip-validator", action="store_true")
+    parser.add_argument("--skip-ssoc", action="store_true")
+    parser.add_argument("--skip-import", action="store_true", help="Skip the import-time / --help startup benchmarks")
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history)
+    history = load_history(history_path)
+    base = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    job_pool = load_job_pool(REPO_ROOT / "references" / "ssoc2024-detailed-definitions.xlsx")
+    root = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="clfs_bench_"))
+
+    records = []
+    try:
+        if not args.skip_validator:
+            for size in args.sizes:
+                print(f"Benchmarking CLFS_validator on {size} members...")
+                records.append(dict(base, **bench_validator(size, root / f"wave_{size}", args.seed, job_pool)))
+        if not args.skip_ssoc and args.ssoc_samples > 0:
+            print(f"Benchmarking best_match_duties_priority / assign_ssoc_batch on {args.ssoc_samples} jobs...")
+            records.extend(dict(base, **record) for record in bench_ssoc(args.ssoc_samples, args.seed, job_pool))
+        if not args.skip_import:
+            print("Benchmarking import time and CLI startup...")
+            records.extend(dict(base, **record) for record in import_time.run())
+    finally:
+        if not args.keep_data and not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"\n{'benchmark':<30} {'size':>9} {'wall s':>9} {'per s':>10} {'peak MB':>9}")
+    for record in records:
+        throughput = record.get("throughput_members_per_s") or record.get("throughput_per_s")
+        print(f"{record['benchmark']:<30} {record['size']:>9} {record['wall_s']:>9.3f} "
+              f"{throughput or 0:>10.1f} {record.get('peak_rss_mb') or 0:>9.1f}")
+        comparison = compare_with_previous(record, history)
+        if comparison:
+            print(f"  {comparison}")
+        if record.get("stages"):
+            slowest = sorted(record["stages"].items(), key=lambda kv: kv[1], reverse=True)[:3]
+            print("  slowest stages: " + ", ".join(f"{name} {secs:.2f}s" for name, secs in slowest))
+        if record.get("slowest_imports"):
+            slowest = list(record["slowest_imports"].items())[:3]
+            print("  slowest imports: " + ", ".join(f"{name} {secs:.3f}s" for name, secs in slowest))
+        if record.get("exit_code"):
+            print(f"  ⚠ validator exited with code {record['exit_code']}")
+        append_history(history_path, record)
+
+    print(f"\n✓ Results appended to {history_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Synthetic CLFS wave generator.
+
+Builds a tab-separated export in the same layout as Operating_Table/CLFS_newformat.csv
+(5 metadata rows, header row, one row per household with repeated member blocks).
+Answers are drawn from the answer.json option lists, job titles and duties from the
+SSOC 2024 definitions, and establishment names from the SSIC company list.
+
+Usage:
+    python -m benchmarks.synthetic_wave --members 10000 --output synthetic/CLFS_synthetic_10k.csv
+"""
+
+import argparse
+import csv
+import json
+import re
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TEMPLATE = REPO_ROOT / "Operating_Table" / "CLFS_newformat.csv"
+DEFAULT_ANSWER_JSON = REPO_ROOT / "answer.json"
+DEFAULT_SSOC_DEFINITIONS = REPO_ROOT / "references" / "ssoc2024-detailed-definitions.xlsx"
+DEFAULT_SSIC_LIST = REPO_ROOT / "references" / "SSIC_List_2Sep2025.csv"
+
+METADATA_ROWS = 5
+CHUNK_ROWS = 20000
+OTHERS_RATE = 0.03
+BLANK_RATE = 0.05
+
+FIRST_NAMES = [
+    "Wei Ling", "Jun Hao", "Siti", "Muhammad", "Priya", "Arjun", "Mei Ling", "Kumar",
+    "Nur Aisyah", "Hui Min", "Ravi", "Jia Hui", "Ahmad", "Lakshmi", "Zhi Wei", "Farah",
+]
+LAST_NAMES = [
+    "Tan", "Lim", "Lee", "Ng", "Wong", "Goh", "Chua", "Koh", "Rahman", "Ismail",
+    "Subramaniam", "Nair", "Teo", "Ong", "Yeo", "Hassan",
+]
+OTHERS_TEXT = [
+    "Others: Mahayana Buddhism", "Others: no religion", "Others: Japan", "Others: Freethinker",
+    "Others: Sunni Islam", "Others: Atlantis", "Others: Catholicism", "Others: Working",
+]
+
+# (pattern on the lower-cased question, low, high) for numeric answers
+NUMERIC_RANGES = [
+    (r"usual hours|hours of work|hours did you", 5, 80),
+    (r"bonus", 0, 6),
+    (r"interest|dividend", 0, 5000),
+    (r"rent", 0, 30000),
+    (r"allowance|contribution|sources other than employment", 0, 25000),
+    (r"gross monthly|\bgmi\b|salary|income|drawn", 800, 20000),
+    (r"\bage\b|what age", 15, 70),
+    (r"children", 0, 4),
+    (r"how many|number of|no\. of", 0, 5),
+    (r"weeks", 1, 52),
+    (r"months", 1, 24),
+]
+
+
+def _norm_title(text: object) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+
+def read_template(template_path: Path) -> tuple[list[list[str]], list[str], list[list[str]]]:
+    """Return (metadata rows, header, sample data rows) of a CLFS export."""
+    with open(template_path, encoding="utf-8-sig", newline="") as fh:
+        rows = list(csv.reader(fh, delimiter="\t"))
+    metadata = rows[:METADATA_ROWS]
+    header = [col.strip() for col in rows[METADATA_ROWS]]
+    samples = [row for row in rows[METADATA_ROWS + 1:] if any(cell.strip() for cell in row)]
+    return metadata, header, samples
+
+
+def load_form_fields(answer_json_path: Path) -> dict[str, dict]:
+    """Map normalized question title -> {"type", "options", "others"} from answer.json."""
+    with open(answer_json_path, encoding="utf-8") as fh:
+        form = json.load(fh)
+    fields: dict[str, dict] = {}
+    for field in form.get("form", {}).get("form_fields", []):
+        key = _norm_title(field.get("title"))
+        if not key or key in fields:
+            continue
+        fields[key] = {
+            "type": field.get("fieldType"),
+            "options": [str(opt) for opt in field.get("fieldOptions") or []],
+            "others": bool(field.get("othersRadioButton")),
+        }
+    return fields
+
+
+def load_job_pool(definitions_path: Path, limit: Optional[int] = None) -> list[tuple[str, str]]:
+    """
+    Draw (job title, duties) pairs from the SSOC definitions: titles from the
+    example job titles (or the occupation title), duties from the first
+    sentence of the detailed definition.
+    """
+    import SSOC_assigner_V3 as ssoc
+
+    defs, _ = ssoc.load_definitions(str(definitions_path), ssoc.DEFAULT_DEF_SHEET, ssoc.DEFAULT_DEF_SKIP_ROWS)
+    pool: list[tuple[str, str]] = []
+    for rec in defs:
+        if not rec.get("is_5d"):
+            continue
+        definition = str(rec.get("detailed definitions", "") or "")
+        duties = re.split(r"(?<=[.;])\s", definition, maxsplit=1)[0].strip()
+        examples = str(rec.get("examples of job classified under this code", "") or "")
+        titles = [
+            re.sub(r"^[^\w]+", "", part).strip()
+            for part in re.split(r"[\n;]", examples)
+        ]
+        titles = [t for t in titles if t] or [rec.get("title", "")]
+        for title in titles:
+            pool.append((title, duties))
+    if limit:
+        pool = pool[:limit]
+    return pool
+
+
+def load_establishments(ssic_path: Path) -> list[str]:
+    if not ssic_path.exists():
+        return ["ABC PTE LTD"]
+    names = pd.read_csv(ssic_path, sep="\t", usecols=["CompanyName"], dtype=str)["CompanyName"]
+    return names.dropna().str.strip().loc[lambda s: s != ""].drop_duplicates().tolist()
+
+
+def member_blocks(header: list[str]) -> list[tuple[int, int]]:
+    """Column ranges [start, end) of each household member block (one per "Full Name")."""
+    starts = [idx for idx, col in enumerate(header) if _norm_title(col) == "full name"]
+    return [
+        (start, starts[pos + 1] if pos + 1 < len(starts) else len(header))
+        for pos, start in enumerate(starts)
+    ]
+
+
+class WaveGenerator:
+    """Column-wise synthetic data generator for one CLFS export layout."""
+
+    def __init__(
+        self,
+        header: list[str],
+        samples: list[list[str]],
+        fields: dict[str, dict],
+        job_pool: list[tuple[str, str]],
+        establishments: list[str],
+        seed: int = 2026,
+        reference_date: Optional[date] = None,
+    ):
+        self.header = header
+        self.fields = fields
+        self.job_pool = job_pool or [("Software developer", "Develops software applications")]
+        self.establishments = np.array(establishments or ["ABC PTE LTD"], dtype=object)
+        self.rng = np.random.default_rng(seed)
+        self.reference_date = reference_date or date.today()
+        self.blocks = member_blocks(header)
+        self.sample_values = [
+            sorted({row[idx].strip() for row in samples if idx < len(row) and row[idx].strip()})
+            for idx in range(len(header))
+        ]
+
+    def _choice(self, values, size: int) -> np.ndarray:
+        return np.asarray(values, dtype=object)[self.rng.integers(0, len(values), size)]
+
+    def _blank(self, values: np.ndarray, rate: float = BLANK_RATE) -> np.ndarray:
+        values[self.rng.random(len(values)) < rate] = ""
+        return values
+
+    def _numeric(self, title: str, size: int) -> np.ndarray:
+        lowered = title.lower()
+        for pattern, low, high in NUMERIC_RANGES:
+            if re.search(pattern, lowered):
+                return self.rng.integers(low, high + 1, size).astype(str).astype(object)
+        return self.rng.integers(0, 11, size).astype(str).astype(object)
+
+    def _column(self, col_idx: int, size: int, job_idx: np.ndarray, dob: np.ndarray) -> np.ndarray:
+        title = self.header[col_idx]
+        key = _norm_title(title)
+        field = self.fields.get(key)
+
+        if key == "full name":
+            first = self._choice(FIRST_NAMES, size)
+            last = self._choice(LAST_NAMES, size)
+            return np.char.add(np.char.add(last.astype(str), " "), first.astype(str)).astype(object)
+        if key.startswith("date of birth"):
+            return np.array([d.strftime("%d/%m/%Y") for d in dob], dtype=object)
+        if key == "age":
+            ref = self.reference_date
+            ages = [ref.year - d.year - ((ref.month, ref.day) < (d.month, d.day)) for d in dob]
+            return np.array([str(a) for a in ages], dtype=object)
+        if key == "job title":
+            return np.array([self.job_pool[i][0] for i in job_idx], dtype=object)
+        if key.startswith("main tasks"):
+            return np.array([self.job_pool[i][1] for i in job_idx], dtype=object)
+        if key.startswith("name of establishment"):
+            return self._blank(self._choice(self.establishments, size))
+
+        if field is not None:
+            ftype = field["type"]
+            if ftype == "yes_no":
+                return self._blank(self._choice(["Yes", "No"], size))
+            if ftype in ("number", "decimal"):
+                return self._blank(self._numeric(title, size))
+            if ftype == "date":
+                return np.array([d.strftime("%d/%m/%Y") for d in dob], dtype=object)
+            if field["options"]:
+                values = self._choice(field["options"], size)
+                if field["others"]:
+                    others = self.rng.random(size) < OTHERS_RATE
+                    values[others] = self._choice(OTHERS_TEXT, int(others.sum()))
+                return self._blank(values)
+
+        samples = self.sample_values[col_idx]
+        if samples:
+            return self._blank(self._choice(samples, size), rate=0.5)
+        return np.full(size, "", dtype=object)
+
+    def generate_chunk(self, start_row: int, household_sizes: np.ndarray) -> pd.DataFrame:
+        """Generate one chunk of household rows."""
+        n_rows = len(household_sizes)
+        columns: dict[int, np.ndarray] = {}
+
+        member_cols: dict[int, int] = {}
+        for member_pos, (start, end) in enumerate(self.blocks):
+            for col_idx in range(start, end):
+                member_cols[col_idx] = member_pos
+
+        per_member_state = []
+        for _ in self.blocks:
+            days = self.rng.integers(0, 365 * 68, n_rows)
+            base = np.datetime64(date(self.reference_date.year - 83, 1, 1))
+            dob = (base + days.astype("timedelta64[D]")).astype(object)
+            per_member_state.append((self.rng.integers(0, len(self.job_pool), n_rows), dob))
+
+        household_job = self.rng.integers(0, len(self.job_pool), n_rows)
+        household_dob = per_member_state[0][1] if per_member_state else np.array(
+            [self.reference_date] * n_rows, dtype=object
+        )
+        for col_idx in range(len(self.header)):
+            member_pos = member_cols.get(col_idx)
+            if member_pos is None:
+                columns[col_idx] = self._column(col_idx, n_rows, household_job, household_dob)
+            else:
+                job_idx, dob = per_member_state[member_pos]
+                values = self._column(col_idx, n_rows, job_idx, dob)
+                values[household_sizes <= member_pos] = ""
+                columns[col_idx] = values
+
+        row_ids = np.arange(start_row, start_row + n_rows)
+        for col_idx, col in enumerate(self.header):
+            key = _norm_title(col)
+            if key == "response id":
+                columns[col_idx] = np.array([f"syn{i:020d}" for i in row_ids], dtype=object)
+            elif key == "download status":
+                columns[col_idx] = np.full(n_rows, "Success", dtype=object)
+            elif key == "no. of household members":
+                columns[col_idx] = household_sizes.astype(str).astype(object)
+            elif key == "household no.":
+                columns[col_idx] = np.array([f"Household {i + 1}" for i in row_ids], dtype=object)
+
+        return pd.DataFrame({idx: columns[idx] for idx in range(len(self.header))})
+
+
+def generate_wave(
+    members: int,
+    output_path: Path,
+    template_path: Path = DEFAULT_TEMPLATE,
+    answer_json_path: Path = DEFAULT_ANSWER_JSON,
+    definitions_path: Path = DEFAULT_SSOC_DEFINITIONS,
+    ssic_path: Path = DEFAULT_SSIC_LIST,
+    seed: int = 2026,
+    job_pool: Optional[list[tuple[str, str]]] = None,
+) -> dict:
+    """
+    Write a synthetic wave with roughly `members` household members.
+
+    Returns a summary dict with the path, household row count and member count.
+    """
+    metadata, header, samples = read_template(Path(template_path))
+    fields = load_form_fields(Path(answer_json_path))
+    if job_pool is None:
+        job_pool = load_job_pool(Path(definitions_path))
+    generator = WaveGenerator(header, samples, fields, job_pool, load_establishments(Path(ssic_path)), seed=seed)
+
+    max_members = max(len(generator.blocks), 1)
+    rng = np.random.default_rng(seed + 1)
+    sizes: list[int] = []
+    total = 0
+    while total < members:
+        size = int(min(rng.integers(1, max_members + 1), members - total))
+        sizes.append(size)
+        total += size
+    household_sizes = np.array(sizes, dtype=int)
+    n_rows = len(household_sizes)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    width = len(header)
+    counts = {"Expected total responses": n_rows, "Success count": n_rows}
+    with open(output_path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh, delimiter="\t")
+        for row in metadata:
+            row = list(row) + [""] * max(0, width - len(row))
+            if row and row[0] in counts:
+                row[1] = str(counts[row[0]])
+            writer.writerow(row[:width])
+        writer.writerow(header)
+        for start in range(0, n_rows, CHUNK_ROWS):
+            chunk = generator.generate_chunk(start, household_sizes[start:start + CHUNK_ROWS])
+            chunk.to_csv(fh, sep="\t", header=False, index=False, lineterminator="\n")
+
+    return {"path": str(output_path), "rows": n_rows, "members": int(household_sizes.sum())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic CLFS wave")
+    parser.add_argument("--members", type=int, default=1000, help="Number of household members to generate")
+    parser.add_argument("--output", default=None, help="Output .csv path (tab-separated)")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--template", default=str(DEFAULT_TEMPLATE))
+    parser.add_argument("--answer-json", default=str(DEFAULT_ANSWER_JSON))
+    args = parser.parse_args(argv)
+
+    output = args.output or str(REPO_ROOT / "benchmarks" / "data" / f"CLFS_synthetic_{args.members}.csv")
+    summary = generate_wave(
+        args.members,
+        Path(output),
+        template_path=Path(args.template),
+        answer_json_path=Path(args.answer_json),
+        seed=args.seed,
+    )
+    print(f"✓ Generated {summary['members']} members in {summary['rows']} households: {summary['path']}")
+
+
+if __name__ == "__main__":
+    main()
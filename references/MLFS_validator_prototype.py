@@ -1,8 +1,16 @@
+import argparse
 import pandas as pd
-from datetime import datetime
 import numpy as np
 import glob
 import os
+import re
+import sys
+import time
+
+# Shared DOB parsing / age derivation and results warehouse (CLFS_demographics.py, CLFS_warehouse.py in the repository root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import CLFS_demographics as demographics
+import CLFS_warehouse as warehouse
 
 ################################################################################
 ## 1. CONFIGURATION
@@ -13,6 +21,7 @@ import os
 INPUT_FOLDER_PATH = r'C:\path\to\your\input_folder'  # Path to the folder containing your Excel/CSV files
 OUTPUT_FOLDER_PATH = r'C:\path\to\your\output_folder' # Path to save the final combined report
 HEADER_ROW_INDEX = 5 # The Excel/CSV file's header is on row 6, which is index 5
+WAREHOUSE_FILE = warehouse.recording_file_from_env() # Results warehouse every file's issues are appended to (None = off unless CLFS_WAREHOUSE is set)
 
 # ##############################################################################
 # ### CUSTOMIZE ### - ASSUMED COLUMN NAMES (All Batches)
@@ -29,6 +38,9 @@ COL_MEMBER_ID = 'Member_ID' # This will be created during restructuring
 COL_AGE = 'Age' # This will be calculated from DOB
 COL_DOB = 'Date of Birth (DD/MM/YYYY)'
 COL_DOB_DT = 'Date of Birth (datetime)' # We will create this
+COL_AGE_BAND = 'Age Band' # 5-year band of the calculated age
+DOB_FORMATS = ('%d-%b-%y', '%d/%m/%Y') # Sample: 1-Jan-93; fallback DD/MM/YYYY
+SURVEY_REFERENCE_DATE = None # ### CUSTOMIZE ### 'YYYY-MM-DD' ages are calculated at (None = CLFS_REFERENCE_DATE, else the last day of the file's month)
 COL_SEX = 'Sex'
 COL_RACE = 'Race'
 COL_ID_TYPE = 'Identification Type'
@@ -88,23 +100,38 @@ COL_REMARKS = 'Remark'
 ## Reusable functions for common tasks like calculating age.
 ################################################################################
 
-def calculate_age(dob_datetime):
-    """Calculates age in years from a datetime object."""
-    if pd.isna(dob_datetime):
-        return None
-    today = datetime.today()
-    # Ensure dob_datetime is a datetime object before accessing attributes
-    if isinstance(dob_datetime, pd.Timestamp):
-        try:
-            age = today.year - dob_datetime.year - ((today.month, today.day) < (dob_datetime.month, dob_datetime.day))
-            return age
-        except AttributeError:
-             print(f"Warning: Could not calculate age for value {dob_datetime}. It might not be a valid date.")
-             return None
-    else:
-        # Handle cases where conversion might have failed upstream
-        # print(f"Warning: calculate_age received non-datetime value: {dob_datetime}")
-        return None
+def derive_age_columns(df_tidy, month=None, reference_date=SURVEY_REFERENCE_DATE):
+    """
+    Attaches COL_DOB_DT, COL_AGE and COL_AGE_BAND to the tidy DataFrame once per file.
+    Every member's own DOB is parsed with one pass per format in DOB_FORMATS and ages are
+    exact completed years at reference_date, else at the last day of month (see
+    CLFS_demographics); without either, ages are left unknown. An existing datetime
+    COL_DOB_DT is used as it is.
+    """
+    reference_date = demographics.reference_date(reference_date, wave=month)
+    if reference_date is None:
+        print("⚠️ Warning: No survey month (YYYY-MM in the file name) or SURVEY_REFERENCE_DATE. Ages will not be calculated.")
+    has_dob_dt = COL_DOB_DT in df_tidy.columns and pd.api.types.is_datetime64_any_dtype(df_tidy[COL_DOB_DT])
+    if COL_DOB in df_tidy.columns and not has_dob_dt:
+        df_tidy[COL_DOB_DT] = demographics.parse_dob(df_tidy[COL_DOB], DOB_FORMATS, reference_date)
+        failed_count = int((df_tidy[COL_DOB_DT].isna() & df_tidy[COL_DOB].notna()).sum())
+        if failed_count > 0:
+            print(f"⚠️ Warning: Could not parse {failed_count} non-empty DOB values using formats 'D-Mon-YY' or 'DD/MM/YYYY'. Age calculations may be affected.")
+    elif COL_DOB_DT in df_tidy.columns and not has_dob_dt:
+        print(f"⚠️ Warning: Column '{COL_DOB_DT}' is not datetime type. Cannot calculate age accurately.")
+    elif not has_dob_dt:
+        print(f"⚠️ Warning: Column '{COL_DOB}' not found. Age calculations will fail for this file.")
+
+    if not (COL_DOB_DT in df_tidy.columns and pd.api.types.is_datetime64_any_dtype(df_tidy[COL_DOB_DT])):
+        df_tidy[COL_AGE] = None # Ensure 'Age' column exists to prevent errors
+        df_tidy[COL_AGE_BAND] = None
+        return df_tidy
+
+    ages = demographics.exact_age(df_tidy[COL_DOB_DT], reference_date)
+    # Plain int64 when every age is known, float64 with NaN otherwise (what the rules compare against)
+    df_tidy[COL_AGE] = ages.astype('float64') if ages.isna().any() else ages.astype('int64')
+    df_tidy[COL_AGE_BAND] = demographics.age_band(ages)
+    return df_tidy
 
 
 def get_person_by_relationship(household_df, relationship):
@@ -169,39 +196,101 @@ def load_and_clean_data(file_path, header_index):
     # Clean up column names (remove leading/trailing spaces)
     df.columns = df.columns.str.strip()
 
-    # Convert DOB column to datetime objects for calculations
-    # Use errors='coerce' to handle any unparseable dates gracefully
-    if COL_DOB in df.columns:
-        # Attempt conversion, replace unparseable with NaT (Not a Time)
-        df[COL_DOB_DT] = pd.to_datetime(df[COL_DOB], format='%d-%b-%y', errors='coerce') # Adjusted format based on sample: 1-Jan-93
+    # Date of Birth is parsed per member after restructuring (derive_age_columns)
+    if COL_DOB not in df.columns:
+        print(f"⚠️ Warning: Column '{COL_DOB}' not found in {file_name}. Age calculations will fail for this file.")
+
+    return df
 
-        # Fallback for DD/MM/YYYY if the first format fails for some rows
-        mask_failed = df[COL_DOB_DT].isna() & df[COL_DOB].notna()
-        if mask_failed.any():
-            print(f"   Info: Retrying DOB parsing with DD/MM/YYYY for {mask_failed.sum()} rows in {file_name}...")
-            df.loc[mask_failed, COL_DOB_DT] = pd.to_datetime(df.loc[mask_failed, COL_DOB], format='%d/%m/%Y', errors='coerce')
 
-        failed_count = df[COL_DOB_DT].isna().sum() - df[COL_DOB].isna().sum() # Count newly failed conversions
-        if failed_count > 0:
-             print(f"⚠️ Warning: Could not parse {failed_count} non-empty DOB values in {file_name} using formats 'D-Mon-YY' or 'DD/MM/YYYY'. Age calculations may be affected.")
+def _member_count(value):
+    """Declared household size as an int; 1 when missing or not an integer."""
+    try:
+        return int(value) if pd.notna(value) else 1
+    except (TypeError, ValueError, OverflowError):
+        return 1
+
+
+def detect_member_layout(columns, household_cols_end=None):
+    """
+    Locates the member column blocks of a wide MLFS header once per file.
+
+    Returns a dict with:
+        person_1_cols             - column names of Person 1 (the target generic names)
+        subsequent_person_indices - position of every "Relationship..." column (start of Person 2, 3, ...)
+        cols_per_extra_person     - stride between consecutive member blocks (0 if unknown)
+        remark_index              - position of 'Remark' (member blocks never extend past it)
+    Raises ValueError when the first person's start column is missing.
+    """
+    first_person_start_col = 'Full Name'
+    subsequent_person_start_col = 'Relationship to Household Reference Person'
+    columns = pd.Index(columns)
+    household_cols_end = household_cols_end or []
+    remark_index = columns.get_loc(household_cols_end[0]) if household_cols_end else len(columns)
+
+    # Note: pandas may add .1, .2, .3 suffixes to duplicate column names when reading
+    first_person_indices = [i for i, col in enumerate(columns) if col == first_person_start_col]
+    subsequent_person_indices = [i for i, col in enumerate(columns)
+                                 if col.startswith(subsequent_person_start_col)]
+
+    if not first_person_indices:
+        raise ValueError(f"Cannot find the starting column '{first_person_start_col}' for the first person.")
+
+    first_p1_start_index = first_person_indices[0]
+
+    # Person 1 ends just before the first 'Relationship...' column (or at 'Remark' if there is none)
+    if subsequent_person_indices:
+        person_1_cols = columns[first_p1_start_index:subsequent_person_indices[0]].tolist()
     else:
-        print(f"⚠️ Warning: Column '{COL_DOB}' not found in {file_name}. Age calculations will fail for this file.")
-        df[COL_DOB_DT] = pd.NaT # Create the column anyway
+        person_1_cols = columns[first_p1_start_index:remark_index].tolist()
+
+    # Block size of subsequent persons: distance between "Relationship..." columns
+    num_cols_per_extra_person = 0
+    if len(subsequent_person_indices) >= 2:
+        num_cols_per_extra_person = subsequent_person_indices[1] - subsequent_person_indices[0]
+        print(f"   Identified {len(person_1_cols)} cols for Person 1, {num_cols_per_extra_person} cols per subsequent person.")
+    elif len(subsequent_person_indices) == 1:
+        # Only one "Relationship..." found - block runs to Remark or end
+        num_cols_per_extra_person = remark_index - subsequent_person_indices[0]
+        print(f"   Identified {len(person_1_cols)} cols for Person 1, {num_cols_per_extra_person} cols for Person 2 (only 1 subsequent person detected).")
+
+    return {
+        'first_person_start_index': first_p1_start_index,
+        'person_1_cols': person_1_cols,
+        'subsequent_person_indices': subsequent_person_indices,
+        'cols_per_extra_person': num_cols_per_extra_person,
+        'remark_index': remark_index,
+    }
 
-    return df
+
+def _member_block_renames(block_cols, base_generic_cols):
+    """
+    Maps a Person 2+ block onto the Person 1 column names.
+    Person 2+ blocks start with Relationship (-> COL_RELATIONSHIP) and col[i] maps to
+    Person 1 col[i - 1]; a target that is itself a Relationship column is skipped.
+    """
+    subsequent_person_start_col = 'Relationship to Household Reference Person'
+    rename_map = {}
+    for i, col_original in enumerate(block_cols):
+        if col_original.startswith(subsequent_person_start_col):
+            rename_map[col_original] = COL_RELATIONSHIP
+        elif i > 0 and (i - 1) < len(base_generic_cols):
+            target_col = base_generic_cols[i - 1]
+            if not target_col.startswith(subsequent_person_start_col):
+                rename_map[col_original] = target_col
+    return [rename_map.get(col, col) for col in block_cols]
 
 
 def restructure_data(df_wide):
     """
     Transforms the data from a wide format (one row per household with repeating member columns)
-    to a long format (one row per person). Attempts to dynamically identify column blocks.
+    to a long format (one row per person). The member column blocks are identified once from
+    the header; each block is then sliced for all households at once.
     """
     print("⏳ Restructuring data from wide to long format...")
-    all_members_data = []
 
     # --- Configuration for Restructuring ---
     first_person_start_col = 'Full Name'
-    subsequent_person_start_col = 'Relationship to Household Reference Person'
     # Define household columns (usually at the start and maybe 'Remark' at the end)
     household_cols_start = [
         'Response ID', 'Timestamp', 'Download Status', 'Survey Code',
@@ -216,43 +305,7 @@ def restructure_data(df_wide):
 
     # --- Identify Column Blocks ---
     try:
-        # Find all occurrences of the start columns
-        # Note: pandas may add .1, .2, .3 suffixes to duplicate column names when reading
-        first_person_indices = [i for i, col in enumerate(df_wide.columns) if col == first_person_start_col]
-        subsequent_person_indices = [i for i, col in enumerate(df_wide.columns) 
-                                    if col.startswith(subsequent_person_start_col)]
-
-        if not first_person_indices:
-            raise ValueError(f"Cannot find the starting column '{first_person_start_col}' for the first person.")
-
-        first_p1_start_index = first_person_indices[0]
-
-        # Determine the block for Person 1
-        # It ends just before the first 'Relationship...' column (if it exists)
-        first_p2_start_index = subsequent_person_indices[0] if subsequent_person_indices else -1
-
-        if first_p2_start_index != -1:
-            person_1_cols = df_wide.columns[first_p1_start_index:first_p2_start_index].tolist()
-        else:
-            # Only one person's data found, goes up to 'Remark' column (if exists)
-            remark_index = df_wide.columns.get_loc(household_cols_end[0]) if household_cols_end else len(df_wide.columns)
-            person_1_cols = df_wide.columns[first_p1_start_index:remark_index].tolist()
-
-        base_generic_cols = person_1_cols # These are the target column names
-
-        # Determine block size for subsequent persons by finding distance between "Relationship..." columns
-        num_cols_per_extra_person = 0
-        if len(subsequent_person_indices) >= 2:
-            # Calculate distance between first two "Relationship..." columns
-            num_cols_per_extra_person = subsequent_person_indices[1] - subsequent_person_indices[0]
-            print(f"   Identified {len(person_1_cols)} cols for Person 1, {num_cols_per_extra_person} cols per subsequent person.")
-        elif len(subsequent_person_indices) == 1:
-            # Only one "Relationship..." found - calculate distance to Remark or end
-            p2_start = subsequent_person_indices[0]
-            remark_index = df_wide.columns.get_loc(household_cols_end[0]) if household_cols_end else len(df_wide.columns)
-            num_cols_per_extra_person = remark_index - p2_start
-            print(f"   Identified {len(person_1_cols)} cols for Person 1, {num_cols_per_extra_person} cols for Person 2 (only 1 subsequent person detected).")
-
+        layout = detect_member_layout(df_wide.columns, household_cols_end)
     except Exception as e:
         print(f"❌ ERROR identifying column blocks: {e}. Cannot restructure.")
         # Return original df with placeholder Member_ID
@@ -260,133 +313,93 @@ def restructure_data(df_wide):
         df_return[COL_MEMBER_ID] = 1
         return df_return
 
-    # --- Process Each Row ---
-    for index, row_wide in df_wide.iterrows():
-        household_base_data = row_wide[household_cols_all]
-        expected_num_members = row_wide.get('No. of Household Members', 1)
-        
-        # Try to convert to int
-        try:
-            expected_num_members = int(expected_num_members) if pd.notna(expected_num_members) else 1
-        except:
-            expected_num_members = 1
-
-        # Detect actual number of member blocks with data (including beyond expected)
-        # We scan all subsequent person blocks and count any block that has data, plus Person 1 if present
-        remark_index = df_wide.columns.get_loc(household_cols_end[0]) if household_cols_end else len(df_wide.columns)
-        actual_members_count = 0
-        # Person 1 considered present if start col has data
-        p1_has_data = pd.notna(row_wide.get(first_person_start_col))
-        if p1_has_data:
-            actual_members_count = 1
-        # Count subsequent blocks with any data (relationship or any non-null field)
-        if subsequent_person_indices and num_cols_per_extra_person > 0:
-            for start_col_index in subsequent_person_indices:
-                end_col_index = min(start_col_index + num_cols_per_extra_person, remark_index)
-                member_cols_detect = df_wide.columns[start_col_index:end_col_index].tolist()
-                if not member_cols_detect:
-                    continue
-                member_block = row_wide[member_cols_detect]
-                rel_in_block = [c for c in member_cols_detect if c.startswith(subsequent_person_start_col)]
-                rel_val_detect = member_block.get(rel_in_block[0]) if rel_in_block else None
-                has_block_data = member_block.notna().any()
-                if pd.notna(rel_val_detect) or has_block_data:
-                    actual_members_count += 1
-
-        # Process Member 1
-        member_1_data = row_wide[person_1_cols]
-        # Check if Person 1 has actual data (e.g., non-empty Full Name)
-        if pd.isna(member_1_data.get(first_person_start_col)):
-             print(f"   Skipping row index {index}: First person's '{first_person_start_col}' is empty.")
-             continue # Skip this household row if P1 is empty
-
-        member_1_series = pd.concat([household_base_data, member_1_data])
-        member_1_series[COL_MEMBER_ID] = 1
-        member_1_series[COL_RELATIONSHIP] = 'Reference Person' # Set relationship for P1
-        # Add detected members count for household-level checks
-        member_1_series['Detected Members (Auto)'] = actual_members_count
-        all_members_data.append(member_1_series)
-
-        # Process Members 2+ using ALL "Relationship..." column positions
-        if subsequent_person_indices and num_cols_per_extra_person > 0:
-            for member_num in range(2, expected_num_members + 1):
-                # Find which "Relationship..." column corresponds to this member
-                # Person 2 is at subsequent_person_indices[0]
-                # Person 3 is at subsequent_person_indices[1], etc.
-                person_index = member_num - 2  # 0-based index into subsequent_person_indices
-                
-                if person_index < len(subsequent_person_indices):
-                    # Use the actual column position from subsequent_person_indices
-                    start_col_index = subsequent_person_indices[person_index]
-                    end_col_index = start_col_index + num_cols_per_extra_person
-                else:
-                    # Calculate position based on pattern
-                    start_col_index = subsequent_person_indices[0] + (person_index * num_cols_per_extra_person)
-                    end_col_index = start_col_index + num_cols_per_extra_person
-
-                # Check bounds
-                if start_col_index >= len(df_wide.columns):
-                    break
-                
-                # Ensure we don't go past Remark or end of file
-                remark_index = df_wide.columns.get_loc(household_cols_end[0]) if household_cols_end else len(df_wide.columns)
-                end_col_index = min(end_col_index, remark_index)
-                
-                member_cols = df_wide.columns[start_col_index:end_col_index].tolist()
-                
-                if not member_cols:
-                    break
-                
-                member_data = row_wide[member_cols]
-
-                # Check if this member block actually has data
-                # Find the relationship column (might have .1, .2, .3 suffix)
-                rel_col_in_block = [c for c in member_cols if c.startswith(subsequent_person_start_col)]
-                rel_val = member_data.get(rel_col_in_block[0]) if rel_col_in_block else None
-                # Find any non-null value in the block
-                has_data = member_data.notna().any()
-                
-                if pd.isna(rel_val) and not has_data:
-                    # Completely empty block, stop processing
-                    break
-
-                member_series = pd.concat([household_base_data, member_data])
-                member_series[COL_MEMBER_ID] = member_num
-                # Add detected members count for household-level checks
-                member_series['Detected Members (Auto)'] = actual_members_count
-
-                # Rename columns: Map member_cols to base_generic_cols
-                # Person 2+ has 70 columns: [Relationship, Full Name.1, Sex.1, ..., (last col).1]
-                # Person 1 has 69 columns: [Full Name, Sex, ..., Relationship]
-                # The structure is: Person 1 ends with Relationship, Person 2+ starts with Relationship
-                # So: Person 2+ col[0] = Relationship → maps to COL_RELATIONSHIP
-                #     Person 2+ col[1] = Full Name.1 → maps to Person 1 col[0] = Full Name
-                #     Person 2+ col[2] = Sex.1 → maps to Person 1 col[1] = Sex
-                #     ...
-                #     Person 2+ col[69] = (last).1 → maps to Person 1 col[68] = Relationship (skip this)
-                rename_map = {}
-                for i, col_original in enumerate(member_cols):
-                    if col_original.startswith(subsequent_person_start_col):
-                        # First column is "Relationship to HRP"
-                        rename_map[col_original] = COL_RELATIONSHIP
-                    elif i > 0 and (i - 1) < len(base_generic_cols):
-                        # Map Person 2+ col[1..69] to Person 1 col[0..68]
-                        # But skip Person 1's last column (Relationship) if present
-                        target_col = base_generic_cols[i - 1]
-                        if not target_col.startswith(subsequent_person_start_col):
-                            rename_map[col_original] = target_col
-
-                member_series = member_series.rename(index=rename_map)
-                all_members_data.append(member_series)
+    base_generic_cols = layout['person_1_cols'] # These are the target column names
+    subsequent_person_indices = layout['subsequent_person_indices']
+    num_cols_per_extra_person = layout['cols_per_extra_person']
+    remark_index = layout['remark_index']
+    n_cols = len(df_wide.columns)
+
+    # --- Member presence masks (households x columns) ---
+    has_value = df_wide.notna().to_numpy()
+    p1_present = has_value[:, layout['first_person_start_index']]
+    for index in df_wide.index[~p1_present]:
+        print(f"   Skipping row index {index}: First person's '{first_person_start_col}' is empty.")
+
+    if 'No. of Household Members' in df_wide.columns:
+        expected_members = df_wide['No. of Household Members'].map(_member_count).to_numpy(dtype=np.int64)
+    else:
+        expected_members = np.ones(len(df_wide), dtype=np.int64)
+
+    # Detected members: Person 1 plus every subsequent block holding any data (regardless of declared size)
+    detected_members = p1_present.astype(np.int64)
+    if subsequent_person_indices and num_cols_per_extra_person > 0:
+        for start_col_index in subsequent_person_indices:
+            end_col_index = min(start_col_index + num_cols_per_extra_person, remark_index)
+            if end_col_index > start_col_index:
+                detected_members += has_value[:, start_col_index:end_col_index].any(axis=1)
+
+    household_positions = [df_wide.columns.get_loc(col) for col in household_cols_all]
+
+    def member_frame(rows, block_positions, block_names, member_num):
+        frame = df_wide.iloc[rows, household_positions + block_positions]
+        frame = frame.set_axis(household_cols_all + block_names, axis=1)
+        frame = frame.loc[:, ~frame.columns.duplicated()]
+        frame[COL_MEMBER_ID] = member_num
+        frame['Detected Members (Auto)'] = detected_members[rows]
+        frame['_household_pos'] = rows
+        return frame
+
+    # --- Person 1 of every household ---
+    rows = np.flatnonzero(p1_present)
+    p1_start = layout['first_person_start_index']
+    p1_positions = list(range(p1_start, p1_start + len(base_generic_cols)))
+    member_frames = []
+    if len(rows):
+        frame = member_frame(rows, p1_positions, list(base_generic_cols), 1)
+        frame[COL_RELATIONSHIP] = 'Reference Person' # Set relationship for P1
+        member_frames.append(frame)
+
+    # --- Members 2+ ---
+    # Person 2 is at subsequent_person_indices[0], Person 3 at [1], ...; beyond the detected
+    # "Relationship..." columns the block position follows the stride. A household stops at its
+    # declared size or at its first completely empty block.
+    if len(rows) and subsequent_person_indices and num_cols_per_extra_person > 0:
+        still_listing = p1_present.copy()
+        max_members = int(expected_members[p1_present].max())
+        for member_num in range(2, max_members + 1):
+            person_index = member_num - 2
+            if person_index < len(subsequent_person_indices):
+                start_col_index = subsequent_person_indices[person_index]
+            else:
+                start_col_index = subsequent_person_indices[0] + (person_index * num_cols_per_extra_person)
+            if start_col_index >= n_cols:
+                break
+            end_col_index = min(start_col_index + num_cols_per_extra_person, remark_index)
+            if end_col_index <= start_col_index:
+                break
+
+            still_listing &= (expected_members >= member_num) & has_value[:, start_col_index:end_col_index].any(axis=1)
+            if not still_listing.any():
+                break
+
+            block_cols = df_wide.columns[start_col_index:end_col_index].tolist()
+            member_frames.append(member_frame(
+                np.flatnonzero(still_listing),
+                list(range(start_col_index, end_col_index)),
+                _member_block_renames(block_cols, base_generic_cols),
+                member_num,
+            ))
 
     # --- Combine and Finalize ---
-    if not all_members_data:
+    if not member_frames:
         print("❌ ERROR: No member data could be extracted during restructuring.")
         # Return empty df with expected columns based on P1 + household + meta
         expected_cols = household_cols_all + [COL_MEMBER_ID, COL_RELATIONSHIP] + base_generic_cols
         return pd.DataFrame(columns=list(dict.fromkeys(expected_cols))) # Keep unique cols in order
 
-    tidy_df = pd.DataFrame(all_members_data)
+    tidy_df = pd.concat(member_frames).infer_objects()
+    # Household order, then member order within the household
+    tidy_df = tidy_df.iloc[np.lexsort((tidy_df[COL_MEMBER_ID].to_numpy(), tidy_df['_household_pos'].to_numpy()))]
 
     # Reorder columns to a standard format (Household, Meta, Person)
     # Include helper column for household-level checks if present
@@ -395,14 +408,10 @@ def restructure_data(df_wide):
     final_cols_order_present = [col for col in list(dict.fromkeys(final_cols_order)) if col in tidy_df.columns]
     tidy_df = tidy_df[final_cols_order_present]
 
-
     # Drop rows that might be entirely empty except for household info and Member ID
     # Check for empty 'Relationship' - all valid members should have this field
     if COL_RELATIONSHIP in tidy_df.columns:
         tidy_df = tidy_df[tidy_df[COL_RELATIONSHIP].notna()]
-    # Tidy DF might have duplicate columns if renaming failed, drop them
-    tidy_df = tidy_df.loc[:,~tidy_df.columns.duplicated()]
-
 
     print(f"✅ Restructuring complete. Created {len(tidy_df)} person records.")
     return tidy_df
@@ -2137,6 +2146,8 @@ def check_nie_diploma_institution(row):
 # Rule Type: Per-Person (Requires Previous Month Data)
 # ---
 def check_nric_hprefpin_change(row):
+    # Implemented as vectorized month-over-month deltas in section 4d
+    # (LONGITUDINAL_RULE_SPECS); this row function stays a no-op.
     # ### PLACEHOLDER ###
     # This check requires loading and merging data from the previous month.
     # The 'row' object would need to contain 'NRIC_current' and 'NRIC_previous'.
@@ -2370,6 +2381,8 @@ def check_unemployed_20_24_upper_sec_not_student(row):
 def check_changes_from_previous_month(row):
     # This is a single placeholder for all "change" rules (123-130).
     # You would implement separate functions for each logic.
+    # Implemented as vectorized month-over-month deltas in section 4d
+    # (LONGITUDINAL_RULE_SPECS); this row function stays a no-op.
     # ### PLACEHOLDER ###
     # if row.get('UnemploymentDuration_current') > row.get('UnemploymentDuration_previous') + 5:
     #    errors.append({'Error': 'Unemployment duration increased by >= 5 weeks.'})
@@ -2493,6 +2506,8 @@ def check_duplicate_nric(full_tidy_df):
 # Rule Type: Per-Person (Requires Previous Month Data)
 # ---
 def check_high_income_difference(row):
+    # Implemented as vectorized month-over-month deltas in section 4d
+    # (LONGITUDINAL_RULE_SPECS); this row function stays a no-op.
     # ### PLACEHOLDER ###
     # Requires merged row with 'GMI_current' and 'GMI_previous'.
     # current_gmi = row.get(COL_GMI)
@@ -2705,6 +2720,8 @@ def check_ssoc_111(row):
 # ---
 def check_changes_from_previous_month_batch_2(row):
     # This is another placeholder for rules checking against previous month's data.
+    # Implemented as vectorized month-over-month deltas in section 4d
+    # (LONGITUDINAL_RULE_SPECS); this row function stays a no-op.
     # ### PLACEHOLDER ###
     # if row.get('ActivityStatus_current') != row.get('ActivityStatus_previous'):
     #    errors.append({'Error': 'Activity Status has changed. Please verify.'})
@@ -2740,6 +2757,8 @@ def check_real_estate_agent_status(row):
 # ---
 def check_changes_from_previous_month_batch_3(row):
     # This is another placeholder for rules checking against previous month's data.
+    # Implemented as vectorized month-over-month deltas in section 4d
+    # (LONGITUDINAL_RULE_SPECS); this row function stays a no-op.
     # ### PLACEHOLDER ###
     # if row.get(COL_EVER_WORKED) == 'Yes' and row.get('EverWorked_previous') == 'No':
     #    errors.append({'Error': 'Respondent indicated "Ever worked before" changed from No to Yes. Please verify.'})
@@ -2763,28 +2782,1034 @@ def check_changes_from_previous_month_batch_3(row):
 #     return []
 
 
+################################################################################
+## 4b. VECTORIZED PER-PERSON RULES
+## Rule specs evaluated as one boolean mask over the whole tidy DataFrame.
+## Each spec mirrors a check_* function above: 'rule' is the function name (so
+## reports are unchanged), 'mask' flags the persons in error, and 'message' is
+## a str.format template filled from 'fields' (column names, or functions of
+## the flagged rows). A check that emits several errors has one spec per error,
+## in the order the function appends them. Checks without a spec keep running
+## row by row in run_validations.
+################################################################################
+
+def _col(df, col_name, default=None):
+    """Column of df, or a column of `default` when it does not exist (like row.get)."""
+    if col_name in df.columns:
+        return df[col_name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _age(df):
+    """Age as numbers; missing/None ages never satisfy a comparison."""
+    return pd.to_numeric(_col(df, COL_AGE), errors='coerce')
+
+
+def _text(df, col_name, default=None):
+    """Column as str(value), e.g. 'nan' for missing values."""
+    return _col(df, col_name, default).astype(str)
+
+
+PERSON_RULE_SPECS = [
+    # Rule 2 & 3
+    {'rule': 'check_private_hire_driver',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Private Hire Driver') & (_col(df, COL_ID_TYPE) != 'Singapore Citizen'),
+     'message': 'Private Hire Driver must be a Singapore Citizen (ID Type: {}).',
+     'fields': [COL_ID_TYPE]},
+    {'rule': 'check_private_hire_driver',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Private Hire Driver') & (_age(df) < 30),
+     'message': 'Private Hire Driver is only {} (must be >= 30).',
+     'fields': [COL_AGE]},
+    {'rule': 'check_private_hire_driver',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Private Hire Driver') & (_age(df) >= 75),
+     'message': 'Private Hire Driver is {} (must be < 75).',
+     'fields': [COL_AGE]},
+    # Rule 6
+    {'rule': 'check_construction_labourer_industry',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Civil Engineering Labourer', 'Building Construction Labourer'])
+                        & (_col(df, COL_INDUSTRY) != 'Construction'),
+     'message': 'Job is {} but industry is not Construction.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 7
+    {'rule': 'check_pass_holder_location',
+     'mask': lambda df: _col(df, COL_ID_TYPE).isin(['Employment Pass', 'S Pass', 'Work Permit', 'Training Pass'])
+                        & _col(df, COL_STAY_LOCATION).isin(['Institutional Unit', 'Outside Singapore overseas']),
+     'message': 'Pass holder ({}) has unusual location: {}.',
+     'fields': [COL_ID_TYPE, COL_STAY_LOCATION]},
+    # Rule 8 & 9
+    {'rule': 'check_hawker_industry',
+     'mask': lambda df: (_text(df, COL_OCCUPATION_CODE) == '52119') & _text(df, COL_INDUSTRY).str.startswith('4781'),
+     'message': 'Occupation 52119 (Hawker excl. food) in Industry 4781 (Food courts). Check if 52120.'},
+    # Rule 10
+    {'rule': 'check_legislator_industry',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Legislator', 'Senior Government Official', 'Stat Board Official'])
+                        & ~_col(df, COL_INDUSTRY).isin(['Central Bank', 'Provident Funding']),
+     'message': 'Job is {} but industry is not Central Bank/Provident Funding.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 11
+    {'rule': 'check_male_part_time_reason_childcare',
+     'mask': lambda df: (_col(df, COL_SEX) == 'Male') & (_col(df, COL_PART_TIME_REASON) == 'Care for own children aged 12 & below'),
+     'message': 'Male respondent working part-time for childcare. Please verify.'},
+    # Rule 13
+    {'rule': 'check_age_vs_student_job',
+     'mask': lambda df: (_age(df) > 26) & _col(df, COL_LABOUR_STATUS).isin(
+         ['Student on vacation job', 'Paid internship', 'Awaiting examination results', 'Awaiting NS call-up']),
+     'message': 'Person aged {} has student-related labour status: {}.',
+     'fields': [COL_AGE, COL_LABOUR_STATUS]},
+    # Rule 14
+    {'rule': 'check_age_15_qualification',
+     'mask': lambda df: (_age(df) == 15) & (_col(df, COL_HIGHEST_ACADEMIC_QUAL) == 'Secondary'),
+     'message': 'Person aged 15 has Secondary qualification. Please verify.'},
+    # Rule 16
+    {'rule': 'check_age_vs_schooling',
+     'mask': lambda df: (_age(df) < 18) & _col(df, COL_EDU_STATUS).isin(['Not Enrolled', 'Completed Education']),
+     'message': 'Person is {} years old but is not enrolled in school (Status: {}).',
+     'fields': [COL_AGE, COL_EDU_STATUS]},
+    # Rule 18
+    {'rule': 'check_pt_student_available',
+     'mask': lambda df: (_col(df, COL_PART_TIME_REASON) == 'Pursuing full-time/part-time studies')
+                        & (_col(df, COL_AVAILABLE_FOR_ADDITIONAL_WORK) == 'Yes'),
+     'message': 'Part-time student says they are available for additional work. Please verify.'},
+    # Rule 19
+    {'rule': 'check_pt_student_willing',
+     'mask': lambda df: (_col(df, COL_PART_TIME_REASON) == 'Pursuing full-time/part-time studies')
+                        & (_col(df, COL_WILLING_TO_WORK_ADDITIONAL_HOURS) == 'Yes'),
+     'message': 'Part-time student says they are willing to work additional hours. Please verify.'},
+    # Rule 21
+    {'rule': 'check_pt_no_full_time_willingness',
+     'mask': lambda df: (_col(df, COL_PART_TIME_REASON) == 'Could not find a full-time job')
+                        & (_col(df, COL_WILLING_TO_WORK_ADDITIONAL_HOURS) == 'No'),
+     'message': 'Works part-time (could not find full-time) but is NOT willing to work more hours. Please verify.'},
+    # Rule 23
+    {'rule': 'check_tertiary_under_40_not_working_reason',
+     'mask': lambda df: _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Degree', 'Diploma', 'Masters', 'PhD'])
+                        & (_age(df) < 40)
+                        & (_col(df, COL_LABOUR_STATUS) == 'Not in Labour Force')
+                        & _col(df, COL_REASON_NOT_WORKING).isin(['No suitable work available', 'Lacks necessary qualifications/skills']),
+     'message': 'Tertiary educated person < 40 not working due to: {}. Please verify.',
+     'fields': [COL_REASON_NOT_WORKING]},
+    # Rule 27
+    {'rule': 'check_own_account_worker_job_title',
+     'mask': lambda df: (_col(df, COL_EMPLOYMENT_STATUS) == 'Own Account Worker')
+                        & _col(df, COL_JOB_TITLE).isin(['Managing Director', 'Chief Executive', 'General Manager']),
+     'message': 'Person is Own Account Worker but job is {}. Please verify.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 29 & 82
+    {'rule': 'check_babysitter_employment_status',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Babysitter') & (_col(df, COL_EMPLOYMENT_STATUS) != 'Own Account Worker'),
+     'message': 'Babysitter employment status is {}, not Own Account Worker.',
+     'fields': [COL_EMPLOYMENT_STATUS]},
+    # Rule 30
+    {'rule': 'check_cleaner_labourer_employment_status',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Cleaner', 'Labourer', 'Related Worker'])
+                        & (_col(df, COL_EMPLOYMENT_STATUS) == 'Employer'),
+     'message': 'Job is {} but employment status is Employer. Please verify.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 31
+    {'rule': 'check_mgmt_exec_employment_status',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Management Executive') & (_col(df, COL_EMPLOYMENT_STATUS) != 'Employee'),
+     'message': 'Management Executive status is {}, not Employee.',
+     'fields': [COL_EMPLOYMENT_STATUS]},
+    # Rule 37
+    {'rule': 'check_male_not_working_reason_housework',
+     'mask': lambda df: (_col(df, COL_SEX) == 'Male')
+                        & (_col(df, COL_LABOUR_STATUS) == 'Not in Labour Force')
+                        & _col(df, COL_REASON_NOT_WORKING).isin(['Doing housework', 'Looking after children']),
+     'message': 'Male is Not in Labour Force due to: {}. Please verify.',
+     'fields': [COL_REASON_NOT_WORKING]},
+    # Rule 42
+    {'rule': 'check_age_le_21_marital_status',
+     'mask': lambda df: (_age(df) <= 21) & (_col(df, COL_MARITAL_STATUS) != 'Single'),
+     'message': 'Person aged {} has marital status "{}", not Single.',
+     'fields': [COL_AGE, COL_MARITAL_STATUS]},
+    # Rule 47
+    {'rule': 'check_age_100_plus',
+     'mask': lambda df: _age(df) >= 100,
+     'message': 'Person is aged {} (>= 100). Please verify.',
+     'fields': [COL_AGE]},
+    # Rule 48
+    {'rule': 'check_manager_qualification',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).notna() & (_col(df, COL_JOB_TITLE) != '')
+                        & _text(df, COL_JOB_TITLE).str.contains('Manager|Director|Professional|Surgeon|Lawyer', regex=True)
+                        & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Primary', 'Lower Secondary']),
+     'message': 'Job is "{}" but qualification is "{}". Please verify.',
+     'fields': [COL_JOB_TITLE, COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 49
+    {'rule': 'check_sg_male_gt_30_never_worked',
+     'mask': lambda df: (_col(df, COL_ID_TYPE) == 'Singapore Citizen') & (_col(df, COL_SEX) == 'Male')
+                        & (_age(df) > 30) & (_col(df, COL_EVER_WORKED) == 'No'),
+     'message': 'Singaporean male aged > 30 has never worked. Please verify.'},
+    # Rule 50
+    {'rule': 'check_scpr_degree_clerical_job',
+     'mask': lambda df: _col(df, COL_ID_TYPE).isin(['Singapore Citizen', 'Permanent Resident'])
+                        & (_col(df, COL_HIGHEST_ACADEMIC_QUAL) == 'Degree')
+                        & _col(df, COL_JOB_TITLE).isin(['Clerk', 'Admin Assistant']),
+     'message': 'SC/PR with Degree is working as "{}". Please verify.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 51
+    {'rule': 'check_scpr_uni_craft_job',
+     'mask': lambda df: _col(df, COL_ID_TYPE).isin(['Singapore Citizen', 'Permanent Resident'])
+                        & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Degree', 'Masters', 'PhD'])
+                        & _col(df, COL_JOB_TITLE).isin(['Cleaner', 'Labourer', 'Craftsman']),
+     'message': 'SC/PR with {} is working as "{}". Please verify.',
+     'fields': [COL_HIGHEST_ACADEMIC_QUAL, COL_JOB_TITLE]},
+    # Rule 56
+    {'rule': 'check_student_pass_labour_status',
+     'mask': lambda df: (_col(df, COL_ID_TYPE) == 'Student Pass') & (_col(df, COL_LABOUR_STATUS) == 'Employed')
+                        & ~_col(df, COL_EMPLOYMENT_STATUS).isin([
+                            'Schooling but currently working in vacation job',
+                            'Schooling but currently undergoing paid internship',
+                            'Working while awaiting examination results',
+                            'Working while schooling',
+                        ]),
+     'message': 'Student Pass holder is Employed, but status is "{}". Please verify.',
+     'fields': [COL_EMPLOYMENT_STATUS]},
+    # Rule 57
+    {'rule': 'check_ite_institution',
+     'mask': lambda df: _text(df, COL_HIGHEST_ACADEMIC_QUAL).str.contains('ITE', regex=False)
+                        & ~_text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains('ITE', regex=False),
+     'message': 'Qualification is {} but institution is {} (not ITE). Please verify.',
+     'fields': [COL_HIGHEST_ACADEMIC_QUAL, COL_HIGHEST_ACADEMIC_ATTAINED_IN]},
+    # Rule 58
+    {'rule': 'check_age_15_qualification_level',
+     'mask': lambda df: (_age(df) == 15) & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(
+         ['GCE N level', 'GCE O level', 'Secondary', 'GCE A level', 'Diploma', 'Degree']),
+     'message': 'Person aged 15 has qualification "{}". Please verify.',
+     'fields': [COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 59
+    {'rule': 'check_pass_holder_unemployed',
+     'mask': lambda df: _col(df, COL_ID_TYPE).isin(['Employment Pass', 'S Pass', 'Work Permit', 'Training Pass'])
+                        & (_col(df, COL_LABOUR_STATUS) == 'Unemployed'),
+     'message': 'Pass holder ({}) is Unemployed. Please verify.',
+     'fields': [COL_ID_TYPE]},
+    # Rule 60
+    {'rule': 'check_foreigner_not_employee',
+     'mask': lambda df: ~_col(df, COL_ID_TYPE).isin(['Singapore Citizen', 'Permanent Resident'])
+                        & (_col(df, COL_LABOUR_STATUS) == 'Employed') & (_col(df, COL_EMPLOYMENT_STATUS) != 'Employee'),
+     'message': 'Foreigner ({}) is Employed but status is "{}", not Employee. Please verify.',
+     'fields': [COL_ID_TYPE, COL_EMPLOYMENT_STATUS]},
+    # Rule 61 & 62
+    {'rule': 'check_health_worker_industry',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(
+         ['Health Services Manager', 'Medical Doctor', 'Nursing Professional', 'Dentist', 'Physiotherapist'])
+                        & (_col(df, COL_INDUSTRY) != 'Health & Social Services'),
+     'message': 'Job is {} but industry is "{}", not Health.',
+     'fields': [COL_JOB_TITLE, COL_INDUSTRY]},
+    # Rule 63
+    {'rule': 'check_age_18_qualification_degree',
+     'mask': lambda df: (_age(df) == 18) & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Degree', 'Masters', 'PhD']),
+     'message': 'Person aged 18 has qualification "{}". Please verify.',
+     'fields': [COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 64
+    {'rule': 'check_age_le_18_qualification_diploma',
+     'mask': lambda df: (_age(df) <= 18) & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Diploma', 'Polytechnic Diploma']),
+     'message': 'Person aged {} has qualification "{}". Please verify.',
+     'fields': [COL_AGE, COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 67
+    {'rule': 'check_id_type_dependant_pass',
+     'mask': lambda df: _col(df, COL_ID_TYPE) == 'Dependant Pass',
+     'message': 'ID Type is "Dependant Pass". Please verify this is correct (not Social Visit Pass).'},
+    # Rule 68
+    {'rule': 'check_judge_govt_industry',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(
+         ['Judge', 'Government Associate Professional', 'Police Officer', 'Narcotics Officer', 'Prison Officer'])
+                        & (_col(df, COL_INDUSTRY) != 'Public Administration & Defence'),
+     'message': 'Job is {} but industry is "{}", not Public Administration & Defence.',
+     'fields': [COL_JOB_TITLE, COL_INDUSTRY]},
+    # Rule 69
+    {'rule': 'check_primary_teacher_industry',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Primary School Teacher') & (_col(df, COL_INDUSTRY) != 'Primary School'),
+     'message': 'Job is Primary School Teacher but industry is "{}".',
+     'fields': [COL_INDUSTRY]},
+    # Rule 70
+    {'rule': 'check_secondary_teacher_industry',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Secondary School Teacher') & (_col(df, COL_INDUSTRY) != 'Secondary School'),
+     'message': 'Job is Secondary School Teacher but industry is "{}".',
+     'fields': [COL_INDUSTRY]},
+    # Rule 71
+    {'rule': 'check_education_manager_industry',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Education and Training Institution Manager', 'Relief Teacher'])
+                        & (_col(df, COL_INDUSTRY) != 'Education'),
+     'message': 'Job is {} but industry is "{}", not Education.',
+     'fields': [COL_JOB_TITLE, COL_INDUSTRY]},
+    # Rule 72
+    {'rule': 'check_finance_job_industry',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Financial Analyst', 'Insurance Agent', 'Bank Teller'])
+                        & (_col(df, COL_INDUSTRY) != 'Financial & Insurance Services'),
+     'message': 'Job is {} but industry is "{}", not Finance.',
+     'fields': [COL_JOB_TITLE, COL_INDUSTRY]},
+    # Rule 74
+    {'rule': 'check_age_gt_35_studying',
+     'mask': lambda df: (_age(df) > 35) & _col(df, COL_EDU_STATUS).isin(
+         ['Pursuing full-time study', 'Pursuing part-time study', 'Awaiting start of academic year']),
+     'message': 'Person aged {} has student status: "{}". Please verify.',
+     'fields': [COL_AGE, COL_EDU_STATUS]},
+    # Rule 76
+    {'rule': 'check_student_pass_age_gt_25',
+     'mask': lambda df: (_col(df, COL_ID_TYPE) == 'Student Pass') & (_age(df) > 25),
+     'message': 'Person on Student Pass is aged {} (> 25). Please verify.',
+     'fields': [COL_AGE]},
+    # Rule 78
+    {'rule': 'check_left_last_job_40_years',
+     'mask': lambda df: _col(df, COL_LEFT_LAST_JOB) == 'More than 40 years ago',
+     'message': 'Person left last job > 40 years ago. Please verify.'},
+    # Rule 79
+    {'rule': 'check_poly_cert_institution',
+     'mask': lambda df: _text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains('Polytechnic', regex=False)
+                        & _text(df, COL_HIGHEST_ACADEMIC_QUAL).str.contains('Certificate', regex=False)
+                        & _text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains('ITE|University', regex=True),
+     'message': 'Polytechnic Certificate (Academic) awarded by {}. Please verify.',
+     'fields': [COL_HIGHEST_ACADEMIC_ATTAINED_IN]},
+    # Rule 80
+    {'rule': 'check_lasalle_diploma',
+     'mask': lambda df: (_col(df, COL_VOCATIONAL_QUAL) == 'LaSalle-SIA Diploma')
+                        & ~_text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains('LaSalle', regex=False),
+     'message': 'Vocational Qual is LaSalle-SIA Diploma but institution is not LaSalle.'},
+    # Rule 81
+    {'rule': 'check_nafa_diploma',
+     'mask': lambda df: (_col(df, COL_VOCATIONAL_QUAL) == 'NAFA Diploma')
+                        & ~_text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains('NAFA', regex=False),
+     'message': 'Vocational Qual is NAFA Diploma but institution is not NAFA.'},
+    # Rule 83
+    {'rule': 'check_legislator_employment_status',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin([
+         'Legislator', 'Senior Government Official', 'Stat Board Official', 'Judge',
+         'Government Associate Professional', 'Police Officer', 'Narcotics Officer', 'Prison Officer'])
+                        & (_col(df, COL_EMPLOYMENT_STATUS) != 'Employee'),
+     'message': 'Job is {} but status is "{}", not Employee.',
+     'fields': [COL_JOB_TITLE, COL_EMPLOYMENT_STATUS]},
+    # Rule 85
+    {'rule': 'check_relh_age_lt_15',
+     'mask': lambda df: _col(df, COL_RELATIONSHIP).isin(['Parent', 'Parent-in-law', 'Spouse', 'Partner']) & (_age(df) < 15),
+     'message': 'Relationship is {} but age is {} (< 15). Please verify DOB.',
+     'fields': [COL_RELATIONSHIP, COL_AGE]},
+    # Rule 91
+    {'rule': 'check_nitec_institution',
+     'mask': lambda df: _text(df, COL_VOCATIONAL_QUAL).str.contains('NITEC', regex=False)
+                        & _text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains(
+                            'University|Polytechnic|SkillsFuture Singapore|WDA|NAFA|LASALLE', regex=True),
+     'message': 'Qualification is {} but institution is {}, which is disallowed.',
+     'fields': [COL_VOCATIONAL_QUAL, COL_HIGHEST_ACADEMIC_ATTAINED_IN]},
+    # Rule 100
+    {'rule': 'check_saf_industry',
+     'mask': lambda df: (_col(df, COL_JOB_TITLE) == 'Singapore Armed Forces Personnel')
+                        & ~_col(df, COL_INDUSTRY).isin(['Armed Forces', 'Police', 'Civil Defence']),
+     'message': 'Job is Singapore Armed Forces Personnel but industry is "{}".',
+     'fields': [COL_INDUSTRY]},
+    # Rule 102
+    {'rule': 'check_age_lt_20_occupation',
+     'mask': lambda df: (_age(df) < 20) & _col(df, COL_JOB_TITLE).isin(
+         ['Managing Director', 'Chief Executive', 'Surgeon', 'Lawyer', 'Senior Government Official']),
+     'message': 'Person is aged {} (< 20) but job is "{}". Please verify.',
+     'fields': [COL_AGE, COL_JOB_TITLE]},
+    # Rule 103
+    {'rule': 'check_job_offer_no_application',
+     'mask': lambda df: (_col(df, COL_JOB_OFFERS_RECEIVED) == 'Yes') & (_col(df, COL_JOB_SUBMITTED_APPLICATIONS) == 'No'),
+     'message': 'Received job offer(s) but submitted no applications. Please verify.'},
+    # Rule 104
+    {'rule': 'check_spouse_marital_status',
+     'mask': lambda df: (_col(df, COL_RELATIONSHIP) == 'Husband/Wife') & ~_col(df, COL_MARITAL_STATUS).isin(['Married', 'Separated']),
+     'message': 'Relationship is Husband/Wife but marital status is "{}".',
+     'fields': [COL_MARITAL_STATUS]},
+    # Rule 105
+    {'rule': 'check_nie_diploma_institution',
+     'mask': lambda df: _text(df, COL_VOCATIONAL_QUAL).str.contains('NIE Diploma', regex=False)
+                        & ~_text(df, COL_HIGHEST_ACADEMIC_ATTAINED_IN).str.contains('NIE', regex=False),
+     'message': 'Vocational Qual is {} but institution is {} (not NIE).',
+     'fields': [COL_VOCATIONAL_QUAL, COL_HIGHEST_ACADEMIC_ATTAINED_IN]},
+    # Rule 107
+    {'rule': 'check_nursery_farm_worker_occupation',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Nursery Farm Worker', 'Nursery Supervisor']),
+     'message': 'Job is "{}". Verify this is for plants, not childcare.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 110
+    {'rule': 'check_age_gt_16_student_qualification',
+     'mask': lambda df: (_age(df) > 16) & (_col(df, COL_EDU_STATUS) == 'Pursuing full-time study')
+                        & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Below Primary', 'No Qualification']),
+     'message': 'Full-time student aged {} has qualification "{}".',
+     'fields': [COL_AGE, COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 111
+    {'rule': 'check_age_gt_20_student_qualification',
+     'mask': lambda df: (_age(df) > 20) & (_col(df, COL_EDU_STATUS) == 'Pursuing full-time study')
+                        & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Below Primary', 'No Qualification', 'Primary']),
+     'message': 'Full-time student aged {} has qualification "{}".',
+     'fields': [COL_AGE, COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 112 & 113
+    {'rule': 'check_nric_s_t_is_scpr',
+     'mask': lambda df: _text(df, COL_NRIC, '').str.startswith(('S', 'T'))
+                        & ~_col(df, COL_ID_TYPE).isin(['Singapore Citizen', 'Permanent Resident']),
+     'message': 'NRIC starts with {} but ID Type is "{}".',
+     'fields': [lambda df: _text(df, COL_NRIC, '').str[0], COL_ID_TYPE]},
+    # Rule 115
+    {'rule': 'check_age_0_dob',
+     'mask': lambda df: _age(df) == 0,
+     'message': 'Person is aged 0. Please verify DOB is correct.'},
+    # Rule 120
+    {'rule': 'check_age_lt_17_olevel_not_student',
+     'mask': lambda df: (_age(df) < 17) & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['GCE A level', 'Diploma', 'Degree'])
+                        & (_col(df, COL_EDU_STATUS) != 'Pursuing full-time study'),
+     'message': 'Person aged {} has {} but is not in full-time study.',
+     'fields': [COL_AGE, COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 121
+    {'rule': 'check_unemployed_15_19_not_student',
+     'mask': lambda df: (_col(df, COL_LABOUR_STATUS) == 'Unemployed') & _age(df).between(15, 19)
+                        & ~_col(df, COL_LOOKING_FOR_WORK_STATUS).isin(['Enrolled in school/course', 'Awaiting NS callup']),
+     'message': 'Unemployed person aged {} has looking-for-work status "{}".',
+     'fields': [COL_AGE, COL_LOOKING_FOR_WORK_STATUS]},
+    # Rule 122
+    {'rule': 'check_unemployed_20_24_upper_sec_not_student',
+     'mask': lambda df: (_col(df, COL_LABOUR_STATUS) == 'Unemployed') & _age(df).between(20, 24)
+                        & _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Upper Secondary', 'GCE A level'])
+                        & ~_col(df, COL_LOOKING_FOR_WORK_STATUS).isin(['Enrolled in school/course', 'Awaiting NS callup']),
+     'message': 'Unemployed person aged {} with {} has looking-for-work status "{}".',
+     'fields': [COL_AGE, COL_HIGHEST_ACADEMIC_QUAL, COL_LOOKING_FOR_WORK_STATUS]},
+    # Rule 148
+    {'rule': 'check_degree_police_officer',
+     'mask': lambda df: (_col(df, COL_HIGHEST_ACADEMIC_QUAL) == 'Degree') & (_text(df, COL_OCCUPATION_CODE) == '54121'),
+     'message': 'Person has Degree but occupation is 54121 (Police Officer), not 33550 (Inspector). Please verify.'},
+    # Rule 149
+    {'rule': 'check_diploma_assistant_nurse',
+     'mask': lambda df: _col(df, COL_HIGHEST_ACADEMIC_QUAL).isin(['Diploma', 'Degree', 'Masters', 'PhD'])
+                        & (_text(df, COL_OCCUPATION_CODE) == '32200'),
+     'message': 'Person has {} but occupation is 32200 (Enrolled/Asst Nurse), not 22200. Please verify.',
+     'fields': [COL_HIGHEST_ACADEMIC_QUAL]},
+    # Rule 150
+    {'rule': 'check_student_job_employment_type',
+     'mask': lambda df: _col(df, COL_LABOUR_STATUS).isin(['Student on vacation job', 'Paid internship'])
+                        & (_col(df, COL_TYPE_OF_EMPLOYMENT) == 'Permanent'),
+     'message': 'Labour status is {} but employment type is Permanent. Please verify.',
+     'fields': [COL_LABOUR_STATUS]},
+    # Rule 152
+    {'rule': 'check_self_employed_not_employer',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Private Hire Driver', 'Freelance Writer', 'Real Estate Agent', 'Insurance Agent'])
+                        & (_col(df, COL_EMPLOYMENT_STATUS) == 'Employer'),
+     'message': 'Job is {} (typically Own Account Worker) but status is Employer. Please verify.',
+     'fields': [COL_JOB_TITLE]},
+    # Rule 154
+    {'rule': 'check_ssoc_111',
+     'mask': lambda df: _text(df, COL_OCCUPATION_CODE).str.startswith('111'),
+     'message': 'Occupation code starts with 111 (Legislators/Senior Officials). Please verify.'},
+    # Rule 165
+    {'rule': 'check_real_estate_agent_status',
+     'mask': lambda df: _col(df, COL_JOB_TITLE).isin(['Real Estate Agent', 'Insurance Agent'])
+                        & (_col(df, COL_EMPLOYMENT_STATUS) == 'Employee'),
+     'message': 'Job is {} but status is Employee (not Own Account Worker). Please verify.',
+     'fields': [COL_JOB_TITLE]},
+]
+
+
+def evaluate_person_rule_spec(df_tidy, spec, rule_position=0, sequence=0):
+    """
+    Evaluates one rule spec over all persons. Returns the errors as a DataFrame
+    (Response ID, Member_ID, Rule, Error) plus the ordering keys _row/_rule/_seq.
+    """
+    mask = spec['mask'](df_tidy)
+    positions = np.flatnonzero(mask.fillna(False).to_numpy(dtype=bool))
+    flagged = df_tidy.iloc[positions]
+
+    fields = [
+        (field(flagged) if callable(field) else _col(flagged, field)).tolist()
+        for field in spec.get('fields', [])
+    ]
+    if fields:
+        messages = [spec['message'].format(*values) for values in zip(*fields)]
+    else:
+        messages = [spec['message']] * len(positions)
+
+    return pd.DataFrame({
+        COL_RESPONSE_ID: _col(flagged, COL_RESPONSE_ID, 'N/A').to_numpy(),
+        COL_MEMBER_ID: _col(flagged, COL_MEMBER_ID, 'N/A').to_numpy(),
+        'Rule': spec['rule'],
+        'Error': messages,
+        '_row': positions,
+        '_rule': rule_position,
+        '_seq': sequence,
+    })
+
+
+################################################################################
+## 4c. VECTORIZED HOUSEHOLD RELATIONSHIP RULES
+## The attributes of each household's (first) Reference Person are merged back
+## onto every member once, so the relationship checks become column
+## comparisons across the whole file instead of one call per household.
+## 'member' specs flag individual members (errors in member order within the
+## household); 'household' specs flag one row per household, using the first
+## member of each relationship exactly as the check_* functions do.
+################################################################################
+
+HRP_ATTRIBUTES = [COL_AGE, COL_SEX, COL_RACE, COL_MARITAL_STATUS, COL_ID_TYPE, COL_STAYING_WHERE]
+
+
+def _hrp(col_name):
+    """Name of the merged-back Reference Person attribute for col_name."""
+    return f'HRP {col_name}'
+
+
+def _not_none(series):
+    """True where the value is not None (NaN counts as a value, like `is not None`)."""
+    return ~series.map(lambda value: value is None).astype(bool)
+
+
+def _numeric(series):
+    return pd.to_numeric(series, errors='coerce')
+
+
+def _first_per_household(members, mask, n_households, cols, rank=0):
+    """
+    Columns of the rank-th member matching mask in each household (file order),
+    reindexed to all households; also returns whether such a member exists.
+    """
+    matched = members[mask]
+    matched = matched[matched.groupby('_hh').cumcount() == rank]
+    found = np.zeros(n_households, dtype=bool)
+    found[matched['_hh'].to_numpy()] = True
+    values = matched.set_index('_hh')[cols].reindex(range(n_households))
+    return values, found
+
+
+def build_household_frames(df_tidy):
+    """
+    Returns (members, households) for the vectorized household rules.
+
+    members:    one row per person with a Response ID, in file order, with
+                '_hh' (household number in groupby order), '_row' (position in
+                df_tidy), 'Has HRP' and the HRP attributes
+    households: one row per household with the first spouse, parents, in-laws,
+                son and grandson attributes used by the household-level rules
+    """
+    # Persons without a Response ID belong to no household (ngroup gives NaN)
+    household_number = df_tidy.groupby(COL_RESPONSE_ID).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    keep = household_number >= 0
+
+    members = pd.DataFrame({
+        COL_RESPONSE_ID: df_tidy[COL_RESPONSE_ID].to_numpy()[keep],
+        COL_MEMBER_ID: df_tidy[COL_MEMBER_ID].to_numpy()[keep],
+        COL_RELATIONSHIP: df_tidy[COL_RELATIONSHIP].to_numpy()[keep],
+        '_hh': household_number[keep],
+        '_row': np.flatnonzero(keep),
+    })
+    for col_name in HRP_ATTRIBUTES + ['No. of Household Members', 'Detected Members (Auto)']:
+        members[col_name] = _col(df_tidy, col_name).astype(object).to_numpy()[keep]
+    members['_age'] = _numeric(members[COL_AGE])
+
+    n_households = int(household_number.max()) + 1 if keep.any() else 0
+    relationship = members[COL_RELATIONSHIP]
+
+    # Reference Person attributes merged back onto every member
+    hrp, has_hrp = _first_per_household(members, relationship == 'Reference Person', n_households, HRP_ATTRIBUTES)
+    member_hh = members['_hh'].to_numpy()
+    members['Has HRP'] = has_hrp[member_hh]
+    for col_name in HRP_ATTRIBUTES:
+        members[_hrp(col_name)] = hrp[col_name].to_numpy()[member_hh]
+    members['_hrp_age'] = _numeric(members[_hrp(COL_AGE)])
+
+    households = pd.DataFrame({'_hh': np.arange(n_households)})
+    first_rows = members.drop_duplicates('_hh').set_index('_hh').reindex(range(n_households))
+    households[COL_RESPONSE_ID] = first_rows[COL_RESPONSE_ID].to_numpy()
+    households['Has HRP'] = has_hrp
+    for col_name in HRP_ATTRIBUTES:
+        households[_hrp(col_name)] = hrp[col_name].to_numpy()
+    households['Reference Persons'] = np.bincount(member_hh[(relationship == 'Reference Person').to_numpy()], minlength=n_households)
+    households['Parents'] = np.bincount(member_hh[(relationship == 'Parent').to_numpy()], minlength=n_households)
+    households['Has Partner/Spouse'] = np.bincount(
+        member_hh[relationship.isin(['Partner', 'Husband/Wife']).to_numpy()], minlength=n_households) > 0
+
+    for label, rel_value, cols, rank in [
+        ('Spouse', 'Husband/Wife', [COL_AGE, COL_SEX, COL_MARITAL_STATUS], 0),
+        ('Parent 1', 'Parent', [COL_AGE, COL_MARITAL_STATUS], 0),
+        ('Parent 2', 'Parent', [COL_AGE, COL_MARITAL_STATUS], 1),
+        ('Parent-in-law', 'Parent-in-law', [COL_AGE], 0),
+        ('Son', 'Son', [COL_AGE], 0),
+        ('Son-in-law', 'Son-in-law', [COL_AGE], 0),
+        ('Grandson', 'Grandson', [COL_AGE], 0),
+    ]:
+        values, found = _first_per_household(members, relationship == rel_value, n_households, cols, rank)
+        households[f'Has {label}'] = found
+        for col_name in cols:
+            households[f'{label} {col_name}'] = values[col_name].to_numpy()
+
+    # First-row household values (constant within a household)
+    households['Declared Members'] = _numeric(first_rows['No. of Household Members'])
+    households['Detected Members'] = _numeric(first_rows['Detected Members (Auto)'])
+    households['Has Member Count Columns'] = (
+        'No. of Household Members' in df_tidy.columns and 'Detected Members (Auto)' in df_tidy.columns
+    )
+
+    duplicated = members.duplicated(['_hh', COL_MEMBER_ID])
+    dup_ids = members[duplicated].groupby('_hh')[COL_MEMBER_ID].unique()
+    households['Duplicate Member IDs'] = dup_ids.map(lambda ids: ids.tolist()).reindex(range(n_households)).to_numpy()
+    households['Has Duplicate Member IDs'] = households['Duplicate Member IDs'].notna()
+    return members, households
+
+
+def _age_gap_lt_15(h, older, younger):
+    both = h[f'Has {older}'] & h[f'Has {younger}']
+    gap = (_numeric(h[f'{older} {COL_AGE}']) - _numeric(h[f'{younger} {COL_AGE}'])).abs()
+    return both & (gap < 15)
+
+
+HOUSEHOLD_RULE_SPECS = [
+    # Rule 1 & 164
+    {'rule': 'check_household_ref_person_count', 'level': 'household',
+     'mask': lambda h: h['Reference Persons'] == 0,
+     'message': 'Household has no Reference Person.'},
+    {'rule': 'check_household_ref_person_count', 'level': 'household',
+     'mask': lambda h: h['Reference Persons'] > 1,
+     'message': 'Household has more than one Reference Person.'},
+    # Rule 12 & 93
+    {'rule': 'check_married_hrp_has_partner', 'level': 'household',
+     'mask': lambda h: h['Has HRP'] & (h[_hrp(COL_MARITAL_STATUS)] == 'Married') & ~h['Has Partner/Spouse'],
+     'message': 'Married HRP has no partner/spouse listed in the household.'},
+    # Rule 17
+    {'rule': 'check_household_hrp_location', 'level': 'household',
+     'mask': lambda h: h['Has HRP'] & h[_hrp(COL_STAYING_WHERE)].astype(str).str.strip().isin(
+         ['Institutional Unit', 'Outside Singapore overseas for more than 6 months']),
+     'message': 'Household Reference Person location is "{}".',
+     'fields': [lambda h: h[_hrp(COL_STAYING_WHERE)].astype(str).str.strip()]},
+    # Rule 24
+    {'rule': 'check_various_age_gaps_lt_15', 'level': 'household',
+     'mask': lambda h: _age_gap_lt_15(h, 'Parent-in-law', 'Spouse'),
+     'message': 'Age gap between Parent-in-law (Age {}) and Spouse (Age {}) is < 15 years.',
+     'fields': [f'Parent-in-law {COL_AGE}', f'Spouse {COL_AGE}']},
+    {'rule': 'check_various_age_gaps_lt_15', 'level': 'household',
+     'mask': lambda h: _age_gap_lt_15(h, 'Son', 'Grandson'),
+     'message': 'Age gap between Son (Age {}) and Grandson (Age {}) is < 15 years.',
+     'fields': [f'Son {COL_AGE}', f'Grandson {COL_AGE}']},
+    {'rule': 'check_various_age_gaps_lt_15', 'level': 'household',
+     'mask': lambda h: _age_gap_lt_15(h, 'Son-in-law', 'Grandson'),
+     'message': 'Age gap between Son-in-law (Age {}) and Grandson (Age {}) is < 15 years.',
+     'fields': [f'Son-in-law {COL_AGE}', f'Grandson {COL_AGE}']},
+    # Rule 25
+    {'rule': 'check_hrp_child_age_gap', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & (m[COL_RELATIONSHIP] == 'Child') & ((m['_hrp_age'] - m['_age']) < 15),
+     'message': 'Age gap between HRP (Age {}) and Child (Age {}) is < 15 years.',
+     'fields': [_hrp(COL_AGE), COL_AGE]},
+    # Rule 26
+    {'rule': 'check_hrp_parent_age_gap', 'level': 'household',
+     'mask': lambda h: (h['Parents'] == 2)
+                       & ((_numeric(h[f'Parent 1 {COL_AGE}']) - _numeric(h[f'Parent 2 {COL_AGE}'])).abs() > 15),
+     'message': 'Age gap between HRP\'s parents (Age {}, {}) is > 15 years.',
+     'fields': [f'Parent 1 {COL_AGE}', f'Parent 2 {COL_AGE}']},
+    # Rule 32 & 33
+    {'rule': 'check_hrp_child_id_type', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & (m[COL_RELATIONSHIP] == 'Child')
+                       & m[COL_ID_TYPE].isin(['Singapore Citizen', 'Permanent Resident'])
+                       & ~m[_hrp(COL_ID_TYPE)].isin(['Singapore Citizen', 'Permanent Resident']),
+     'message': 'Child is SC/PR (ID: {}) but HRP is not (ID: {}).',
+     'fields': [COL_ID_TYPE, _hrp(COL_ID_TYPE)]},
+    {'rule': 'check_hrp_child_id_type', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & (m[COL_RELATIONSHIP] == 'Child')
+                       & ~m[COL_ID_TYPE].isin(['Singapore Citizen', 'Permanent Resident'])
+                       & m[_hrp(COL_ID_TYPE)].isin(['Singapore Citizen', 'Permanent Resident']),
+     'message': 'HRP is SC/PR (ID: {}) but Child is not (ID: {}).',
+     'fields': [_hrp(COL_ID_TYPE), COL_ID_TYPE]},
+    # Rule 34
+    {'rule': 'check_hrp_parent_race', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & _not_none(m[_hrp(COL_RACE)]) & (m[COL_RELATIONSHIP] == 'Parent')
+                       & _not_none(m[COL_RACE]) & (m[COL_RACE] != m[_hrp(COL_RACE)]),
+     'message': 'HRP race ({}) is different from Parent race ({}).',
+     'fields': [_hrp(COL_RACE), COL_RACE]},
+    # Rule 35
+    {'rule': 'check_hrp_spouse_marital_status', 'level': 'household',
+     'mask': lambda h: h['Has HRP'] & h['Has Spouse']
+                       & _not_none(h[_hrp(COL_MARITAL_STATUS)]) & _not_none(h[f'Spouse {COL_MARITAL_STATUS}'])
+                       & (h[_hrp(COL_MARITAL_STATUS)] != h[f'Spouse {COL_MARITAL_STATUS}']),
+     'message': 'HRP marital status ({}) is different from Spouse status ({}).',
+     'fields': [_hrp(COL_MARITAL_STATUS), f'Spouse {COL_MARITAL_STATUS}']},
+    # Rule 36
+    {'rule': 'check_household_hrp_age_lt_18', 'level': 'household',
+     'mask': lambda h: h['Has HRP'] & (_numeric(h[_hrp(COL_AGE)]) < 18),
+     'message': 'Household Reference Person is aged {} (< 18). Please verify.',
+     'fields': [_hrp(COL_AGE)]},
+    # Rule 40
+    {'rule': 'check_hrp_parents_marital_status', 'level': 'household',
+     'mask': lambda h: (h['Parents'] == 2)
+                       & _not_none(h[f'Parent 1 {COL_MARITAL_STATUS}']) & _not_none(h[f'Parent 2 {COL_MARITAL_STATUS}'])
+                       & (h[f'Parent 1 {COL_MARITAL_STATUS}'] != h[f'Parent 2 {COL_MARITAL_STATUS}']),
+     'message': 'HRP\'s parents have different marital status: {} and {}.',
+     'fields': [f'Parent 1 {COL_MARITAL_STATUS}', f'Parent 2 {COL_MARITAL_STATUS}']},
+    # Rule 41
+    {'rule': 'check_hrp_parent_is_single', 'level': 'member',
+     'mask': lambda m: (m[COL_RELATIONSHIP] == 'Parent') & (m[COL_MARITAL_STATUS] == 'Single'),
+     'message': 'HRP\'s parent has marital status "Single". Please verify.'},
+    # Rule 43
+    {'rule': 'check_hrp_parent_age_inversion', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & (m[COL_RELATIONSHIP] == 'Parent') & (m['_age'] < m['_hrp_age']),
+     'message': 'Parent (Age {}) is younger than HRP (Age {}).',
+     'fields': [COL_AGE, _hrp(COL_AGE)]},
+    # Rule 44
+    {'rule': 'check_parent_age_lt_30', 'level': 'member',
+     'mask': lambda m: m[COL_RELATIONSHIP].isin(['Parent', 'Parent-in-law']) & (m['_age'] < 30),
+     'message': 'Parent/Parent-in-law (Rel: {}) is aged {} (< 30). Please verify.',
+     'fields': [COL_RELATIONSHIP, COL_AGE]},
+    # Rule 52
+    {'rule': 'check_hrp_child_age_inversion', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & m[COL_RELATIONSHIP].isin(['Son', 'Daughter', 'Child']) & (m['_age'] > m['_hrp_age']),
+     'message': 'Child (Age {}) is older than HRP (Age {}).',
+     'fields': [COL_AGE, _hrp(COL_AGE)]},
+    # Rule 53
+    {'rule': 'check_hrp_inlaw_age_gap', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & m[COL_RELATIONSHIP].isin(['Son-in-law', 'Daughter-in-law'])
+                       & ((m['_hrp_age'] - m['_age']).abs() < 15),
+     'message': 'Age gap between HRP (Age {}) and {} (Age {}) is < 15 years.',
+     'fields': [_hrp(COL_AGE), COL_RELATIONSHIP, COL_AGE]},
+    # Rule 66
+    {'rule': 'check_hrp_spouse_same_sex', 'level': 'household',
+     'mask': lambda h: h['Has HRP'] & h['Has Spouse'] & _not_none(h[_hrp(COL_SEX)])
+                       & (h[_hrp(COL_SEX)] == h[f'Spouse {COL_SEX}']),
+     'message': 'HRP ({}) and Spouse ({}) are of the same sex. Amend relationship to "Partner".',
+     'fields': [_hrp(COL_SEX), f'Spouse {COL_SEX}']},
+    # Rule 92
+    {'rule': 'check_hrp_work_permit_family_pass', 'level': 'member',
+     'mask': lambda m: m['Has HRP'] & (m[_hrp(COL_ID_TYPE)] == 'Work Permit')
+                       & m[COL_RELATIONSHIP].isin(['Husband/Wife', 'Child', 'Parent', 'Parent-in-law'])
+                       & m[COL_ID_TYPE].isin(['Social Visit Pass', 'Dependant Pass']),
+     'message': 'HRP is Work Permit holder, but {} is on {}.',
+     'fields': [COL_RELATIONSHIP, COL_ID_TYPE]},
+    # Rule 94
+    {'rule': 'check_single_hrp_no_spouse', 'level': 'household',
+     'mask': lambda h: h['Has HRP'] & h[_hrp(COL_MARITAL_STATUS)].isin(['Single', 'Widowed', 'Divorced']) & h['Has Partner/Spouse'],
+     'message': 'HRP is {} but a spouse/partner is listed in household.',
+     'fields': [_hrp(COL_MARITAL_STATUS)]},
+    # Rule 117
+    {'rule': 'check_foreign_child_id_type', 'level': 'member', 'member_id': True,
+     'mask': lambda m: m['Has HRP'] & m[_hrp(COL_ID_TYPE)].isin(['Singapore Citizen', 'Permanent Resident'])
+                       & (m[COL_RELATIONSHIP] == 'Child') & (m[COL_ID_TYPE] == 'Dependant Pass'),
+     'message': 'Child of SC/PR HRP is on "Dependant Pass". Please verify (should be Social Visit Pass?).'},
+    # Rule 118
+    {'rule': 'check_foreign_spouse_id_type', 'level': 'member', 'member_id': True,
+     'mask': lambda m: m['Has HRP'] & m[_hrp(COL_ID_TYPE)].isin(['Singapore Citizen', 'Permanent Resident'])
+                       & (m[COL_RELATIONSHIP] == 'Husband/Wife') & (m[COL_ID_TYPE] == 'Dependant Pass'),
+     'message': 'Spouse of SC/PR HRP is on "Dependant Pass". Please verify (should be Social Visit Pass?).'},
+    # Rule 147
+    {'rule': 'check_household_duplicate_member_id', 'level': 'household',
+     'mask': lambda h: h['Has Duplicate Member IDs'],
+     'message': 'Household contains duplicate Member IDs: {}. Restructuring issue?',
+     'fields': ['Duplicate Member IDs']},
+    # Rule 147b
+    {'rule': 'check_household_member_count_mismatch', 'level': 'household', 'context': 'All',
+     'mask': lambda h: h['Has Member Count Columns'] & h['Declared Members'].notna() & h['Detected Members'].notna()
+                       & (np.trunc(h['Declared Members']) != np.trunc(h['Detected Members'])),
+     'message': 'Household size mismatch: Declared {}, Detected {}.',
+     'fields': [lambda h: h['Declared Members'].map(int), lambda h: h['Detected Members'].map(int)]},
+]
+
+
+def evaluate_household_rule_spec(members, households, spec, rule_position=0, sequence=0):
+    """
+    Evaluates one household rule spec across all households. Returns the errors
+    as a DataFrame (Response ID, Rule, Member_ID_Context, Error[, Member_ID])
+    plus the ordering keys _hh/_rule/_member/_seq.
+    """
+    frame = members if spec['level'] == 'member' else households
+    positions = np.flatnonzero(spec['mask'](frame).fillna(False).to_numpy(dtype=bool))
+    flagged = frame.iloc[positions]
+
+    fields = [
+        (field(flagged) if callable(field) else flagged[field]).tolist()
+        for field in spec.get('fields', [])
+    ]
+    if fields:
+        messages = [spec['message'].format(*values) for values in zip(*fields)]
+    else:
+        messages = [spec['message']] * len(positions)
+
+    errors = pd.DataFrame({
+        COL_RESPONSE_ID: flagged[COL_RESPONSE_ID].to_numpy(),
+        'Rule': spec['rule'],
+        'Member_ID_Context': spec.get('context', 'N/A'),
+        'Error': messages,
+    })
+    if spec.get('member_id'):
+        errors[COL_MEMBER_ID] = flagged[COL_MEMBER_ID].to_numpy()
+    errors['_hh'] = flagged['_hh'].to_numpy()
+    errors['_rule'] = rule_position
+    errors['_member'] = flagged['_row'].to_numpy() if spec['level'] == 'member' else -1
+    errors['_seq'] = sequence
+    return errors
+
+
+################################################################################
+## 4d. LONGITUDINAL (MONTH-OVER-MONTH) CHECKS
+## Rules 106, 123-130, 145, 155-163 and 166-172 compare a person with the same
+## person in the previous month. Each processed month's tidy data is kept in a
+## MonthlyPanelStore (one column-subset DataFrame per month and input file); the current month
+## is joined to the previous one with one indexed lookup (by NRIC where both
+## months have it, otherwise by Response ID + Member_ID) and every change rule
+## is a vectorized comparison of the two sides, evaluated like PERSON_RULE_SPECS.
+################################################################################
+
+# ### CUSTOMIZE ###: Columns only used by the month-over-month rules
+COL_COMPANY_NAME = 'ASSUMED_Company_Name_Column'
+COL_EVER_RETIRED = 'Have you ever retired from any job?'
+HIGH_INCOME_DIFFERENCE = 1000 # Rule 145: absolute GMI change that counts as "high"
+PANEL_FOLDER_NAME = 'monthly_panel' # Created inside OUTPUT_FOLDER_PATH
+
+# Columns kept per month (only those present in the file are stored)
+PANEL_COLUMNS = [
+    COL_RESPONSE_ID, COL_MEMBER_ID, COL_NRIC, COL_DOB, COL_DOB_DT,
+    COL_LABOUR_STATUS, COL_UNEMPLOYMENT_WEEKS, COL_EDU_STATUS,
+    COL_HIGHEST_ACADEMIC_QUAL, COL_VOCATIONAL_QUAL, COL_OCCUPATION_CODE,
+    COL_SSOC_TWIN_CODE, COL_COMPANY_NAME, COL_GMI, COL_EVER_WORKED, COL_EVER_RETIRED,
+]
+
+MATCHED_BY = 'Matched By (Previous Month)'
+
+
+def month_label(file_name):
+    """'YYYY-MM' taken from a file name such as 'MLFS_2025-03.xlsx' or 'MLFS 202503.csv'; None if absent."""
+    match = re.search(r'(20\d{2})[-_ ]?(0[1-9]|1[0-2])(?!\d)', os.path.basename(file_name))
+    if not match:
+        return None
+    return f'{match.group(1)}-{match.group(2)}'
+
+
+class MonthlyPanelStore:
+    """
+    Per-month tidy data (PANEL_COLUMNS only) saved as <folder>/<YYYY-MM>/<file name>.pkl.
+
+    Each input file keeps its own entry, so two files of the same month (or parallel
+    workers storing them) never overwrite each other; a month is the union of its files.
+    Entries are written to a temporary file and renamed into place, so readers never see
+    a half-written pickle. Pickle is used rather than Parquet or SQLite because it keeps
+    the tidy dtypes (datetimes, nullable codes) the change rules compare, without adding
+    pyarrow or a schema to maintain.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def _path(self, month, file_name):
+        return os.path.join(self.folder, month, f'{os.path.basename(file_name)}.pkl')
+
+    def months(self):
+        return sorted(
+            os.path.basename(os.path.dirname(p)) for p in glob.glob(os.path.join(self.folder, '*', ''))
+            if glob.glob(os.path.join(p, '*.pkl'))
+        )
+
+    def save(self, month, df_tidy, file_name):
+        path = self._path(month, file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        columns = [col for col in dict.fromkeys(PANEL_COLUMNS) if col in df_tidy.columns]
+        scratch = f'{path}.{os.getpid()}.tmp'
+        df_tidy[columns].reset_index(drop=True).to_pickle(scratch)
+        os.replace(scratch, path)
+
+    def load(self, month):
+        paths = sorted(glob.glob(os.path.join(self.folder, month, '*.pkl')))
+        if not paths:
+            return None
+        return pd.concat([pd.read_pickle(path) for path in paths], ignore_index=True)
+
+    def previous_month(self, month):
+        earlier = [m for m in self.months() if m < month]
+        return earlier[-1] if earlier else None
+
+    def load_previous(self, month):
+        """The latest stored month before `month` as (label, DataFrame), or (None, None)."""
+        previous = self.previous_month(month)
+        if previous is None:
+            return None, None
+        return previous, self.load(previous)
+
+    def panel(self, months=None):
+        """Stored months stacked into one long DataFrame with a 'Month' column."""
+        frames = []
+        for month in months or self.months():
+            df = self.load(month)
+            if df is not None:
+                frames.append(df.assign(Month=month))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _prev(col_name):
+    """Name of the previous-month value of col_name in the joined frame."""
+    return f'{col_name} [previous month]'
+
+
+def _nric_key(df):
+    if COL_NRIC not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+    key = df[COL_NRIC].astype(str).str.strip().str.upper()
+    return key.where(df[COL_NRIC].notna() & (key != ''))
+
+
+def _member_key(df):
+    if COL_RESPONSE_ID not in df.columns or COL_MEMBER_ID not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+    key = df[COL_RESPONSE_ID].astype(str).str.strip() + '|' + df[COL_MEMBER_ID].astype(str).str.strip()
+    return key.where(df[COL_RESPONSE_ID].notna() & df[COL_MEMBER_ID].notna())
+
+
+def join_previous_month(df_tidy, previous_tidy):
+    """
+    df_tidy with the previous month's PANEL_COLUMNS appended as '<col> [previous month]'
+    and MATCHED_BY set to 'NRIC', 'Member' or NaN (person not found last month).
+    Both lookups are hash-indexed reindexes, so the join is linear in the file size.
+    A key that repeats on either side (e.g. a contact number shared by a household)
+    does not identify a person, so those rows fall back to the Response ID + Member_ID key.
+    """
+    columns = [col for col in dict.fromkeys(PANEL_COLUMNS) if col in previous_tidy.columns]
+    previous = previous_tidy[columns].reset_index(drop=True)
+    current_nric, previous_nric = _nric_key(df_tidy), _nric_key(previous)
+    current_member, previous_member = _member_key(df_tidy), _member_key(previous)
+
+    def lookup(current_key, previous_key):
+        current_key = current_key.where(~current_key.duplicated(keep=False))
+        positions = pd.Series(np.arange(len(previous)), index=previous_key)
+        positions = positions[positions.index.notna() & ~positions.index.duplicated(keep=False)]
+        return current_key.map(positions)
+
+    by_nric = lookup(current_nric, previous_nric)
+    by_member = lookup(current_member, previous_member)
+    position = by_nric.fillna(by_member)
+
+    matched = position.notna().to_numpy()
+    joined = df_tidy.copy()
+    taken = previous.iloc[position[matched].astype(int).to_numpy()]
+    for col_name in columns:
+        values = pd.Series(np.nan, index=df_tidy.index, dtype=object)
+        values[matched] = taken[col_name].astype(object).to_numpy()
+        joined[_prev(col_name)] = values
+    joined[MATCHED_BY] = np.where(by_nric.notna(), 'NRIC', np.where(by_member.notna(), 'Member', None))
+    return joined
+
+
+def _both(df, col_name):
+    """Both months answered col_name."""
+    return _col(df, col_name).notna() & _col(df, _prev(col_name)).notna()
+
+
+def _changed(df, col_name):
+    """Both months answered col_name and the answers differ (compared as stripped text)."""
+    current = _text(df, col_name).str.strip()
+    previous = _text(df, _prev(col_name)).str.strip()
+    return _both(df, col_name) & (current != previous)
+
+
+def _weeks_delta(df):
+    return pd.to_numeric(_col(df, COL_UNEMPLOYMENT_WEEKS), errors='coerce') - pd.to_numeric(_col(df, _prev(COL_UNEMPLOYMENT_WEEKS)), errors='coerce')
+
+
+def _dob(df, col_name):
+    return pd.to_datetime(_col(df, col_name), errors='coerce')
+
+
+def _unemployed(df):
+    return _col(df, COL_LABOUR_STATUS) == 'Unemployed'
+
+
+LONGITUDINAL_RULE_SPECS = [
+    # Rule 106
+    {'rule': 'check_nric_hprefpin_change',
+     'mask': lambda df: (_col(df, MATCHED_BY) == 'NRIC')
+                        & ((_text(df, COL_RESPONSE_ID) != _text(df, _prev(COL_RESPONSE_ID)))
+                           | (_text(df, COL_MEMBER_ID) != _text(df, _prev(COL_MEMBER_ID)))),
+     'message': 'NRIC has a different HREFPIN in the previous month (Response ID {}, Member {}). Please retain HREFPIN from previous month.',
+     'fields': [_prev(COL_RESPONSE_ID), _prev(COL_MEMBER_ID)]},
+    # Rule 123-130
+    {'rule': 'check_changes_from_previous_month',
+     'mask': lambda df: _unemployed(df) & (_weeks_delta(df) >= 5),
+     'message': 'R. is unemployed in current month but increase in unemployment duration is 5 weeks or more ({} -> {} weeks).',
+     'fields': [_prev(COL_UNEMPLOYMENT_WEEKS), COL_UNEMPLOYMENT_WEEKS]},
+    {'rule': 'check_changes_from_previous_month',
+     'mask': lambda df: _unemployed(df) & (_weeks_delta(df) < 0),
+     'message': 'R. is unemployed in current month but unemployment duration has declined from previous month ({} -> {} weeks).',
+     'fields': [_prev(COL_UNEMPLOYMENT_WEEKS), COL_UNEMPLOYMENT_WEEKS]},
+    {'rule': 'check_changes_from_previous_month',
+     'mask': lambda df: _changed(df, COL_EDU_STATUS),
+     'message': 'Educational status has changed from "{}" to "{}". Please verify.',
+     'fields': [_prev(COL_EDU_STATUS), COL_EDU_STATUS]},
+    {'rule': 'check_changes_from_previous_month',
+     'mask': lambda df: _changed(df, COL_VOCATIONAL_QUAL),
+     'message': 'Respondent\'s WSQ_EDUC is different from previous month ("{}" -> "{}"), please verify and confirm.',
+     'fields': [_prev(COL_VOCATIONAL_QUAL), COL_VOCATIONAL_QUAL]},
+    {'rule': 'check_changes_from_previous_month',
+     'mask': lambda df: (_col(df, _prev(COL_EVER_RETIRED)) == 'Yes') & (_col(df, COL_EVER_RETIRED) == 'No'),
+     'message': 'Respondent indicated he or she has retired before in the previous month, please verify and confirm.'},
+    # Rule 145
+    {'rule': 'check_high_income_difference',
+     'mask': lambda df: (pd.to_numeric(_col(df, COL_GMI), errors='coerce')
+                         - pd.to_numeric(_col(df, _prev(COL_GMI)), errors='coerce')).abs() > HIGH_INCOME_DIFFERENCE,
+     'message': 'There are high income difference from previous month (GMI {} -> {}), please check if the income is correct.',
+     'fields': [_prev(COL_GMI), COL_GMI]},
+    # Rule 155-163
+    {'rule': 'check_changes_from_previous_month_batch_2',
+     'mask': lambda df: _changed(df, COL_LABOUR_STATUS),
+     'message': 'There are changes to Activity Status ("{}" -> "{}"), please verify.',
+     'fields': [_prev(COL_LABOUR_STATUS), COL_LABOUR_STATUS]},
+    {'rule': 'check_changes_from_previous_month_batch_2',
+     'mask': lambda df: _changed(df, COL_OCCUPATION_CODE) & _both(df, COL_COMPANY_NAME) & ~_changed(df, COL_COMPANY_NAME),
+     'message': 'There are changes to occupation code from previous month ({} -> {}) but continues employment with current company, please check if there are changes in the job title or job description.',
+     'fields': [_prev(COL_OCCUPATION_CODE), COL_OCCUPATION_CODE]},
+    {'rule': 'check_changes_from_previous_month_batch_2',
+     'mask': lambda df: _changed(df, COL_OCCUPATION_CODE) & ~(_both(df, COL_COMPANY_NAME) & ~_changed(df, COL_COMPANY_NAME)),
+     'message': 'There are changes to occupation code from previous month ({} -> {}), please check if there are changes in the job title or job desc.',
+     'fields': [_prev(COL_OCCUPATION_CODE), COL_OCCUPATION_CODE]},
+    {'rule': 'check_changes_from_previous_month_batch_2',
+     'mask': lambda df: _changed(df, COL_SSOC_TWIN_CODE),
+     'message': 'There are changes to occupation code twin code from previous month ({} -> {}), please check if there are changes in the job title or job desc.',
+     'fields': [_prev(COL_SSOC_TWIN_CODE), COL_SSOC_TWIN_CODE]},
+    {'rule': 'check_changes_from_previous_month_batch_2',
+     'mask': lambda df: (_col(df, MATCHED_BY) == 'Member') & _changed(df, COL_NRIC),
+     'message': 'There are changes to NRIC, please verify.'},
+    {'rule': 'check_changes_from_previous_month_batch_2',
+     'mask': lambda df: _dob(df, _prev(COL_DOB_DT)).notna() & _dob(df, COL_DOB_DT).notna()
+                        & (_dob(df, _prev(COL_DOB_DT)) != _dob(df, COL_DOB_DT)),
+     'message': 'Date of birth has changed from previous month ({} -> {}). Please verify.',
+     'fields': [lambda df: _dob(df, _prev(COL_DOB_DT)).dt.strftime('%d/%m/%Y'),
+                lambda df: _dob(df, COL_DOB_DT).dt.strftime('%d/%m/%Y')]},
+    # Rule 166-172
+    {'rule': 'check_changes_from_previous_month_batch_3',
+     'mask': lambda df: (_col(df, COL_EVER_WORKED) == 'Yes') & (_col(df, _prev(COL_EVER_WORKED)) == 'No'),
+     'message': 'Respondent indicated "Ever worked before" changed from No to Yes. Please verify and confirm.'},
+    {'rule': 'check_changes_from_previous_month_batch_3',
+     'mask': lambda df: _changed(df, COL_HIGHEST_ACADEMIC_QUAL),
+     'message': 'Respondent\'s EDUC is different from previous month ("{}" -> "{}"), please verify and confirm.',
+     'fields': [_prev(COL_HIGHEST_ACADEMIC_QUAL), COL_HIGHEST_ACADEMIC_QUAL]},
+]
+
+
+def run_longitudinal_checks(df_tidy, previous_tidy):
+    """
+    Joins df_tidy to the previous month and evaluates LONGITUDINAL_RULE_SPECS.
+    Returns a list of error dicts (Response ID, Member_ID, Rule, Error) in
+    person order, like the per-person checks.
+    """
+    joined = join_previous_month(df_tidy, previous_tidy)
+    print(f"   - Matched {int(joined[MATCHED_BY].notna().sum())} of {len(joined)} persons to the previous month.")
+
+    frames = []
+    for sequence, spec in enumerate(LONGITUDINAL_RULE_SPECS):
+        try:
+            frames.append(evaluate_person_rule_spec(joined, spec, sequence=sequence))
+        except Exception as e:
+            print(f"❌ ERROR applying longitudinal rule '{spec['rule']}': {e}")
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return []
+    errors = pd.concat(frames, ignore_index=True).sort_values(['_row', '_seq'], kind='stable')
+    return errors.drop(columns=['_row', '_rule', '_seq']).to_dict('records')
+
+
 ################################################################################
 ## 5. MAIN VALIDATION ENGINE
 ## This is the orchestrator that runs all the checks.
 ################################################################################
 
-def run_validations(df_tidy):
+def run_validations(df_tidy, previous_tidy=None, month=None):
     """
     Applies all validation functions to the tidy DataFrame and returns a report.
+    previous_tidy (last month's tidy data, e.g. from MonthlyPanelStore) enables
+    the month-over-month rules; without it they are skipped. Ages are computed
+    at the end of month ('YYYY-MM', see derive_age_columns).
     """
     print("🚀 Starting validation process...")
     all_errors = []
     
-    # Pre-calculate age for all persons if DOB data exists
-    if COL_DOB_DT in df_tidy.columns:
-        # Ensure the column is actually datetime before applying calculate_age
-        if pd.api.types.is_datetime64_any_dtype(df_tidy[COL_DOB_DT]):
-             df_tidy[COL_AGE] = df_tidy[COL_DOB_DT].apply(calculate_age)
-        else:
-             print(f"⚠️ Warning: Column '{COL_DOB_DT}' is not datetime type. Cannot calculate age accurately.")
-             df_tidy[COL_AGE] = None # Set Age to None if DOB_DT is not datetime
-    else:
-        df_tidy[COL_AGE] = None # Ensure 'Age' column exists to prevent errors
+    # Pre-calculate DOB, age and age band for all persons (once per file)
+    derive_age_columns(df_tidy, month)
 
     # A) Apply per-person validation rules
     print("   - Running per-person checks...")
@@ -2866,7 +3891,7 @@ def run_validations(df_tidy):
         check_job_offer_no_application,                 # Rule 103
         check_spouse_marital_status,                    # Rule 104
         check_nie_diploma_institution,                  # Rule 105
-        # check_nric_hprefpin_change,                   # Rule 106 (placeholder)
+        # check_nric_hprefpin_change,                   # Rule 106 (LONGITUDINAL_RULE_SPECS, section D)
         check_nursery_farm_worker_occupation,           # Rule 107
         # check_others_selected,                        # Rule 108 (placeholder)
         # check_others_specified_remarks,               # Rule 109 (placeholder)
@@ -2880,10 +3905,10 @@ def run_validations(df_tidy):
         check_age_lt_17_olevel_not_student,             # Rule 120
         check_unemployed_15_19_not_student,             # Rule 121
         check_unemployed_20_24_upper_sec_not_student,   # Rule 122
-        # check_changes_from_previous_month,            # Rule 123-130 (placeholder)
+        # check_changes_from_previous_month,            # Rule 123-130 (LONGITUDINAL_RULE_SPECS, section D)
         # check_routing_logic,                          # Rule 131-132 (placeholder)
         # check_routing_logic_batch_2,                  # Rule 133-143 (placeholder)
-        # check_high_income_difference,                 # Rule 145 (placeholder)
+        # check_high_income_difference,                 # Rule 145 (LONGITUDINAL_RULE_SPECS, section D)
         check_degree_police_officer,                    # Rule 148
         check_diploma_assistant_nurse,                  # Rule 149
         check_student_job_employment_type,              # Rule 150
@@ -2891,30 +3916,66 @@ def run_validations(df_tidy):
         check_self_employed_not_employer,               # Rule 152
         # check_vocational_cert_institution_type,       # Rule 153 (placeholder)
         check_ssoc_111,                                 # Rule 154
-        # check_changes_from_previous_month_batch_2,    # Rule 155-163 (placeholder)
+        # check_changes_from_previous_month_batch_2,    # Rule 155-163 (LONGITUDINAL_RULE_SPECS, section D)
         check_real_estate_agent_status,                 # Rule 165
-        # check_changes_from_previous_month_batch_3,    # Rule 166-172 (placeholder)
+        # check_changes_from_previous_month_batch_3,    # Rule 166-172 (LONGITUDINAL_RULE_SPECS, section D)
         # check_routing_logic_batch_3,                  # Rule 173-176 (placeholder)
     ]
 
 
-    for index, row in df_tidy.iterrows():
-        # Pass the row Series to each validation function
-        current_row = row
-        for rule_function in per_person_rules:
-            try:
-                errors = rule_function(current_row)
-                for error in errors:
-                    error_context = {
-                        COL_RESPONSE_ID: current_row.get(COL_RESPONSE_ID, 'N/A'),
-                        COL_MEMBER_ID: current_row.get(COL_MEMBER_ID, 'N/A'),
-                        'Rule': rule_function.__name__
-                    }
-                    error_context.update(error) # Add specific error message
-                    all_errors.append(error_context)
-            except Exception as e:
-                # Log error if a rule function fails for a specific row
-                print(f"❌ ERROR applying rule '{rule_function.__name__}' to row index {index} (Response ID: {current_row.get(COL_RESPONSE_ID, 'N/A')}, Member ID: {current_row.get(COL_MEMBER_ID, 'N/A')}): {e}")
+    # Rules with a vectorized spec are evaluated as one mask over all persons;
+    # the rest run row by row. Errors keep the per-row order (person, then rule).
+    specs_by_rule = {}
+    for spec in PERSON_RULE_SPECS:
+        specs_by_rule.setdefault(spec['rule'], []).append(spec)
+
+    person_error_frames = []
+    row_rules = []
+    for rule_position, rule_function in enumerate(per_person_rules):
+        specs = specs_by_rule.get(rule_function.__name__)
+        if not specs:
+            row_rules.append((rule_position, rule_function))
+            continue
+        try:
+            rule_frames = [
+                evaluate_person_rule_spec(df_tidy, spec, rule_position, sequence)
+                for sequence, spec in enumerate(specs)
+            ]
+        except Exception as e:
+            print(f"⚠️ Vectorized rule '{rule_function.__name__}' failed ({e}); applying it row by row.")
+            row_rules.append((rule_position, rule_function))
+            continue
+        person_error_frames.extend(rule_frames)
+
+    row_errors = []
+    if row_rules:
+        for row_position, (index, row) in enumerate(df_tidy.iterrows()):
+            # Pass the row Series to each validation function
+            current_row = row
+            for rule_position, rule_function in row_rules:
+                try:
+                    errors = rule_function(current_row)
+                    for sequence, error in enumerate(errors):
+                        error_context = {
+                            COL_RESPONSE_ID: current_row.get(COL_RESPONSE_ID, 'N/A'),
+                            COL_MEMBER_ID: current_row.get(COL_MEMBER_ID, 'N/A'),
+                            'Rule': rule_function.__name__
+                        }
+                        error_context.update(error) # Add specific error message
+                        error_context.update({'_row': row_position, '_rule': rule_position, '_seq': sequence})
+                        row_errors.append(error_context)
+                except Exception as e:
+                    # Log error if a rule function fails for a specific row
+                    print(f"❌ ERROR applying rule '{rule_function.__name__}' to row index {index} (Response ID: {current_row.get(COL_RESPONSE_ID, 'N/A')}, Member ID: {current_row.get(COL_MEMBER_ID, 'N/A')}): {e}")
+    if row_errors:
+        person_error_frames.append(pd.DataFrame(row_errors))
+
+    person_error_frames = [frame for frame in person_error_frames if not frame.empty]
+    if person_error_frames:
+        person_errors = pd.concat(person_error_frames, ignore_index=True)
+        person_errors = person_errors.sort_values(['_row', '_rule', '_seq'], kind='stable')
+        person_errors = person_errors.drop(columns=['_row', '_rule', '_seq'])
+        all_errors.extend(person_errors.to_dict('records'))
 
 
     # B) Apply per-household validation rules
@@ -2954,37 +4015,72 @@ def run_validations(df_tidy):
     if COL_RESPONSE_ID not in df_tidy.columns:
         print(f"❌ ERROR: Cannot run household checks. Missing '{COL_RESPONSE_ID}' column.")
     else:
-        # Group by Response ID and apply rules to each household subgroup
-        grouped = df_tidy.groupby(COL_RESPONSE_ID)
-        total_groups = len(grouped)
-        current_group = 0
-        for response_id, household_df in grouped:
-            current_group += 1
-            # Optional: Add progress indicator
-            # if current_group % 100 == 0:
-            #    print(f"      Processing household {current_group}/{total_groups}...")
-
-            for rule_function in per_household_rules:
-                try:
-                    # Pass the household DataFrame subset to the function
-                    errors = rule_function(household_df)
-                    for error in errors:
-                        # Add common context, allow function to add specific Member IDs if needed
-                        error_context = {
-                            COL_RESPONSE_ID: response_id,
-                            'Rule': rule_function.__name__,
-                            'Member_ID_Context': error.get('Member_ID_Context', 'N/A') # Get specific ID if provided by rule
-                        }
-                        error_context.update(error) # Add specific error message, potentially overwriting context key
-                        # Clean up helper keys used for context if they exist in the original error dict
-                        error_context.pop('Member_ID_Checked', None)
-                        error_context.pop('Child_Member_ID', None)
-                        error_context.pop('Parent_Member_ID', None)
-
-                        all_errors.append(error_context)
-                except Exception as e:
-                     # Log household-level rule errors
-                     print(f"❌ ERROR applying rule '{rule_function.__name__}' to household Response ID {response_id}: {e}")
+        # Rules with a vectorized spec compare each member against the merged-back
+        # HRP attributes in one pass; the rest still run household by household.
+        # Errors keep the per-household order (household, rule, member).
+        specs_by_rule = {}
+        for spec in HOUSEHOLD_RULE_SPECS:
+            specs_by_rule.setdefault(spec['rule'], []).append(spec)
+
+        household_error_frames = []
+        household_rules = []
+        try:
+            members, households = build_household_frames(df_tidy)
+        except Exception as e:
+            print(f"⚠️ Could not merge HRP attributes ({e}); applying household rules one household at a time.")
+            specs_by_rule = {}
+
+        for rule_position, rule_function in enumerate(per_household_rules):
+            specs = specs_by_rule.get(rule_function.__name__)
+            if not specs:
+                household_rules.append((rule_position, rule_function))
+                continue
+            try:
+                rule_frames = [
+                    evaluate_household_rule_spec(members, households, spec, rule_position, sequence)
+                    for sequence, spec in enumerate(specs)
+                ]
+            except Exception as e:
+                print(f"⚠️ Vectorized rule '{rule_function.__name__}' failed ({e}); applying it household by household.")
+                household_rules.append((rule_position, rule_function))
+                continue
+            household_error_frames.extend(rule_frames)
+
+        group_errors = []
+        if household_rules:
+            # Group by Response ID and apply the remaining rules to each household subgroup
+            grouped = df_tidy.groupby(COL_RESPONSE_ID)
+            for household_position, (response_id, household_df) in enumerate(grouped):
+                for rule_position, rule_function in household_rules:
+                    try:
+                        # Pass the household DataFrame subset to the function
+                        errors = rule_function(household_df)
+                        for sequence, error in enumerate(errors):
+                            # Add common context, allow function to add specific Member IDs if needed
+                            error_context = {
+                                COL_RESPONSE_ID: response_id,
+                                'Rule': rule_function.__name__,
+                                'Member_ID_Context': error.get('Member_ID_Context', 'N/A') # Get specific ID if provided by rule
+                            }
+                            error_context.update(error) # Add specific error message, potentially overwriting context key
+                            # Clean up helper keys used for context if they exist in the original error dict
+                            error_context.pop('Member_ID_Checked', None)
+                            error_context.pop('Child_Member_ID', None)
+                            error_context.pop('Parent_Member_ID', None)
+                            error_context.update({'_hh': household_position, '_rule': rule_position, '_member': -1, '_seq': sequence})
+                            group_errors.append(error_context)
+                    except Exception as e:
+                         # Log household-level rule errors
+                         print(f"❌ ERROR applying rule '{rule_function.__name__}' to household Response ID {response_id}: {e}")
+        if group_errors:
+            household_error_frames.append(pd.DataFrame(group_errors))
+
+        household_error_frames = [frame for frame in household_error_frames if not frame.empty]
+        if household_error_frames:
+            household_errors = pd.concat(household_error_frames, ignore_index=True)
+            household_errors = household_errors.sort_values(['_hh', '_rule', '_member', '_seq'], kind='stable')
+            household_errors = household_errors.drop(columns=['_hh', '_rule', '_member', '_seq'])
+            all_errors.extend(household_errors.to_dict('records'))
 
     # C) Apply global validation rules (e.g., duplicate NRICs across all files)
     # Note: These run on the current file's tidy data. For true global checks across files,
@@ -3012,6 +4108,16 @@ def run_validations(df_tidy):
         except Exception as e:
             print(f"❌ ERROR applying global rule '{rule_function.__name__}' on current file: {e}")
 
+    # D) Apply month-over-month rules (Rule 106, 123-130, 145, 155-163, 166-172)
+    if previous_tidy is None or previous_tidy.empty:
+        print("   - No previous month data; skipping month-over-month checks.")
+    else:
+        print("   - Running month-over-month checks...")
+        try:
+            all_errors.extend(run_longitudinal_checks(df_tidy, previous_tidy))
+        except Exception as e:
+            print(f"❌ ERROR joining current file to previous month: {e}")
+
     print(f"🏁 Validation complete for this file. Found {len(all_errors)} issues.")
 
     # Convert list of error dicts to DataFrame
@@ -3073,12 +4179,219 @@ def all_validation_reports(output_folder_path=OUTPUT_FOLDER_PATH):
         return pd.DataFrame()
     
 
+def load_tidy_file(file_path):
+    """Steps 1-2 for one input file: load the raw data and restructure it to one row per person (None if unusable)."""
+    file_name = os.path.basename(file_path)
+
+    # Step 1: Load the raw data
+    df_raw = load_and_clean_data(file_path, HEADER_ROW_INDEX)
+    if df_raw is None or df_raw.empty:
+        print(f"⚠️ Skipping file {file_name} due to loading error or empty file.")
+        return None
+
+    # Step 2: Restructure the data (Using refined logic)
+    df_tidy = restructure_data(df_raw)
+    if df_tidy is None or df_tidy.empty:
+        print(f"⚠️ Skipping validation for {file_name} due to restructuring issue or empty result.")
+        return None
+    return df_tidy
+
+
+def record_issues(file_name, month, df_tidy, validation_report, wall_s):
+    """Append the issues of one file to the results warehouse (CLFS_warehouse) under its month."""
+    issues = pd.DataFrame()
+    if validation_report is not None and not validation_report.empty:
+        issues = pd.DataFrame({
+            'response_id': validation_report.get(COL_RESPONSE_ID),
+            'member_index': pd.to_numeric(validation_report.get(COL_MEMBER_ID), errors='coerce'),
+            'rule': validation_report.get('Rule'),
+            'message': validation_report.get('Error'),
+        }).astype(object)
+        issues['response_id'] = issues['response_id'].map(warehouse._text)
+    warehouse.record_run(
+        WAREHOUSE_FILE, 'MLFS', file_name, wave=month, rows=len(df_tidy), wall_s=wall_s, errors=issues,
+    )
+
+
+def validate_tidy_file(file_name, df_tidy, output_folder_path, panel_store, save_panel=True):
+    """
+    Steps 3-4 for one input file: run all validation checks (against the
+    previous month stored in panel_store, when there is one) and save the
+    per-file report. Returns the number of issues found.
+    """
+    # Step 3: Run all validation checks (against the previous month when it is stored)
+    started = time.perf_counter()
+    month = month_label(file_name)
+    previous_month, previous_tidy = panel_store.load_previous(month) if month else (None, None)
+    if previous_month:
+        print(f"   Comparing {month} with previous month {previous_month}.")
+    elif not month:
+        print("   No YYYY-MM in file name; month-over-month checks skipped.")
+    validation_report = run_validations(df_tidy, previous_tidy, month)
+    if month and save_panel:
+        panel_store.save(month, df_tidy, file_name)
+    if WAREHOUSE_FILE:
+        record_issues(file_name, month, df_tidy, validation_report, time.perf_counter() - started)
+
+    # Prepare per-file report DataFrame (even if no errors)
+    if validation_report is not None and not validation_report.empty:
+        per_file_df = validation_report.copy()
+        per_file_df['Source_File'] = file_name
+        issues = len(per_file_df)
+        print(f"🏁 File processed. Found {issues} issues.")
+    else:
+        print("🎉 File processed. No validation errors found.")
+        issues = 0
+        per_file_df = pd.DataFrame([
+            {
+                'Source_File': file_name,
+                'Rule': '',
+                'Error': 'No validation errors found.'
+            }
+        ])
+
+    # Reorder, sort, and insert separators between households for this file
+    try:
+        # Define desired order, including potential context columns
+        default_cols_order = [
+            'Source_File', COL_RESPONSE_ID, COL_MEMBER_ID, 'Member_ID_Context',
+            'Rule', 'Error'
+        ]
+        # Get existing columns from the df in the desired order
+        existing_cols_in_order = [col for col in default_cols_order if col in per_file_df.columns]
+        # Get any other columns that might have been added by rules
+        other_cols = [col for col in per_file_df.columns if col not in existing_cols_in_order]
+        # Combine ordered known columns with any others
+        per_file_df = per_file_df[existing_cols_in_order + other_cols]
+
+        # Sort and insert a visual separator row between households (Response IDs)
+        if COL_RESPONSE_ID in per_file_df.columns:
+            sort_keys = ['Source_File'] if 'Source_File' in per_file_df.columns else []
+            sort_keys += [COL_RESPONSE_ID]
+            if COL_MEMBER_ID in per_file_df.columns:
+                sort_keys += [COL_MEMBER_ID]
+            per_file_df = per_file_df.sort_values(by=sort_keys, kind='stable')
+
+            # Build a new DataFrame with separator rows (blank) between groups
+            grouped = per_file_df.groupby(COL_RESPONSE_ID, sort=False)
+            frames = []
+            first = True
+            for _, grp in grouped:
+                if not first:
+                    # Separator row (all empty strings to keep types consistent in Excel)
+                    frames.append(pd.DataFrame([{col: '' for col in per_file_df.columns}]))
+                frames.append(grp)
+                first = False
+            if frames:
+                per_file_df = pd.concat(frames, ignore_index=True)
+    except Exception as e:
+        print(f"   ⚠️ Formatting warning for {file_name}: {e}")
+
+    # Save per-file report
+    per_file_output_path = os.path.join(
+        output_folder_path,
+        f"{os.path.splitext(file_name)[0]}_VALIDATION_REPORT.xlsx"
+    )
+    try:
+        print(f"   Saving per-file report to: {per_file_output_path}")
+        print("   (Ensure this file is not already open in Excel)")
+        # Use openpyxl engine for .xlsx
+        per_file_df.to_excel(per_file_output_path, index=False, engine='openpyxl')
+        print("   ✅ Per-file report saved successfully.")
+    except PermissionError:
+        print(f"   ❌ ERROR: Permission denied for '{per_file_output_path}'. Is it open?")
+    except ImportError:
+        print("   ❌ ERROR: `openpyxl` not installed; cannot write .xlsx. Attempting CSV fallback...")
+        # Fallback to CSV
+        fallback_path = os.path.join(
+            output_folder_path,
+            f"{os.path.splitext(file_name)[0]}_VALIDATION_REPORT_FALLBACK.csv"
+        )
+        try:
+            per_file_df.to_csv(fallback_path, index=False)
+            print(f"   ✅ Fallback CSV report saved: {fallback_path}")
+        except Exception as csv_e:
+            print(f"   ❌ ERROR saving fallback CSV report. Reason: {csv_e}")
+    except Exception as e:
+        print(f"   ❌ ERROR saving per-file report for '{file_name}'. Reason: {e}")
+    return issues
+
+
+def process_file(file_path, output_folder_path, panel_store):
+    """Load, restructure, validate and report one input file. Returns the number of issues (None if skipped)."""
+    file_name = os.path.basename(file_path)
+    print(f"\n--- Processing file: {file_name} ---")
+    df_tidy = load_tidy_file(file_path)
+    if df_tidy is None:
+        return None
+    return validate_tidy_file(file_name, df_tidy, output_folder_path, panel_store)
+
+
+# --- Parallel execution (--workers N) ---
+# Files are restructured in parallel first and each month's panel data is
+# stored, so every file can then be validated in parallel against the month
+# before it. Workers write their own per-file reports.
+
+def _prepare_file_in_worker(file_path, output_folder_path):
+    """Phase 1: restructure one file, store its month panel and spill the tidy data to disk."""
+    file_name = os.path.basename(file_path)
+    print(f"\n--- Restructuring file: {file_name} ---")
+    df_tidy = load_tidy_file(file_path)
+    if df_tidy is None:
+        return None
+    month = month_label(file_name)
+    if month:
+        MonthlyPanelStore(os.path.join(output_folder_path, PANEL_FOLDER_NAME)).save(month, df_tidy, file_name)
+    tidy_folder = os.path.join(output_folder_path, '_tidy_scratch')
+    os.makedirs(tidy_folder, exist_ok=True)
+    tidy_path = os.path.join(tidy_folder, f"{os.path.splitext(file_name)[0]}.pkl")
+    df_tidy.to_pickle(tidy_path)
+    return tidy_path
+
+
+def _validate_file_in_worker(file_path, tidy_path, output_folder_path):
+    """Phase 2: validate one restructured file and write its per-file report."""
+    file_name = os.path.basename(file_path)
+    print(f"\n--- Validating file: {file_name} ---")
+    df_tidy = pd.read_pickle(tidy_path)
+    os.remove(tidy_path)
+    panel_store = MonthlyPanelStore(os.path.join(output_folder_path, PANEL_FOLDER_NAME))
+    return validate_tidy_file(file_name, df_tidy, output_folder_path, panel_store, save_panel=False)
+
+
+def process_files_in_workers(file_paths, output_folder_path, workers):
+    """Process file_paths in a pool of `workers` processes; returns {file_path: issues or None}."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = {file_path: None for file_path in file_paths}
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as pool:
+        tidy_paths = dict(zip(file_paths, pool.map(_prepare_file_in_worker, file_paths, [output_folder_path] * len(file_paths))))
+        prepared = [file_path for file_path in file_paths if tidy_paths[file_path]]
+        issues = pool.map(
+            _validate_file_in_worker,
+            prepared,
+            [tidy_paths[file_path] for file_path in prepared],
+            [output_folder_path] * len(prepared),
+        )
+        results.update(zip(prepared, issues))
+    try:
+        os.rmdir(os.path.join(output_folder_path, '_tidy_scratch'))
+    except OSError:
+        pass
+    return results
+
+
 ################################################################################
 ## 6. EXECUTION BLOCK
 ## This runs the entire process when the script is executed.
 ################################################################################
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MLFS validator prototype")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Process up to N input files in parallel worker processes (default: 1)")
+    args = parser.parse_args()
+
     # --- Folder Setup ---
     # Use absolute paths or ensure relative paths are correct from where script is run
     script_dir = os.path.dirname(os.path.abspath(__file__)) # Get directory where script is located
@@ -3130,108 +4443,28 @@ if __name__ == "__main__":
         print("   Please ensure files are placed directly inside the folder, not in subdirectories.")
         exit()
 
+    # Process months in order so each file can be compared with the month before it
+    all_input_files.sort(key=lambda f: (month_label(f) or '', os.path.basename(f)))
+    panel_store = MonthlyPanelStore(os.path.join(OUTPUT_FOLDER_PATH, PANEL_FOLDER_NAME))
+
     print(f"✅ Found {len(all_input_files)} files to process:")
     for f in all_input_files: print(f"   - {os.path.basename(f)}")
 
     # --- Processing Loop ---
-    for file_path in all_input_files:
-        file_name = os.path.basename(file_path)
-        print(f"\n--- Processing file: {file_name} ---")
-
-        # Step 1: Load the raw data
-        df_raw = load_and_clean_data(file_path, HEADER_ROW_INDEX)
-
-        if df_raw is not None and not df_raw.empty:
-            # Step 2: Restructure the data (Using refined logic)
-            df_tidy = restructure_data(df_raw)
-
-            if df_tidy is not None and not df_tidy.empty:
-                # Step 3: Run all validation checks
-                validation_report = run_validations(df_tidy)
-
-                # Prepare per-file report DataFrame (even if no errors)
-                if validation_report is not None and not validation_report.empty:
-                    per_file_df = validation_report.copy()
-                    per_file_df['Source_File'] = file_name
-                    print(f"🏁 File processed. Found {len(per_file_df)} issues.")
-                else:
-                    print("🎉 File processed. No validation errors found.")
-                    per_file_df = pd.DataFrame([
-                        {
-                            'Source_File': file_name,
-                            'Rule': '',
-                            'Error': 'No validation errors found.'
-                        }
-                    ])
-
-                # Reorder, sort, and insert separators between households for this file
-                try:
-                    # Define desired order, including potential context columns
-                    default_cols_order = [
-                        'Source_File', COL_RESPONSE_ID, COL_MEMBER_ID, 'Member_ID_Context',
-                        'Rule', 'Error'
-                    ]
-                    # Get existing columns from the df in the desired order
-                    existing_cols_in_order = [col for col in default_cols_order if col in per_file_df.columns]
-                    # Get any other columns that might have been added by rules
-                    other_cols = [col for col in per_file_df.columns if col not in existing_cols_in_order]
-                    # Combine ordered known columns with any others
-                    per_file_df = per_file_df[existing_cols_in_order + other_cols]
-
-                    # Sort and insert a visual separator row between households (Response IDs)
-                    if COL_RESPONSE_ID in per_file_df.columns:
-                        sort_keys = ['Source_File'] if 'Source_File' in per_file_df.columns else []
-                        sort_keys += [COL_RESPONSE_ID]
-                        if COL_MEMBER_ID in per_file_df.columns:
-                            sort_keys += [COL_MEMBER_ID]
-                        per_file_df = per_file_df.sort_values(by=sort_keys, kind='stable')
-
-                        # Build a new DataFrame with separator rows (blank) between groups
-                        grouped = per_file_df.groupby(COL_RESPONSE_ID, sort=False)
-                        frames = []
-                        first = True
-                        for _, grp in grouped:
-                            if not first:
-                                # Separator row (all empty strings to keep types consistent in Excel)
-                                frames.append(pd.DataFrame([{col: '' for col in per_file_df.columns}]))
-                            frames.append(grp)
-                            first = False
-                        if frames:
-                            per_file_df = pd.concat(frames, ignore_index=True)
-                except Exception as e:
-                    print(f"   ⚠️ Formatting warning for {file_name}: {e}")
-
-                # Save per-file report
-                per_file_output_path = os.path.join(
-                    OUTPUT_FOLDER_PATH,
-                    f"{os.path.splitext(file_name)[0]}_VALIDATION_REPORT.xlsx"
-                )
-                try:
-                    print(f"   Saving per-file report to: {per_file_output_path}")
-                    print("   (Ensure this file is not already open in Excel)")
-                    # Use openpyxl engine for .xlsx
-                    per_file_df.to_excel(per_file_output_path, index=False, engine='openpyxl')
-                    print("   ✅ Per-file report saved successfully.")
-                except PermissionError:
-                    print(f"   ❌ ERROR: Permission denied for '{per_file_output_path}'. Is it open?")
-                except ImportError:
-                    print("   ❌ ERROR: `openpyxl` not installed; cannot write .xlsx. Attempting CSV fallback...")
-                    # Fallback to CSV
-                    fallback_path = os.path.join(
-                        OUTPUT_FOLDER_PATH,
-                        f"{os.path.splitext(file_name)[0]}_VALIDATION_REPORT_FALLBACK.csv"
-                    )
-                    try:
-                        per_file_df.to_csv(fallback_path, index=False)
-                        print(f"   ✅ Fallback CSV report saved: {fallback_path}")
-                    except Exception as csv_e:
-                        print(f"   ❌ ERROR saving fallback CSV report. Reason: {csv_e}")
-                except Exception as e:
-                    print(f"   ❌ ERROR saving per-file report for '{file_name}'. Reason: {e}")
-            else:
-                 print(f"⚠️ Skipping validation for {file_name} due to restructuring issue or empty result.")
-        else:
-            print(f"⚠️ Skipping file {file_name} due to loading error or empty file.")
+    if args.workers > 1 and len(all_input_files) > 1:
+        print(f"Processing {len(all_input_files)} files with {min(args.workers, len(all_input_files))} workers...")
+        file_issues = process_files_in_workers(all_input_files, OUTPUT_FOLDER_PATH, args.workers)
+    else:
+        file_issues = {
+            file_path: process_file(file_path, OUTPUT_FOLDER_PATH, panel_store)
+            for file_path in all_input_files
+        }
+
+    # Consolidate once every file has been processed
+    print("\n--- Summary ---")
+    for file_path, issues in file_issues.items():
+        status = "skipped" if issues is None else f"{issues} issues"
+        print(f"   {os.path.basename(file_path)}: {status}")
 
     print(f"\n✅ All files processed. Per-file reports are in: {OUTPUT_FOLDER_PATH}")
 
@@ -0,0 +1,136 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ZW_applied_corrections_report as audit_report
+import ZW_corrections_engine as engine
+
+
+def _per_cell_diff(orig, new):
+    """The positional per-cell loop of the previous audit report."""
+    cols = sorted(set(orig.columns).union(new.columns), key=lambda x: str(x))
+    changes = []
+    for i in range(max(len(orig), len(new))):
+        for col in cols:
+            old = orig.at[i, col] if col in orig.columns and i in orig.index else None
+            cur = new.at[i, col] if col in new.columns and i in new.index else None
+            old_val = None if pd.isna(old) else old
+            new_val = None if pd.isna(cur) else cur
+            if old_val is None and new_val is None:
+                continue
+            if (None if old_val is None else str(old_val)) != (None if new_val is None else str(new_val)):
+                changes.append((i + 2, i, col, old_val, new_val))
+    return changes
+
+
+def _records(audit):
+    return list(zip(audit["excel_row"], audit["df_index"], audit["column"], audit["old_value"], audit["new_value"]))
+
+
+def _random_pair(seed, n_rows=60, with_ids=True):
+    rng = random.Random(seed)
+    pool = [None, np.nan, "", "a", "b", 1, 1.0, "1", 2.5]
+    columns = ["Age", "Job", "Remark", 7]
+    orig = pd.DataFrame({c: [rng.choice(pool) for _ in range(n_rows)] for c in columns}, dtype=object)
+    new = orig.copy()
+    for _ in range(n_rows):
+        new.iat[rng.randrange(n_rows), rng.randrange(len(columns))] = rng.choice(pool)
+    new["Added"] = [rng.choice([None, "x"]) for _ in range(n_rows)]
+    orig = orig.drop(columns=["Remark"]).assign(Dropped=[rng.choice([None, "y"]) for _ in range(n_rows)])
+    new = pd.concat([new, new.iloc[:3]], ignore_index=True)  # rows appended in new
+    if with_ids:
+        orig.insert(0, "Response ID", [f"R{i}" for i in range(len(orig))])
+        new.insert(0, "Response ID", [f"R{i}" for i in range(len(new))])
+    return orig, new
+
+
+@pytest.mark.parametrize("with_ids", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_diff_matches_per_cell_loop(seed, with_ids):
+    orig, new = _random_pair(seed, with_ids=with_ids)
+    audit = engine.diff_datasets(orig, new)
+    assert _records(audit) == _per_cell_diff(orig, new)
+    assert len(audit) > 50
+
+
+def test_rows_are_aligned_by_response_id():
+    orig = pd.DataFrame({"Response ID": ["A", "B", "B", "C"], "Age": [30, 40, 41, 50]})
+    # Reordered rows; the second B changed, C dropped, D added
+    new = pd.DataFrame({"Response ID": ["B", "A", "B", "D"], "Age": [40, 30, 42, 60]})
+    audit = engine.diff_datasets(orig, new)
+    assert list(zip(audit["response_id"], audit["excel_row"], audit["column"], audit["old_value"], audit["new_value"])) == [
+        ("B", 4, "Age", 41, 42),
+        ("D", 5, "Age", None, 60),
+        ("D", 5, "Response ID", None, "D"),
+        ("C", 6, "Age", 50, None),
+        ("C", 6, "Response ID", "C", None),
+    ]
+
+
+def test_rules_come_from_the_last_planned_correction():
+    orig = pd.DataFrame({"Response ID": ["A", "B"], "Age": [30, 40]})
+    details = pd.DataFrame({"row": [1, 1, 2], "column": ["Age"] * 3, "corrections": ["31", "32", "40"],
+                            "Rule ID": ["R1", "R2", "R3"]})
+    new = engine.apply_changes(orig.astype(object).copy(), engine.plan_changes(details, orig))
+    audit = engine.attach_rules(engine.diff_datasets(orig, new), engine.plan_changes(details, orig))
+    assert list(zip(audit["response_id"], audit["new_value"], audit["rule"])) == [("A", "32", "R2")]
+
+
+def _log(audit_rows, source, input_file, timestamp, run_id):
+    audit = pd.DataFrame(audit_rows, columns=["response_id", "excel_row", "column", "old_value", "new_value", "rule"])
+    return engine.build_audit_log(audit, applied_by="tester", timestamp=timestamp, source=source,
+                                  input_file=input_file, run_id=run_id)
+
+
+def test_rerun_replaces_its_own_rows_and_summary_counts_latest_run(tmp_path):
+    path = tmp_path / "log.csv"
+    rows = [("A", 2, "Age", 30, "31", "R1"), ("B", 3, "Age", 40, "41", "R1"), ("B", 3, "Job", None, "Clerk", "R2")]
+    engine.write_audit_log(_log(rows, "applier", "wave.xlsx", "2026-01-01T00:00:00", "run1"), path)
+    engine.write_audit_log(_log(rows[:1], "applier", "wave.xlsx", "2026-01-02T00:00:00", "run2"), path)
+    engine.write_audit_log(_log(rows, "report", "wave.xlsx", "2026-01-02T00:00:00", "run3"), path, replace_previous=True)
+    engine.write_audit_log(_log(rows, "report", "wave.xlsx", "2026-01-03T00:00:00", "run4"), path, replace_previous=True)
+
+    log = engine.load_audit_log(path)
+    assert log["run_id"].tolist() == ["run1"] * 3 + ["run2"] + ["run4"] * 3
+    assert engine.latest_runs(log)["run_id"].unique().tolist() == ["run2", "run4"]
+
+    summary = engine.summarize_audit(log, ["source", "rule"])
+    assert list(zip(summary["source"], summary["rule"], summary["changes"], summary["respondents"])) == [
+        ("report", "R1", 2, 2), ("applier", "R1", 1, 1), ("report", "R2", 1, 1),
+    ]
+    assert engine.summarize_audit(log, ["source"], all_runs=True)["changes"].tolist() == [4, 3]
+
+
+def test_log_written_before_run_tagging_is_upgraded(tmp_path):
+    path = tmp_path / "log.csv"
+    pd.DataFrame({"response_id": ["A"], "excel_row": [2], "column": ["Age"], "old": ["30"], "new": ["31"],
+                  "rule": ["R1"], "applied_by": ["x"], "timestamp": ["2025-12-31T00:00:00"]}
+                 ).to_csv(path, index=False, encoding="utf-8-sig")
+    engine.write_audit_log(_log([("B", 3, "Age", 40, "41", "R1")], "applier", "wave.xlsx", "2026-01-01T00:00:00", "run1"), path)
+    log = engine.load_audit_log(path)
+    assert list(log.columns) == engine.LOG_COLUMNS
+    assert log["run_id"].tolist()[1] == "run1" and pd.isna(log["run_id"].tolist()[0])
+    # Untagged rows are always counted
+    assert engine.summarize_audit(log)["changes"].tolist() == [2]
+
+
+def test_report_script_writes_audit_and_log(tmp_path):
+    report, applied = tmp_path / "report.xlsx", tmp_path / "applied.xlsx"
+    orig = pd.DataFrame({"Response ID": ["A", "B"], "Age": [30, 40]})
+    details = pd.DataFrame({"row": [2], "column": ["Age"], "corrections": ["41"], "rule": ["R9"]})
+    with pd.ExcelWriter(report) as writer:
+        details.to_excel(writer, sheet_name=engine.DETAILS_SHEET, index=False)
+        orig.to_excel(writer, sheet_name=engine.COMPLETE_SHEET, index=False)
+    orig.assign(Age=[30, "41"]).to_excel(applied, sheet_name=engine.COMPLETE_SHEET, index=False)
+
+    args = ["--report", str(report), "--applied", str(applied), "--out-csv", str(tmp_path / "audit.csv"),
+            "--log", str(tmp_path / "log.csv"), "--applied-by", "tester"]
+    assert audit_report.main(args) == 0
+    assert audit_report.main(args) == 0  # a re-run replaces its rows
+
+    audit = pd.read_csv(tmp_path / "audit.csv", encoding="utf-8-sig")
+    assert audit[engine.AUDIT_COLUMNS].values.tolist() == [[3, 1, "Age", 40, 41]]
+    log = engine.load_audit_log(tmp_path / "log.csv")
+    assert log[["response_id", "rule", "source", "input"]].values.tolist() == [["B", "R9", "report", "applied.xlsx"]]
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import CLFS_checkpoint as checkpoints
+import CLFS_validator as validator
+
+SAMPLE = Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv"
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def sample(monkeypatch):
+    # Restore the module settings enable_checkpoints changes
+    monkeypatch.setattr(validator, "CHECKPOINT_DIR", validator.CHECKPOINT_DIR)
+    monkeypatch.setattr(validator, "RESUME", validator.RESUME)
+    return validator.load_input_file(SAMPLE)
+
+
+def _results(run):
+    changes = {cell: tuple(None if pd.isna(v) else v for v in change) for cell, change in run.changes.items()}
+    return run.rule_errors, run.error_stages, changes, run.error_cells
+
+
+def _checkpointed_run(df):
+    run = validator.prepare_validation_run(SAMPLE.name, df)
+    validator._attach_checkpoint(run)
+    return run
+
+
+def _interrupt_at(monkeypatch, stage_idx):
+    stages = list(validator.VALIDATION_STAGES)
+    name, _ = stages[stage_idx]
+
+    def interrupted(run):
+        raise Interrupted(name)
+
+    stages[stage_idx] = (name, interrupted)
+    monkeypatch.setattr(validator, "VALIDATION_STAGES", stages)
+
+
+def test_resumed_run_matches_uninterrupted_run(sample, tmp_path, monkeypatch):
+    expected = _results(validator.run_validation_stages(validator.prepare_validation_run(SAMPLE.name, sample)))
+    stage_idx = len(validator.VALIDATION_STAGES) // 2
+
+    validator.enable_checkpoints(str(tmp_path))
+    with monkeypatch.context() as m:
+        _interrupt_at(m, stage_idx)
+        run = _checkpointed_run(sample)
+        with pytest.raises(Interrupted):
+            validator.run_validation_stages(run)
+        validator._save_checkpoint(run, force=True)
+    assert run.checkpoint.path.exists()
+
+    validator.enable_checkpoints(str(tmp_path), resume=True)
+    resumed = _checkpointed_run(sample)
+    assert resumed.stage_idx == stage_idx
+    validator.run_validation_stages(resumed)
+    assert _results(resumed) == expected
+
+
+def test_checkpoint_of_other_input_is_not_reused(sample, tmp_path):
+    validator.enable_checkpoints(str(tmp_path), resume=True)
+    run = _checkpointed_run(sample)
+    run.stage_idx = 2
+    validator._save_checkpoint(run, force=True)
+
+    edited = sample.copy()
+    edited.iat[0, 0] = "changed"
+    assert _checkpointed_run(edited).stage_idx == 0
+    assert _checkpointed_run(sample).stage_idx == 2
+
+
+def test_checkpoints_are_named_by_full_file_name(tmp_path):
+    csv = checkpoints.RunCheckpoint(tmp_path, "wave.csv", lambda: "a")
+    xlsx = checkpoints.RunCheckpoint(tmp_path, "Operating_Table/wave.xlsx", lambda: "a")
+    assert csv.path != xlsx.path
+    assert xlsx.path.parent == tmp_path
@@ -0,0 +1,150 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import ZW_applied_corrections as applier
+import ZW_corrections_engine as engine
+
+COLUMNS = ["Response ID", "Age", "Job Title", "Industry", "Remark"]
+
+
+def _per_row_loop(details_df, complete_df):
+    """The Details loop the engine replaced: (final dataset, changed (row, position) in order)."""
+    complete_df = complete_df.astype(object).copy()
+    correction_cols = [c for c in engine.CORRECTION_COLUMNS if c in details_df.columns]
+    changes = []
+    for _, drow in details_df.iterrows():
+        try:
+            raw_row = drow.get("row")
+            if pd.isna(raw_row):
+                continue
+            target_row = int(float(raw_row)) - 1
+        except Exception:
+            continue
+        if target_row < 0 or target_row >= len(complete_df):
+            continue
+        target_columns = []
+        if "column" in details_df.columns and pd.notna(drow.get("column")):
+            target_columns.extend(c.strip() for c in str(drow.get("column")).split("&") if c.strip())
+        i = 2
+        while f"column_{i-1}" in details_df.columns or f"column_{i}" in details_df.columns:
+            key = f"column_{i-1}" if f"column_{i-1}" in details_df.columns else f"column_{i}"
+            if pd.notna(drow.get(key)):
+                target_columns.append(str(drow.get(key)).strip())
+            i += 1
+        for idx_c, corr_col in enumerate(correction_cols):
+            corr_val = drow.get(corr_col)
+            if pd.isna(corr_val) or not str(corr_val).strip():
+                continue
+            corr_str = str(corr_val).strip()
+            col_name = target_columns[idx_c] if idx_c < len(target_columns) else (target_columns[0] if target_columns else None)
+            if not col_name:
+                continue
+            if col_name not in complete_df.columns:
+                col_name = next((c for c in complete_df.columns if str(c).strip().lower() == col_name.lower()), None)
+                if col_name is None:
+                    continue
+            loc = list(complete_df.columns).index(col_name)
+            old_val = complete_df.iat[target_row, loc]
+            if ("" if pd.isna(old_val) else str(old_val)) != corr_str:
+                complete_df.iat[target_row, loc] = corr_str
+                changes.append((target_row, loc))
+    return complete_df, changes
+
+
+def _random_report(seed, n_rows=40, n_details=250):
+    rng = random.Random(seed)
+    complete = pd.DataFrame({
+        "Response ID": [f"R{i}" for i in range(n_rows)],
+        "Age": [rng.choice([20, 35, None, 35.0]) for _ in range(n_rows)],
+        "Job Title": [rng.choice(["Clerk", "Driver", None]) for _ in range(n_rows)],
+        "Industry": [rng.choice(["Retail", "Transport", ""]) for _ in range(n_rows)],
+        "Remark": [None] * n_rows,
+    })
+    names = ["Age", "job title", " Industry ", "Remark", "Unknown", "Age & Job Title", "Industry&Remark", None, ""]
+    values = ["35", "36", "Clerk", "Driver", "Retail", " Retail ", "", None, "x"]
+    details = pd.DataFrame({
+        "row": [rng.choice([1, 2, "3", "4.0", 0, n_rows, n_rows + 1, None, "abc", rng.randint(1, n_rows)]) for _ in range(n_details)],
+        "column": [rng.choice(names) for _ in range(n_details)],
+        "column_2": [rng.choice(names) for _ in range(n_details)],
+        "column_4": [rng.choice(names) for _ in range(n_details)],
+        "corrections": [rng.choice(values) for _ in range(n_details)],
+        "corrections_2": [rng.choice(values) for _ in range(n_details)],
+        "corrections_3": [rng.choice(values) for _ in range(n_details)],
+        "Rule ID": [rng.choice(["R1", "R2", None]) for _ in range(n_details)],
+    })
+    return details, complete
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_plan_and_apply_match_per_row_loop(seed):
+    details, complete = _random_report(seed)
+    expected_df, expected_changes = _per_row_loop(details, complete)
+
+    changes = engine.plan_changes(details, complete)
+    applied = engine.apply_changes(complete.astype(object).copy(), changes)
+
+    assert list(zip(changes["target_row"], changes["loc"])) == expected_changes
+    assert len(expected_changes) > 20
+    pd.testing.assert_frame_equal(applied, expected_df)
+
+
+def test_repeated_corrections_keep_sequential_old_values():
+    complete = pd.DataFrame({"Response ID": ["A"], "Age": [30]})
+    details = pd.DataFrame({
+        "row": [1, 1, 1, 1],
+        "column": ["Age"] * 4,
+        "corrections": ["31", "31", "30", "32"],
+        "rule": ["first", "same", "back", "last"],
+    })
+    changes = engine.plan_changes(details, complete)
+    assert list(zip(changes["old_value"], changes["new_value"], changes["rule"])) == [
+        (30, "31", "first"), ("31", "30", "back"), ("30", "32", "last"),
+    ]
+    assert changes["response_id"].tolist() == ["A"] * 3
+
+
+def _write_report(path):
+    wb = Workbook()
+    details = wb.active
+    details.title = engine.DETAILS_SHEET
+    details.append(["row", "column", "corrections", "corrections_2"])
+    details.append([1, "Job Title & industry", "Driver", "Transport"])
+    details.append([2, "Age", "41", None])
+    details.append([2, "Remark", "=1+1", None])
+    complete = wb.create_sheet(engine.COMPLETE_SHEET)
+    complete.append(COLUMNS)
+    complete.append(["R1", 30, "Clerk", "Retail", "=LEN(C2)"])
+    complete.append(["R2", 40, "Clerk", "Retail", None])
+    wb.save(path)
+
+
+def test_applier_writes_highlighted_copy(tmp_path):
+    source, target = tmp_path / "report.xlsx", tmp_path / "applied.xlsx"
+    _write_report(source)
+    assert applier.main([str(source), str(target)]) == 0
+
+    ws = load_workbook(target)[engine.COMPLETE_SHEET]
+    assert [ws["C2"].value, ws["D2"].value, ws["B3"].value] == ["Driver", "Transport", "41"]
+    assert all(ws[cell].fill.start_color.rgb.endswith(engine.HIGHLIGHT_COLOR) for cell in ("C2", "D2", "B3"))
+    # Untouched formula cells keep their formula; Details cells are read as cached
+    # values, and the never-calculated =1+1 has none, so it corrects nothing
+    assert ws["E2"].value == "=LEN(C2)"
+    assert ws["E3"].value is None
+    assert ws["B2"].fill.fill_type is None
+
+
+def test_table_corrections_take_first_non_empty_correction(tmp_path):
+    df = pd.DataFrame({
+        engine.COMPLETE_SHEET: ["a", "b", "c", None],
+        "corrections": [None, " ", "c", "d"],
+        "corrections_2": ["x", "y", None, None],
+    })
+    output = tmp_path / "applied.xlsx"
+    assert engine.apply_table_corrections(df, output) == 0
+    assert df[engine.COMPLETE_SHEET].tolist() == ["x", "y", "c", "d"]
+    ws = load_workbook(output).active
+    assert [ws.cell(row=r, column=1).fill.fill_type for r in range(2, 6)] == ["solid", "solid", None, "solid"]
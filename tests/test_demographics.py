@@ -0,0 +1,87 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import CLFS_demographics as demographics
+import CLFS_validator as validator
+
+REFERENCE = "2025-03-31"
+
+
+@pytest.fixture(autouse=True)
+def no_reference_env(monkeypatch):
+    monkeypatch.delenv("CLFS_REFERENCE_DATE", raising=False)
+
+
+def _age_row_by_row(dob, ref):
+    # Completed years, the per-member calculation the column version replaced
+    return ref.year - dob.year - ((ref.month, ref.day) < (dob.month, dob.day))
+
+
+def test_parse_dob_accepts_both_export_formats():
+    values = pd.Series(["15/03/1990", "1-Jan-93", "31-Dec-25", "not a date", None])
+    parsed = demographics.parse_dob(values, reference=REFERENCE)
+    assert parsed.tolist()[:3] == [pd.Timestamp("1990-03-15"), pd.Timestamp("1993-01-01"), pd.Timestamp("1925-12-31")]
+    assert parsed.iloc[3:].isna().all()
+
+
+def test_duplicated_index_is_parsed_by_position():
+    # A tidy MLFS frame repeats the household's index for every member
+    values = pd.Series(["15/03/1990", "1-Jan-93", None, "31-Dec-25"], index=[0, 0, 1, 1])
+    parsed = demographics.parse_dob(values, reference=REFERENCE)
+    assert parsed.index.tolist() == [0, 0, 1, 1]
+    assert parsed.tolist() == [pd.Timestamp("1990-03-15"), pd.Timestamp("1993-01-01"), pd.NaT, pd.Timestamp("1925-12-31")]
+
+    df = pd.DataFrame({demographics.DOB_COLUMN: values})
+    demographics.attach_demographics(df, reference=REFERENCE)
+    assert df[demographics.AGE_YEARS].tolist()[:2] == [35, 32]
+    assert df[demographics.AGE_BAND].tolist()[:2] == ["35-39", "30-34"]
+
+
+def test_exact_age_matches_row_by_row_age():
+    dobs = pd.Series(pd.to_datetime([
+        "1990-03-31", "1990-04-01", "1990-03-30", "2000-02-29", "2010-12-31", "1950-01-01", None,
+    ]))
+    ages = demographics.exact_age(dobs, REFERENCE)
+    ref = date(2025, 3, 31)
+    expected = [_age_row_by_row(d.date(), ref) for d in dobs.iloc[:-1]]
+    assert ages.iloc[:-1].tolist() == expected
+    assert ages.isna().tolist() == [False] * 6 + [True]
+
+
+def test_reference_date_precedence(monkeypatch):
+    assert demographics.reference_date() is None
+    assert demographics.reference_date(wave="2025-02") == pd.Timestamp("2025-02-28")
+    monkeypatch.setenv("CLFS_REFERENCE_DATE", "2025-01-15")
+    assert demographics.reference_date(wave="2025-02") == pd.Timestamp("2025-01-15")
+    assert demographics.reference_date("2024-06-30", wave="2025-02") == pd.Timestamp("2024-06-30")
+
+
+def test_ages_unknown_without_reference_date():
+    ages = demographics.exact_age(pd.Series(pd.to_datetime(["1990-01-01"])))
+    assert ages.isna().all()
+
+
+def test_age_band_edges():
+    bands = demographics.age_band(pd.Series([None, -1, 0, 14, 15, 19, 20, 69, 70, 101]))
+    assert bands.tolist() == [None, None, "Below 15", "Below 15", "15-19", "15-19", "20-24", "65-69", "70 & Over", "70 & Over"]
+
+
+def test_attach_demographics_adds_the_three_columns():
+    df = pd.DataFrame({demographics.DOB_COLUMN: ["15/03/1990", None]})
+    demographics.attach_demographics(df, reference=REFERENCE, prefix="m1_")
+    assert df["m1_dob_dt"].iloc[0] == pd.Timestamp("1990-03-15")
+    assert df["m1_age_years"].tolist()[0] == 35
+    assert df["m1_age_band"].tolist() == ["35-39", None]
+
+
+def test_household_members_carry_dob_age_and_band():
+    df = validator.load_input_file(Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv")
+    members = [m for household in validator.extract_household_members(df, pd.Timestamp(REFERENCE)) for m in household]
+    dated = [m for m in members if m.dob_dt is not None]
+    assert dated
+    for member in dated:
+        assert member.age_years == _age_row_by_row(member.dob_dt.date(), date(2025, 3, 31))
+        assert member.age_band == demographics.age_band(pd.Series([member.age_years])).iloc[0]
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import CLFS_incremental as incremental
+import CLFS_validator as validator
+
+SAMPLE = Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv"
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return validator.load_input_file(SAMPLE)
+
+
+def _full(df):
+    run = validator.prepare_validation_run(SAMPLE.name, df)
+    return validator.run_validation_stages(run)
+
+
+def _incremental(df, store):
+    run = validator.prepare_validation_run(SAMPLE.name, df)
+    return validator.run_incremental_validation(run, store)
+
+
+def _results(run):
+    # NaN != NaN, so empty original values are compared as None
+    changes = {cell: tuple(None if pd.isna(v) else v for v in change) for cell, change in run.changes.items()}
+    return run.rule_errors, run.error_stages, changes, run.error_cells, run.modified_df
+
+
+def _assert_same(actual, expected):
+    errors, stages, changes, cells, modified = _results(actual)
+    exp_errors, exp_stages, exp_changes, exp_cells, exp_modified = _results(expected)
+    assert errors == exp_errors
+    assert stages == exp_stages
+    assert changes == exp_changes
+    assert cells == exp_cells
+    assert modified.equals(exp_modified)
+
+
+def test_incremental_runs_match_full_runs(sample, tmp_path):
+    store = incremental.IncrementalStateStore(str(tmp_path / "state.sqlite"))
+    _assert_same(_incremental(sample, store), _full(sample))
+    # Unchanged file: everything comes from the cache
+    _assert_same(_incremental(sample, store), _full(sample))
+
+    edited = sample.copy()
+    column = validator._find_column_name(list(edited.columns), "Job Title")
+    edited.at[1, column] = "Kitchen assistant"
+    _assert_same(_incremental(edited, store), _full(edited))
+
+
+def test_fingerprint_ignores_ssoc_workers(sample, monkeypatch):
+    run = validator.prepare_validation_run(SAMPLE.name, sample)
+    before = validator._incremental_fingerprint(run)
+    monkeypatch.setattr(validator, "SSOC_WORKERS", validator.SSOC_WORKERS + 3)
+    assert validator._incremental_fingerprint(run) == before
+    monkeypatch.setattr(validator, "SSOC_MIN_SCORE", validator.SSOC_MIN_SCORE + 0.1)
+    assert validator._incremental_fingerprint(run) != before
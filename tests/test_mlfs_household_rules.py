@@ -0,0 +1,97 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "references"))
+
+import MLFS_validator_prototype as mlfs
+
+RELATIONSHIPS = [
+    "Husband/Wife", "Partner", "Child", "Son", "Daughter", "Parent", "Parent-in-law",
+    "Son-in-law", "Daughter-in-law", "Grandson", "Other",
+]
+ID_TYPES = ["Singapore Citizen", "Permanent Resident", "Work Permit", "Dependant Pass", "Social Visit Pass", None]
+MARITAL = ["Single", "Married", "Widowed", "Divorced", None]
+STAYING = ["In Singapore", "Institutional Unit", "Outside Singapore overseas for more than 6 months ", None]
+
+
+def _tidy(households=200, seed=3, missing_ages=True):
+    rng = random.Random(seed)
+    rows = []
+    for h in range(households):
+        size = rng.randint(1, 6)
+        # Most households start with one Reference Person; some have none or two
+        first = rng.choices(["Reference Person", None], weights=[9, 1])[0]
+        relationships = ([first] if first else []) + [rng.choice(RELATIONSHIPS + ["Reference Person"] * (rng.random() < 0.05))
+                                                      for _ in range(size - (1 if first else 0))]
+        member_ids = list(range(1, size + 1))
+        if size > 1 and rng.random() < 0.05:
+            member_ids[-1] = member_ids[0]
+        response_id = None if rng.random() < 0.01 else f"R{h:04d}"
+        declared = rng.choice([size, size, size + 1, None, "3.0"])
+        for member_id, relationship in zip(member_ids, relationships):
+            rows.append({
+                mlfs.COL_RESPONSE_ID: response_id,
+                mlfs.COL_MEMBER_ID: member_id,
+                mlfs.COL_RELATIONSHIP: relationship,
+                mlfs.COL_AGE: rng.choice([rng.randint(0, 95), rng.randint(10, 40)]),
+                mlfs.COL_SEX: rng.choice(["Male", "Female", None]),
+                mlfs.COL_RACE: rng.choice(["Chinese", "Malay", "Indian", None]),
+                mlfs.COL_MARITAL_STATUS: rng.choice(MARITAL),
+                mlfs.COL_ID_TYPE: rng.choice(ID_TYPES),
+                mlfs.COL_STAYING_WHERE: rng.choice(STAYING),
+                "No. of Household Members": declared,
+                "Detected Members (Auto)": size,
+            })
+    df = pd.DataFrame(rows)
+    if missing_ages:
+        df[mlfs.COL_AGE] = df[mlfs.COL_AGE].astype("float64").mask(pd.Series([rng.random() < 0.1 for _ in rows]))
+    return df
+
+
+def _report(df, monkeypatch, vectorized):
+    with monkeypatch.context() as m:
+        m.setattr(mlfs, "derive_age_columns", lambda df_tidy, month=None: df_tidy)
+        if not vectorized:
+            def unavailable(df_tidy):
+                raise RuntimeError("per-household reference run")
+            m.setattr(mlfs, "build_household_frames", unavailable)
+        return mlfs.run_validations(df.copy())
+
+
+def _normalized(report):
+    report = report.reset_index(drop=True).astype(object)
+    return report.where(report.notna(), None)
+
+
+@pytest.mark.parametrize("missing_ages", [False, True])
+def test_household_specs_match_per_household_checks(monkeypatch, missing_ages):
+    df = _tidy(missing_ages=missing_ages)
+    vectorized = _report(df, monkeypatch, vectorized=True)
+    per_household = _report(df, monkeypatch, vectorized=False)
+
+    spec_rules = {spec["rule"] for spec in mlfs.HOUSEHOLD_RULE_SPECS}
+    fired = set(vectorized["Rule"]) & spec_rules
+    # The random households exercise nearly every household spec
+    assert len(fired) >= len(spec_rules) - 2, spec_rules - fired
+    pd.testing.assert_frame_equal(_normalized(vectorized), _normalized(per_household[vectorized.columns]))
+
+
+def test_hrp_attributes_are_merged_onto_members():
+    df = pd.DataFrame({
+        mlfs.COL_RESPONSE_ID: ["A", "A", "B", "B"],
+        mlfs.COL_MEMBER_ID: [1, 2, 1, 2],
+        mlfs.COL_RELATIONSHIP: ["Child", "Reference Person", "Parent", "Parent"],
+        mlfs.COL_AGE: [10, 40, 70, 65],
+        mlfs.COL_MARITAL_STATUS: ["Single", "Married", "Married", "Widowed"],
+    })
+    members, households = mlfs.build_household_frames(df)
+    assert members["Has HRP"].tolist() == [True, True, False, False]
+    assert members[mlfs._hrp(mlfs.COL_AGE)].tolist()[:2] == [40, 40]
+    assert households["Reference Persons"].tolist() == [1, 0]
+    assert households["Parents"].tolist() == [0, 2]
+    assert households[f"Parent 2 {mlfs.COL_MARITAL_STATUS}"].tolist()[1] == "Widowed"
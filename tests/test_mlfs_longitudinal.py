@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "references"))
+
+import MLFS_validator_prototype as mlfs
+
+
+def _household_month(labour_status=("Employed", "Employed", "Outside Labour Force")):
+    # Three members of one household reached on the same contact number
+    return pd.DataFrame({
+        mlfs.COL_RESPONSE_ID: ["R1", "R1", "R1"],
+        mlfs.COL_MEMBER_ID: [1, 2, 3],
+        mlfs.COL_NRIC: ["91234567"] * 3,
+        mlfs.COL_LABOUR_STATUS: list(labour_status),
+        mlfs.COL_HIGHEST_ACADEMIC_QUAL: ["Degree", "Diploma", "Primary"],
+        mlfs.COL_EDU_STATUS: ["Not studying", "Not studying", "Studying"],
+        mlfs.COL_GMI: [5000, 3000, None],
+    })
+
+
+def test_shared_contact_number_falls_back_to_member_key():
+    month = _household_month()
+    joined = mlfs.join_previous_month(month, month.copy())
+    assert joined[mlfs.MATCHED_BY].tolist() == ["Member"] * 3
+    assert joined[mlfs._prev(mlfs.COL_MEMBER_ID)].tolist() == [1, 2, 3]
+    assert mlfs.run_longitudinal_checks(month, month.copy()) == []
+
+
+def test_unique_key_matches_across_households():
+    previous = _household_month().assign(**{mlfs.COL_NRIC: ["S1", "S2", "S3"]})
+    current = previous.assign(**{mlfs.COL_RESPONSE_ID: "R9"})
+    joined = mlfs.join_previous_month(current, previous)
+    assert joined[mlfs.MATCHED_BY].tolist() == ["NRIC"] * 3
+    rules = {error["Rule"] for error in mlfs.run_longitudinal_checks(current, previous)}
+    assert rules == {"check_nric_hprefpin_change"}
+
+
+def test_real_change_is_still_reported():
+    previous = _household_month()
+    current = _household_month(labour_status=("Unemployed", "Employed", "Outside Labour Force"))
+    errors = mlfs.run_longitudinal_checks(current, previous)
+    assert [(e[mlfs.COL_MEMBER_ID], e["Rule"]) for e in errors] == [(1, "check_changes_from_previous_month_batch_2")]
+
+
+def test_panel_store_keeps_files_of_one_month_apart(tmp_path):
+    store = mlfs.MonthlyPanelStore(str(tmp_path))
+    month = _household_month()
+    store.save("2025-01", month, "MLFS_2025-01.csv")
+    store.save("2025-01", month, "MLFS_2025-01.xlsx")
+    store.save("2025-02", month, "MLFS_2025-02.csv")
+    assert store.months() == ["2025-01", "2025-02"]
+    previous_month, previous = store.load_previous("2025-02")
+    assert previous_month == "2025-01" and len(previous) == 6
@@ -0,0 +1,95 @@
+import inspect
+import os
+import random
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "references"))
+
+import MLFS_validator_prototype as mlfs
+
+SPEC_RULES = list(dict.fromkeys(spec["rule"] for spec in mlfs.PERSON_RULE_SPECS))
+
+
+def _rule_frame(rule_function, rows=1500, seed=0, missing_ages=False):
+    """Persons drawn from the literals and columns the per-row check refers to."""
+    source = inspect.getsource(rule_function)
+    columns = sorted({getattr(mlfs, name) for name in re.findall(r"\b(COL_[A-Z_0-9]+)\b", source)} - {mlfs.COL_AGE})
+    literals = re.findall(r"'([^'{}]*)'", source) + re.findall(r'"([^"{}]*)"', source)
+    numbers = {int(n) for n in re.findall(r"\b(\d{1,3})\b", source)}
+    ages = sorted({n + d for n in numbers for d in (-1, 0, 1) if 0 <= n + d <= 110})
+
+    # Values the check compares against (not its error messages), plus misses
+    literals = [v for v in dict.fromkeys(literals) if v != "Error" and "Please verify" not in v]
+    rng = random.Random(f"{rule_function.__name__}-{seed}")
+
+    def value():
+        roll = rng.random()
+        if roll < 0.1:
+            # Literals the check matches by substring also appear inside longer text
+            return f"x {rng.choice(literals)} {rng.choice(literals)} y"
+        return rng.choice(literals) if roll < 0.85 else rng.choice(["Other", "", None])
+
+    frame = {col: [value() for _ in range(rows)] for col in columns}
+    age = [rng.choice(ages) if ages else rng.randrange(110) for _ in range(rows)]
+    df = pd.DataFrame(frame)
+    df[mlfs.COL_AGE] = pd.Series(age, dtype="int64")
+    if missing_ages:
+        df[mlfs.COL_AGE] = df[mlfs.COL_AGE].astype("float64").mask(pd.Series([rng.random() < 0.2 for _ in range(rows)]))
+    df.insert(0, mlfs.COL_RESPONSE_ID, [f"R{i // 3}" for i in range(rows)])
+    df.insert(1, mlfs.COL_MEMBER_ID, [i % 3 + 1 for i in range(rows)])
+    return df
+
+
+def _per_row(df, rule_function):
+    errors = []
+    for row_position, (_, row) in enumerate(df.iterrows()):
+        for error in rule_function(row):
+            errors.append((row_position, row[mlfs.COL_RESPONSE_ID], row[mlfs.COL_MEMBER_ID], error["Error"]))
+    return errors
+
+
+def _vectorized(df, rule_name):
+    specs = [spec for spec in mlfs.PERSON_RULE_SPECS if spec["rule"] == rule_name]
+    frames = [mlfs.evaluate_person_rule_spec(df, spec, 0, sequence) for sequence, spec in enumerate(specs)]
+    errors = pd.concat(frames, ignore_index=True).sort_values(["_row", "_seq"], kind="stable")
+    return list(zip(errors["_row"], errors[mlfs.COL_RESPONSE_ID], errors[mlfs.COL_MEMBER_ID], errors["Error"]))
+
+
+@pytest.mark.parametrize("missing_ages", [False, True])
+@pytest.mark.parametrize("rule_name", SPEC_RULES)
+def test_spec_matches_per_row_check(rule_name, missing_ages):
+    rule_function = getattr(mlfs, rule_name)
+    df = _rule_frame(rule_function, missing_ages=missing_ages)
+    assert _vectorized(df, rule_name) == _per_row(df, rule_function)
+
+
+def test_every_spec_names_a_per_row_check():
+    for rule_name in SPEC_RULES:
+        assert callable(getattr(mlfs, rule_name, None)), rule_name
+
+
+def test_run_validations_keeps_person_then_rule_order(monkeypatch):
+    monkeypatch.setattr(mlfs, "derive_age_columns", lambda df, month=None: df)
+    df = pd.DataFrame({
+        mlfs.COL_RESPONSE_ID: ["R1", "R1", "R2"],
+        mlfs.COL_MEMBER_ID: [1, 2, 1],
+        mlfs.COL_RELATIONSHIP: ["Reference Person", "Child", "Reference Person"],
+        mlfs.COL_AGE: [120, 16, 25],
+        mlfs.COL_JOB_TITLE: ["Private Hire Driver", None, "Private Hire Driver"],
+        mlfs.COL_ID_TYPE: ["Employment Pass", "Singapore Citizen", "Singapore Citizen"],
+        mlfs.COL_MARITAL_STATUS: ["Married", "Married", "Single"],
+    })
+    report = mlfs.run_validations(df)
+    person = report[report["Rule"].isin(SPEC_RULES)]
+    assert list(zip(person[mlfs.COL_RESPONSE_ID], person[mlfs.COL_MEMBER_ID], person["Rule"])) == [
+        ("R1", 1, "check_private_hire_driver"),
+        ("R1", 1, "check_private_hire_driver"),
+        ("R1", 1, "check_age_100_plus"),
+        ("R1", 2, "check_age_le_21_marital_status"),
+        ("R2", 1, "check_private_hire_driver"),
+    ]
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "references"))
+
+import MLFS_validator_prototype as mlfs
+
+REL = mlfs.COL_RELATIONSHIP
+COLUMNS = [
+    "Response ID", "No. of Household Members",
+    "Full Name", "Sex",
+    REL, "Full Name.1", "Sex.1",
+    f"{REL}.1", "Full Name.2", "Sex.2",
+    "Remark",
+]
+
+
+def _wide():
+    rows = [
+        # Declared size matches the listed members
+        ["H1", 3, "Ann", "F", "Spouse", "Bob", "M", "Child", "Cat", "F", "ok"],
+        # More blocks filled than declared: only the declared members are kept, all are detected
+        ["H2", 2, "Dan", "M", "Child", "Eve", "F", "Child", "Fay", "F", None],
+        # An empty block ends the household even when a later block has data
+        ["H3", 3, "Gus", "M", None, None, None, "Parent", "Hal", "M", None],
+        # No first person: the household is skipped
+        ["H4", 2, None, "F", "Spouse", "Ian", "M", None, None, None, None],
+        # Unreadable size counts as one member
+        ["H5", "two", "Jo", "F", "Spouse", "Kim", "M", None, None, None, None],
+        # A member block without a relationship is dropped
+        ["H6", 2, "Lee", "M", None, "Max", "M", None, None, None, None],
+    ]
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_layout_is_detected_from_the_header():
+    layout = mlfs.detect_member_layout(pd.Index(COLUMNS), ["Remark"])
+    assert layout["person_1_cols"] == ["Full Name", "Sex"]
+    assert layout["subsequent_person_indices"] == [4, 7]
+    assert layout["cols_per_extra_person"] == 3
+    assert layout["remark_index"] == 10
+
+    with pytest.raises(ValueError):
+        mlfs.detect_member_layout(pd.Index(["Response ID", "Sex"]))
+
+
+def test_member_blocks_are_renamed_onto_person_1_columns():
+    assert mlfs._member_block_renames([f"{REL}.1", "Full Name.2", "Sex.2"], ["Full Name", "Sex"]) == [REL, "Full Name", "Sex"]
+
+
+def test_restructure_data():
+    tidy = mlfs.restructure_data(_wide())
+    assert list(tidy.columns) == [
+        "Response ID", "No. of Household Members", "Remark", "Detected Members (Auto)",
+        mlfs.COL_MEMBER_ID, REL, "Full Name", "Sex",
+    ]
+    members = list(zip(tidy["Response ID"], tidy[mlfs.COL_MEMBER_ID], tidy["Full Name"], tidy[REL]))
+    assert members == [
+        ("H1", 1, "Ann", "Reference Person"), ("H1", 2, "Bob", "Spouse"), ("H1", 3, "Cat", "Child"),
+        ("H2", 1, "Dan", "Reference Person"), ("H2", 2, "Eve", "Child"),
+        ("H3", 1, "Gus", "Reference Person"),
+        ("H5", 1, "Jo", "Reference Person"),
+        ("H6", 1, "Lee", "Reference Person"),
+    ]
+    # Rows keep the wide frame's index of their household
+    assert tidy.index.tolist() == [0, 0, 0, 1, 1, 2, 4, 5]
+    assert tidy["Detected Members (Auto)"].tolist() == [3, 3, 3, 3, 3, 2, 2, 2]
+    assert tidy["Remark"].tolist()[:3] == ["ok"] * 3
+    assert tidy[mlfs.COL_MEMBER_ID].dtype == np.int64
+
+
+def test_restructure_without_first_person_column_keeps_households():
+    wide = pd.DataFrame({"Response ID": ["H1"], "Sex": ["F"]})
+    tidy = mlfs.restructure_data(wide)
+    assert tidy[mlfs.COL_MEMBER_ID].tolist() == [1]
+    assert tidy["Sex"].tolist() == ["F"]
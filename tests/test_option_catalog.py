@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+import CLFS_option_catalog as option_catalog
+
+
+def _write_form(path, options):
+    form = {"form": {"form_fields": [
+        {"globalId": "q1", "title": "Marital Status", "fieldType": "radiobutton", "fieldOptions": options},
+    ]}}
+    path.write_text(json.dumps(form), encoding="utf-8")
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    monkeypatch.setattr(option_catalog, "_LOADED", {})
+    calls = []
+    fingerprint = option_catalog._fingerprint
+
+    def counting(sources):
+        calls.append(tuple(sources))
+        return fingerprint(sources)
+
+    monkeypatch.setattr(option_catalog, "_fingerprint", counting)
+    return calls
+
+
+def test_unchanged_sources_are_not_rehashed(tmp_path, counted):
+    source = tmp_path / "answer.json"
+    _write_form(source, ["Single", "Married"])
+    first = option_catalog.load_catalog([source], cache_file=None)
+    second = option_catalog.load_catalog([source], cache_file=None)
+    assert second is first
+    assert len(counted) == 1
+    assert first.options("Marital Status") == ["Single", "Married"]
+
+
+def test_changed_source_rebuilds(tmp_path, counted):
+    source = tmp_path / "answer.json"
+    _write_form(source, ["Single", "Married"])
+    first = option_catalog.load_catalog([source], cache_file=None)
+    _write_form(source, ["Single", "Married", "Widowed"])
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = option_catalog.load_catalog([source], cache_file=None)
+    assert second is not first
+    assert len(counted) == 2
+    assert second.options("Marital Status") == ["Single", "Married", "Widowed"]
+
+
+def test_pickle_cache_is_reused_across_processes(tmp_path, counted, monkeypatch):
+    source = tmp_path / "answer.json"
+    cache = tmp_path / "catalog.pickle"
+    _write_form(source, ["Single", "Married"])
+    built = option_catalog.load_catalog([source], cache_file=cache)
+    assert cache.exists()
+
+    # A fresh process: empty memo, the pickle is loaded instead of rebuilding
+    monkeypatch.setattr(option_catalog, "_LOADED", {})
+    monkeypatch.setattr(option_catalog, "build_catalog", lambda sources: pytest.fail("catalog rebuilt"))
+    loaded = option_catalog.load_catalog([source], cache_file=cache)
+    assert loaded is not built
+    assert loaded.fingerprint == built.fingerprint
+    assert loaded.canonical("q1", " married ") == "Married"
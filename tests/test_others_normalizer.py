@@ -0,0 +1,121 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import CLFS_others_normalizer as others
+import CLFS_validation_rules as rules
+
+
+def _answers(question_key, count=300, seed=7):
+    """Randomized answers around the options of a question: exact, partial, padded, long and unrelated."""
+    rng = random.Random(seed)
+    options = rules.QUESTIONS_WITH_OTHERS[question_key]["options"]
+    words = ["part", "time", "care", "of", "my", "family", "abroad", "xyz", "study", "land"]
+    answers = [None, np.nan, "", "Others:", "Others:   ", options[0], "others:" + options[-1]]
+    for _ in range(count):
+        option = rng.choice(options)
+        kind = rng.randrange(6)
+        if kind == 0:
+            payload = option.upper()
+        elif kind == 1:
+            payload = option[: max(1, len(option) // 2)]
+        elif kind == 2:
+            payload = f"{rng.choice(words)} {option.lower()} {rng.choice(words)}"
+        elif kind == 3:
+            payload = " ".join(rng.choice(words) for _ in range(rng.randrange(1, 15)))
+        elif kind == 4:
+            payload = rng.choice(words)
+        else:
+            answers.append(option)
+            continue
+        answers.append(f"{rng.choice(['Others:', 'OTHERS: ', 'others:  '])}{payload}")
+    return pd.Series(answers, dtype=object)
+
+
+def _scalar_rule1(series, question_key):
+    rows = {}
+    for row_idx, value in series.items():
+        if pd.isna(value):
+            continue
+        result = rules.validate_others_option(str(value), question_key)
+        if result.corrected_value and result.corrected_value != str(value):
+            rows[row_idx] = (result.original_value, result.corrected_value, result.message)
+    return rows
+
+
+def _rows(result):
+    return {idx: tuple(values) for idx, values in zip(result.index, result[others.RESULT_COLUMNS].itertuples(index=False))}
+
+
+@pytest.mark.parametrize("question_key", sorted(rules.QUESTIONS_WITH_OTHERS))
+def test_rule1_column_matches_validate_others_option(question_key):
+    series = _answers(question_key)
+    assert _rows(others.normalize_others_column(series, question_key)) == _scalar_rule1(series, question_key)
+
+
+def test_rule1_unknown_question_changes_nothing():
+    assert others.normalize_others_column(pd.Series(["Others: x"]), "no_such_question").empty
+
+
+def test_option_index_prefers_first_option_in_list_order():
+    index = others.OptionIndex(["Full time", "Part time", "Time off"])
+    for answer in ["time", "part time work", "full time and part time", "off", "unrelated"]:
+        expected = rules._fuzzy_match_option(answer, index.options)
+        idx = index.match_index(answer)
+        assert (index.options[idx] if idx >= 0 else None) == expected
+
+
+RECLASS = {"methodist": "Christianity", "anglican": "Christianity", "soka": "Buddhism", "sikh": "Sikhism"}
+
+
+def _old_religion_rules(series):
+    """The per-row RULE 16 / RULE 17 loops the column functions replaced."""
+    rule16, rule17 = {}, {}
+    for row_idx, value in series.items():
+        if pd.isna(value):
+            continue
+        raw = str(value).strip()
+        raw_lower = raw.lower()
+        if raw_lower.startswith("others:"):
+            text = raw_lower.split(":", 1)[1].strip()
+            for denom, reclass in RECLASS.items():
+                if denom in text:
+                    rule16[row_idx] = (raw, reclass, f"Reclassified to {reclass}")
+                    break
+        if "no religion" in raw_lower and raw != "No religion":
+            rule17[row_idx] = (raw, "No religion", "Normalized to 'No religion'")
+    return rule16, rule17
+
+
+def test_religion_columns_match_per_row_rules():
+    series = pd.Series([
+        None, "Buddhism", "Others: Methodist", " others: soka gakkai anglican ", "Others: sikh",
+        "Others: Jedi", "No religion", "no religion", "Others: no religion", "Others:", 3,
+    ], dtype=object)
+    rule16, rule17 = _old_religion_rules(series)
+    assert _rows(others.reclassify_religion_column(series, RECLASS)) == rule16
+    assert _rows(others.no_religion_column(series)) == rule17
+
+
+def test_invalid_birthplace_matches_per_row_rule():
+    countries = frozenset({"japan", "south korea"})
+    series = pd.Series([None, "Singapore", "Others: Japan", "others:  south korea ", "Others: Atlantis", "Others:", "OTHERS: mars"], dtype=object)
+    expected = []
+    for value in series:
+        raw_lower = "" if pd.isna(value) else str(value).strip().lower()
+        text = raw_lower.split(":", 1)[1].strip() if raw_lower.startswith("others:") else ""
+        expected.append(bool(text) and text not in countries)
+    assert others.invalid_birthplace_mask(series, countries).tolist() == expected
+
+
+def test_reference_lists_keep_built_in_entries(tmp_path):
+    countries = tmp_path / "Countries.csv"
+    countries.write_text("Japan\n\n South Korea \n", encoding="utf-8")
+    assert others.load_country_set(countries, extra=["Singapore"]) == {"japan", "south korea", "singapore"}
+
+    religions = tmp_path / "Religions.csv"
+    religions.write_text("denomination\treligion\nMethodist\tProtestant\nTaoist\tTaoism\n", encoding="utf-8")
+    reclass = others.load_religion_reclass_map(religions, base={"Methodist": "Christianity"})
+    assert list(reclass.items()) == [("methodist", "Christianity"), ("taoist", "Taoism")]
@@ -0,0 +1,101 @@
+import argparse
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import CLFS_validator as validator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "references"))
+
+import MLFS_validator_prototype as mlfs
+
+SAMPLE = Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv"
+
+
+def _reports(folder):
+    return {
+        path.name: pd.read_excel(path).fillna("")
+        for path in sorted(Path(folder).glob("*.xlsx"))
+    }
+
+
+def _assert_same_reports(expected, actual):
+    assert sorted(expected) == sorted(actual)
+    for name in expected:
+        pd.testing.assert_frame_equal(expected[name], actual[name], obj=name)
+
+
+def _args(**overrides):
+    args = dict(tolerances=None, programme_catalog=False, warehouse=None, wave=None,
+                checkpoint_dir=None, resume=False, verbose=False, profile=False)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_clfs_workers_match_sequential_run(tmp_path, monkeypatch):
+    inputs = tmp_path / "Operating_Table"
+    inputs.mkdir()
+    files = [shutil.copy(SAMPLE, inputs / name) for name in ("wave_a.csv", "wave_b.csv")]
+    files = [Path(f) for f in files]
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(validator, "OUTPUT_DIR", tmp_path / "sequential")
+    sequential = [validator.validate_file(f.name, validator.load_input_file(f)) for f in files]
+
+    monkeypatch.setattr(validator, "OUTPUT_DIR", tmp_path / "parallel")
+    parallel = validator._run_in_workers(files, 2, None, _args())
+
+    strip = lambda summaries: [{k: v for k, v in s.items() if k != "wall_s"} for s in summaries]
+    assert strip(parallel) == strip(sequential)
+    assert [s["file"] for s in parallel] == ["wave_a.csv", "wave_b.csv"]
+    _assert_same_reports(_reports(tmp_path / "sequential"), _reports(tmp_path / "parallel"))
+
+
+REL = mlfs.COL_RELATIONSHIP
+
+
+def _write_mlfs_file(path, labour_status):
+    header = [
+        "Response ID", "No. of Household Members",
+        "Full Name", mlfs.COL_DOB, "Sex", mlfs.COL_NRIC, mlfs.COL_LABOUR_STATUS, mlfs.COL_MARITAL_STATUS,
+        REL, "Full Name.1", f"{mlfs.COL_DOB}.1", "Sex.1", f"{mlfs.COL_NRIC}.1", f"{mlfs.COL_LABOUR_STATUS}.1", f"{mlfs.COL_MARITAL_STATUS}.1",
+        "Remark",
+    ]
+    rows = [
+        ["R1", "2", "Ann", "01/02/1980", "Female", "91230001", labour_status, "Married",
+         "Child", "Ben", "05/06/2015", "Male", "91230002", "Outside Labour Force", "Married", ""],
+        ["R2", "1", "Cal", "10/10/1950", "Male", "91230003", "Employed", "Single",
+         "", "", "", "", "", "", "", ""],
+    ]
+    lines = ["metadata"] * mlfs.HEADER_ROW_INDEX + [",".join(header)] + [",".join(row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_mlfs_workers_match_sequential_run(tmp_path):
+    inputs = tmp_path / "input"
+    inputs.mkdir()
+    files = [str(inputs / "MLFS_2025-01.csv"), str(inputs / "MLFS_2025-02.csv")]
+    _write_mlfs_file(Path(files[0]), "Employed")
+    _write_mlfs_file(Path(files[1]), "Unemployed")
+
+    sequential_out = tmp_path / "sequential"
+    sequential_out.mkdir()
+    panel_store = mlfs.MonthlyPanelStore(str(sequential_out / mlfs.PANEL_FOLDER_NAME))
+    sequential = {f: mlfs.process_file(f, str(sequential_out), panel_store) for f in files}
+
+    parallel_out = tmp_path / "parallel"
+    parallel_out.mkdir()
+    parallel = mlfs.process_files_in_workers(files, str(parallel_out), 2)
+
+    assert parallel == sequential
+    assert all(sequential.values())
+    reports = _reports(sequential_out)
+    _assert_same_reports(reports, _reports(parallel_out))
+    # The February file was compared with January in both runs
+    february = reports["MLFS_2025-02_VALIDATION_REPORT.xlsx"]
+    assert february["Rule"].astype(str).str.contains("change|previous", case=False).any()
+    assert not (parallel_out / "_tidy_scratch").exists()
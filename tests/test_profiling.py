@@ -0,0 +1,72 @@
+import csv
+import json
+import math
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import CLFS_profiling as profiling
+import CLFS_validator as validator
+
+SAMPLE = Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv"
+
+
+def test_stage_records_counters_even_when_the_block_raises():
+    profiler = profiling.RunProfiler("wave.csv")
+    with profiler.stage("ok", rows=3) as counters:
+        counters["errors"] = 2
+    with pytest.raises(ValueError):
+        with profiler.stage("failing", rows=5):
+            raise ValueError
+    entries = {e["name"]: e for e in profiler.entries()}
+    assert [e["name"] for e in profiler.entries()] == ["ok", "failing"]
+    assert (entries["ok"]["calls"], entries["ok"]["rows"], entries["ok"]["errors"]) == (1, 3, 2)
+    assert (entries["failing"]["calls"], entries["failing"]["rows"]) == (1, 5)
+    assert profiler.total_wall() == pytest.approx(entries["ok"]["wall_s"] + entries["failing"]["wall_s"])
+
+
+def test_instrumented_module_times_only_listed_functions():
+    module = SimpleNamespace(double=lambda x: 2 * x, half=lambda x: x / 2, LIMIT=3)
+    profiler = profiling.RunProfiler("wave.csv")
+    view = profiler.instrument(module, {"double": "RULE 9"})
+    assert view.double is view.double  # one wrapper per function
+    assert [view.double(1), view.double(2)] == [2, 4]
+    assert view.half is module.half
+    assert view.LIMIT == 3
+    entries = profiler.entries()
+    assert [(e["kind"], e["name"], e["calls"], e["rows"]) for e in entries] == [("rule", "RULE 9", 2, 2)]
+
+    # Rule entries are not part of the stage wall time
+    assert profiler.total_wall() == 0
+
+
+def test_write_report(tmp_path):
+    profiler = profiling.RunProfiler("Operating_Table/wave.csv")
+    with profiler.stage("load", rows=4):
+        pass
+    profiler.record("rule", "RULE 1", 0.5, 0.25, rows=4, errors=1)
+    json_path, csv_path = profiler.write_report(tmp_path)
+    assert json_path.name == "wave_timing.json"
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    assert report["file"] == "Operating_Table/wave.csv"
+    assert [e["name"] for e in report["entries"]] == ["load", "RULE 1"]
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert rows[1]["errors"] == "1"
+    assert "RULE 1" in profiler.format_table()
+
+
+def test_validation_run_attributes_every_error_to_a_stage():
+    df = validator.load_input_file(SAMPLE)
+    run = validator.prepare_validation_run(SAMPLE.name, df)
+    validator.run_validation_stages(run)
+    validator._record_rule_errors(run)
+
+    stages = [e for e in run.profiler.entries() if e["kind"] == "stage"]
+    names = [e["name"] for e in stages]
+    for stage_name, _ in validator.VALIDATION_STAGES:
+        assert stage_name in names
+    assert sum(e["errors"] for e in stages) == len(run.rule_errors)
+    assert all(e["wall_s"] >= 0 and math.isfinite(e["cpu_s"]) for e in stages)
+    assert any(e["kind"] == "rule" and e["calls"] for e in run.profiler.entries())
@@ -0,0 +1,31 @@
+import pandas as pd
+
+import CLFS_programme_catalog as programmes
+from CLFS_programme_catalog import PLACE_ITE, ProgrammeCatalog, check_triple
+
+
+def _catalog() -> ProgrammeCatalog:
+    rows = [
+        ("ITE College Central", PLACE_ITE, "Higher Nitec", "higher_nitec",
+         "Higher Nitec in Electrical Engineering", "electrical engineering"),
+        ("ITE College East", PLACE_ITE, "Higher Nitec", "higher_nitec",
+         "Higher Nitec in Accounting", "accounting"),
+    ]
+    frame = pd.DataFrame(rows, columns=programmes.PROGRAMME_COLUMNS[:6])
+    frame["field_code"] = frame["subject"].map(programmes.field_code)
+    frame["source"] = "test"
+    return ProgrammeCatalog(frame[programmes.PROGRAMME_COLUMNS])
+
+
+def test_level_not_listed_at_place_is_not_judged():
+    # The catalog lists no Nitec intake at ITE: no evidence against the respondent
+    catalog = _catalog()
+    for field_of_study in ("Electrical Engineering", "Culinary Arts", None):
+        assert check_triple(catalog, "National ITE Certificate (Nitec) or equivalent", field_of_study, PLACE_ITE) is None
+
+
+def test_listed_level_still_checks_field_of_study():
+    catalog = _catalog()
+    assert check_triple(catalog, "Higher Nitec or equivalent", "Electrical Engineering", PLACE_ITE) is None
+    result = check_triple(catalog, "Higher Nitec or equivalent", "Nursing", PLACE_ITE)
+    assert result is not None and result["rule"] == "EDU_002"
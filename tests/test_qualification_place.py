@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+import CLFS_validation_rules as rules
+
+
+def _pairs():
+    pairs = []
+    for rule in rules.QUALIFICATION_PLACE_RULES:
+        for qualification in rule["qualification_values"]:
+            for place in rule["place_values"]:
+                pairs.append((qualification, place))
+                pairs.append((f"  {qualification.upper()} ", place.lower()))
+    pairs += [
+        ("Polytechnic Diploma", "Somewhere else"),
+        ("Polytechnic Diploma", None),
+        (None, "National University of Singapore"),
+        ("", ""),
+        (np.nan, np.nan),
+    ]
+    return pairs
+
+
+def _scalar_rows(pairs):
+    rows = []
+    for position, (qualification, place) in enumerate(pairs):
+        if qualification and place and not pd.isna(qualification) and not pd.isna(place):
+            for match in rules.validate_qualification_place(str(qualification), str(place)):
+                rows.append((position, match["rule_id"], match.get("severity"), match["reason"]))
+    return rows
+
+
+def test_column_rule_matches_scalar_rule():
+    pairs = _pairs()
+    qualifications = pd.Series([q for q, _ in pairs], dtype=object)
+    places = pd.Series([p for _, p in pairs], dtype=object)
+
+    result = rules.validate_qualification_place_column(qualifications, places)
+
+    column_rows = [
+        (position, row.rule_id, row.severity, row.reason)
+        for position, row in zip(result.index, result.itertuples(index=False))
+    ]
+    assert column_rows == _scalar_rows(pairs)
+    assert column_rows
+
+
+def test_column_rule_keeps_input_labels():
+    qualifications = pd.Series(["Polytechnic Diploma", "Degree"], index=[10, 20], dtype=object)
+    places = pd.Series(["National University of Singapore", "Unknown"], index=[10, 20], dtype=object)
+    result = rules.validate_qualification_place_column(qualifications, places)
+    assert set(result.index) == {10}
+    assert list(result.columns) == rules.QUALIFICATION_PLACE_COLUMNS
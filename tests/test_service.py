@@ -0,0 +1,143 @@
+import http.client
+import json
+import os
+import stat
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import CLFS_service as service_module
+
+
+class _FakeService:
+    """The endpoints' service interface without the reference data."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def status(self):
+        return {"requests": self.requests}
+
+    def assign_ssic(self, items):
+        return [name.upper() for name in items]
+
+    def validate_file(self, path, incremental=False, profile=False):
+        raise FileNotFoundError(f"Input file not found: {path}")
+
+
+@pytest.fixture
+def server():
+    """A handler on a free local port; yields (port, token, service)."""
+    token = "secret-token"
+    service = _FakeService()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), lambda *a: None)
+    port = httpd.server_address[1]
+    allowed_hosts = {f"{name}:{port}" for name in ("127.0.0.1", "localhost", "[::1]")}
+    httpd.RequestHandlerClass = service_module._make_handler(service, token, allowed_hosts)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield port, token, service
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(port, method, path, headers, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.putrequest(method, path, skip_host=True, skip_accept_encoding=True)
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        if method == "POST":
+            conn.putheader("Content-Length", str(len(data)))
+        conn.endheaders(data if method == "POST" else None)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def _headers(port, token, **extra):
+    headers = {"Host": f"127.0.0.1:{port}", "Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    headers.update(extra)
+    return {name: value for name, value in headers.items() if value is not None}
+
+
+def test_valid_requests_are_served(server):
+    port, token, service = server
+    assert _request(port, "GET", "/status", _headers(port, token)) == (200, {"requests": 0})
+    status, reply = _request(port, "POST", "/assign_ssic", _headers(port, token), {"items": ["dbs", "grab"]})
+    assert status == 200 and reply["results"] == ["DBS", "GRAB"]
+    assert service.requests == 1
+
+
+def test_localhost_host_and_charset_are_accepted(server):
+    port, token, _ = server
+    headers = _headers(port, token, Host=f"localhost:{port}", **{"Content-Type": "application/json; charset=utf-8"})
+    assert _request(port, "POST", "/assign_ssic", headers, {"items": []})[0] == 200
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "secret-token", "Bearer secret-token "])
+def test_missing_or_wrong_token_is_rejected(server, authorization):
+    port, token, service = server
+    for method, path in (("GET", "/status"), ("POST", "/assign_ssic")):
+        status, reply = _request(port, method, path, _headers(port, token, Authorization=authorization), {"items": ["x"]})
+        assert status == 401, (method, authorization)
+        assert "token" in reply["error"]
+    assert service.requests == 0
+
+
+@pytest.mark.parametrize("host", [None, "evil.example:8765", "127.0.0.1", "127.0.0.1:1"])
+def test_unexpected_host_is_rejected(server, host):
+    port, token, service = server
+    for method, path in (("GET", "/status"), ("POST", "/assign_ssic")):
+        status, _ = _request(port, method, path, _headers(port, token, Host=host), {"items": ["x"]})
+        assert status == 403, (method, host)
+    assert service.requests == 0
+
+
+@pytest.mark.parametrize("content_type", [None, "text/plain", "application/x-www-form-urlencoded"])
+def test_post_needs_json_content_type(server, content_type):
+    port, token, service = server
+    headers = _headers(port, token, **{"Content-Type": content_type})
+    assert _request(port, "POST", "/assign_ssic", headers, {"items": ["x"]})[0] == 415
+    assert _request(port, "POST", "/shutdown", headers, {})[0] == 415
+    assert service.requests == 0
+    # GET has no body, so it does not need the header
+    assert _request(port, "GET", "/status", headers)[0] == 200
+
+
+def test_request_errors(server):
+    port, token, _ = server
+    assert _request(port, "GET", "/nope", _headers(port, token))[0] == 404
+    assert _request(port, "POST", "/nope", _headers(port, token), {})[0] == 404
+    status, reply = _request(port, "POST", "/validate_file", _headers(port, token), {"path": "missing.csv"})
+    assert status == 400 and "missing.csv" in reply["error"]
+    assert _request(port, "POST", "/validate_file", _headers(port, token), {})[0] == 400
+
+
+def test_token_file_is_private_and_fresh(tmp_path):
+    path = str(tmp_path / "sub" / "service.token")
+    first = service_module.write_token(path)
+    assert service_module.read_token(path) == first
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    second = service_module.write_token(path)
+    assert second != first and service_module.read_token(path) == second
+    assert service_module.read_token(str(tmp_path / "absent.token")) is None
+
+
+def test_client_sends_the_token(server, tmp_path):
+    port, token, _ = server
+    token_file = tmp_path / "service.token"
+    token_file.write_text(token, encoding="utf-8")
+    url = f"http://127.0.0.1:{port}"
+    reply = service_module.call(url, "/assign_ssic", {"items": ["dbs"]}, token_file=str(token_file))
+    assert reply["results"] == ["DBS"]
+
+    token_file.write_text("stale", encoding="utf-8")
+    with pytest.raises(SystemExit, match="401"):
+        service_module.call(url, "/status", token_file=str(token_file))
+    with pytest.raises(SystemExit, match="No service token"):
+        service_module.call(url, "/status", token_file=str(tmp_path / "absent.token"))
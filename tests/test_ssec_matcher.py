@@ -0,0 +1,65 @@
+import difflib
+
+import numpy as np
+import pytest
+
+import CLFS_validation_rules as rules
+from CLFS_validation_rules import SSECMatcher, _normalize_text
+
+
+def _scan_every_candidate(qualification, candidates, threshold=85):
+    # The per-call scan SSECMatcher replaced
+    qn = _normalize_text(qualification)
+    if not qn or not candidates:
+        return None, 0
+    best_code, best_score = None, 0
+    for code, desc in candidates:
+        dn = _normalize_text(desc)
+        if not dn:
+            continue
+        if dn in qn or qn in dn:
+            return code, 100
+        score = int(difflib.SequenceMatcher(None, qn, dn).ratio() * 100)
+        if score > best_score:
+            best_code, best_score = code, score
+    if best_score >= threshold:
+        return best_code, best_score
+    return None, best_score
+
+
+QUALIFICATIONS = [
+    "Bachelor's Degree",
+    "bachelors degree",
+    "Diploma",
+    "Polytechnic Diploma in Engineering",
+    "GCE 'O' Level",
+    "Master of Science",
+    "Doctorate (PhD)",
+    "Nitec in Electronics",
+    "Primary School Leaving Examination",
+    "something unrelated",
+    "",
+    "   ",
+]
+
+
+@pytest.mark.parametrize("qualification", QUALIFICATIONS)
+def test_matcher_agrees_with_full_scan(qualification):
+    matcher = SSECMatcher(rules.SSEC_CANDIDATES)
+    assert matcher.match(qualification) == _scan_every_candidate(qualification, rules.SSEC_CANDIDATES)
+
+
+def test_match_many_matches_each_value():
+    matcher = SSECMatcher(rules.SSEC_CANDIDATES)
+    column = QUALIFICATIONS + QUALIFICATIONS[::-1]
+    assert matcher.match_many(column) == [matcher.match(value) for value in column]
+
+
+def test_match_many_treats_missing_values_as_empty():
+    matcher = SSECMatcher(rules.SSEC_CANDIDATES)
+    assert matcher.match_many([None, np.nan, float("nan"), "Diploma"])[:3] == [(None, 0)] * 3
+
+
+def test_best_ssec_matches_without_candidates(monkeypatch):
+    monkeypatch.setattr(rules, "SSEC_CANDIDATES", [])
+    assert rules.best_ssec_matches(["Diploma", None]) == [(None, 0), (None, 0)]
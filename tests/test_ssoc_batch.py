@@ -0,0 +1,210 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import SSOC_assigner_V3 as ssoc
+
+DEFINITIONS = [
+    ("21661", "Software developer", "Designs, develops and tests software applications and databases for clients"),
+    ("21662", "Web developer", "Develops websites and web applications, backend api and frontend user interfaces"),
+    ("25121", "Database administrator", "Administers database systems, backups and data security for the network"),
+    ("51201", "Cook", "Prepares and cooks food in a restaurant kitchen according to the menu"),
+    ("51202", "Chef", "Plans menus and supervises kitchen staff preparing food in a restaurant or hotel"),
+    ("52201", "Sales assistant", "Serves customers in a retail shop, handles the cashier counter and stock display"),
+    ("83221", "Delivery van driver", "Drives a van to deliver goods along a route and loads cargo"),
+    ("83311", "Bus driver", "Drives a bus carrying passengers along a route between bus stations"),
+    ("91121", "Office cleaner", "Cleans offices and premises, sweeping and mopping floors"),
+    ("54141", "Security guard", "Guards premises, patrols the site and monitors cctv for incidents"),
+    ("22110", "Medical doctor", "Diagnoses and treats patients in a hospital or clinic"),
+    ("23101", "University lecturer", "Teaches students at a university and conducts research"),
+]
+
+JOBS = [
+    ("Software engineer", "develop backend api and test web applications"),
+    ("software engineer", "develop backend api and test web applications"),
+    ("Cook", "prepare food"),
+    ("Kitchen assistant", "help the chef prepare food in the restaurant kitchen"),
+    ("Driver", "deliver goods to customers with the company van"),
+    ("Retail assistant", "serve customers at the counter and handle cash in the shop"),
+    ("Cleaner", "sweeping and mopping the office premises"),
+    ("Guard", "patrol the building and watch the cctv"),
+    ("", ""),
+    ("Analyst", ""),
+]
+
+
+@pytest.fixture(scope="module")
+def definitions(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ssoc") / "definitions.xlsx"
+    pd.DataFrame(DEFINITIONS, columns=["SSOC 2024", "SSOC 2024 Title", "Detailed Definitions"]).to_excel(path, index=False)
+    defs, title_map = ssoc.load_definitions(str(path), 0, 0)
+    ssoc.build_tfidf_index(defs)
+    return defs, title_map
+
+
+def _scalar(defs, title_map, industry=""):
+    return [
+        ssoc.best_match_duties_priority(title, duties, defs, title_map, {}, 0.05, "", company_industry=industry)
+        for title, duties in JOBS
+    ]
+
+
+def _batch_rows(out):
+    return list(zip(out["code"], out["title"], out["score"], out["explain"], out["top_5"], out["search_type"]))
+
+
+@pytest.mark.parametrize("industry", ["", "retail sale of food in supermarkets"])
+def test_batch_matches_scalar(definitions, industry):
+    defs, title_map = definitions
+    jobs = pd.DataFrame(JOBS, columns=["title", "duties"]).assign(industry=industry)
+    out = ssoc.assign_ssoc_batch(jobs, "title", "duties", industry_col="industry",
+                                 defs=defs, title_map=title_map, min_score_0_to_1=0.05)
+    assert _batch_rows(out) == _scalar(defs, title_map, industry)
+    assert out.attrs["unique"] == len(set(JOBS))
+
+
+def test_concurrent_batches_share_the_worker_pool(definitions):
+    defs, title_map = definitions
+    jobs = pd.DataFrame(JOBS * 2, columns=["title", "duties"])
+    try:
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            outs = list(ex.map(
+                lambda _: ssoc.assign_ssoc_batch(jobs, "title", "duties", defs=defs, title_map=title_map,
+                                                 min_score_0_to_1=0.05, workers=2),
+                range(3),
+            ))
+    finally:
+        ssoc.shutdown_batch_pool()
+    expected = _scalar(defs, title_map) * 2
+    assert all(_batch_rows(out) == expected for out in outs)
+
+
+def _sector_cues_every_anchor(text):
+    # The per-call anchor scan the memoized index replaced
+    toks, lower, cues = set(ssoc._tokens(text)), ssoc._normalize(text), set()
+    for sector, anchors in ssoc.SECTOR_ANCHORS.items():
+        for a in anchors:
+            a_norm = ssoc._normalize(a.replace("_", " "))
+            if (a_norm in lower) if " " in a_norm else (a_norm in toks):
+                cues.add(sector)
+    return cues
+
+
+SECTOR_TEXTS = [text for pair in JOBS for text in pair] + [d[2] for d in DEFINITIONS] + [
+    "front office guest relations at the hotel",
+    "testing and commissioning of switchboards",
+    "clerk_of_works at the construction site",
+    "personal trainer at the gym",
+]
+
+
+@pytest.mark.parametrize("text", SECTOR_TEXTS)
+def test_sector_cues_match_anchor_scan(text):
+    assert ssoc._sector_cues_from_text(text) == _sector_cues_every_anchor(text)
+
+
+# Boilerplate returns: the same description with one word changed per row
+NEAR_DUPLICATE_JOBS = [
+    ("Operations associate", f"prepare weekly sales reports and update the inventory records for the {outlet} outlet manager")
+    for outlet in ("north", "south", "east", "west")
+] + [
+    ("Research assistant", f"collect survey data and clean the {survey} datasets for the project team")
+    for survey in ("household", "labour", "wage")
+] + JOBS
+
+
+def _near_duplicate_batch(definitions, jobs, threshold):
+    defs, title_map = definitions
+    frame = pd.DataFrame(jobs, columns=["title", "duties"])
+    return ssoc.assign_ssoc_batch(frame, "title", "duties", defs=defs, title_map=title_map,
+                                  min_score_0_to_1=0.05, near_duplicate_threshold=threshold)
+
+
+def test_near_duplicate_clusters_partition_rows():
+    titles = [t for t, _ in NEAR_DUPLICATE_JOBS]
+    duties = [d for _, d in NEAR_DUPLICATE_JOBS]
+    clusters = ssoc.near_duplicate_clusters(titles, duties, 0.8)
+    assert sorted(i for cluster in clusters for i in cluster) == list(range(len(titles)))
+    assert [0, 1, 2, 3] in clusters and [4, 5, 6] in clusters
+    # Exact-duplicate shingles only at 1.0; empty inputs stay on their own
+    assert [0] in ssoc.near_duplicate_clusters(titles, duties, 1.0)
+    assert ssoc.near_duplicate_clusters(["", ""], ["", ""], 0.8) == [[0], [1]]
+
+
+def test_near_duplicate_clusters_respect_context():
+    jobs = NEAR_DUPLICATE_JOBS[:2] * 2
+    titles = [t for t, _ in jobs]
+    duties = [d for _, d in jobs]
+    clusters = ssoc.near_duplicate_clusters(titles, duties, 0.8, context=[("Degree",), ("Degree",), ("",), ("",)])
+    assert clusters == [[0, 1], [2, 3]]
+
+
+def test_near_duplicate_clustering_is_off_by_default(definitions):
+    defs, title_map = definitions
+    frame = pd.DataFrame(NEAR_DUPLICATE_JOBS, columns=["title", "duties"])
+    default = ssoc.assign_ssoc_batch(frame, "title", "duties", defs=defs, title_map=title_map, min_score_0_to_1=0.05)
+    off = _near_duplicate_batch(definitions, NEAR_DUPLICATE_JOBS, None)
+    assert _batch_rows(default) == _batch_rows(off)
+    assert not off["search_type"].str.endswith("(near-duplicate)").any()
+
+
+def test_near_duplicate_codes_match_scoring_every_row(definitions):
+    exact = _near_duplicate_batch(definitions, NEAR_DUPLICATE_JOBS, None)
+    clustered = _near_duplicate_batch(definitions, NEAR_DUPLICATE_JOBS, 0.8)
+    assert list(clustered["code"]) == list(exact["code"])
+    assert list(clustered["title"]) == list(exact["title"])
+    shared = clustered["search_type"].str.endswith("(near-duplicate)")
+    assert shared.sum() > 0
+    # Rows scored on their own are unchanged
+    assert _batch_rows(clustered[~shared]) == _batch_rows(exact[~shared])
+    assert clustered.attrs["scored"] < exact.attrs["scored"]
+
+
+def _fake_shortlist_match(code_of):
+    def match(title, duties, defs, min_score, edu, hint, industry, cand):
+        code = code_of(title, duties)
+        return (code, f"title {code}", 0.5, f"scored {title} / {duties}", [], "Shortlist")
+    return match
+
+
+def test_near_duplicate_clusters_propagate_when_representatives_agree(definitions, monkeypatch):
+    monkeypatch.setattr(ssoc, "_shortlist_match", _fake_shortlist_match(lambda t, d: "33491"))
+    jobs = NEAR_DUPLICATE_JOBS[:4]
+    out = _near_duplicate_batch(definitions, jobs, 0.8)
+    assert list(out["code"]) == ["33491"] * 4
+    # The first row and the member least similar to it (the first of the equally similar) are scored
+    assert list(out["search_type"]) == ["Shortlist"] * 2 + ["Shortlist (near-duplicate)"] * 2
+    assert out.attrs["scored"] == 2
+
+
+def test_near_duplicate_clusters_opt_out_when_representatives_disagree(definitions, monkeypatch):
+    # A scorer that reads the one word the rows differ in
+    monkeypatch.setattr(ssoc, "_shortlist_match", _fake_shortlist_match(lambda t, d: d.split()[-3]))
+    jobs = NEAR_DUPLICATE_JOBS[:4]
+    clustered = _near_duplicate_batch(definitions, jobs, 0.8)
+    exact = _near_duplicate_batch(definitions, jobs, None)
+    assert _batch_rows(clustered) == _batch_rows(exact)
+    assert clustered.attrs["scored"] == 4
+
+
+def test_cli_near_duplicate_threshold_is_opt_in(monkeypatch):
+    seen = []
+
+    class Parsed(Exception):
+        pass
+
+    def capture(args):
+        seen.append(args.near_dup_threshold)
+        raise Parsed
+
+    monkeypatch.setattr(ssoc, "load_definitions", lambda *a, **k: ([], {}))
+    for name in ("load_expert_map", "load_uen_to_ssic_map", "load_ssic_definitions"):
+        monkeypatch.setattr(ssoc, name, lambda *a, **k: {})
+    monkeypatch.setattr(ssoc, "build_tfidf_index", lambda defs: None)
+    monkeypatch.setattr(ssoc, "_resolve_jobs_input", capture)
+    for argv in ([], ["--near-dup-threshold"], ["--near-dup-threshold", "0.9"]):
+        monkeypatch.setattr("sys.argv", ["SSOC_assigner_V3.py", *argv])
+        with pytest.raises(Parsed):
+            ssoc.main()
+    assert seen == [None, ssoc.NEAR_DUPLICATE_THRESHOLD, 0.9]
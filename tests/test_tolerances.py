@@ -0,0 +1,249 @@
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import CLFS_option_catalog as option_catalog
+import CLFS_tolerances as tolerances
+import CLFS_validator as validator
+
+
+SAMPLE = Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv"
+
+
+def _write_config(tmp_path, fields, tols):
+    path = tmp_path / "tolerances.json"
+    path.write_text(json.dumps({"version": "t", "fields": fields, "tolerances": tols}), encoding="utf-8")
+    return path
+
+
+def _table(fields, tols):
+    return tolerances.ToleranceTable(
+        version="t",
+        fields={name: tolerances.FieldSpec(name=name, column=name, kind=kind) for name, kind in fields.items()},
+        tolerances=[tolerances.Tolerance(id=i, cell="", target=target, message=i, when=when) for i, target, when in tols],
+    )
+
+
+@pytest.mark.parametrize("fields, tols, error", [
+    ({"a": {"column": "A", "kind": "float"}}, [], "unknown kind"),
+    ({"a": {"column": "A"}},
+     [{"id": "T", "target": "a", "message": "m"}, {"id": "T", "target": "a", "message": "m"}], "duplicate"),
+    ({"a": {"column": "A"}}, [{"id": "T", "target": "b", "message": "m"}], "undefined field"),
+    ({"a": {"column": "A"}}, [{"id": "T", "target": "a", "message": "m", "when": [["a", "between", 1]]}], "unknown op"),
+])
+def test_invalid_config_is_rejected(tmp_path, fields, tols, error):
+    with pytest.raises(ValueError, match=error):
+        tolerances.load_tolerances(_write_config(tmp_path, fields, tols))
+
+
+def test_shipped_config_loads():
+    table = tolerances.load_tolerances(tolerances.DEFAULT_CONFIG_FILE)
+    assert table.tolerances
+    assert len({tol.id for tol in table.tolerances}) == len(table.tolerances)
+
+
+@pytest.mark.parametrize("op, operand, expected", [
+    ("gt", 2, [False, False, True, False]),
+    ("ge", 2, [False, True, True, False]),
+    ("lt", 2, [True, False, False, False]),
+    ("le", 2, [True, True, False, False]),
+    ("eq", 2, [False, True, False, False]),
+    ("ne", 2, [True, False, True, False]),
+    ("in", [1, 3], [True, False, True, False]),
+    ("not_in", [1, 3], [False, True, False, False]),
+    ("outside", [1, 3], [True, False, True, False]),
+])
+def test_number_ops_never_match_missing(op, operand, expected):
+    values = np.array([1.0, 2.0, 3.0, np.nan])
+    assert tolerances._condition_mask(values, op, operand).tolist() == expected
+
+
+@pytest.mark.parametrize("op, operand, expected", [
+    ("eq", "1", [True, False, False]),
+    ("ne", "1", [False, True, False]),
+    ("in", ["1", "X"], [True, False, False]),
+    ("not_in", ["1", "X"], [False, True, False]),
+])
+def test_text_ops_never_match_missing(op, operand, expected):
+    values = np.array(["1", "9", None], dtype=object)
+    assert tolerances._condition_mask(values, op, operand).tolist() == expected
+
+
+def test_text_fields_reject_order_ops():
+    with pytest.raises(ValueError):
+        tolerances._condition_mask(np.array(["1"], dtype=object), "gt", 1)
+
+
+def test_derive_feature_kinds():
+    values = pd.Series([" 12 ", "abc", None, "", "x1234", "2411"])
+    number = tolerances.derive_feature(values, tolerances.FieldSpec("n", "N", "number"))
+    assert np.array_equal(number, [12.0, np.nan, np.nan, np.nan, np.nan, 2411.0], equal_nan=True)
+    group = tolerances.derive_feature(values, tolerances.FieldSpec("g", "G", "ssoc_group"))
+    assert group.tolist() == ["1", None, None, None, "X", "2"]
+    text = tolerances.derive_feature(pd.Series(["HDB  1-Room Flat", None]), tolerances.FieldSpec("t", "T", "text"))
+    assert text.tolist() == ["hdb 1-room flat", None]
+    assert tolerances.derive_feature(None, tolerances.FieldSpec("n", "N")) is None
+
+
+def test_evaluate_hits_and_skipped():
+    table = _table(
+        {"hours": "number", "gmi": "number", "missing": "number"},
+        [
+            ("PART", "gmi", [("hours", "lt", 35), ("gmi", "ge", 10000)]),
+            ("HIGH", "gmi", [("gmi", "ge", 200000)]),
+            ("GONE", "gmi", [("missing", "gt", 0)]),
+        ],
+    )
+    index = pd.Index([10, 11, 12, 13])
+    features = {
+        "hours": np.array([20.0, 40.0, np.nan, 20.0]),
+        "gmi": np.array([12000.0, 250000.0, 300000.0, np.nan]),
+        "missing": None,
+    }
+    hits, skipped = tolerances.evaluate(features, table, index)
+    assert list(hits.columns) == tolerances.HIT_COLUMNS
+    assert list(zip(hits.index, hits["tolerance"])) == [(10, "PART"), (11, "HIGH"), (12, "HIGH")]
+    assert skipped == ["GONE"]
+
+
+def test_evaluate_without_hits_is_empty():
+    table = _table({"gmi": "number"}, [("HIGH", "gmi", [("gmi", "ge", 200000)])])
+    hits, skipped = tolerances.evaluate({"gmi": np.array([1.0])}, table, pd.Index([0]))
+    assert hits.empty and list(hits.columns) == tolerances.HIT_COLUMNS
+    assert skipped == []
+
+
+# -------------------
+# Shipped config against a per-row check
+# -------------------
+
+def _scalar_value(raw, spec, catalog):
+    """One cell as the per-row check reads it (None when missing)."""
+    text = None if raw is None else str(raw).strip() or None
+    if text is None:
+        return None
+    if spec["kind"] == "number":
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    if spec["kind"] == "code":
+        options = catalog.field(spec.get("options") or spec["column"]).options
+        return options.index(text) + 1 if text in options else None
+    if spec["kind"] == "ssoc_group":
+        if text[0] in "xX":
+            return "X"
+        digits = [c for c in text if c in "123456789"]
+        return digits[0] if digits else None
+    return " ".join(text.split()).lower()
+
+
+def _holds(value, op, operand):
+    if value is None:
+        return False
+    if isinstance(value, str):
+        operand = [str(x) for x in operand] if op in ("in", "not_in") else str(operand)
+    return {
+        "gt": lambda: value > operand,
+        "ge": lambda: value >= operand,
+        "lt": lambda: value < operand,
+        "le": lambda: value <= operand,
+        "eq": lambda: value == operand,
+        "ne": lambda: value != operand,
+        "in": lambda: value in operand,
+        "not_in": lambda: value not in operand,
+        "outside": lambda: value <= operand[0] or value >= operand[1],
+    }[op]()
+
+
+def _random_rows(config, catalog, n_rows, seed):
+    rng = random.Random(seed)
+    pools = {
+        "age": [None, "", "15", "19", "20", "34", "35", "60", "abc"],
+        "hours": [None, "5", "9", "10", "25", "34", "35", "40", "50", "51", "120"],
+        "gmi": [None, "", "0", "300", "755", "2500", "4000", "7001", "10000", "30000", "50000", "199999", "200000"],
+        "bonus": [None, "0", "5", "6.5", "12", "13", "50", "100", "150"],
+        "ssoc_group": [None, "", "X1000", "11111", "24111", "31111", "41111", "83111", "91111", "0"],
+        "dwelling_type": [None, "HDB 1-Room Flat", "hdb  2-room flat", "Condominium"],
+    }
+    money = [None, "0", "1", "600", "10000", "19000", "24000", "600000"]
+    rows = []
+    for _ in range(n_rows):
+        row = {}
+        for name, spec in config["fields"].items():
+            if spec["kind"] == "code":
+                pool = [None, "unknown"] + list(catalog.field(spec.get("options") or spec["column"]).options)
+            else:
+                pool = pools.get(name, money)
+            row[spec["column"]] = rng.choice(pool)
+        rows.append(row)
+    return pd.DataFrame(rows, dtype=object)
+
+
+def test_shipped_config_matches_per_row_check():
+    config = json.loads(tolerances.DEFAULT_CONFIG_FILE.read_text(encoding="utf-8"))
+    table = tolerances.load_tolerances(tolerances.DEFAULT_CONFIG_FILE)
+    catalog = option_catalog.load_catalog()
+    df = _random_rows(config, catalog, 3000, seed=41)
+
+    expected = []
+    for tol in config["tolerances"]:
+        for row_idx, row in df.iterrows():
+            values = {
+                name: _scalar_value(row[spec["column"]], spec, catalog)
+                for name, spec in config["fields"].items()
+            }
+            if values[tol["target"]] is None:
+                continue
+            if all(_holds(values[name], op, operand) for name, op, operand in tol.get("when", [])):
+                expected.append((row_idx, tol["id"]))
+
+    columns = {name: df[spec.column] for name, spec in table.fields.items()}
+    hits, skipped = tolerances.evaluate(tolerances.derive_features(columns, table, catalog), table, df.index)
+    assert skipped == []
+    assert list(zip(hits.index, hits["tolerance"])) == expected
+    # Every tolerance fires somewhere, so none is compared only on misses
+    assert {tol["id"] for tol in config["tolerances"]} == {tol_id for _, tol_id in expected}
+
+
+# -------------------
+# Validator stage
+# -------------------
+
+def _sample_run():
+    df = validator.load_input_file(SAMPLE)
+    return validator.prepare_validation_run(SAMPLE.name, df)
+
+
+def test_stage_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(validator, "TOLERANCE_TABLE", None)
+    run = _sample_run()
+    validator._apply_tolerance_rules(run)
+    assert run.rule_errors == []
+
+
+def test_stage_flags_member_cells(monkeypatch):
+    monkeypatch.setattr(validator, "TOLERANCE_TABLE", None)
+    validator.enable_tolerances(str(tolerances.DEFAULT_CONFIG_FILE))
+    table = validator.TOLERANCE_TABLE
+    assert table is not None
+
+    run = _sample_run()
+    gmi = run.modified_df.columns.get_loc("GMI")
+    run.modified_df.iat[1, gmi] = "250000"
+    validator._apply_tolerance_rules(run)
+    assert [(e["row"], e["column"], e["rule"]) for e in run.rule_errors] == [(2, "GMI", "TOL-B-H171")]
+    assert (1, gmi) in run.error_cells
+
+    targets = {tol.id: table.fields[tol.target].column for tol in table.tolerances}
+    for error in run.rule_errors:
+        assert error["rule"] in targets
+        assert targets[error["rule"]] in str(error["column"])
+        assert error["member_index"] is not None and error["member_index"] > 0
+
+    validator.enable_tolerances(None)
+    assert validator.TOLERANCE_TABLE is None
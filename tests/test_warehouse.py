@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import CLFS_validator as validator
+import CLFS_warehouse as warehouse
+
+
+SAMPLE = Path(__file__).resolve().parents[1] / "Operating_Table" / "CLFS_newformat.csv"
+
+
+def _errors(*rules):
+    return [{"row": i + 1, "rule": rule, "column": "GMI", "message": rule} for i, rule in enumerate(rules)]
+
+
+def _counts(frame, key="rule"):
+    return dict(zip(frame[key], frame["count"]))
+
+
+@pytest.mark.parametrize("name, wave, quarter", [
+    ("MLFS_2025-03.xlsx", "2025-03", "2025Q1"),
+    ("CLFS 202508.csv", "2025-08", "2025Q3"),
+    ("CLFS_2025_12_final.csv", "2025-12", "2025Q4"),
+    ("out/CLFS_newformat.csv", None, None),
+    ("CLFS_2025-13.csv", None, None),
+])
+def test_wave_from_file_name(name, wave, quarter):
+    assert warehouse.file_wave(name) == wave
+    assert warehouse.quarter_label(wave) == quarter
+
+
+def test_wave_falls_back_to_the_run_month():
+    assert warehouse.wave_label("CLFS_newformat.csv", pd.Timestamp("2026-02-14").to_pydatetime()) == "2026-02"
+    assert warehouse.wave_label("CLFS_2025-03.csv", pd.Timestamp("2026-02-14").to_pydatetime()) == "2025-03"
+
+
+def test_counts_read_only_the_latest_run_of_each_file(tmp_path):
+    with warehouse.Warehouse(str(tmp_path / "w.sqlite")) as store:
+        store.record_run("CLFS_validator", "CLFS_2025-03.csv", errors=_errors("R1", "R1", "R2"))
+        store.record_run("CLFS_validator", "CLFS_2025-03.csv", errors=_errors("R1"))
+        store.record_run("CLFS_validator", "CLFS_2025-08.csv", errors=_errors("R2"))
+        store.record_run("MLFS_validator", "CLFS_2025-03.csv", errors=_errors("R3"))
+
+        assert _counts(store.count()) == {"R1": 1, "R2": 1, "R3": 1}
+        assert _counts(store.count(all_runs=True)) == {"R1": 3, "R2": 2, "R3": 1}
+        assert _counts(store.count(tool="CLFS_validator")) == {"R1": 1, "R2": 1}
+        assert _counts(store.count(by=["quarter"]), "quarter") == {"2025Q1": 2, "2025Q3": 1}
+        assert _counts(store.count(by=["wave"], rule="R2", all_runs=True), "wave") == {"2025-03": 1, "2025-08": 1}
+        assert store.count(by=[]).at[0, "count"] == 3
+
+        runs = store.runs()
+        assert list(runs["errors"]) == [1, 1, 1, 3]
+        assert set(runs["quarter"]) == {"2025Q1", "2025Q3"}
+
+
+def test_failing_establishments_use_the_latest_run(tmp_path):
+    def ssic(*names):
+        return [{"scheme": "SSIC", "input_text": name, "code": None, "matched": 0} for name in names]
+
+    with warehouse.Warehouse(str(tmp_path / "w.sqlite")) as store:
+        store.record_run("CLFS_validator", "CLFS_2025-03.csv", assignments=ssic("Acme ", "acme", "Foo"))
+        store.record_run("CLFS_validator", "CLFS_2025-03.csv", assignments=ssic("Acme"))
+        store.record_run("CLFS_validator", "CLFS_2025-08.csv", assignments=ssic(" ACME") + [
+            {"scheme": "SSIC", "input_text": "Bar", "code": "64191", "matched": 1},
+        ])
+
+        latest = store.failing_establishments()
+        assert list(zip(latest["establishment"], latest["failures"], latest["waves"])) == [("acme", 2, 2)]
+        every = store.failing_establishments(min_count=2, all_runs=True)
+        assert list(zip(every["establishment"], every["failures"])) == [("acme", 4)]
+
+
+def test_facts_are_stored_as_text_with_missing_cells_null(tmp_path):
+    with warehouse.Warehouse(str(tmp_path / "w.sqlite")) as store:
+        store.record_run("CLFS_validator", "CLFS_2025-03.csv", changes=pd.DataFrame({
+            "row": [2, 3], "column": ["Age", "Age"], "old_value": [None, "12"], "new_value": ["13", float("nan")],
+            "ignored": ["x", "y"],
+        }))
+        changes = store.query("SELECT old_value, new_value, response_id FROM changes ORDER BY row")
+    assert changes.to_dict("list") == {"old_value": [None, "12"], "new_value": ["13", None], "response_id": [None, None]}
+
+
+def test_unknown_table_or_column_is_rejected(tmp_path):
+    with warehouse.Warehouse(str(tmp_path / "w.sqlite")) as store:
+        with pytest.raises(ValueError, match="Unknown table"):
+            store.count(table="runs")
+        with pytest.raises(ValueError, match="Cannot group"):
+            store.count(by=["rule; DROP TABLE errors"])
+
+
+def test_record_run_warns_instead_of_failing(tmp_path, capsys):
+    assert warehouse.record_run(str(tmp_path), "CLFS_validator", "CLFS_2025-03.csv") is None
+    assert "could not record" in capsys.readouterr().out
+
+
+def test_recording_is_opt_in(monkeypatch):
+    monkeypatch.delenv("CLFS_WAREHOUSE", raising=False)
+    assert warehouse.recording_file_from_env() is None
+    assert warehouse.warehouse_file_from_env() == str(warehouse.DEFAULT_WAREHOUSE_FILE)
+    monkeypatch.setenv("CLFS_WAREHOUSE", "elsewhere.sqlite")
+    assert warehouse.recording_file_from_env() == "elsewhere.sqlite"
+
+
+def _finished_run():
+    df = validator.load_input_file(SAMPLE)
+    return validator.run_validation_stages(validator.prepare_validation_run(SAMPLE.name, df))
+
+
+def test_validator_records_only_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(validator, "WAREHOUSE_FILE", None)
+    monkeypatch.setattr(validator, "SURVEY_WAVE", None)
+    run = _finished_run()
+    assert validator.record_in_warehouse(run) is None
+
+    path = tmp_path / "results.sqlite"
+    validator.enable_warehouse(str(path), "2025-08")
+    run_id = validator.record_in_warehouse(run)
+    assert run_id is not None
+    with warehouse.Warehouse(str(path)) as store:
+        runs = store.runs()
+        assert list(zip(runs["tool"], runs["file"], runs["wave"], runs["quarter"], runs["rows"])) == [
+            ("CLFS_validator", SAMPLE.name, "2025-08", "2025Q3", len(run.df)),
+        ]
+        assert runs.at[0, "errors"] == len(run.rule_errors)
+        assert store.count(by=[]).at[0, "count"] == len(run.rule_errors)
+        assert store.count(by=[], table="changes").at[0, "count"] == len(run.changes)
+        assert store.count(by=[], table="timings").at[0, "count"] == len(run.profiler.entries())
@@ -0,0 +1,53 @@
+import os
+import time
+
+import CLFS_validator as validator
+from CLFS_watch import FolderWatcher, WatchLedger, file_digest
+
+SUMMARY = {"rows": 3, "errors": 1}
+
+
+def test_ledger_skips_only_same_content_and_settings(tmp_path):
+    ledger = WatchLedger(tmp_path / "ledger.json")
+    ledger.record("wave.csv", "abc", "settings-1", SUMMARY)
+
+    reloaded = WatchLedger(tmp_path / "ledger.json")
+    assert reloaded.already_validated("wave.csv", "abc", "settings-1")
+    assert not reloaded.already_validated("wave.csv", "abd", "settings-1")
+    assert not reloaded.already_validated("wave.csv", "abc", "settings-2")
+    assert not reloaded.already_validated("other.csv", "abc", "settings-1")
+
+
+def test_ledger_entries_without_settings_are_revalidated(tmp_path):
+    path = tmp_path / "ledger.json"
+    path.write_text('{"wave.csv": {"sha256": "abc", "rows": 3, "errors": 1}}', encoding="utf-8")
+    assert not WatchLedger(path).already_validated("wave.csv", "abc", validator.settings_fingerprint())
+
+
+def test_settings_fingerprint_follows_options_and_config(tmp_path):
+    config = tmp_path / "tolerances.json"
+    config.write_text("{}", encoding="utf-8")
+    base = validator.settings_fingerprint()
+    with_config = validator.settings_fingerprint(str(config))
+
+    assert validator.settings_fingerprint() == base
+    assert with_config != base
+    assert validator.settings_fingerprint(programme_catalog=True) != base
+
+    config.write_text('{"changed": true}', encoding="utf-8")
+    assert validator.settings_fingerprint(str(config)) != with_config
+
+
+def test_watcher_waits_for_debounce_and_skips_handled_files(tmp_path):
+    export = tmp_path / "wave.csv"
+    export.write_text("a,b\n1,2\n", encoding="utf-8")
+    (tmp_path / "~$wave.xlsx").write_text("lock", encoding="utf-8")
+    watcher = FolderWatcher(str(tmp_path), debounce_s=60)
+
+    assert watcher.poll() == [] and watcher.settling
+
+    past = time.time() - 120
+    os.utime(export, (past, past))
+    assert [path.name for path, _ in watcher.poll()] == ["wave.csv"]
+    assert watcher.poll() == [] and not watcher.settling
+    assert len(file_digest(export)) == 64
@@ -0,0 +1,88 @@
+import itertools
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ZW_Usable_Validation_Rules as zw
+
+NUMBERS = [None, np.nan, "", " ", "abc", "nan", 0, 1, True, "1", 1.0, "2.5", 5, "12", 30, 45]
+
+
+def _scalar_failures(results, index):
+    failed = [(i, vr) for i, vr in zip(index, results) if not vr.is_valid]
+    return pd.DataFrame(
+        {"rule": [vr.rule_applied for _, vr in failed], "message": [vr.message for _, vr in failed]},
+        index=pd.Index([i for i, _ in failed], dtype=index.dtype),
+        dtype=object,
+    )
+
+
+def _assert_parity(column_failures, results, index):
+    expected = _scalar_failures(results, index)
+    pd.testing.assert_frame_equal(column_failures.astype(object), expected, check_index_type=False)
+
+
+def test_years_in_employment_column_matches_scalar():
+    rows = list(itertools.product([None, "", "abc", "nan", 1, True, 3, "10", 25], [None, 2, 5, "12"],
+                                  [None, 16, 30, "40"], [None, 15, 20, 35]))
+    index = pd.RangeIndex(len(rows))
+    columns = [pd.Series([row[i] for row in rows], dtype=object) for i in range(4)]
+    results = [zw.validate_years_in_employment_consistency(*row) for row in rows]
+    _assert_parity(zw.years_in_employment_consistency_column(*columns, index), results, index)
+
+
+def test_num_children_column_matches_scalar():
+    rows = list(itertools.product(NUMBERS, [None, "", 8, "11", 13.5, 14, 30]))
+    index = pd.RangeIndex(len(rows))
+    children, ages = (pd.Series([row[i] for row in rows], dtype=object) for i in range(2))
+    results = [zw.validate_num_children(*row) for row in rows]
+    _assert_parity(zw.num_children_column(children, ages, index), results, index)
+
+
+@pytest.mark.parametrize("column_rule, scalar_rule", [
+    (zw.activity_status_column, zw.validate_activity_status),
+    (zw.i_l_column, zw.validate_i_l),
+    (zw.travel_time_format_column, zw.validate_travel_time_format),
+])
+def test_single_value_columns_match_scalar(column_rule, scalar_rule):
+    values = [None, "", "Yes", "n", "maybe", "Employed", "not working", "Retired", "0", "015", "30", "12 mins", 1, True]
+    index = pd.RangeIndex(len(values))
+    results = [scalar_rule(v) for v in values]
+    _assert_parity(column_rule(pd.Series(values, dtype=object), index), results, index)
+
+
+TEXTS = [None, np.nan, "", "Yes", "n", "maybe", "Employed", "Own Account Worker", "not working",
+         "Institutional unit", "None of the above", "None of the above; Car", "0", "015", "30", 0, 1, True]
+
+
+@pytest.mark.parametrize("column_rule, scalar_rule, arity", [
+    (zw.residential_st_column, zw.validate_residential_st, 1),
+    (zw.none_of_the_above_exclusive_column, zw.validate_none_of_the_above_exclusive, 1),
+    (zw.duration_numeric_column, zw.validate_duration_numeric, 1),
+    (zw.oaw_income_threshold_column, zw.validate_oaw_income_threshold, 2),
+    (zw.occupation_details_column, zw.validate_occupation_details, 3),
+    (zw.employment_consistency_column, zw.validate_employment_consistency, 4),
+    (zw.seeking_work_logic_column, zw.validate_seeking_work_logic, 4),
+])
+def test_other_columns_match_scalar(column_rule, scalar_rule, arity):
+    values = TEXTS + NUMBERS[4:]
+    rnd = random.Random(arity)
+    rows = [(v,) for v in values] if arity == 1 else [tuple(rnd.choice(values) for _ in range(arity)) for _ in range(400)]
+    index = pd.RangeIndex(len(rows))
+    columns = [pd.Series([row[k] for row in rows], dtype=object) for k in range(arity)]
+    results = [scalar_rule(*row) for row in rows]
+    _assert_parity(column_rule(*columns, index), results, index)
+
+
+def test_unique_map_keeps_mixed_object_values_apart():
+    values = pd.Series([1, True, None, np.nan, 1.0, 1, None], dtype=object)
+    calls = []
+
+    def func(value):
+        calls.append(value)
+        return repr(value)
+
+    assert list(zw._unique_map(values, func)) == ["1", "True", "None", "nan", "1.0", "1", "None"]
+    assert len(calls) == 5